@@ -0,0 +1,97 @@
+"""
+bench_express.py — quanto a poda (substrate.paint, prune=True) corta do nascimento.
+
+Conta as consultas ao CPPN e o tempo da expressão completa vs podada numa população de
+CPPNs primordiais (recém-configurados) e "evoluídos" (N rodadas de mutação). O corte
+depende do LEO: quanto mais ocultos sem saída, mais das 163 consultas por oculto somem.
+Depois, o TICK: activate() denso de referência vs CompiledSubstrate (NumPy e laço puro), e
+a memória que cada forma segura por vida.
+
+Uso:  python bench_express.py [n_cppns] [rodadas_de_mutacao]
+"""
+import os
+import statistics as st
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                                "client_native"))
+import substrate as sub                            # noqa: E402
+from synth_cppn import cppn_net, random_cppn       # noqa: E402
+
+
+class _Contador:
+    """Embrulha a rede do CPPN e conta activate() — cada uma é uma consulta."""
+
+    def __init__(self, net):
+        self.net, self.n = net, 0
+
+    def activate(self, x):
+        self.n += 1
+        return self.net.activate(x)
+
+
+def medir(genomas):
+    linhas = []
+    for g in genomas:
+        net = cppn_net(g)
+        r = {}
+        for nome, prune in (("full", False), ("pruned", True)):
+            c = _Contador(net)
+            t0 = time.perf_counter()
+            W_ih, W_ho, n = sub.paint(c, prune=prune)
+            r[nome] = (c.n, (time.perf_counter() - t0) * 1e3, n)
+        r["fconns"] = sub.functional_synapses(W_ih, W_ho)
+        linhas.append(r)
+    return linhas
+
+
+def _denso_bytes(W_ih, W_ho):
+    """Listas densas + os floats não-zero encaixotados (o 0.0 é um objeto só)."""
+    rows = W_ih + W_ho
+    return (sum(sys.getsizeof(r) for r in rows) + sys.getsizeof(W_ih) + sys.getsizeof(W_ho)
+            + sum(24 for r in rows for w in r if w != 0.0))
+
+
+def medir_tick(genomas, rep=200):
+    x = [((i * 7) % 11) / 11.0 - 0.4 for i in range(sub.N_IN)]
+    t = {"ref": 0.0, "np": 0.0, "py": 0.0}
+    mem_d = mem_c = 0
+    for g in genomas:
+        W_ih, W_ho, n = sub.paint(cppn_net(g))
+        cs = sub.compile_substrate(W_ih, W_ho, n)
+        mem_d += _denso_bytes(W_ih, W_ho)
+        mem_c += cs.nbytes
+        fns = {"ref": lambda: sub.activate(W_ih, W_ho, x), "py": lambda: sub._activate_py(cs, x)}
+        if cs._np is not None:
+            fns["np"] = lambda: cs.activate(x)
+        for nome, fn in fns.items():
+            t0 = time.perf_counter()
+            for _ in range(rep):
+                fn()
+            t[nome] += (time.perf_counter() - t0) / rep * 1e6
+    k = len(genomas)
+    print(f"      tick: ref {t['ref'] / k:.0f} us | compilado numpy "
+          f"{(t['np'] / k) if t['np'] else float('nan'):.0f} us | laco puro {t['py'] / k:.0f} us")
+    print(f"   memoria: denso {mem_d / k / 1024:.1f} KiB -> compilado {mem_c / k / 1024:.1f} KiB por vida")
+
+
+def _resumo(nome, linhas):
+    qf = [r["full"][0] for r in linhas]
+    qp = [r["pruned"][0] for r in linhas]
+    tf = [r["full"][1] for r in linhas]
+    tp = [r["pruned"][1] for r in linhas]
+    corte = 1.0 - sum(qp) / sum(qf)
+    print(f"{nome:>10}: consultas {st.mean(qf):.0f} -> {st.mean(qp):.0f} (-{corte:.0%}) | "
+          f"{st.mean(tf):.1f} -> {st.mean(tp):.1f} ms | sinapses {st.mean(r['full'][2] for r in linhas):.0f}"
+          f" -> {st.mean(r['pruned'][2] for r in linhas):.0f} expressas, "
+          f"{st.mean(r['fconns'] for r in linhas):.0f} funcionais")
+
+
+if __name__ == "__main__":
+    n = int(sys.argv[1]) if len(sys.argv) > 1 else 40
+    rodadas = int(sys.argv[2]) if len(sys.argv) > 2 else 30
+    _resumo("primordial", medir([random_cppn(s) for s in range(n)]))
+    evoluidos = [random_cppn(s, rodadas) for s in range(n)]
+    _resumo("evoluido", medir(evoluidos))
+    medir_tick(evoluidos)
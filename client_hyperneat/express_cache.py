@@ -0,0 +1,171 @@
+"""
+express_cache.py — cache ENDEREÇADO POR CONTEÚDO da expressão do substrato.
+
+`substrate.express(cppn)` é função determinística do CPPN: 2.720 consultas (163x16 + 16x7),
+pagas em todo nascimento. Mas muito nascimento repete um CPPN já visto — clone do mesmo pai,
+mutação que só mexeu em material morto (conexão desabilitada, nó que não alcança saída).
+A chave aqui é o hash canônico do SUBGRAFO FUNCIONAL do CPPN — exatamente o que a
+FeedForwardNetwork avalia (nós na ordem de id, ativação, agregação, bias, response e as
+ligações com peso, na ORDEM em que a soma as percorre) —, então dois genomas que pintam o
+mesmo substrato caem na mesma entrada mesmo com DNA diferente. Floats entram pelo float.hex:
+igualdade de bit, não de arredondamento. Junto vai o que pinta o substrato fora do CPPN: a
+geometria (substrate.geometry_digest), WEIGHT_SCALE, a versão da regra de consulta/LEO
+(substrate.RULE_VERSION) e a poda — o nível compartilhado sobrevive a deploy, e um deploy
+que muda qualquer um deles não pode anexar substrato pintado pra outra geometria.
+
+Guarda o substrato JÁ COMPILADO (substrate.CompiledSubstrate): cabeçalho, os pesos f64
+escalonados (alinhados em 8) e os CSR ptr/idx u16. Em máquina little-endian o acerto NÃO
+copia: os arrays do substrato são memoryviews sobre a própria entrada — e, vinda do nível
+compartilhado, sobre as MESMAS páginas em todos os processos. O filho enxerga bit a bit o
+substrato que enxergaria sem cache.
+
+Dois níveis:
+  - memória: LRU por processo (REGENES_EXPRESS_CACHE entradas, default 128; 0 desliga);
+  - compartilhado (opcional): um shm_registry.Registry — o do host em /dev/shm quando
+    REGENES_SHM=1, ou REGENES_EXPRESS_CACHE_DIR=<dir> (ex.: disco, sobrevive a reboot).
+    Publicação atômica: quem lê nunca vê entrada pela metade.
+"""
+import hashlib
+import os
+import struct
+import sys
+from array import array
+from collections import OrderedDict
+
+import shm_registry
+import substrate as sub
+
+_MAX = int(os.getenv("REGENES_EXPRESS_CACHE", "128"))
+
+
+def _shared():
+    """REGENES_EXPRESS_CACHE_DIR, ou o registro do host; raiz recusada (não é nossa, aberta
+    pra grupo/outros) -> sem nível compartilhado."""
+    d = os.getenv("REGENES_EXPRESS_CACHE_DIR")
+    if not d:
+        return shm_registry.default()
+    try:
+        return shm_registry.Registry(d)
+    except OSError as e:
+        print(f"[express_cache] {e} — seguindo só com o cache em memória")
+        return None
+
+
+_SHARED = _shared()
+_MAGIC = b"RGS4"                                # RGS1-3 (sem poda/denso/desalinhado): ignorados
+_HEAD = struct.Struct("<4sIII")                 # magic, nnz_ih, nnz_ho, n_conns (LEO acesos)
+
+_mem = OrderedDict()                            # digest -> bytes (formato do disco)
+_stats = {"hits_mem": 0, "hits_shared": 0, "misses": 0, "bytes": 0}
+
+
+def cppn_digest(cppn, prune: bool = True) -> str:
+    """Hash canônico do subgrafo funcional de uma FeedForwardNetwork + o que pinta o
+    substrato fora dele (geometria, escala, regra, poda) (hex, 32 chars)."""
+    h = hashlib.blake2b(digest_size=16)
+    h.update(f"{sub.geometry_digest()}:{float(sub.WEIGHT_SCALE).hex()}:v{sub.RULE_VERSION}:"
+             f"{int(prune)}".encode("ascii"))
+    h.update(repr((tuple(cppn.input_nodes), tuple(cppn.output_nodes))).encode("ascii"))
+    for node, act, agg, bias, resp, links in sorted(cppn.node_evals, key=lambda e: e[0]):
+        h.update(f"|{node}:{act.__name__}:{agg.__name__}:{float(bias).hex()}:"
+                 f"{float(resp).hex()}".encode("ascii"))
+        for i, w in links:                      # ordem da soma: outra ordem, outro último bit
+            h.update(f",{i}:{float(w).hex()}".encode("ascii"))
+    return h.hexdigest()
+
+
+def _encode(cs) -> bytes:
+    arrs = [array(getattr(a, "typecode", None) or a.format, a)
+            for a in (cs.ih_w, cs.ho_w, cs.ih_ptr, cs.ih_idx, cs.ho_ptr, cs.ho_idx)]
+    if sys.byteorder != "little":
+        for a in arrs:
+            a.byteswap()
+    return (_HEAD.pack(_MAGIC, len(cs.ih_idx), len(cs.ho_idx), cs.n_conns)
+            + b"".join(a.tobytes() for a in arrs))
+
+
+def _decode(buf, check: bool = True):
+    """Entrada -> CompiledSubstrate. Little-endian: memoryviews sobre `buf`, sem cópia.
+
+    `check` (o default; só a LRU do próprio processo, que guarda o que ele mesmo codificou,
+    pula): o que vem do nível compartilhado vira cérebro — tamanho exato, CSR coerente
+    (ptr de 0 a nnz, sem descer) e todo índice dentro de N_IN/N_HID, senão ValueError."""
+    magic, nnz_ih, nnz_ho, n_conns = _HEAD.unpack_from(buf, 0)
+    if magic != _MAGIC:
+        raise ValueError("entrada de cache de substrato inválida")
+    if check and (nnz_ih > sub.N_IN * sub.N_HID or nnz_ho > sub.N_HID * sub.N_OUT
+                  or len(buf) != _HEAD.size + 8 * (nnz_ih + nnz_ho)
+                  + 2 * (sub.N_HID + 1 + nnz_ih + sub.N_OUT + 1 + nnz_ho)):
+        raise ValueError("entrada de cache de substrato com tamanho inválido")
+    mv = memoryview(buf)
+    off = _HEAD.size
+    arrs = []
+    for code, n in (("d", nnz_ih), ("d", nnz_ho), ("H", sub.N_HID + 1), ("H", nnz_ih),
+                    ("H", sub.N_OUT + 1), ("H", nnz_ho)):
+        end = off + (8 if code == "d" else 2) * n
+        if end > len(mv):
+            raise ValueError("entrada de cache de substrato truncada")
+        if sys.byteorder == "little":
+            arrs.append(mv[off:end].cast(code))
+        else:
+            a = array(code)
+            a.frombytes(mv[off:end])
+            a.byteswap()
+            arrs.append(a)
+        off = end
+    ih_w, ho_w, ih_ptr, ih_idx, ho_ptr, ho_idx = arrs
+    if check:
+        for ptr, idx, nnz, n_cols in ((ih_ptr, ih_idx, nnz_ih, sub.N_IN),
+                                      (ho_ptr, ho_idx, nnz_ho, sub.N_HID)):
+            if (ptr[0] != 0 or ptr[-1] != nnz or any(a > b for a, b in zip(ptr, ptr[1:]))
+                    or (nnz and max(idx) >= n_cols)):
+                raise ValueError("entrada de cache de substrato com índice fora do substrato")
+    return sub.CompiledSubstrate(ih_ptr, ih_idx, ih_w, ho_ptr, ho_idx, ho_w, n_conns)
+
+
+def _remember(key: str, buf: bytes) -> None:
+    if _MAX <= 0:
+        return
+    _mem[key] = buf
+    _stats["bytes"] += len(buf)
+    while len(_mem) > _MAX:
+        _, old = _mem.popitem(last=False)
+        _stats["bytes"] -= len(old)
+
+
+def express(cppn, prune: bool = True):
+    """Mesmo contrato de substrate.express (CompiledSubstrate) — do cache quando dá."""
+    key = cppn_digest(cppn, prune)
+    buf = _mem.get(key)
+    if buf is not None:
+        _mem.move_to_end(key)
+        _stats["hits_mem"] += 1
+        return _decode(buf, check=False)
+    if _SHARED is not None:
+        buf = _SHARED.get("express." + key)
+        if buf is not None:
+            try:
+                out = _decode(buf)
+            except (ValueError, struct.error, TypeError):
+                buf = None                      # entrada estragada: recalcula e republica
+            else:
+                _stats["hits_shared"] += 1
+                _remember(key, buf)
+                return out
+    _stats["misses"] += 1
+    cs = sub.express(cppn, prune)
+    buf = _encode(cs)
+    _remember(key, buf)
+    if _SHARED is not None:
+        _SHARED.put("express." + key, buf)
+    return cs
+
+
+def stats() -> dict:
+    """Acertos por nível, faltas, taxa de acerto, entradas e bytes em memória."""
+    hm, hs, m = _stats["hits_mem"], _stats["hits_shared"], _stats["misses"]
+    tot = hm + hs + m
+    return {"hits_mem": hm, "hits_shared": hs, "misses": m,
+            "hit_rate": (hm + hs) / tot if tot else 0.0,
+            "entries": len(_mem), "max_entries": _MAX, "bytes": _stats["bytes"],
+            "shared": _SHARED.stats() if _SHARED is not None else None}
@@ -17,282 +17,159 @@ independentes pra formar "comida à esquerda -> vira esquerda". O CPPN expressa
 função de x1*x2. Se a aposta estiver certa, esta espécie acha quimiotaxia muito mais rápido.
 Quem decide não sou eu: as duas competem no mesmo mundo. Ver GENESIS_BIBLE §15.
 
+O laço da ameba (conexão, encode, decide, viz, drenagem, vagas) é o runtime compartilhado
+com o nativo (client_native/executor.py); aqui mora só o BACKEND HyperNEAT: CPPN ->
+substrato. As duas espécies num processo só: `python executor.py --native N --hyper M`.
+
 Uso:
-    python host_hyper.py [N] [ws_base]
+    python host_hyper.py [N] [ws_base] [--measure-startup]
       N       -> quantas amebas HyperNEAT (default 8)
       ws_base -> ex.: ws://127.0.0.1:8000 (default)
+      --measure-startup -> mede a partida a frio e sai (mesmo relatório do nativo)
 """
-import asyncio
-import json
-import math
-import os
-import random
-import ssl
-import sys
 import time
 
-import websockets
+_T0 = time.perf_counter()            # a partida conta daqui (startup.py)
+
+import os                            # noqa: E402
+import random                        # noqa: E402
+import sys                           # noqa: E402
 
 # reusa a maquinaria de genoma do client nativo (o CPPN É um genoma NEAT: pack/unpack/
 # crossover/mutate valem igual — inclusive a identidade DETERMINÍSTICA, sem a qual o
 # crossover distribuído erode, que foi o bug estrutural que a gente caçou lá atrás).
 sys.path.insert(0, os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
                                 "client_native"))
+import executor                  # noqa: E402
 import neat_brain as nb          # noqa: E402
 import substrate as sub          # noqa: E402
-import cone_psf                  # noqa: E402  R-BLUR: MESMA PSF do nativo (encode idêntico)
-
-N = int(sys.argv[1]) if len(sys.argv) > 1 else 8
-BASE = sys.argv[2] if len(sys.argv) > 2 else "ws://127.0.0.1:8000"
-OP = os.getenv("REGENES_OPERATOR", "")
-# §46 (R-SHAPE, card #38): o contrato DECLARADO no join — o mundo valida contra o
-# /protocol dele (passo 1: avisa; passo 2: recusa com close 4001). MESMO shape do
-# nativo (§15/§16): encode() monta 194 (8 escalares + 6×31 do cone), ACTIONS tem 7.
-PROTOCOL_VERSION = 7
-N_OBS = 163
-N_ACTIONS = 7
-URL = (BASE.rstrip("/") + "/ws/join?species=HyperNEAT&paradigm=hyperneat_cppn"
-       "&wants_brain=1&self_learns=0"
-       f"&protocol_version={PROTOCOL_VERSION}&n_obs={N_OBS}&n_actions={N_ACTIONS}"
-       + (f"&operator={OP}" if OP else ""))
-
-
-def _ssl_ctx():
-    """SSL só p/ wss. Tolera o MITM do Avast (VERIFY_X509_STRICT); REGENES_INSECURE_TLS=1 desliga tudo.
-    Idêntico ao do client_native — antivírus que intercepta TLS apresenta um certificado PRÓPRIO
-    (às vezes vencido/stale), e é ELE que o Python reprova, não o cert real do servidor."""
-    if not URL.startswith("wss"):
-        return None
-    ctx = ssl.create_default_context()
-    if os.getenv("REGENES_INSECURE_TLS") == "1":
-        ctx.check_hostname = False
-        ctx.verify_mode = ssl.CERT_NONE
-    else:
-        ctx.verify_flags &= ~ssl.VERIFY_X509_STRICT
-    return ctx
-
-
-SSL = _ssl_ctx()
+import express_cache             # noqa: E402
+import lagmon                    # noqa: E402
+import telemetry                 # noqa: E402
+# MESMO contrato do nativo (§15/§16): encode idêntico — o substrato mapeia coordenada por
+# ÍNDICE (substrate.INPUT_COORDS segue a ordem do encode) —, mesma PSF, mesma lei de
+# acuidade, mesmo decide (§16.5). Re-exportado do runtime: não tem mais como divergir.
+from executor import (PROTOCOL_VERSION, N_OBS, N_ACTIONS, ACTIONS, acuity_params,  # noqa: E402,F401
+                      encode, decide)
+
+SPECIES, PARADIGM = "HyperNEAT", "hyperneat_cppn"
+URL = executor.join_url(executor.DEFAULT_BASE, SPECIES, PARADIGM)   # o join com a base default
 
 _CPPN_CONFIG = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config-cppn")
 
-# --- lei da acuidade: idêntica à do nativo (mesma física de percepção, §FISICA_DA_PERCEPCAO).
-# A capacidade C aqui é a do SUBSTRATO EXPRESSO (a rede que de fato pensa), não a do CPPN:
-# a lei fala de capacidade neural, e o substrato é o sistema nervoso. Efeito colateral honesto
-# e importante: o encoding indireto expressa MUITA conexão barato -> nasce enxergando melhor
-# que o NEAT direto. Isso é a força do paradigma, não trapaça — mas confunde a comparação e
-# está registrado como ressalva na §15.
-ACUITY_K = 120.0
-ACUITY_SIGMA_MAX = 6.0
-# R5/#2 (08/2026): sem fade semântico (pred_w/_PRED_CH removidos) — o executor não edita a
-# observação; a PSF borra TODOS os canais igual. Mesma física do nativo.
-
-
-def acuity_params(conns):
-    """R-BLUR: PSF na geometria do cone (cone_psf), não no índice serial. A lei de
-    acuidade é a mesma do nativo — tem de ser, ou os dois encodes divergem."""
-    A = conns / (conns + ACUITY_K)
-    sigma = ACUITY_SIGMA_MAX * (1.0 - A)
-    return (cone_psf.psf(sigma), sigma, A)
-
-
-def _blur(row, P):
-    """R-BLUR: mesma PSF geométrica do nativo."""
-    return cone_psf.blur(row, P)
-
-
-def encode(vision, chemical, energy, stomach, stomach_size, ingested, pace_sin, pace_cos,
-           acuity,
-           damage=0.0, impact=0.0,
-           moved_self=0.0, moved_passive=0.0, contact_body=0.0, contact_wall=0.0):
-    """IDÊNTICO ao do nativo — mesma ordem das 194 entradas. Tem que ser: o substrato mapeia
-    coordenada por ÍNDICE (substrate.INPUT_COORDS segue esta mesma ordem)."""
-    if not vision or len(vision) < 4 or len(vision[0]) < 31:
-        return [0.0] * 163
-    if not chemical or len(chemical) < 3 or len(chemical[0]) < 9:
-        return [0.0] * 163
-    P = acuity[0]
-    ss = stomach_size or 1.0
-    # §26: damage/impact = fato bruto interoceptivo, normalizado pelo próprio estômago.
-    # R4/#3: ingested idem — fato do tick vindo do mundo; substitui a endorfina fabricada.
-    inp = [1.0, min(1.0, energy / ss), min(stomach, ss) / ss, min(1.0, ingested / ss),
-           pace_sin, pace_cos, min(1.0, damage / ss), min(1.0, impact / ss),
-           # §50/§51 (#43): quatro fatos que o mundo passou a entregar. Ja chegam
-           # normalizados (bits e fracao sobre 4), entao NAO passam pelo estomago.
-           #   moved_self/moved_passive: PROPRIOCEPCAO. A rede e feedforward, sem
-           #     memoria — sem estes bits, "andei" e "esbarrei num corpo" tem o mesmo
-           #     vetor de entrada, e ser deslocada por forca externa era invisivel.
-           #   contact_body/contact_wall: PELE. Fracao das 4 ortogonais ocupadas,
-           #     360 graus, independente do heading. O cone e OLHO e nao ve atras;
-           #     estar cercada e exatamente quando a informacao esta fora do cone.
-           moved_self, moved_passive, contact_body, contact_wall]
-    # §23: 6º canal (sangue) como o cheiro — traço químico, legível por qualquer cérebro.
-    # 52 (#44): o cone tem 4 canais de VISAO (obstaculo, corpo, perigo, comida). O
-    # borrao da acuidade e a PSF geometrica DO CONE — do olho. Nao se aplica a quimico.
-    for ch in range(4):
-        inp.extend(_blur(vision[ch], P))
-    # 52: campos QUIMICOS por CONTATO — 3 canais x 9 celulas (a propria + as 8 vizinhas,
-    # em coordenada de corpo). SEM borrao: acuidade e propriedade do olho, e este bloco
-    # nao passa pelo olho. Valor bruto, como o mundo entrega.
-    for ch in range(3):
-        inp.extend(chemical[ch])
-    return inp
-
-
-ACTIONS = [
-    {"action": "forward"},
-    {"action": "backward"},
-    {"action": "turn", "dir": "left"},
-    {"action": "turn", "dir": "right"},
-    {"action": "stay"},
-    {"action": "attack"},
-    {"action": "push"},
-]
-
-
-NULL_EPS = 0.05   # abaixo disto, a saída é ruído: o cérebro não disse nada
-
-
-def decide(out):
-    """Saídas do substrato -> índice da ação. MESMO contrato do client_native (§16.5).
-
-    1) SEM SINAL (tudo ~0) -> FICA. Nervo desconectado não dispara músculo. Isto importa MUITO
-       aqui: o LEO pode zerar o substrato inteiro, e o cérebro-zero estava CONQUISTANDO a
-       espécie (31 de 39 provados, mediana 0 conexões) — não por estratégia, mas porque o
-       argmax de [0,0,...] devolve o índice 0, que por acaso é "frente". Ganhava uma caminhada
-       reta de graça e não pagava imposto cerebral. Agora quem não tem cérebro não age.
-    2) EMPATE SATURADO -> sorteio uniforme (§14.5).
-    3) Gradiente -> argmax.
-    """
-    mx = max(out)
-    if max(abs(mx), abs(min(out))) < NULL_EPS:
-        return 4                                    # "stay": o cérebro não disse nada
-    near = [i for i in range(len(out)) if out[i] >= mx - 0.05]
-    if len(near) > 1 and mx >= 0.9:
-        return random.choice(near)
-    return max(range(len(out)), key=lambda i: out[i])
-
-
-async def run_one(idx: int):
-    while True:
-        try:
-            # CRONÔMETRO DE CICLO (diagnóstico Fable 04/08, mesmo do host nativo):
-            # 79% do ciclo do cliente fora do ar. close_timeout=1 mitiga a hipótese do
-            # close handshake esperando um servidor que já saiu; o print mede as fases.
-            t0 = time.perf_counter()
-            t_born = t_dead = None
-            async with websockets.connect(URL, max_size=8_000_000, ssl=SSL,
-                                          close_timeout=1) as ws:
-                welcome = json.loads(await ws.recv())
-                t_born = time.perf_counter()
-                seed_a, seed_b = welcome.get("brain_a"), welcome.get("brain_b")
-                body = welcome.get("body") or welcome.get("stats") or {}
-                stomach_size = body.get("stomach_size", 200) or 200
-
-                # HERANÇA do CPPN. O mundo já filtra por espécie (§15), então estas sementes
-                # são sempre CPPNs — nunca um genoma do NEAT direto (que nem decodificaria).
-                if seed_a and seed_b:
-                    g = nb.crossover(nb.unpack(seed_a), nb.unpack(seed_b),
-                                     random.randint(1, 1_000_000))
-                    nb.mutate(g)
-                    origin = "cruzamento"
-                elif seed_a or seed_b:
-                    g = nb.unpack(seed_a or seed_b)
-                    nb.mutate(g)
-                    origin = "mutacao"
-                else:
-                    g = nb.random_genome(random.randint(1, 1_000_000))
-                    origin = "primordial"
-
-                # EXPRESSÃO: o CPPN pinta o substrato. Custo pago 1x, no nascimento.
-                cppn = nb.build_net(g)
-                W_ih, W_ho, n_conns = sub.express(cppn)
-                cppn_nodes, cppn_conns = nb.complexity(g)
-                # §24 #4: o funcional do CPPN com a MESMA régua do nativo (o config memoizado
-                # neste processo é o do CPPN — saídas = pesos + LEO). genes = genoma do CPPN
-                # (o "DNA" que o §21 cobra): até aqui o HyperNEAT não reportava e pagava ZERO.
-                # #34 (auditoria 15/08): genes usa a MESMA régua do nativo — TODAS as
-                # conexões, habilitadas ou não (host.py: len(nodes)+len(connections)).
-                # Antes: cppn_nodes+cppn_conns (só habilitadas) — sub-reportava 1-6 genes
-                # e sub-pagava o §21 na direção do incentivo que o world.py:1832 registra.
-                fnodes, fconns = nb.functional_complexity(g)
-                genes = len(g.nodes) + len(g.connections)
-                acuity = acuity_params(n_conns)
-
-                # Reporta o CPPN (o genoma) como blob opaco. nodes/conns = do SUBSTRATO (a rede
-                # que pensa), pra a telemetria do mundo comparar maçã com maçã com o nativo.
-                await ws.send(json.dumps({
-                    "type": "brain", "brain": nb.pack(g),
-                    "nodes": sub.N_IN + sub.N_HID + sub.N_OUT, "conns": n_conns,
-                    "fnodes": fnodes, "fconns": fconns, "genes": genes,
-                    "acuity": round(acuity[2], 3)}))
-                print(f"[H{idx}] nasceu ({origin}) cppn: {cppn_nodes}n/{cppn_conns}c (real {fnodes}/{fconns}, {genes} genes) -> "
-                      f"substrato: {n_conns} sinapses | acuidade={acuity[2]:.2f} sigma={acuity[1]:.2f}")
-
-                viz_sent = False   # já mandei a ESTRUTURA nesta sessão de observação?
-                async for raw in ws:
-                    msg = json.loads(raw)
-                    if msg.get("type") == "UPDATE":
-                        if not msg.get("alive", True):
-                            t_dead = time.perf_counter()
-                            break
-                        continue
-                    if "vision" in msg:
-                        # R10: corpo atual (tanque cresce com a massa). Sem o campo, mantém WELCOME.
-                        stomach_size = msg.get("stomach_size", stomach_size)
-                        energy = msg.get("energy", 0)
-                        stomach = msg.get("stomach", 0)
-                        # R4/#3: ingested vem do TICK (fato do mundo; 0.0 na ausência do campo).
-                        # Sem estado, sem decaimento: um tick não vaza para o seguinte.
-                        inp = encode(msg.get("vision"), msg.get("chemical"),
-                                     energy, stomach, stomach_size,
-                                     msg.get("ingested", 0.0),
-                                     msg.get("pace_sin", 0.0), msg.get("pace_cos", 0.0), acuity,
-                                     damage=msg.get("damage", 0.0), impact=msg.get("impact", 0.0),
-                                     moved_self=msg.get("moved_self", 0.0),
-                                     moved_passive=msg.get("moved_passive", 0.0),
-                                     contact_body=msg.get("contact_body", 0.0),
-                                     contact_wall=msg.get("contact_wall", 0.0))
-                        out, hid = sub.activate(W_ih, W_ho, inp)
-                        a = decide(out)
-                        await ws.send(json.dumps(ACTIONS[a]))
-
-                        # VIZ DE CÉREBRO: mesmo contrato do nativo — se algum viewer observa
-                        # esta ameba, manda a estrutura (1x) + as ativações (todo tick). O
-                        # substrato é traduzido pro formato do viewer em sub.to_struct().
-                        if msg.get("viz"):
-                            act = {
-                                "inp": [round(x, 3) for x in inp],       # 192 entradas (borradas)
-                                "hid": sub.hidden_dict(hid),             # os 16 ocultos
-                                "out": [round(x, 3) for x in out],       # 7 saídas
-                                "win": a,                                # ação vencedora
-                            }
-                            payload = {"type": "brain_viz", "act": act}
-                            if not viz_sent:
-                                payload["struct"] = sub.to_struct(W_ih, W_ho)
-                                viz_sent = True
-                            await ws.send(json.dumps(payload))
-                        else:
-                            viz_sent = False   # parou de observar -> reenvia estrutura depois
-            t_end = time.perf_counter()
-            print(f"[H{idx}] ciclo: connect {((t_born or t0) - t0):.1f}s | "
-                  f"vida {((t_dead - t_born) if (t_dead and t_born) else -1):.1f}s | "
-                  f"close {(t_end - (t_dead or t_born or t0)):.1f}s")
-        except Exception as e:
-            print(f"[H{idx}] reconnect ({e.__class__.__name__}: {e})")
-            await asyncio.sleep(1.0)
-
-
-async def main():
-    nb.load_config(_CPPN_CONFIG)   # memoiza O CONFIG DO CPPN neste processo (7 in / 2 out)
-    print(f"Executor HyperNEAT: {N} amebas -> {URL}")
-    print(f"substrato: {sub.N_IN} entradas -> {sub.N_HID} ocultos -> {sub.N_OUT} saidas "
-          f"| {sub.N_IN*sub.N_HID + sub.N_HID*sub.N_OUT} sinapses possiveis")
-    await asyncio.gather(*[run_one(i) for i in range(N)])
+# TELEMETRIA LOCAL: o mesmo registro por nascimento do nativo (telemetry.py: lote, thread de
+# fundo, rotação; REGENES_TELEMETRY=0 desliga). Antes o HyperNEAT só tinha a linha do stdout.
+# As métricas do CPPN E as do substrato — s_conns/s_fconns são a rede que pensa e que compra
+# a acuidade; cppn_*/fnodes/fconns/genes, o genoma (§24 #4, §21).
+_SINK = telemetry.Sink(
+    os.path.join(os.path.dirname(os.path.abspath(__file__)), "hyper_telemetry.csv"),
+    (("unix_time", "q"), ("idx", "I"), ("origin", "s"), ("cppn_nodes", "I"),
+     ("cppn_conns", "I"), ("fnodes", "I"), ("fconns", "I"), ("genes", "I"),
+     ("s_conns", "I"), ("s_fconns", "I"), ("acuity", "d")))
+
+# Lei da acuidade: a do nativo (executor.acuity_params). A capacidade C aqui é a do SUBSTRATO
+# FUNCIONAL (a rede que de fato pensa), não a do CPPN: a lei fala de capacidade neural, e o
+# substrato é o sistema nervoso. Efeito colateral honesto e importante: o encoding indireto
+# expressa MUITA conexão barato -> nasce enxergando melhor que o NEAT direto. Isso é a força
+# do paradigma, não trapaça — mas confunde a comparação e está registrado como ressalva na §15.
+# LEO (§16.5): o substrato pode sair zerado — e quem não tem cérebro não age (decide: "stay").
+
+class HyperBackend(executor.Backend):
+    name, tag, title = "hyper", "H", "Executor HyperNEAT"
+    species, paradigm = SPECIES, PARADIGM
+
+    def warm(self) -> None:
+        """O config do CPPN (7 in / 2 out) e a tabela de consultas do substrato (anexada do
+        /dev/shm quando outro processo já publicou) — a 1ª expressão (~20 ms) não cai em cima
+        do 1º WELCOME (o primordial pronto é do runtime)."""
+        self.cfg = nb.load_config(_CPPN_CONFIG)
+        sub.query_table()
+
+    def nascer(self, g, pai=None, express=express_cache.express) -> dict:
+        """CPPN final -> tudo o que o nascimento reporta e usa: blob, substrato, métricas, acuidade.
+
+        EXPRESSÃO: o CPPN pinta o substrato. Custo pago 1x, no nascimento — e nem isso quando o
+        subgrafo funcional do CPPN já foi expresso (clone, mutação que só mexeu em material
+        morto): cache endereçado por conteúdo. O substrato sai COMPILADO (CSR, fan-in dobrado).
+
+        Substrato: expressas (o que ele carrega) x FUNCIONAIS (caminho completo entrada->oculto->
+        saída). A acuidade segue as funcionais, como no nativo (§24 #5): sinapse que não leva
+        sinal a ação nenhuma não compra visão.
+
+        CPPN: §24 #4 — o funcional com a MESMA régua do nativo (self.cfg é o do CPPN — saídas =
+        pesos + LEO). genes = genoma do CPPN (o "DNA" que o §21 cobra).
+        #34 (auditoria 15/08): genes conta TODAS as conexões, habilitadas ou não (host.py:
+        len(nodes)+len(connections)); antes cppn_nodes+cppn_conns sub-reportava 1-6 genes e
+        sub-pagava o §21 na direção do incentivo que o world.py:1832 registra.
+
+        pai: de quem `g` saiu por mutação — o CPPN remenda o esqueleto compilado dele. A
+        expressão não tem remendo: peso novo no CPPN muda todas as consultas."""
+        with lagmon.stage("express"):
+            brain = express(nb.build_net(g, parent=pai, cfg=self.cfg))
+        s_fconns = brain.functional_synapses()
+        cppn_nodes, cppn_conns = nb.complexity(g)
+        fnodes, fconns = nb.functional_complexity(g, cfg=self.cfg)
+        with lagmon.stage("pack"):
+            blob = nb.pack(g)
+        return {"g": g, "blob": blob, "brain": brain, "s_fconns": s_fconns,
+                "cppn_nodes": cppn_nodes, "cppn_conns": cppn_conns, "fnodes": fnodes,
+                "fconns": fconns, "genes": len(g.nodes) + len(g.connections),
+                "acuity": acuity_params(s_fconns)}
+
+    def primordial(self) -> dict:
+        # Primordial: CPPN sorteado nunca se repete — expressa direto, sem ocupar o cache.
+        return self.nascer(nb.random_genome(random.randint(1, 1_000_000), self.cfg),
+                           express=sub.express)
+
+    def report(self, b) -> dict:
+        # Reporta o CPPN (o genoma) como blob opaco. nodes/conns = do SUBSTRATO (a rede que
+        # pensa), pra a telemetria do mundo comparar maçã com maçã com o nativo.
+        # substrate_fconns = as funcionais do substrato (fnodes/fconns são do CPPN, §24 #4).
+        return {"type": "brain", "brain": b["blob"],
+                "nodes": sub.N_IN + sub.N_HID + sub.N_OUT, "conns": b["brain"].n_conns,
+                "substrate_fconns": b["s_fconns"],
+                "fnodes": b["fnodes"], "fconns": b["fconns"], "genes": b["genes"],
+                "acuity": round(b["acuity"][2], 3)}
+
+    def born_line(self, b, origin: str) -> str:
+        ac = b["acuity"]
+        return (f"nasceu ({origin}) cppn: {b['cppn_nodes']}n/{b['cppn_conns']}c "
+                f"(real {b['fnodes']}/{b['fconns']}, {b['genes']} genes) -> "
+                f"substrato: {b['brain'].n_conns} sinapses ({b['s_fconns']} funcionais) | "
+                f"acuidade={ac[2]:.2f} sigma={ac[1]:.2f}")
+
+    def start(self, idx: int, origin: str, b) -> None:
+        _SINK.record(int(time.time()), idx, origin, b["cppn_nodes"], b["cppn_conns"],
+                     b["fnodes"], b["fconns"], b["genes"], b["brain"].n_conns, b["s_fconns"],
+                     round(b["acuity"][2], 3))
+
+    async def activate(self, b, inp, viz: bool):
+        with lagmon.stage("activate"):
+            out, b["hid"] = b["brain"].activate(inp)
+        return out
+
+    def viz_ids(self, b) -> list:
+        # dos 16 ocultos, os que recebem de alguma entrada e alimentam alguma saída
+        return [sub.HIDDEN_ID_BASE + h for h in b["brain"].functional_hidden()]
+
+    def viz_hidden(self, b, ids) -> list:
+        hid = b["hid"]
+        return [hid[i - sub.HIDDEN_ID_BASE] for i in ids]
+
+    def viz_struct(self, b) -> dict:
+        # o substrato FUNCIONAL traduzido pro formato do viewer
+        return b["brain"].to_struct(functional=True)
+
+    def caches(self) -> dict:
+        return {"express": express_cache.stats()}
+
+    def banner(self) -> str:
+        return (f"\nsubstrato: {sub.N_IN} entradas -> {sub.N_HID} ocultos -> {sub.N_OUT} saidas "
+                f"| {sub.N_IN*sub.N_HID + sub.N_HID*sub.N_OUT} sinapses possiveis")
+
+    def close(self) -> None:
+        _SINK.close()
 
 
 if __name__ == "__main__":
-    try:
-        asyncio.run(main())
-    except KeyboardInterrupt:
-        print("\nExecutor HyperNEAT encerrado.")
+    executor.main(sys.argv[1:], only=HyperBackend(), t0=_T0)
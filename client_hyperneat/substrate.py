@@ -20,7 +20,24 @@ sorteio. Ninguém escreve "vá pra comida": o CPPN nasce aleatório e a seleçã
 Ref: Stanley, D'Ambrosio & Gauci (2009), "A Hypercube-Based Encoding for Evolving
 Large-Scale Neural Networks", Artificial Life 15(2). CPPN: Stanley (2007).
 """
+import hashlib
 import math
+import os
+import sys
+from array import array
+from operator import itemgetter, mul
+
+try:                                       # tabela de consultas compartilhada entre processos
+    import shm_registry                    # (client_native; ausente = cada um monta a sua)
+except ImportError:
+    shm_registry = None
+
+try:                                       # NumPy é opcional: sem ele, o laço puro abaixo
+    import numpy as _np
+except ImportError:
+    _np = None
+if os.getenv("REGENES_NUMPY", "1") == "0":
+    _np = None
 
 # --- o cone (mesma geometria do mundo, world.py _build_cone) ---
 def _build_cone():
@@ -97,20 +114,75 @@ N_IN, N_HID, N_OUT = len(INPUT_COORDS), len(HIDDEN_COORDS), len(OUTPUT_COORDS)
 
 WEIGHT_SCALE = 3.0
 
+# VERSÃO DA REGRA de expressão: a consulta (_query), o que cada saída do CPPN vira (peso,
+# LEO) e a poda. Mudou o que paint() faz com o mesmo CPPN na mesma geometria, sobe aqui —
+# a tabela de consultas compartilhada e o cache de expressão (express_cache) põem isto na
+# chave, e o que sobreviveu ao deploy (/dev/shm, REGENES_EXPRESS_CACHE_DIR) deixa de casar.
+RULE_VERSION = 1
+_GEO = None
+
+
+def geometry_digest() -> str:
+    """Hash (hex, 16 chars) da geometria: coordenadas de entrada, ocultos e saídas."""
+    global _GEO
+    if _GEO is None:
+        geo = repr((INPUT_COORDS, HIDDEN_COORDS, OUTPUT_COORDS)).encode("ascii")
+        _GEO = hashlib.blake2b(geo, digest_size=8).hexdigest()
+    return _GEO
+
 
 def _scale(w: float) -> float:
     """CPPN cru (tanh, [-1,1]) -> peso da sinapse."""
     return WEIGHT_SCALE * max(-1.0, min(1.0, w))
 
 
-def _query(cppn, c1, c2):
-    """Pergunta ao CPPN os pesos entre dois pontos. A distância entra como entrada porque é o
-    que deixa ele expressar LOCALIDADE ('só conecte o que está perto') sem ter que derivá-la."""
+def _query(c1, c2):
+    """Entrada do CPPN pra um par de pontos. A distância entra como entrada porque é o que
+    deixa ele expressar LOCALIDADE ('só conecte o que está perto') sem ter que derivá-la."""
     d = math.sqrt(sum((a - b) ** 2 for a, b in zip(c1, c2)))
-    return cppn.activate([c1[0], c1[1], c1[2], c2[0], c2[1], c2[2], d])
-
-
-def express(cppn):
+    return [c1[0], c1[1], c1[2], c2[0], c2[1], c2[2], d]
+
+
+# TABELA DE CONSULTAS: as 2.720 entradas do CPPN só dependem da geometria (fixa), não do
+# genoma — montadas UMA vez e, com REGENES_SHM=1, publicadas no shm_registry do host: os
+# processos HyperNEAT anexam a mesma tabela sem cópia. Linha k = 7 floats; primeiro as
+# N_OUT*N_HID consultas oculto->saída (o*N_HID + h), depois as N_HID*N_IN entrada->oculto.
+_QUERY_W = 7
+_QTAB = None
+
+
+def _build_query_table() -> bytes:
+    tab = array("d")
+    for co in OUTPUT_COORDS:
+        for ch in HIDDEN_COORDS:
+            tab.extend(_query(ch, co))
+    for ch in HIDDEN_COORDS:
+        for ci in INPUT_COORDS:
+            tab.extend(_query(ci, ch))
+    if sys.byteorder != "little":
+        tab.byteswap()
+    return tab.tobytes()
+
+
+def query_table():
+    """memoryview 'd' com as consultas (do registro compartilhado quando há)."""
+    global _QTAB
+    if _QTAB is None:
+        reg = shm_registry.default() if shm_registry is not None else None
+        if reg is not None and sys.byteorder == "little":
+            # fixa (PIN): lida em toda expressão, a varredura do teto nunca a apaga
+            key = f"{shm_registry.PIN}substrate-queries-v{RULE_VERSION}-{geometry_digest()}"
+            _QTAB = reg.get_or_build(key, _build_query_table).cast("d")
+        else:
+            tab = array("d")
+            tab.frombytes(_build_query_table())
+            if sys.byteorder != "little":
+                tab.byteswap()
+            _QTAB = memoryview(tab)
+    return _QTAB
+
+
+def paint(cppn, prune: bool = True):
     """Consulta o CPPN em cada par de coordenadas e PINTA a rede: (W_ih, W_ho, n_conns).
 
     É aqui que o encoding indireto acontece: o genoma (CPPN pequeno) vira uma rede grande.
@@ -120,27 +192,57 @@ def express(cppn):
     ESPARSIDADE ser evoluível: carregar 2.5k sinapses custa 3.4× o metabolismo (morte em ~95
     ticks), então a seleção empurra o CPPN a expressar só o que vale. O tamanho do cérebro vira
     uma decisão ECONÔMICA da linhagem — não um número que a gente fixou no config.
+
+    PODA (prune=True, o default desde 10/2026): oculto->saída é consultado PRIMEIRO. Oculto sem
+    nenhuma sinapse de saída não influencia ação nenhuma — as 163 consultas de entrada dele eram
+    trabalho jogado fora, e as sinapses que ele recebia ainda contavam em n_conns (e, pela lei
+    de acuidade, compravam visão de graça). Agora elas nem são expressas: n_conns conta o que o
+    substrato de fato carrega. As saídas ficam idênticas às da expressão completa (prune=False,
+    mantida pra bancada/teste); só o valor do oculto morto, que ninguém lê, vira 0.
     """
     W_ih = [[0.0] * N_IN for _ in range(N_HID)]
     W_ho = [[0.0] * N_HID for _ in range(N_OUT)]
+    tab, q = query_table(), _QUERY_W
     n = 0
-    for h in range(N_HID):
-        ch = HIDDEN_COORDS[h]
-        for i in range(N_IN):
-            out = _query(cppn, INPUT_COORDS[i], ch)
-            if out[2] > 0.0:                       # LEO: a conexão existe?
-                W_ih[h][i] = _scale(out[0])        # saída 0 = peso entrada->oculto
-                n += 1
     for o in range(N_OUT):
-        co = OUTPUT_COORDS[o]
         for h in range(N_HID):
-            out = _query(cppn, HIDDEN_COORDS[h], co)
+            k = (o * N_HID + h) * q
+            out = cppn.activate(tab[k:k + q].tolist())
             if out[2] > 0.0:                       # LEO
                 W_ho[o][h] = _scale(out[1])        # saída 1 = peso oculto->saída
                 n += 1
+    for h in range(N_HID):
+        if prune and not any(W_ho[o][h] != 0.0 for o in range(N_OUT)):
+            continue                               # oculto que não alcança saída: nem pergunta
+        base = (N_OUT * N_HID + h * N_IN) * q
+        for i in range(N_IN):
+            k = base + i * q
+            out = cppn.activate(tab[k:k + q].tolist())
+            if out[2] > 0.0:                       # LEO: a conexão existe?
+                W_ih[h][i] = _scale(out[0])        # saída 0 = peso entrada->oculto
+                n += 1
     return W_ih, W_ho, n
 
 
+def express(cppn, prune: bool = True):
+    """CPPN -> substrato COMPILADO (CompiledSubstrate): o que o host carrega a vida inteira."""
+    return compile_substrate(*paint(cppn, prune))
+
+
+def functional_synapses(W_ih, W_ho) -> int:
+    """Sinapses num caminho COMPLETO entrada->oculto->saída — o substrato que pensa.
+
+    Mesma régua do functional_complexity do nativo (§24 #5): oculto sem entrada ativa dispara
+    0 e oculto sem saída não é lido; as sinapses deles existem, mas não levam sinal."""
+    n = 0
+    for h in range(N_HID):
+        n_in = sum(1 for w in W_ih[h] if w != 0.0)
+        n_out = sum(1 for o in range(N_OUT) if W_ho[o][h] != 0.0)
+        if n_in and n_out:
+            n += n_in + n_out
+    return n
+
+
 def _fire(pares):
     """Um neurônio: soma as entradas ATIVAS e dispara — com ESCALONAMENTO HOMEOSTÁTICO.
 
@@ -176,6 +278,159 @@ def activate(W_ih, W_ho, inputs):
     return out, hid
 
 
+# --- SUBSTRATO COMPILADO ---
+# activate() acima é a REFERÊNCIA (legível, é ela que documenta o _fire), mas paga caro em
+# todo tick: anda 16x163 + 7x16 pesos em listas de listas, re-testa `w != 0.0`, reconta o
+# fan-in e recalcula sqrt em cada neurônio — pra um substrato que não muda a vida inteira.
+# Compilado, o LEO já decidiu quem existe: CSR (ptr/idx/peso) só com as sinapses acesas, e
+# o escalonamento homeostático 1/sqrt(fan_in) dobrado no peso UMA vez, no nascimento.
+# Memória: ~10 B por sinapse em array tipado, contra ~2.7k floats Python por vida.
+# As saídas batem com a referência a menos de arredondamento (w*x/sqrt(n) vs (w/sqrt(n))*x).
+
+class CompiledSubstrate:
+    """Substrato pronto pra rodar: CSR entrada->oculto (linha = oculto) e oculto->saída
+    (linha = saída), pesos já escalonados por 1/sqrt(fan_in) da linha."""
+
+    __slots__ = ("ih_ptr", "ih_idx", "ih_w", "ho_ptr", "ho_idx", "ho_w", "n_conns", "_np", "_py")
+
+    def __init__(self, ih_ptr, ih_idx, ih_w, ho_ptr, ho_idx, ho_w, n_conns):
+        self.ih_ptr, self.ih_idx, self.ih_w = ih_ptr, ih_idx, ih_w
+        self.ho_ptr, self.ho_idx, self.ho_w = ho_ptr, ho_idx, ho_w
+        self.n_conns = n_conns
+        self._np = _np_views(self) if _np is not None else None
+        self._py = None
+
+    @property
+    def nbytes(self) -> int:
+        return sum(a.itemsize * len(a) for a in (self.ih_ptr, self.ih_idx, self.ih_w,
+                                                 self.ho_ptr, self.ho_idx, self.ho_w))
+
+    def activate(self, inputs):
+        """Mesmo contrato do activate() de referência: (saidas, ocultos), listas de float."""
+        if self._np is not None:
+            return _activate_np(self._np, inputs)
+        return _activate_py(self, inputs)
+
+    def _fan_out(self):
+        n_out = [0] * N_HID
+        for h in self.ho_idx:
+            n_out[h] += 1
+        return n_out
+
+    def functional_synapses(self) -> int:
+        """functional_synapses() sobre o compilado (mesma régua, sem densificar)."""
+        n_out = self._fan_out()
+        n = 0
+        for h in range(N_HID):
+            n_in = self.ih_ptr[h + 1] - self.ih_ptr[h]
+            if n_in and n_out[h]:
+                n += n_in + n_out[h]
+        return n
+
+    def functional_hidden(self) -> list:
+        """Ocultos FUNCIONAIS (recebem de alguma entrada E alimentam alguma saída) — a mesma
+        régua do functional_synapses; o resto não leva sinal a ação nenhuma."""
+        n_out = self._fan_out()
+        return [h for h in range(N_HID) if n_out[h] and self.ih_ptr[h + 1] > self.ih_ptr[h]]
+
+    def dense(self):
+        """-> (W_ih, W_ho) com os pesos CRUS (desfaz o escalonamento) — viz e inspeção."""
+        W_ih = [[0.0] * N_IN for _ in range(N_HID)]
+        W_ho = [[0.0] * N_HID for _ in range(N_OUT)]
+        for W, ptr, idx, w in ((W_ih, self.ih_ptr, self.ih_idx, self.ih_w),
+                               (W_ho, self.ho_ptr, self.ho_idx, self.ho_w)):
+            for r, row in enumerate(W):
+                a, b = ptr[r], ptr[r + 1]
+                s = math.sqrt(b - a)
+                for k in range(a, b):
+                    row[idx[k]] = w[k] * s
+        return W_ih, W_ho
+
+    def to_struct(self, functional: bool = False):
+        """Formato do viewer — o mesmo de to_struct(W_ih, W_ho), direto do CSR: anda só nas
+        sinapses expressas, sem densificar as N_IN*N_HID + N_HID*N_OUT possíveis.
+        functional: só os ocultos funcionais e as sinapses deles (o que a viz desenha)."""
+        hs = self.functional_hidden() if functional else range(N_HID)
+        viva = set(hs)
+        nodes = {str(o): [0.0, 1.0, "tanh", "sum"] for o in range(N_OUT)}
+        for h in hs:
+            nodes[str(HIDDEN_ID_BASE + h)] = [0.0, 1.0, "tanh", "sum"]
+        conns = []
+        ptr, idx, w = self.ih_ptr, self.ih_idx, self.ih_w
+        for h in hs:
+            a, b = ptr[h], ptr[h + 1]
+            s = math.sqrt(b - a)                # desfaz o 1/sqrt(fan_in) dobrado no peso
+            conns.extend([-(idx[k] + 1), HIDDEN_ID_BASE + h, round(w[k] * s, 3), True, 0]
+                         for k in range(a, b))
+        ptr, idx, w = self.ho_ptr, self.ho_idx, self.ho_w
+        for o in range(N_OUT):
+            a, b = ptr[o], ptr[o + 1]
+            s = math.sqrt(b - a)
+            conns.extend([HIDDEN_ID_BASE + idx[k], o, round(w[k] * s, 3), True, 0]
+                         for k in range(a, b) if idx[k] in viva)
+        return {"key": 0, "nodes": nodes, "conns": conns}
+
+
+def _csr(W, n_cols):
+    ptr, idx, val = array("H", [0]), array("H"), array("d")
+    for row in W:
+        cols = [c for c in range(n_cols) if row[c] != 0.0]
+        if cols:
+            inv = 1.0 / math.sqrt(len(cols))
+            idx.extend(cols)
+            val.extend(row[c] * inv for c in cols)
+        ptr.append(len(idx))
+    return ptr, idx, val
+
+
+def compile_substrate(W_ih, W_ho, n_conns) -> CompiledSubstrate:
+    """Substrato denso (paint) -> CompiledSubstrate. Custo de nascimento, não de tick."""
+    return CompiledSubstrate(*_csr(W_ih, N_IN), *_csr(W_ho, N_HID), n_conns)
+
+
+def _np_views(cs):
+    """Visões NumPy (sem cópia) + o número da linha de cada sinapse, pro bincount."""
+    def rows(ptr):
+        return _np.repeat(_np.arange(len(ptr) - 1), _np.diff(_np.frombuffer(ptr, _np.uint16)))
+    return (_np.frombuffer(cs.ih_idx, _np.uint16).astype(_np.intp),
+            _np.frombuffer(cs.ih_w, _np.float64), rows(cs.ih_ptr),
+            _np.frombuffer(cs.ho_idx, _np.uint16).astype(_np.intp),
+            _np.frombuffer(cs.ho_w, _np.float64), rows(cs.ho_ptr))
+
+
+def _activate_np(v, inputs):
+    ih_idx, ih_w, ih_row, ho_idx, ho_w, ho_row = v
+    x = _np.asarray(inputs, dtype=_np.float64)
+    hid = _np.tanh(_np.bincount(ih_row, ih_w * x[ih_idx], N_HID))
+    out = _np.tanh(_np.bincount(ho_row, ho_w * hid[ho_idx], N_OUT))
+    return out.tolist(), hid.tolist()
+
+
+def _getter(cols):
+    """itemgetter que devolve SEMPRE tupla (o de 1 índice devolve o item solto)."""
+    if len(cols) == 1:
+        c = cols[0]
+        return lambda x: (x[c],)
+    return itemgetter(*cols) if cols else (lambda x: ())
+
+
+def _py_rows(cs):
+    """Linhas do laço puro: (getter das entradas, pesos como lista) — montado 1x, só sem NumPy."""
+    return tuple(tuple((_getter(idx[ptr[r]:ptr[r + 1]].tolist()), w[ptr[r]:ptr[r + 1]].tolist())
+                       for r in range(len(ptr) - 1))
+                 for ptr, idx, w in ((cs.ih_ptr, cs.ih_idx, cs.ih_w),
+                                     (cs.ho_ptr, cs.ho_idx, cs.ho_w)))
+
+
+def _activate_py(cs, inputs):
+    if cs._py is None:
+        cs._py = _py_rows(cs)
+    rows_ih, rows_ho = cs._py
+    hid = [math.tanh(sum(map(mul, w, g(inputs)))) for g, w in rows_ih]
+    out = [math.tanh(sum(map(mul, w, g(hid)))) for g, w in rows_ho]
+    return out, hid
+
+
 # --- VIZ: traduz o substrato pro formato que o viewer entende ---
 # O painel do viewer fala "genoma NEAT": conns = [in, out, peso, enabled], com saidas em 0..6,
 # entradas NEGATIVAS (-(i+1)) e ocultos com id >= 7. O substrato do HyperNEAT nao tem esses ids
@@ -186,21 +441,23 @@ def activate(W_ih, W_ho, inputs):
 HIDDEN_ID_BASE = N_OUT   # 7: os ids 0..6 sao as saidas
 
 
-def to_struct(W_ih, W_ho):
-    """Substrato -> dict no formato do viewer (mesmo contrato do neat_brain.to_dict)."""
+def to_struct(W_ih, W_ho, keep=None):
+    """Substrato -> dict no formato do viewer (mesmo contrato do neat_brain.to_dict).
+    keep: os ocultos a desenhar (default: os N_HID); sinapse de oculto fora dele não vai."""
+    hs = range(N_HID) if keep is None else keep
     nodes = {}
     for o in range(N_OUT):
         nodes[str(o)] = [0.0, 1.0, "tanh", "sum"]
-    for h in range(N_HID):
+    for h in hs:
         nodes[str(HIDDEN_ID_BASE + h)] = [0.0, 1.0, "tanh", "sum"]
     conns = []
-    for h in range(N_HID):
+    for h in hs:
         for i in range(N_IN):
             w = W_ih[h][i]
             if w != 0.0:
                 conns.append([-(i + 1), HIDDEN_ID_BASE + h, round(w, 3), True, 0])
     for o in range(N_OUT):
-        for h in range(N_HID):
+        for h in hs:
             w = W_ho[o][h]
             if w != 0.0:
                 conns.append([HIDDEN_ID_BASE + h, o, round(w, 3), True, 0])
@@ -0,0 +1,43 @@
+"""
+synth_cppn.py — CPPNs SINTÉTICOS determinísticos (benchmarks e testes do HyperNEAT).
+
+Usa um config de CPPN PRÓPRIO em vez do nb.load_config(): aquele é memoizado por processo,
+e numa sessão de pytest que já carregou o nativo ele devolveria o config errado (163 in /
+7 out). Aqui a identidade determinística é instalada igual à do executor.
+"""
+import os
+import random
+
+import neat
+import neat_brain as nb
+
+_CFG = None
+_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), "config-cppn")
+
+
+def cppn_config():
+    global _CFG
+    if _CFG is None:
+        _CFG = neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                           neat.DefaultSpeciesSet, neat.DefaultStagnation, _PATH)
+        nb._install_deterministic_identity(_CFG)
+    return _CFG
+
+
+def random_cppn(seed: int, mutations: int = 0):
+    """CPPN primordial (mutations=0) ou 'evoluído' por `mutations` rodadas de mutação."""
+    gc = cppn_config().genome_config
+    estado = random.getstate()
+    random.seed(seed)
+    try:
+        g = neat.DefaultGenome(seed)
+        g.configure_new(gc)
+        for _ in range(mutations):
+            g.mutate(gc)
+        return g
+    finally:
+        random.setstate(estado)
+
+
+def cppn_net(genome):
+    return neat.nn.FeedForwardNetwork.create(genome, cppn_config())
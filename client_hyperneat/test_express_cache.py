@@ -0,0 +1,147 @@
+"""
+Testes do cache de expressão do substrato (express_cache.py).
+
+Cache de expressão só presta se for INVISÍVEL: o substrato que sai dele tem de ser
+idêntico, bit a bit, ao que substrate.express pintaria — senão o filho enxerga um cérebro
+que o genoma dele não codifica. E a chave tem de ignorar o que não computa (material
+morto) e não ignorar nada que computa.
+
+Roda com:  pytest test_express_cache.py   (ou: python test_express_cache.py)
+"""
+import os
+import sys
+import tempfile
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, AQUI)
+sys.path.insert(0, os.path.join(os.path.dirname(AQUI), "client_native"))
+import neat_brain as nb            # noqa: E402
+import substrate as sub            # noqa: E402
+import express_cache as ec         # noqa: E402
+import shm_registry                # noqa: E402
+from synth_cppn import cppn_config, cppn_net as _net, random_cppn   # noqa: E402
+
+
+def _cppn_genome(seed, muta=3):
+    return random_cppn(seed, muta)
+
+
+def _campos(cs):
+    return tuple(list(a) for a in (cs.ih_ptr, cs.ih_idx, cs.ih_w, cs.ho_ptr, cs.ho_idx,
+                                   cs.ho_w)) + (cs.n_conns,)
+
+
+def _limpa():
+    ec._mem.clear()
+    ec._stats.update(hits_mem=0, hits_shared=0, misses=0, bytes=0)
+
+
+def test_acerto_devolve_o_mesmo_substrato():
+    _limpa()
+    g = _cppn_genome(1)
+    ref = _campos(sub.express(_net(g)))
+    assert _campos(ec.express(_net(g))) == ref   # falta: calcula
+    assert _campos(ec.express(_net(g))) == ref   # acerto: decodifica do cache
+    st = ec.stats()
+    assert (st["hits_mem"], st["misses"]) == (1, 1)
+
+
+def test_material_morto_nao_muda_a_chave():
+    """Nó que não alcança saída (e sua ligação) não computa: mesma entrada de cache."""
+    g = _cppn_genome(2)
+    h = nb.copy_genome(g)
+    morto = 999_999
+    h.nodes[morto] = h.create_node(cppn_config().genome_config, morto)
+    h.add_connection(cppn_config().genome_config, -1, morto, 0.5, True)
+    assert ec.cppn_digest(_net(g)) == ec.cppn_digest(_net(h))
+
+
+def test_peso_funcional_muda_a_chave():
+    g = _cppn_genome(3)
+    h = nb.copy_genome(g)
+    cg = next(c for c in h.connections.values() if c.enabled)
+    cg.weight += 1e-12                           # um ulp qualquer já é outro substrato
+    assert ec.cppn_digest(_net(g)) != ec.cppn_digest(_net(h))
+
+
+def test_o_que_pinta_fora_do_cppn_entra_na_chave():
+    """Escala do peso (e geometria, regra, poda) muda o substrato do MESMO CPPN: deploy que
+    mexe nisso não pode anexar a entrada pintada antes (o nível compartilhado sobrevive)."""
+    _limpa()
+    g = _cppn_genome(5)
+    velho = sub.WEIGHT_SCALE
+    try:
+        antes = ec.cppn_digest(_net(g))
+        ec.express(_net(g))
+        sub.WEIGHT_SCALE = velho * 2
+        assert ec.cppn_digest(_net(g)) != antes
+        cs = ec.express(_net(g))
+        assert ec.stats()["misses"] == 2 and ec.stats()["hits_mem"] == 0
+        assert _campos(cs) == _campos(sub.express(_net(g)))
+    finally:
+        sub.WEIGHT_SCALE = velho
+        _limpa()
+    assert ec.cppn_digest(_net(g)) == antes
+    assert ec.cppn_digest(_net(g), prune=False) != antes
+
+
+def test_nivel_compartilhado_entre_processos():
+    """Outro processo (simulado: memória limpa, registro novo na mesma raiz) acha a entrada
+    publicada — e anexa sem cópia: os pesos são uma memoryview sobre o mapa."""
+    _limpa()
+    velho = ec._SHARED
+    with tempfile.TemporaryDirectory() as d:
+        ec._SHARED = shm_registry.Registry(d)
+        try:
+            g = _cppn_genome(4)
+            ref = _campos(ec.express(_net(g)))
+            _limpa()
+            ec._SHARED = shm_registry.Registry(d)
+            cs = ec.express(_net(g))
+            assert _campos(cs) == ref
+            assert ec.stats()["hits_shared"] == 1
+            assert isinstance(cs.ih_w, memoryview)
+            out_cache = cs.activate([0.1] * sub.N_IN)
+            assert out_cache == sub.express(_net(g)).activate([0.1] * sub.N_IN)
+        finally:
+            ec._SHARED = velho
+            _limpa()
+
+
+def test_entrada_plantada_no_compartilhado_e_recusada():
+    """Índice fora do substrato ou tamanho errado no nível compartilhado: recalcula, não roda."""
+    import struct
+    _limpa()
+    velho = ec._SHARED
+    with tempfile.TemporaryDirectory() as d:
+        ec._SHARED = shm_registry.Registry(d)
+        try:
+            g = _cppn_genome(6)
+            cs = sub.express(_net(g))
+            boa = ec._encode(cs)
+            assert _campos(ec._decode(boa)) == _campos(cs)
+            ruim = bytearray(boa)
+            fim = len(ruim) - 2 * len(cs.ho_idx)           # ho_idx é a última coluna
+            struct.pack_into("<H", ruim, fim, sub.N_HID)   # oculto que não existe
+            for plantada in (bytes(ruim), boa + b"\0\0"):
+                ec._SHARED.put("express." + ec.cppn_digest(_net(g)), plantada)
+                _limpa()
+                assert _campos(ec.express(_net(g))) == _campos(cs)
+                assert ec.stats()["misses"] == 1 and ec.stats()["hits_shared"] == 0
+        finally:
+            ec._SHARED = velho
+            _limpa()
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
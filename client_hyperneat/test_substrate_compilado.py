@@ -0,0 +1,109 @@
+"""
+Testes do substrato COMPILADO (substrate.CompiledSubstrate).
+
+O compilado é o que roda todo tick; a referência (activate sobre as matrizes densas) é o que
+o _fire documenta. Os dois só podem diferir no arredondamento de dobrar 1/sqrt(fan_in) no
+peso — nunca numa sinapse a mais, a menos, ou num oculto que dispara onde não devia.
+
+Roda com:  pytest test_substrate_compilado.py   (ou: python test_substrate_compilado.py)
+"""
+import os
+import sys
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, AQUI)
+sys.path.insert(0, os.path.join(os.path.dirname(AQUI), "client_native"))
+import substrate as sub                            # noqa: E402
+from synth_cppn import cppn_net, random_cppn       # noqa: E402
+
+TOL = 1e-12
+ENTRADAS = [[((i * (k + 3)) % 17) / 17.0 - 0.3 for i in range(sub.N_IN)] for k in range(5)]
+
+
+def _casos():
+    for seed in range(1, 7):
+        for muta in (0, 10):
+            W_ih, W_ho, n = sub.paint(cppn_net(random_cppn(seed, muta)))
+            yield f"cppn {seed}/{muta}", W_ih, W_ho, sub.compile_substrate(W_ih, W_ho, n)
+
+
+def _perto(a, b):
+    return len(a) == len(b) and all(abs(x - y) <= TOL for x, y in zip(a, b))
+
+
+def test_ativacao_igual_a_referencia_nos_dois_caminhos():
+    """NumPy (quando há) e laço puro batem com activate() denso a menos de arredondamento."""
+    for nome, W_ih, W_ho, cs in _casos():
+        for x in ENTRADAS:
+            ref_out, ref_hid = sub.activate(W_ih, W_ho, x)
+            for out, hid in (cs.activate(x), sub._activate_py(cs, x)):
+                assert type(out) is list and type(hid) is list
+                assert _perto(out, ref_out) and _perto(hid, ref_hid), nome
+
+
+def test_oculto_sem_entrada_dispara_zero():
+    W_ih = [[0.0] * sub.N_IN for _ in range(sub.N_HID)]
+    W_ho = [[0.0] * sub.N_HID for _ in range(sub.N_OUT)]
+    W_ih[3][0] = 2.0; W_ho[1][3] = 1.0; W_ho[1][4] = 1.0   # oculto 4 só tem saída
+    cs = sub.compile_substrate(W_ih, W_ho, 3)
+    x = [1.0] * sub.N_IN
+    for out, hid in (cs.activate(x), sub._activate_py(cs, x)):
+        assert hid[4] == 0.0 and out[0] == 0.0 and _perto(out, sub.activate(W_ih, W_ho, x)[0])
+
+
+def test_estrutura_e_contagens_batem_com_o_denso():
+    for nome, W_ih, W_ho, cs in _casos():
+        assert cs.functional_synapses() == sub.functional_synapses(W_ih, W_ho), nome
+        assert len(cs.ih_idx) + len(cs.ho_idx) == sum(
+            1 for W in (W_ih, W_ho) for row in W for w in row if w != 0.0), nome
+        d_ih, d_ho = cs.dense()
+        for A, B in ((W_ih, d_ih), (W_ho, d_ho)):
+            for ra, rb in zip(A, B):
+                assert [w != 0.0 for w in ra] == [w != 0.0 for w in rb], nome
+                assert _perto(ra, rb), nome
+
+
+def test_to_struct_do_compilado_igual_ao_denso():
+    for nome, W_ih, W_ho, cs in _casos():
+        a, b = cs.to_struct(), sub.to_struct(W_ih, W_ho)
+        assert a["nodes"] == b["nodes"]
+        assert [c[:2] for c in a["conns"]] == [c[:2] for c in b["conns"]], nome
+        assert all(abs(p[2] - q[2]) <= 1e-3 for p, q in zip(a["conns"], b["conns"])), nome
+
+
+def test_to_struct_funcional_so_tem_o_que_leva_sinal():
+    W_ih = [[0.0] * sub.N_IN for _ in range(sub.N_HID)]
+    W_ho = [[0.0] * sub.N_HID for _ in range(sub.N_OUT)]
+    W_ih[3][0] = 2.0; W_ho[1][3] = 1.0; W_ho[1][4] = 1.0; W_ih[5][2] = 1.0   # 4 e 5: mortos
+    cs = sub.compile_substrate(W_ih, W_ho, 4)
+    assert cs.functional_hidden() == [3]
+    st = cs.to_struct(functional=True)
+    assert set(st["nodes"]) == {str(o) for o in range(sub.N_OUT)} | {str(sub.HIDDEN_ID_BASE + 3)}
+    assert [c[:2] for c in st["conns"]] == [[-1, sub.HIDDEN_ID_BASE + 3],
+                                            [sub.HIDDEN_ID_BASE + 3, 1]]
+    for nome, W_ih, W_ho, cs in _casos():
+        viva = {sub.HIDDEN_ID_BASE + h for h in cs.functional_hidden()}
+        st = cs.to_struct(functional=True)
+        assert len(st["conns"]) == cs.functional_synapses(), nome
+        assert all(c[0] in viva or c[1] in viva for c in st["conns"]), nome
+
+
+def test_memoria_compacta():
+    """~10 B por sinapse acesa (u16 + f64), longe das listas densas de float Python."""
+    for nome, W_ih, W_ho, cs in _casos():
+        nnz = len(cs.ih_idx) + len(cs.ho_idx)
+        assert cs.nbytes <= 10 * nnz + 2 * (sub.N_HID + sub.N_OUT + 2), nome
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
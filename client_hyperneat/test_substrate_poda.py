@@ -0,0 +1,69 @@
+"""
+Testes da expressão PODADA do substrato (substrate.paint, prune=True).
+
+A poda só pode cortar trabalho, nunca comportamento: para qualquer CPPN e qualquer entrada,
+as 7 saídas têm de ser IDÊNTICAS às da expressão completa. O que muda é o que não era lido
+— os ocultos sem saída deixam de receber sinapses — e a contagem que os incluía.
+
+Roda com:  pytest test_substrate_poda.py   (ou: python test_substrate_poda.py)
+"""
+import os
+import sys
+
+AQUI = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, AQUI)
+sys.path.insert(0, os.path.join(os.path.dirname(AQUI), "client_native"))
+import substrate as sub                            # noqa: E402
+from synth_cppn import cppn_net, random_cppn       # noqa: E402
+
+ENTRADAS = [[((i * (k + 3)) % 17) / 17.0 - 0.3 for i in range(sub.N_IN)] for k in range(5)]
+CPPNS = [(s, m) for s in range(1, 9) for m in (0, 10)]
+
+
+def test_saidas_identicas_a_expressao_completa():
+    for seed, muta in CPPNS:
+        net = cppn_net(random_cppn(seed, muta))
+        podado, completo = sub.paint(net), sub.paint(net, prune=False)
+        for x in ENTRADAS:
+            assert sub.activate(podado[0], podado[1], x)[0] == \
+                sub.activate(completo[0], completo[1], x)[0], f"cppn {seed}/{muta}"
+
+
+def test_oculto_sem_saida_nao_recebe_sinapse():
+    for seed, muta in CPPNS:
+        W_ih, W_ho, n = sub.paint(cppn_net(random_cppn(seed, muta)))
+        for h in range(sub.N_HID):
+            if not any(W_ho[o][h] for o in range(sub.N_OUT)):
+                assert not any(W_ih[h]), f"cppn {seed}/{muta}: oculto {h} morto com entrada"
+
+
+def test_contagens_expressa_e_funcional():
+    """funcionais <= expressas <= completas; e a poda só tira o que não alcança saída."""
+    for seed, muta in CPPNS:
+        net = cppn_net(random_cppn(seed, muta))
+        W_ih, W_ho, n = sub.paint(net)
+        _, _, n_full = sub.paint(net, prune=False)
+        assert sub.functional_synapses(W_ih, W_ho) <= n <= n_full
+
+
+def test_funcional_conta_so_caminho_completo():
+    W_ih = [[0.0] * sub.N_IN for _ in range(sub.N_HID)]
+    W_ho = [[0.0] * sub.N_HID for _ in range(sub.N_OUT)]
+    W_ih[0][5] = W_ih[0][6] = 1.0; W_ho[2][0] = 1.0        # oculto 0: 2 entram, 1 sai
+    W_ih[1][5] = 1.0                                        # oculto 1: sem saída
+    W_ho[3][2] = 1.0                                        # oculto 2: sem entrada
+    assert sub.functional_synapses(W_ih, W_ho) == 3
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
@@ -0,0 +1,263 @@
+"""
+admin.py — endpoint LOCAL de métricas de um executor em execução (compartilhado pelos hosts
+e pelo SDK).
+
+Hoje, pra saber o estado de um executor no Luna, é `tail -f logs/native.log`. Com
+REGENES_ADMIN, o processo abre um HTTP mínimo (só GET) no próprio event loop:
+
+    REGENES_ADMIN=127.0.0.1:9464        TCP (porta ocupada -> tenta as 63 seguintes: vários
+                                        workers do supervisor com a mesma variável)
+    REGENES_ADMIN=unix:/tmp/rg-{pid}.sock   unix socket ({pid} vira o pid do processo)
+
+    GET /metrics        texto Prometheus (version=0.0.4)
+    GET /metrics.json   o mesmo, em JSON (mais o que não é número: as piores travas)
+
+O que sai é o que o `collect()` do processo devolve (executor.metrics(), regenes_agent): amebas
+vivas, nascimentos por origem e por segundo, ticks/s, percentis por etapa (lagmon), taxas de
+acerto dos caches, tamanho dos reservatórios, memória (RSS), descritores abertos, atraso do
+loop e o degrau de corte (governor). Os "por segundo" são a diferença entre duas coletas
+(>= 1 s entre elas).
+
+Barato de raspar e nunca no caminho do tick: uma coleta serve todo raspador por
+`min_interval` s (default 1); o handler só lê contadores (nada de disco, nada de lock) e cada
+conexão tem teto de tempo e de tamanho de pedido. Nada de endereço público: o default é
+loopback, e quem quiser expor põe um proxy na frente.
+"""
+import asyncio
+import errno
+import json
+import os
+import sys
+import time
+
+ADMIN = os.getenv("REGENES_ADMIN", "")
+_MAX_REQUEST = 8192
+_PORT_TRIES = 64
+
+
+def rss_bytes():
+    """Memória residente do processo (/proc; fora do Linux, o pico do getrusage; no Windows,
+    sem `resource`, None)."""
+    try:
+        with open("/proc/self/statm", "rb") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError, AttributeError):
+        pass
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak if sys.platform == "darwin" else peak * 1024     # macOS: bytes; resto: KiB
+
+
+def open_fds(pid="self"):
+    """Descritores de arquivo abertos (/proc/<pid>/fd); None fora do Linux."""
+    try:
+        n = len(os.listdir(f"/proc/{pid}/fd"))
+    except OSError:
+        return None
+    return n - 1 if pid == "self" else n      # o do próprio listdir
+
+
+# --- texto Prometheus -------------------------------------------------------------------------
+
+def _esc(v) -> str:
+    return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class _Prom:
+    """Séries agrupadas por métrica (o formato exige a família inteira junta, com um TYPE)."""
+
+    def __init__(self):
+        self.families = {}                   # nome -> [linhas], na ordem da 1ª aparição
+
+    def add(self, name: str, value, kind: str = "gauge", help_: str = "", **labels) -> None:
+        if value is None or isinstance(value, bool) or not isinstance(value, (int, float)):
+            return
+        name = "regenes_" + name
+        fam = self.families.get(name)
+        if fam is None:
+            fam = self.families[name] = ([f"# HELP {name} {help_}"] if help_ else []) + [
+                f"# TYPE {name} {kind}"]
+        lab = ",".join(f'{k}="{_esc(v)}"' for k, v in labels.items())
+        fam.append(f"{name}{{{lab}}} {value}" if lab else f"{name} {value}")
+
+    @property
+    def lines(self) -> list:
+        return [x for fam in self.families.values() for x in fam]
+
+    def text(self) -> str:
+        return "\n".join(self.lines) + "\n"
+
+
+_QUANTILES = (("p50", "0.5"), ("p90", "0.9"), ("p99", "0.99"), ("max", "1"))
+
+
+def prometheus(m: dict) -> str:
+    """O JSON do collect() -> texto Prometheus. Chave ausente não vira série."""
+    p = _Prom()
+    p.add("up", 1)
+    p.add("uptime_seconds", m.get("uptime_s"))
+    p.add("rss_bytes", m.get("rss_bytes"), help_="memória residente do processo")
+    p.add("open_fds", m.get("open_fds"), help_="descritores de arquivo abertos")
+    for sp, s in (m.get("species") or {}).items():
+        p.add("alive", s.get("alive"), help_="amebas no ar", species=sp)
+        p.add("slots_target", s.get("target"), help_="alvo de vagas (autoscale)", species=sp)
+        p.add("ticks_total", s.get("ticks"), "counter", species=sp)
+        p.add("ticks_per_second", s.get("ticks_per_s"), species=sp)
+        p.add("deaths_total", s.get("deaths"), "counter", species=sp)
+        p.add("reconnects_total", s.get("reconnects"), "counter", species=sp)
+        for origin, n in (s.get("births_by_origin") or {}).items():
+            p.add("births_total", n, "counter", "nascimentos por origem", species=sp,
+                  origin=origin)
+        for origin, r in (s.get("births_per_s") or {}).items():
+            p.add("births_per_second", r, species=sp, origin=origin)
+        for k, q in _QUANTILES:
+            p.add("tick_latency_ms", (s.get("tick_ms") or {}).get(k),
+                  help_="chegou a mensagem -> ação enviada", species=sp, quantile=q)
+        pool = s.get("pool") or {}
+        p.add("pool_ready", pool.get("ready"), help_="primordiais prontos", species=sp)
+        p.add("pool_size", pool.get("size"), species=sp)
+    for name, c in (m.get("caches") or {}).items():
+        hits = c.get("hits", (c.get("hits_mem") or 0) + (c.get("hits_shared") or 0))
+        p.add("cache_hits_total", hits, "counter", cache=name)
+        p.add("cache_misses_total", c.get("misses"), "counter", cache=name)
+        p.add("cache_hit_ratio", c.get("hit_rate"), cache=name)
+        p.add("cache_entries", c.get("entries", c.get("ready")), cache=name)
+        p.add("cache_bytes", c.get("bytes"), cache=name)
+    for st, s in (m.get("stages") or {}).items():
+        p.add("stage_runs_total", s.get("n"), "counter", stage=st)
+        for k, q in _QUANTILES:
+            p.add("stage_latency_ms", s.get(k), help_="duração da etapa (lagmon)", stage=st,
+                  quantile=q)
+    loop = m.get("loop") or {}
+    for k, q in _QUANTILES:
+        p.add("loop_lag_ms", (loop.get("lag_ms") or {}).get(k),
+              help_="atraso de agendamento do event loop", quantile=q)
+    p.add("loop_stalls_total", loop.get("stalls"), "counter")
+    shed = m.get("shed") or {}
+    p.add("shed_level", shed.get("level"), help_="degrau de corte sob carga (governor)")
+    return p.text()
+
+
+# --- o servidor ---------------------------------------------------------------------------------
+
+class Admin:
+    """Coletas em cache + taxas entre coletas + o servidor HTTP mínimo."""
+
+    def __init__(self, collect, min_interval: float = 1.0):
+        self.collect = collect
+        self.min_interval = min_interval
+        self.address = None
+        self.scrapes = 0
+        self._cache = None                   # (quando, json, texto prometheus)
+        self._prev = None                    # (quando, contadores) da coleta anterior
+        self._rates = {}
+        self._server = None
+
+    def _counters(self, m: dict) -> dict:
+        out = {}
+        for sp, s in (m.get("species") or {}).items():
+            out[(sp, "ticks")] = s.get("ticks", 0)
+            for origin, n in (s.get("births_by_origin") or {}).items():
+                out[(sp, "births", origin)] = n
+        return out
+
+    def snapshot(self, now: float = None):
+        """-> (json, texto prometheus), recoletando no máximo a cada min_interval s."""
+        now = time.monotonic() if now is None else now
+        if self._cache is not None and now - self._cache[0] < self.min_interval:
+            return self._cache[1], self._cache[2]
+        m = self.collect()
+        m.setdefault("rss_bytes", rss_bytes())
+        m.setdefault("open_fds", open_fds())
+        cur = self._counters(m)
+        prev = self._prev
+        if prev is not None and now - prev[0] >= 1.0:
+            dt = now - prev[0]
+            self._rates = {k: round((v - prev[1].get(k, 0)) / dt, 2) for k, v in cur.items()}
+            self._prev = (now, cur)
+        elif prev is None:
+            self._prev = (now, cur)
+        for sp, s in (m.get("species") or {}).items():
+            s["ticks_per_s"] = self._rates.get((sp, "ticks"))
+            s["births_per_s"] = {k[2]: r for k, r in self._rates.items()
+                                 if k[0] == sp and k[1] == "births"}
+        body = json.dumps(m)
+        self._cache = (now, body, prometheus(m))
+        return body, self._cache[2]
+
+    async def start(self, spec: str = ADMIN):
+        """Abre o endpoint. Spec vazia: não abre nada (None). Não abriu (endereço inválido,
+        sem permissão): avisa e segue sem — métrica nunca derruba o executor."""
+        if not spec:
+            return None
+        try:
+            await self._listen(spec)
+        except (OSError, ValueError) as e:
+            print(f"[admin] não abriu {spec}: {e} — seguindo sem endpoint")
+            return None
+        print(f"[admin] escutando em {self.address} (GET /metrics | /metrics.json)")
+        return self._server
+
+    async def _listen(self, spec: str) -> None:
+        if spec.startswith("unix:"):
+            path = spec[5:].replace("{pid}", str(os.getpid()))
+            try:
+                os.unlink(path)              # socket velho de um processo que já morreu
+            except FileNotFoundError:
+                pass
+            self._server = await asyncio.start_unix_server(self._handle, path)
+            self.address = "unix:" + path
+        else:
+            host, _, port = spec.rpartition(":")
+            host, port = host or "127.0.0.1", int(port)
+            for p in range(port, port + (_PORT_TRIES if port else 1)):
+                try:
+                    self._server = await asyncio.start_server(self._handle, host, p)
+                    break
+                except OSError as e:
+                    if e.errno != errno.EADDRINUSE or p == port + _PORT_TRIES - 1:
+                        raise
+            bound = self._server.sockets[0].getsockname()
+            self.address = f"http://{bound[0]}:{bound[1]}"
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            if self.address and self.address.startswith("unix:"):
+                try:
+                    os.unlink(self.address[5:])
+                except OSError:
+                    pass
+
+    async def _handle(self, reader, writer) -> None:
+        try:
+            head = await asyncio.wait_for(reader.readuntil(b"\r\n\r\n"), 2.0)
+            parts = head[:_MAX_REQUEST].split(b"\r\n", 1)[0].split()
+            method, path = (parts[0], parts[1].split(b"?")[0]) if len(parts) >= 2 else (b"", b"")
+            if method != b"GET":
+                status, ctype, body = "405 Method Not Allowed", "text/plain", "só GET\n"
+            elif path == b"/metrics":
+                status, ctype = "200 OK", "text/plain; version=0.0.4; charset=utf-8"
+                body = self.snapshot()[1]
+            elif path in (b"/metrics.json", b"/status"):
+                status, ctype, body = "200 OK", "application/json", self.snapshot()[0]
+            else:
+                status, ctype = "404 Not Found", "text/plain"
+                body = "GET /metrics | /metrics.json\n"
+            self.scrapes += 1
+            data = body.encode("utf-8")
+            writer.write(f"HTTP/1.0 {status}\r\nContent-Type: {ctype}\r\n"
+                         f"Content-Length: {len(data)}\r\nConnection: close\r\n\r\n"
+                         .encode("ascii") + data)
+            await asyncio.wait_for(writer.drain(), 2.0)
+        except (asyncio.TimeoutError, asyncio.IncompleteReadError, asyncio.LimitOverrunError,
+                ConnectionError):
+            pass                             # raspador lento/torto: só fecha
+        except Exception as e:               # coleta quebrada nunca derruba o executor
+            print(f"[admin] {e.__class__.__name__}: {e}")
+        finally:
+            writer.close()
@@ -0,0 +1,142 @@
+"""
+autoscale.py — quantas amebas este executor aguenta, medido em vez de chutado.
+
+N_NATIVE=20 / N_HYPER=20 eram chutes. Host sobrecarregado decide TARDE (a ação chega
+depois do tick seguinte: a ameba age sobre um mundo que já passou); host ocioso desperdiça
+vaga. Aqui o próprio executor mede a latência de decisão por tick (runtime_stats: chegou a
+mensagem -> ação enviada) e a CPU do processo, e mexe no ALVO de vagas dentro de
+[mínimo, máximo]:
+
+  · CRESCE quando o p99 da janela ficou abaixo de `low` × alvo E a CPU abaixo de
+    `cpu_grow`, por `patience` avaliações seguidas;
+  · ENCOLHE quando o p99 passou do alvo OU a CPU passou de `cpu_shrink`, idem;
+  · depois de cada mudança, `cooldown` segundos sem mexer (o efeito precisa aparecer na
+    latência antes da próxima decisão). A faixa morta entre `low`×alvo e o alvo é a
+    histerese: o controlador não fica oscilando em volta do limite.
+
+Encolher NUNCA mata ameba viva: a vaga acima do alvo termina a vida em curso e não
+reconecta (Slots/run_one). Crescer abre vagas novas na hora.
+
+Liga com REGENES_AUTOSCALE=1; sem ela o alvo é N, fixo. Faixa: REGENES_AUTOSCALE_MIN
+(default 1) e REGENES_AUTOSCALE_MAX (default 2×N); alvo de latência REGENES_TICK_TARGET_MS
+(p99, default 50 ms — o mundo tica a ~4 Hz); avaliação a cada REGENES_AUTOSCALE_EVERY s
+(default 5), pausa pós-mudança REGENES_AUTOSCALE_COOLDOWN s (default 30). Toda decisão sai
+no log com o porquê.
+"""
+import asyncio
+import os
+import time
+
+from runtime_stats import percentile
+
+ENABLED = os.getenv("REGENES_AUTOSCALE") == "1"
+EVAL_S = float(os.getenv("REGENES_AUTOSCALE_EVERY", "5"))
+
+
+class Autoscaler:
+    """Controlador do alvo de vagas. decide() é puro (dados -> novo alvo); sample() lê os
+    números do processo e chama decide()."""
+
+    def __init__(self, n: int, lo: int = 1, hi: int = None, target_ms: float = 50.0,
+                 low: float = 0.5, cpu_grow: float = 0.6, cpu_shrink: float = 0.85,
+                 patience: int = 3, cooldown: float = 30.0, enabled: bool = True,
+                 label: str = ""):
+        self.lo = max(1, lo)
+        self.hi = max(self.lo, hi if hi is not None else 2 * n)
+        self.target = min(self.hi, max(self.lo, n))
+        self.target_ms = target_ms
+        self.low = low
+        self.cpu_grow = cpu_grow
+        self.cpu_shrink = cpu_shrink
+        self.patience = patience
+        self.cooldown = cooldown
+        self.enabled = enabled
+        self.label = label
+        self._over = self._under = 0
+        self._last_change = None
+        self._seen_ticks = 0
+        self._cpu_prev = None
+        self.decisions = []                  # (quando, de, para, motivo) — o log em memória
+
+    @classmethod
+    def from_env(cls, n: int, label: str = ""):
+        return cls(n, lo=int(os.getenv("REGENES_AUTOSCALE_MIN", "1")),
+                   hi=int(os.getenv("REGENES_AUTOSCALE_MAX", str(2 * n))),
+                   target_ms=float(os.getenv("REGENES_TICK_TARGET_MS", "50")),
+                   cooldown=float(os.getenv("REGENES_AUTOSCALE_COOLDOWN", "30")),
+                   enabled=ENABLED, label=label)
+
+    def decide(self, p99_ms, cpu, now: float) -> int:
+        """Nova meta de vagas a partir do p99 da janela (ms, None = sem ticks) e da fração de
+        CPU do processo (0..1, None = desconhecida)."""
+        if not self.enabled or p99_ms is None:
+            return self.target
+        cpu = cpu or 0.0
+        if p99_ms > self.target_ms or cpu > self.cpu_shrink:
+            self._over, self._under = self._over + 1, 0
+        elif p99_ms < self.low * self.target_ms and cpu < self.cpu_grow:
+            self._under, self._over = self._under + 1, 0
+        else:
+            self._over = self._under = 0     # faixa morta: está bom, não mexe
+        if self._last_change is not None and now - self._last_change < self.cooldown:
+            return self.target
+        step = max(1, self.target // 10)
+        new = self.target
+        if self._over >= self.patience and self.target > self.lo:
+            new = max(self.lo, self.target - step)
+            why = (f"p99 {p99_ms:.1f} ms > {self.target_ms:.0f} ms" if p99_ms > self.target_ms
+                   else f"CPU {cpu:.0%} > {self.cpu_shrink:.0%}")
+        elif self._under >= self.patience and self.target < self.hi:
+            new = min(self.hi, self.target + step)
+            why = (f"p99 {p99_ms:.1f} ms < {self.low * self.target_ms:.0f} ms, "
+                   f"CPU {cpu:.0%} < {self.cpu_grow:.0%}")
+        if new != self.target:
+            print(f"[scale{self.label}] vagas {self.target} -> {new} ({why})")
+            self.decisions.append((time.time(), self.target, new, why))
+            self.target = new
+            self._over = self._under = 0
+            self._last_change = now
+        return self.target
+
+    def sample(self, stats, now: float = None) -> int:
+        """Lê a janela desde a última amostra (latências novas + CPU do processo) e decide."""
+        now = time.monotonic() if now is None else now
+        lat = sorted(stats.recent(stats.ticks - self._seen_ticks))
+        self._seen_ticks = stats.ticks
+        cpu_now = time.process_time()
+        prev, self._cpu_prev = self._cpu_prev, (cpu_now, now)
+        cpu = (cpu_now - prev[0]) / (now - prev[1]) if prev and now > prev[1] else None
+        p99 = percentile(lat, 0.99)
+        return self.decide(None if p99 is None else p99 * 1e3, cpu, now)
+
+
+class Slots:
+    """As vagas de amebas do executor: uma task run_one(idx) por vaga, idx em [0, alvo).
+    run_one deve sair do laço quando idx >= alvo (depois da vida em curso) ou na drenagem."""
+
+    def __init__(self, run_one, scaler: Autoscaler):
+        self.run_one = run_one
+        self.scaler = scaler
+        self.tasks = {}
+
+    def fill(self) -> None:
+        """Abre as vagas que faltam até o alvo."""
+        for idx in range(self.scaler.target):
+            if idx not in self.tasks:
+                t = asyncio.create_task(self.run_one(idx))
+                self.tasks[idx] = t
+                t.add_done_callback(lambda _t, i=idx: self.tasks.pop(i, None))
+
+    async def control(self, stats, draining, every: float = EVAL_S) -> None:
+        """Task: a cada `every` s, reavalia o alvo e abre vagas (até a drenagem)."""
+        while not draining():
+            await asyncio.sleep(every)
+            if draining():
+                break
+            stats.n = self.scaler.sample(stats)
+            self.fill()
+
+    async def wait(self) -> None:
+        """Volta quando não sobrar vaga nenhuma (só acontece drenando)."""
+        while self.tasks:
+            await asyncio.wait(list(self.tasks.values()))
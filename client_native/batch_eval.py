@@ -0,0 +1,245 @@
+"""
+batch_eval.py — forward pass EM LOTE de todas as amebas nativas do processo.
+
+Cada ameba tem topologia própria, mas todas são DAGs feed-forward pequenos sobre as mesmas
+163 entradas e 7 saídas. Rodar `FeedForwardNetwork.activate` uma por uma paga o interpretador
+Python por sinapse: com 200 amebas de ~300 ligações, são 60k multiplicações em laço Python
+a cada tick do mundo. Aqui os subgrafos funcionais de todas as amebas vivas são empacotados
+numa estrutura ÚNICA, esparsa por blocos e ordenada por NÍVEL de profundidade: um nó do
+nível L só lê entradas e nós de níveis < L. Todos os ticks pendentes são avaliados numa
+varredura vetorizada por nível — gather dos pesos, bincount por nó, ativação por grupo.
+
+Layout de um buffer plano de valores:
+  [ entradas: slot*163 + i  |  nós: blocos por ameba, alocados em ordem de nascimento  | 0 ]
+O último elemento é sempre 0.0: saída que a rede não avalia (sem caminho) lê dali, como o
+0.0 inicial do `values` da FeedForwardNetwork.
+
+Incremental: nascer COMPILA só a rede nova e anexa o bloco dela ao fim de cada nível;
+morrer só marca o slot livre (o bloco morto segue calculando lixo que ninguém lê). Quando
+os blocos mortos passam dos vivos, ou o buffer enche, a estrutura é reconstruída a partir
+dos blocos já compilados — nunca das redes.
+
+Semântica: a MESMA do activate (act(bias + response * soma(w*x))), a menos de arredondamento
+(a soma do Python 3.12 é compensada; a do bincount não). Genoma com agregação diferente de
+sum ou ativação fora de tanh/sigmoid/relu/identity vira slot SOLO: roda pelo net.activate.
+
+Requer NumPy (opcional no executor): sem ele, available() é False e o host segue por ameba.
+"""
+import asyncio
+import contextlib
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+N_IN = 163
+
+
+def available() -> bool:
+    return np is not None
+
+
+# ativação do neat-python -> versão vetorizada com o MESMO clamp
+_ACTS = {
+    "tanh_activation": lambda z: np.tanh(np.clip(2.5 * z, -60.0, 60.0)),
+    "sigmoid_activation": lambda z: 1.0 / (1.0 + np.exp(-np.clip(5.0 * z, -60.0, 60.0))),
+    "relu_activation": lambda z: np.where(z > 0.0, z, 0.0),
+    "identity_activation": lambda z: z,
+}
+_ACT_CODES = {name: k for k, name in enumerate(_ACTS)}
+_ACT_FNS = list(_ACTS.values())
+
+
+class _Block:
+    """Uma rede compilada em índices LOCAIS: fonte < N_IN é entrada, >= N_IN é o nó
+    (fonte - N_IN) do bloco. Por nível: (nós, bias, response, ativação, arestas)."""
+
+    __slots__ = ("n_nodes", "levels", "out_local")
+
+    def __init__(self, net):
+        pos = {k: i for i, k in enumerate(net.input_nodes)}
+        depth = {k: 0 for k in net.input_nodes}
+        per_level = {}
+        for j, (node, act, agg, bias, resp, links) in enumerate(net.node_evals):
+            if agg.__name__ != "sum_aggregation" or act.__name__ not in _ACT_CODES:
+                raise ValueError(f"nó {node}: {agg.__name__}/{act.__name__} fora do lote")
+            d = 1 + max((depth[i] for i, _ in links), default=0)
+            depth[node] = d
+            pos[node] = N_IN + j
+            lv = per_level.setdefault(d, ([], [], [], [], [], [], []))
+            row = len(lv[0])
+            lv[0].append(j)
+            lv[1].append(bias)
+            lv[2].append(resp)
+            lv[3].append(_ACT_CODES[act.__name__])
+            for i, w in links:
+                lv[4].append(pos[i])
+                lv[5].append(row)
+                lv[6].append(w)
+        self.n_nodes = len(net.node_evals)
+        self.levels = {d: (np.array(a, np.intp), np.array(b, np.float64), np.array(r, np.float64),
+                           np.array(c, np.int8), np.array(s, np.intp), np.array(e, np.intp),
+                           np.array(w, np.float64))
+                       for d, (a, b, r, c, s, e, w) in per_level.items()}
+        self.out_local = [pos.get(k, -1) for k in net.output_nodes]
+
+
+class BatchEvaluator:
+    """Lote de redes FeedForwardNetwork do processo. add(net) -> slot; remove(slot);
+    evaluate({slot: entradas}) -> {slot: saídas}; ou `await activate(slot, entradas)`, que
+    junta todos os pedidos da mesma volta do event loop numa varredura só."""
+
+    def __init__(self, n_outputs: int = 7, slots: int = 16, nodes: int = 4096,
+                 stage=contextlib.nullcontext):
+        self.n_out = n_outputs
+        self._stage = stage              # contexto em volta da varredura (host: lagmon.stage)
+        self._nets = {}                  # slot -> net (slots solo e viz usam a rede)
+        self._blocks = {}                # slot -> (_Block, base do bloco) | None (solo)
+        self._free = []
+        self._next_slot = 0
+        self._dead = 0                   # nós de blocos mortos ainda no buffer
+        self._pending = {}
+        self._scheduled = False
+        self._alloc(slots, nodes)
+
+    # --- estrutura ---
+
+    def _alloc(self, slots, nodes):
+        self._cap_slots, self._cap_nodes = slots, nodes
+        self._node0 = slots * N_IN
+        self._buf = np.zeros(self._node0 + nodes + 1)
+        self._zero = len(self._buf) - 1
+        self._X = self._buf[:self._node0].reshape(slots, N_IN)
+        self._out_idx = np.full((slots, self.n_out), self._zero, np.intp)
+        self._used = 0
+        self._lv = {}                    # nível -> partes anexadas (listas de arrays)
+        self._cat = {}                   # nível -> arrays prontos pra varredura (+ grupos de ativação)
+
+    def _place(self, slot, blk):
+        base = self._used
+        self._used += blk.n_nodes
+        g0 = self._node0 + base
+        for d, (nodes, bias, resp, act, src, row, w) in blk.levels.items():
+            parts = self._lv.setdefault(d, [[], [], [], [], [], [], []])
+            n_rows = sum(len(a) for a in parts[0])
+            src_g = np.where(src < N_IN, slot * N_IN + src, g0 + src - N_IN)
+            for lst, arr in zip(parts, (nodes + g0, bias, resp, act, src_g, row + n_rows, w)):
+                lst.append(arr)
+            self._cat.pop(d, None)
+        self._out_idx[slot] = [g0 + p - N_IN if p >= N_IN else self._zero
+                               for p in blk.out_local]
+        return base
+
+    def _rebuild(self, slots=None, nodes=None):
+        """Reconstrói o buffer a partir dos blocos VIVOS já compilados (compacta os mortos)."""
+        live = [(s, v[0]) for s, v in self._blocks.items() if v is not None]
+        need = sum(b.n_nodes for _, b in live)
+        slots = slots or self._cap_slots
+        nodes = max(nodes or self._cap_nodes, 2 * need, 64)
+        old_X = self._X
+        self._alloc(slots, nodes)
+        self._X[:len(old_X)] = old_X[:slots]
+        self._dead = 0
+        for s, blk in live:
+            self._blocks[s] = (blk, self._place(s, blk))
+
+    def add(self, net) -> int:
+        """Registra a rede de uma ameba que nasceu; devolve o slot dela."""
+        slot = self._free.pop() if self._free else self._next_slot
+        if slot == self._next_slot:
+            self._next_slot += 1
+        self._nets[slot] = net
+        try:
+            blk = _Block(net)
+        except ValueError:
+            self._blocks[slot] = None    # solo: fora do que o lote sabe avaliar
+            return slot
+        if slot >= self._cap_slots or self._used + blk.n_nodes > self._cap_nodes:
+            self._rebuild(slots=max(self._cap_slots, 2 * (slot + 1)),
+                          nodes=2 * (self._used - self._dead + blk.n_nodes))
+        self._blocks[slot] = (blk, self._place(slot, blk))
+        return slot
+
+    def remove(self, slot: int) -> None:
+        """A ameba morreu: libera o slot. O bloco fica até a próxima compactação."""
+        v = self._blocks.pop(slot, None)
+        self._nets.pop(slot, None)
+        p = self._pending.pop(slot, None)
+        if p is not None:
+            p[1].cancel()
+        if v is not None:
+            self._out_idx[slot] = self._zero
+            self._dead += v[0].n_nodes
+            if self._dead > self._used - self._dead:
+                self._rebuild()
+        self._free.append(slot)
+
+    def __len__(self):
+        return len(self._nets)
+
+    # --- avaliação ---
+
+    def _level(self, d):
+        c = self._cat.get(d)
+        if c is None:
+            parts = self._lv[d]
+            for p in parts:                  # anexos desde a última varredura: cola no bloco
+                if len(p) > 1:               # já concatenado e deixa a lista com um array só
+                    p[:] = [np.concatenate(p)]
+            nodes, bias, resp, act, src, row, w = (p[0] for p in parts)
+            codes = np.unique(act)
+            groups = (None if len(codes) == 1 else
+                      [(_ACT_FNS[k], np.flatnonzero(act == k)) for k in codes])
+            c = self._cat[d] = (nodes, bias, resp, _ACT_FNS[codes[0]], groups, src, row, w)
+        return c
+
+    def evaluate(self, batch: dict) -> dict:
+        """{slot: 163 entradas} -> {slot: 7 saídas}, numa varredura por nível."""
+        res = {}
+        lote = []
+        for slot, inputs in batch.items():
+            if self._blocks.get(slot) is None:
+                res[slot] = self._nets[slot].activate(inputs)
+            else:
+                lote.append(slot)
+        if not lote:
+            return res
+        self._X[lote] = batch[lote[0]] if len(lote) == 1 else [batch[s] for s in lote]
+        buf = self._buf
+        for d in sorted(self._lv):
+            nodes, bias, resp, act, groups, src, row, w = self._level(d)
+            z = bias + resp * np.bincount(row, w * buf[src], len(nodes))
+            if groups is None:
+                buf[nodes] = act(z)
+            else:
+                for fn, rows in groups:
+                    buf[nodes[rows]] = fn(z[rows])
+        outs = buf[self._out_idx[lote]].tolist()
+        for slot, out in zip(lote, outs):
+            res[slot] = out
+        return res
+
+    async def activate(self, slot: int, inputs):
+        """Mesmo contrato de net.activate, mas o tick espera a varredura da volta do loop."""
+        fut = asyncio.get_running_loop().create_future()
+        self._pending[slot] = (inputs, fut)
+        if not self._scheduled:
+            self._scheduled = True
+            asyncio.get_running_loop().call_soon(self._flush)
+        return await fut
+
+    def _flush(self):
+        self._scheduled = False
+        pend, self._pending = self._pending, {}
+        try:
+            with self._stage():
+                res = self.evaluate({s: inp for s, (inp, _) in pend.items()})
+        except Exception as e:          # erro no lote não pode pendurar as amebas
+            for _, fut in pend.values():
+                if not fut.done():
+                    fut.set_exception(e)
+            return
+        for s, (_, fut) in pend.items():
+            if not fut.done():
+                fut.set_result(res[s])
@@ -0,0 +1,66 @@
+"""
+bench_batch.py — forward pass em lote (batch_eval.BatchEvaluator) vs net.activate por ameba.
+
+Mede um tick do MUNDO inteiro — todas as amebas do processo pedem ação — a 20, 200 e 2000
+amebas por processo. As redes saem de um pool bank_like (magro/mediano/inchado, como o
+banco) reusado em ciclo. Também mede o custo incremental de nascer (add) e morrer (remove).
+
+Uso:  python bench_batch.py [ticks]
+"""
+import random
+import sys
+import time
+
+import batch_eval as be
+import neat_brain as nb
+from synth_genomes import bank_like_corpus
+
+POP = (20, 200, 2000)
+
+
+def run(ticks: int = 20, pool_size: int = 30):
+    """-> lista de linhas {amebas, per_net_ms, batch_ms, speedup, add_ms, remove_ms}."""
+    pool = [nb.build_net(g) for g in bank_like_corpus(pool_size)]
+    rnd = random.Random(0)
+    linhas = []
+    for n in POP:
+        nets = [pool[k % len(pool)] for k in range(n)]
+        ev = be.BatchEvaluator()
+        t0 = time.perf_counter()
+        slots = [ev.add(net) for net in nets]
+        t_add = (time.perf_counter() - t0) / n * 1e3
+        xs = [[rnd.uniform(-1.0, 1.0) for _ in range(be.N_IN)] for _ in range(8)]
+        batch = {s: xs[s % len(xs)] for s in slots}
+        rep = max(1, ticks * 20 // n)
+        t0 = time.perf_counter()
+        for _ in range(rep):
+            for s, net in zip(slots, nets):
+                net.activate(batch[s])
+        t_net = (time.perf_counter() - t0) / rep * 1e3
+        ev.evaluate(batch)                      # aquece o cache de níveis
+        t0 = time.perf_counter()
+        for _ in range(ticks):
+            ev.evaluate(batch)
+        t_batch = (time.perf_counter() - t0) / ticks * 1e3
+        # rotatividade: 10% morrem e renascem (o que o host faz o tempo todo)
+        churn = slots[: max(1, n // 10)]
+        t0 = time.perf_counter()
+        for s in churn:
+            ev.remove(s)
+        t_rm = (time.perf_counter() - t0) / len(churn) * 1e3
+        for s in churn:
+            ev.add(nets[s])
+        ev.evaluate(batch)
+        linhas.append({"amebas": n, "per_net_ms": t_net, "batch_ms": t_batch,
+                       "speedup": t_net / t_batch, "add_ms": t_add, "remove_ms": t_rm})
+    return linhas
+
+
+if __name__ == "__main__":
+    ticks = int(sys.argv[1]) if len(sys.argv) > 1 else 20
+    if not be.available():
+        sys.exit("batch_eval precisa de NumPy")
+    print(f"{'amebas':>7} | {'por rede':>9} {'lote':>8} {'ganho':>6} | {'add':>7} {'remove':>7}  (ms)")
+    for r in run(ticks):
+        print(f"{r['amebas']:>7} | {r['per_net_ms']:>9.2f} {r['batch_ms']:>8.2f} "
+              f"{r['speedup']:>5.1f}x | {r['add_ms']:>7.3f} {r['remove_ms']:>7.3f}")
@@ -0,0 +1,90 @@
+"""
+bench_blob.py — tamanho e tempo do pacote de cérebro: v1 base64(gzip(json)) vs v2 binário,
+e v2 com dicionário pré-treinado (blob_dict.py).
+
+Roda sobre genomas sintéticos com o formato do brain_bank (synth_genomes.bank_like): o
+magro (~120 ligações), o mediano (~400) e o inchado (~900, a ordem medida em produção).
+O dicionário é medido num corpus de LINHAGENS (synth_genomes.lineage_corpus): treina na
+metade, mede na outra — o banco real é parente entre si, e sem parentesco o ganho some.
+
+Uso:  python bench_blob.py [repeticoes]
+"""
+import sys
+import time
+
+import blob_dict
+import neat_brain as nb
+from synth_genomes import bank_like, lineage_corpus
+
+SIZES = (120, 400, 900)
+
+
+def _ms(fn, arg, rep):
+    t0 = time.perf_counter()
+    for _ in range(rep):
+        fn(arg)
+    return (time.perf_counter() - t0) / rep * 1e3
+
+
+def run(rep: int = 50):
+    """-> lista de linhas {conns, v1_bytes, v2_bytes, pack_v1_ms, ...} (uma por tamanho)."""
+    linhas = []
+    for n in SIZES:
+        g = bank_like(n, n)
+        v1, v2 = nb.pack(g, 1), nb.pack(g, 2)
+        linhas.append({
+            "conns": len(g.connections), "nodes": len(g.nodes),
+            "v1_bytes": len(v1), "v2_bytes": len(v2),
+            "pack_v1_ms": _ms(lambda x: nb.pack(x, 1), g, rep),
+            "pack_v2_ms": _ms(lambda x: nb.pack(x, 2), g, rep),
+            "unpack_v1_ms": _ms(nb.unpack, v1, rep),
+            "unpack_v2_ms": _ms(nb.unpack, v2, rep),
+        })
+    return linhas
+
+
+_BENCH_DICT = 255       # id só de bancada: registrado em memória, nunca vai pra disco
+
+
+def run_dict(n: int = 40, rep: int = 20):
+    """Corpus aparentado: bytes e ms por blob de v1 (o pack de antes), v2 e v2+dicionário."""
+    pool = lineage_corpus(n)
+    treino, teste = pool[: n // 2], pool[n // 2:]
+    nb._DICTS[_BENCH_DICT] = blob_dict.train([nb._to_binary(g) for g in treino])
+    try:
+        linhas = {}
+        for nome, kw in (("v1", {"version": 1}), ("v2", {"version": 2, "dict_id": 0}),
+                         ("v2+dict", {"version": 2, "dict_id": _BENCH_DICT})):
+            blobs = [nb.pack(g, **kw) for g in teste]
+            t0 = time.perf_counter()
+            for _ in range(rep):
+                for g in teste:
+                    nb.pack(g, **kw)
+            t_pack = (time.perf_counter() - t0) / (rep * len(teste)) * 1e3
+            t0 = time.perf_counter()
+            for _ in range(rep):
+                for b in blobs:
+                    nb.unpack(b)
+            t_unpack = (time.perf_counter() - t0) / (rep * len(teste)) * 1e3
+            linhas[nome] = {"bytes": sum(map(len, blobs)) / len(blobs),
+                            "pack_ms": t_pack, "unpack_ms": t_unpack}
+        return linhas
+    finally:
+        nb._DICTS.pop(_BENCH_DICT, None)
+
+
+if __name__ == "__main__":
+    rep = int(sys.argv[1]) if len(sys.argv) > 1 else 50
+    print(f"{'conns':>6} {'v1 B':>7} {'v2 B':>7} {'razao':>6} | "
+          f"{'pack v1':>8} {'pack v2':>8} | {'unpk v1':>8} {'unpk v2':>8}  (ms)")
+    for r in run(rep):
+        print(f"{r['conns']:>6} {r['v1_bytes']:>7} {r['v2_bytes']:>7} "
+              f"{r['v2_bytes'] / r['v1_bytes']:>6.2f} | "
+              f"{r['pack_v1_ms']:>8.2f} {r['pack_v2_ms']:>8.2f} | "
+              f"{r['unpack_v1_ms']:>8.2f} {r['unpack_v2_ms']:>8.2f}")
+    print("\ncorpus aparentado (linhagens, ~300 ligacoes), media por blob:")
+    base = None
+    for nome, r in run_dict(rep=max(1, rep // 5)).items():
+        base = base or r["bytes"]
+        print(f"{nome:>8} {r['bytes']:>8.0f} B ({r['bytes'] / base:.2f}x) | "
+              f"pack {r['pack_ms']:.2f} ms | unpack {r['unpack_ms']:.2f} ms")
@@ -0,0 +1,43 @@
+"""
+bench_build.py — compilar a rede do filho: FeedForwardNetwork.create (o do fork) vs
+build_net linear do zero vs build_net remendando o esqueleto do pai.
+
+Filhos por mutação de um pai bank_like compartilhado (o caso do nascimento "mutacao").
+
+Uso:  python bench_build.py [filhos]
+"""
+import sys
+import time
+
+import neat
+import neat_brain as nb
+from synth_genomes import bank_like
+
+SIZES = (120, 400, 900)
+
+
+def run(n_filhos: int = 10):
+    cfg = nb.load_config()
+    linhas = []
+    for n in SIZES:
+        pai = nb.unpack_shared(nb.pack(bank_like(n, n)))
+        filhos = [nb.mutate(pai) for _ in range(n_filhos)]
+        nb.build_net(filhos[0], parent=pai)             # esqueleto do pai já em memória
+        r = {"conns": len(pai.connections)}
+        for nome, fn in (("create_ms", lambda f: neat.nn.FeedForwardNetwork.create(f, cfg)),
+                         ("linear_ms", nb.build_net),
+                         ("patch_ms", lambda f: nb.build_net(f, parent=pai))):
+            t0 = time.perf_counter()
+            for f in filhos:
+                fn(f)
+            r[nome] = (time.perf_counter() - t0) / n_filhos * 1e3
+        linhas.append(r)
+    return linhas
+
+
+if __name__ == "__main__":
+    k = int(sys.argv[1]) if len(sys.argv) > 1 else 10
+    print(f"{'conns':>6} | {'create':>8} {'linear':>8} {'remendo':>8}  (ms por filho)")
+    for r in run(k):
+        print(f"{r['conns']:>6} | {r['create_ms']:>8.2f} {r['linear_ms']:>8.2f} {r['patch_ms']:>8.2f}")
+    print(nb.build_stats())
@@ -0,0 +1,303 @@
+"""
+bench_suite.py — MICROBENCHMARKS do caminho quente do executor, com JSON e comparação.
+
+Os bench_*.py respondem uma pergunta cada (remendo x do zero, poda x sem poda) e imprimem
+tabela. Pra saber se um commit deixou o TICK ou o NASCIMENTO mais lento, falta uma régua
+fixa: os mesmos casos, as mesmas entradas, o mesmo formato de resultado. Aqui:
+
+  · tick      cone_psf.psf (construção e cache) e blur; encode (visão nítida e borrada) e
+              encode_msg; FeedForwardNetwork.activate com 10/300/1000 conexões;
+              substrato: activate compilado e o de referência
+  · nascimento  sub.express; nb.crossover, nb.mutate, nb.pack, nb.unpack e
+              functional_complexity (300 e 1000 conexões)
+
+Entradas DETERMINÍSTICAS: genomas de synth_genomes/synth_cppn pela semente, `random`
+semeado antes de cada caso. Cada caso roda em laço até `min_time/repeat` por repetição
+(autorange) e guarda mediana e mínimo por chamada, em µs. A COMPARAÇÃO usa o mínimo (o menos
+ruidoso): caso mais lento que a base por mais de `threshold` (default 15%) é regressão.
+
+Uso:
+    python bench_suite.py [--out bench.json] [--only encode,psf] [--min-time 0.2] [--repeat 5]
+    python bench_suite.py --compare base.json [atual.json] [--threshold 0.15]
+        (sem atual.json, mede agora; código de saída 1 se houver regressão)
+    pytest test_bench_suite.py   (todo caso roda rápido; REGENES_BENCH=1 mede pra valer)
+"""
+import argparse
+import gc
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(os.path.dirname(_HERE), "client_hyperneat"))
+
+import cone_psf                              # noqa: E402
+import executor                              # noqa: E402
+import neat_brain as nb                      # noqa: E402
+import substrate as sub                      # noqa: E402
+from synth_cppn import cppn_net, random_cppn  # noqa: E402
+from synth_genomes import bank_like, lineage_corpus, thin  # noqa: E402
+
+CASES = {}                                   # nome -> setup() -> função sem argumentos
+
+
+def case(name: str):
+    def deco(setup):
+        CASES[name] = setup
+        return setup
+    return deco
+
+
+# --- entradas ---
+
+def _msg(seed: int = 0) -> dict:
+    """TICK com a textura do mundo: visão quase toda zero, químico denso."""
+    rng = random.Random(seed)
+    return {"vision": [[rng.random() if rng.random() < 0.2 else 0.0 for _ in range(31)]
+                       for _ in range(4)],
+            "chemical": [[rng.random() for _ in range(9)] for _ in range(3)],
+            "energy": 120.0, "stomach": 80.0, "ingested": 2.0, "pace_sin": 0.3,
+            "pace_cos": 0.95, "damage": 0.0, "impact": 0.0, "contact_wall": 0.25}
+
+
+def _inputs(seed: int = 0) -> list:
+    return executor.encode_msg(_msg(seed), 200.0, executor.acuity_params(60))
+
+
+# --- tick ---
+
+@case("cone_psf.psf[build]")
+def _psf_build():
+    def fn():
+        cone_psf._cache.clear()
+        cone_psf.psf(2.0)
+    return fn
+
+
+@case("cone_psf.psf[cache]")
+def _psf_cache():
+    cone_psf.psf(2.0)
+    return lambda: cone_psf.psf(2.0)
+
+
+@case("cone_psf.blur")
+def _blur():
+    P, row = cone_psf.psf(2.0), _msg()["vision"][0]
+    return lambda: cone_psf.blur(row, P)
+
+
+def _encode(conns):
+    m, ac = _msg(), executor.acuity_params(conns)
+    args = (m["vision"], m["chemical"], m["energy"], m["stomach"], 200.0, m["ingested"],
+            m["pace_sin"], m["pace_cos"], ac)
+    return lambda: executor.encode(*args, damage=0.0, impact=0.0)
+
+
+case("encode[nitido]")(lambda: _encode(5000))      # sigma < 0.35: PSF identidade
+case("encode[borrado]")(lambda: _encode(10))       # sigma ~5: PSF larga
+
+
+@case("encode_msg")
+def _encode_msg():
+    m, ac = _msg(), executor.acuity_params(60)
+    return lambda: executor.encode_msg(m, 200.0, ac)
+
+
+def _ffnet(n_conns):
+    g = thin(n_conns, n_conns) if n_conns < 100 else bank_like(n_conns, n_conns)
+    net, inp = nb.build_net(g), _inputs()
+    return lambda: net.activate(inp)
+
+
+for _n in (10, 300, 1000):
+    case(f"ffnet.activate[{_n}c]")(lambda n=_n: _ffnet(n))
+
+
+def _substrate():
+    return sub.paint(cppn_net(random_cppn(3, 20)))
+
+
+@case("sub.activate[compilado]")
+def _sub_compiled():
+    cs, inp = sub.compile_substrate(*_substrate()), _inputs()
+    return lambda: cs.activate(inp)
+
+
+@case("sub.activate[referencia]")
+def _sub_reference():
+    W_ih, W_ho, _ = _substrate()
+    inp = _inputs()
+    return lambda: sub.activate(W_ih, W_ho, inp)
+
+
+# --- nascimento ---
+
+@case("sub.express")
+def _express():
+    net = cppn_net(random_cppn(3, 20))
+    return lambda: sub.express(net)
+
+
+def _shared(g):
+    """Genoma compartilhado (como o pai do cache): mutate() copia em vez de crescer o pai."""
+    return nb.unpack_shared(nb.pack(g))
+
+
+@case("nb.crossover[300c]")
+def _crossover():
+    a, b = (_shared(g) for g in lineage_corpus(2, 300, gens=2))
+    return lambda: nb.crossover(a, b, 7)
+
+
+@case("nb.mutate[300c]")
+def _mutate():
+    pai = _shared(bank_like(300, 300))
+    return lambda: nb.mutate(pai)
+
+
+@case("nb.pack[300c]")
+def _pack():
+    g = bank_like(300, 300)
+    return lambda: nb.pack(g)
+
+
+@case("nb.unpack[300c]")
+def _unpack():
+    blob = nb.pack(bank_like(300, 300))
+    return lambda: nb.unpack(blob)
+
+
+for _n in (300, 1000):
+    case(f"nb.functional_complexity[{_n}c]")(
+        lambda n=_n: (lambda g: lambda: nb.functional_complexity(g))(bank_like(n, n)))
+
+
+# --- medição ---
+
+def measure(fn, min_time: float = 0.2, repeat: int = 5) -> dict:
+    """µs por chamada: `repeat` repetições de `loops` chamadas (autorange até min_time/repeat).
+    Coletor de lixo desligado durante a medição, como no timeit."""
+    gc_on = gc.isenabled()
+    gc.disable()
+    try:
+        return _measure(fn, min_time, repeat)
+    finally:
+        if gc_on:
+            gc.enable()
+
+
+def _measure(fn, min_time: float, repeat: int) -> dict:
+    alvo, loops = min_time / repeat, 1
+    while True:
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        dt = time.perf_counter() - t0
+        if dt >= alvo or loops >= 1 << 20:
+            break
+        loops *= max(2, min(10, int(alvo / dt) + 1)) if dt > 0 else 10
+    vezes = [dt / loops]
+    for _ in range(repeat - 1):
+        t0 = time.perf_counter()
+        for _ in range(loops):
+            fn()
+        vezes.append((time.perf_counter() - t0) / loops)
+    return {"us": round(statistics.median(vezes) * 1e6, 3), "min_us": round(min(vezes) * 1e6, 3),
+            "loops": loops, "repeat": repeat}
+
+
+def meta() -> dict:
+    try:
+        import numpy
+        np_ver = numpy.__version__
+    except ImportError:
+        np_ver = None
+    try:
+        rev = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=_HERE,
+                             capture_output=True, text=True, timeout=5).stdout.strip() or None
+    except (OSError, subprocess.SubprocessError):
+        rev = None
+    import neat
+    return {"time": time.strftime("%Y-%m-%dT%H:%M:%S"), "git": rev,
+            "python": platform.python_version(), "platform": platform.platform(),
+            "cpus": os.cpu_count(), "neat": getattr(neat, "__version__", None),
+            "numpy": np_ver}
+
+
+def run(only=None, min_time: float = 0.2, repeat: int = 5, log=None) -> dict:
+    """Casos (todos, ou os que contêm algum termo de `only`) -> {"meta", "results"}."""
+    results = {}
+    for name, setup in CASES.items():
+        if only and not any(t in name for t in only):
+            continue
+        random.seed(0)
+        fn = setup()
+        random.seed(0)
+        results[name] = measure(fn, min_time, repeat)
+        if log:
+            log(f"{name:<36} {results[name]['us']:>12.2f} µs")
+    return {"meta": meta(), "results": results}
+
+
+def compare(base: dict, cur: dict, threshold: float = 0.15) -> dict:
+    """Base x atual pelo mínimo por chamada. ratio = atual/base."""
+    rows, reg, imp = [], [], []
+    b, c = base["results"], cur["results"]
+    for name in c:
+        if name not in b:
+            continue
+        ratio = c[name]["min_us"] / b[name]["min_us"] if b[name]["min_us"] else float("inf")
+        row = {"case": name, "base_us": b[name]["min_us"], "cur_us": c[name]["min_us"],
+               "ratio": round(ratio, 3)}
+        rows.append(row)
+        if ratio > 1 + threshold:
+            reg.append(row)
+        elif ratio < 1 - threshold:
+            imp.append(row)
+    return {"threshold": threshold, "cases": rows, "regressions": reg, "improvements": imp,
+            "missing": sorted(set(b) - set(c)), "new": sorted(set(c) - set(b))}
+
+
+def _load(path: str) -> dict:
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Microbenchmarks do caminho quente do executor")
+    ap.add_argument("--out", default="-", help="JSON dos resultados; '-' = stdout")
+    ap.add_argument("--only", default="", help="termos separados por vírgula (ex.: encode,psf)")
+    ap.add_argument("--min-time", type=float, default=0.2, help="segundos por caso (0.2)")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--compare", nargs="+", metavar="JSON",
+                    help="base.json [atual.json]: sem o atual, mede agora")
+    ap.add_argument("--threshold", type=float, default=0.15, help="regressão acima de (0.15)")
+    a = ap.parse_args(argv)
+    only = [t for t in a.only.split(",") if t]
+    log = (lambda s: print(s, file=sys.stderr))
+    if a.compare and len(a.compare) > 1:
+        cur = _load(a.compare[1])
+    else:
+        cur = run(only, a.min_time, a.repeat, log)
+    rep = compare(_load(a.compare[0]), cur, a.threshold) if a.compare else cur
+    text = json.dumps(rep, indent=1)
+    if a.out == "-":
+        print(text)
+    else:
+        with open(a.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    if a.compare:
+        for r in rep["regressions"]:
+            log(f"[bench] REGRESSÃO {r['case']}: {r['base_us']:.2f} -> {r['cur_us']:.2f} µs "
+                f"(x{r['ratio']:.2f})")
+        return 1 if rep["regressions"] else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -43,8 +43,23 @@ A LEI DE ACUIDADE NÃO MUDA: A = C/(C+K), sigma = SIGMA_MAX*(1-A), fixa no nasci
 determinística, client-side. Muda só a MÉTRICA DE VIZINHANÇA — de "adjacente na lista"
 para "adjacente no cone". Shape preservado: 31 células, mesma ordem, 194 entradas.
 Não pede reset de banco.
+
+COMPARTILHADA ENTRE PROCESSOS (REGENES_SHM=1)
+---------------------------------------------
+Cada sigma novo custa ~0,65 ms de exp() por processo executor. Com o registro do host
+(shm_registry) ligado, o primeiro processo que monta a PSF de um sigma a publica — chave =
+sigma arredondado, CSR achatado como as entradas do express_cache: pesos f64, ptr u16 e
+índices u16 — e os outros só anexam e desembrulham as linhas (~0,13 ms). O blur continua
+sobre as listas (j, peso) do processo: sobre o CSR mapeado ele sai ~1,6x mais lento, e ele
+roda 4x por tick. Entrada do registro vira entrada da rede: tamanho, ptr e índices são
+conferidos; entrada estragada é remontada e republicada.
 """
 import math
+import struct
+import sys
+from array import array
+
+import shm_registry
 
 # Cone egocêntrico, idêntico a world.py:_build_cone(). Offset (frente, lateral);
 # +frente = para onde encara, +lateral = à direita dela.
@@ -63,6 +78,8 @@ assert N_CELLS == 31
 
 _PRUNE = 1e-6        # peso relativo abaixo disto não entra na soma esparsa
 _cache = {}          # sigma arredondado -> PSF
+_MAGIC = b"RGP1"
+_HEAD = struct.Struct("<4sI")                     # magic, nnz (os pesos f64 ficam alinhados em 8)
 
 
 def psf(sigma):
@@ -70,7 +87,8 @@ def psf(sigma):
 
     Gaussiana isotrópica sobre a distância euclidiana no plano (frente, lateral),
     normalizada por linha (campo constante permanece constante). sigma pequeno -> identidade.
-    Cacheada: a acuidade é fixa no nascimento, então cada valor é construído uma única vez.
+    Cacheada: a acuidade é fixa no nascimento, então cada valor é construído uma única vez
+    (por host, com o registro compartilhado).
     """
     key = round(float(sigma), 3)
     hit = _cache.get(key)
@@ -80,6 +98,25 @@ def psf(sigma):
         out = [[(i, 1.0)] for i in range(N_CELLS)]
         _cache[key] = out
         return out
+    reg = shm_registry.default()
+    name = f"cone-psf-v1-{key:.3f}"
+    out = None
+    if reg is not None:
+        buf = reg.get(name)
+        if buf is not None:
+            try:
+                out = _decode(buf)
+            except (ValueError, struct.error, TypeError):
+                out = None                           # estragada: remonta e republica
+    if out is None:
+        out = _build(key)
+        if reg is not None:
+            reg.put(name, _encode(out))
+    _cache[key] = out
+    return out
+
+
+def _build(key):
     dois_s2 = 2.0 * key * key
     out = []
     for i, (fi, li) in enumerate(CONE_OFFSETS):
@@ -92,10 +129,45 @@ def psf(sigma):
         # renormaliza depois da poda: a soma tem de ser exatamente 1
         t = sum(w for _, w in linha)
         out.append([(j, w / t) for j, w in linha])
-    _cache[key] = out
     return out
 
 
+def _encode(P) -> bytes:
+    w = array("d", [x for linha in P for _, x in linha])
+    ptr, idx = array("H", [0]), array("H", [j for linha in P for j, _ in linha])
+    for linha in P:
+        ptr.append(ptr[-1] + len(linha))
+    if sys.byteorder != "little":
+        for a in (w, ptr, idx):
+            a.byteswap()
+    return _HEAD.pack(_MAGIC, len(idx)) + w.tobytes() + ptr.tobytes() + idx.tobytes()
+
+
+def _decode(buf):
+    """Entrada do registro -> lista de 31 listas de (j, peso). Confere tamanho, ptr (de 0 a
+    nnz, sem descer) e índices (< 31), senão ValueError."""
+    magic, nnz = _HEAD.unpack_from(buf, 0)
+    if magic != _MAGIC or len(buf) != _HEAD.size + 8 * nnz + 2 * (N_CELLS + 1 + nnz):
+        raise ValueError("entrada de PSF inválida")
+    mv, off, arrs = memoryview(buf), _HEAD.size, []
+    for code, n in (("d", nnz), ("H", N_CELLS + 1), ("H", nnz)):
+        end = off + (8 if code == "d" else 2) * n
+        if sys.byteorder == "little":
+            arrs.append(mv[off:end].cast(code))
+        else:
+            a = array(code)
+            a.frombytes(mv[off:end])
+            a.byteswap()
+            arrs.append(a)
+        off = end
+    w, ptr, idx = arrs
+    if (ptr[0] != 0 or ptr[-1] != nnz or any(a > b for a, b in zip(ptr, ptr[1:]))
+            or (nnz and max(idx) >= N_CELLS)):
+        raise ValueError("entrada de PSF com índice fora do cone")
+    w, idx = w.tolist(), idx.tolist()
+    return [list(zip(idx[a:b], w[a:b])) for a, b in zip(ptr, ptr[1:])]
+
+
 def blur(row, P):
     """Aplica a PSF a um canal de 31 células. Determinístico, sem aleatoriedade."""
     if len(row) < N_CELLS:
@@ -0,0 +1,596 @@
+"""
+executor.py — o RUNTIME dos executores Fase 2: uma espécie ou as duas num processo só.
+
+host.py (NEAT nativo) e host_hyper.py (HyperNEAT) eram quase cópias: encode, decide,
+ACTIONS, _ssl_ctx, cronômetro de ciclo, relato do cérebro, drenagem, vagas — cada um no
+seu processo, com o seu import do neat e os seus caches. Agora o que é da AMEBA e do
+protocolo mora aqui; o que é da ESPÉCIE (como o cérebro nasce, como roda, como aparece na
+viz) é um BACKEND plugado no runtime:
+
+    NativeBackend (host.py)         genoma -> FeedForwardNetwork (ou o lote do batch_eval)
+    HyperBackend  (host_hyper.py)   CPPN -> substrato expresso e compilado
+
+As duas espécies num processo só dividem o import do neat e do websockets, a PSF do cone
+(cone_psf), os codecs/dicionários de blob e o cache de pais (neat_brain.unpack_shared), o
+registro /dev/shm e o event loop. Cada uma continua com o SEU config NEAT (neat_brain,
+cfg=), o seu reservatório primordial, as suas vagas (autoscale) e os seus números
+(runtime_stats) — e o seu join: o mundo vê as mesmas duas espécies de sempre.
+
+Uso:
+    python executor.py [--native N] [--hyper M] [ws_base] [--measure-startup]
+    python host.py N ws_base            (== executor.py --native N --hyper 0 ws_base)
+    python host_hyper.py N ws_base      (== executor.py --native 0 --hyper N ws_base)
+"""
+import time
+
+_T0 = time.perf_counter()            # a partida conta daqui (startup.py)
+
+import argparse                      # noqa: E402
+import asyncio                       # noqa: E402
+import json                          # noqa: E402
+import os                            # noqa: E402
+import random                        # noqa: E402
+import signal                        # noqa: E402
+import sys                           # noqa: E402
+
+import websockets                    # noqa: E402
+import admin                         # noqa: E402
+import autoscale                     # noqa: E402
+import governor                      # noqa: E402
+import lagmon                        # noqa: E402
+import cone_psf                      # noqa: E402  R-BLUR: PSF na geometria do cone (as duas espécies)
+import neat_brain as nb              # noqa: E402
+import primordial                    # noqa: E402
+import profiler                      # noqa: E402
+import recorder                      # noqa: E402
+import runtime_stats                 # noqa: E402
+import startup                       # noqa: E402
+import viz as viz_mod                # noqa: E402  quadros do brain_viz (`viz` é o flag do tick)
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_BASE = "ws://127.0.0.1:8000"
+OP = os.getenv("REGENES_OPERATOR", "")  # dono da linhagem (carimbo na genealogia)
+# §46 (R-SHAPE, card #38): o contrato DECLARADO no join — o mundo valida contra o
+# /protocol dele (passo 1: avisa; passo 2: recusa com close 4001). n_obs = o que o
+# encode() abaixo monta (12 escalares + 4×31 do cone + 3×9 químico); n_actions =
+# len(ACTIONS). Os três andam juntos com o encode/ACTIONS — e valem para as DUAS espécies
+# (§15/§16: mesmo shape), que agora nem têm como divergir: o encode é um só.
+PROTOCOL_VERSION = 7
+N_OBS = 163
+N_ACTIONS = 7
+
+
+def join_url(base: str, species: str, paradigm: str) -> str:
+    return (base.rstrip("/") + f"/ws/join?species={species}&paradigm={paradigm}"
+            "&wants_brain=1&self_learns=0"
+            f"&protocol_version={PROTOCOL_VERSION}&n_obs={N_OBS}&n_actions={N_ACTIONS}"
+            + (f"&operator={OP}" if OP else ""))
+
+
+def ssl_ctx(url: str):
+    """SSL só p/ wss. Tolera o MITM do Avast (VERIFY_X509_STRICT); REGENES_INSECURE_TLS=1 desliga tudo.
+    Antivírus que intercepta TLS apresenta um certificado PRÓPRIO (às vezes vencido/stale), e
+    é ELE que o Python reprova, não o cert real do servidor."""
+    if not url.startswith("wss"):
+        return None
+    import ssl                       # só o wss paga o import (~20 ms na partida)
+    ctx = ssl.create_default_context()
+    if os.getenv("REGENES_INSECURE_TLS") == "1":
+        ctx.check_hostname = False
+        ctx.verify_mode = ssl.CERT_NONE
+    else:
+        ctx.verify_flags &= ~ssl.VERIFY_X509_STRICT
+    return ctx
+
+
+# FÍSICA DA PERCEPÇÃO — acuidade ∝ capacidade neural (ver docs/FISICA_DA_PERCEPCAO.md no world).
+# "Você enxerga na resolução que seu cérebro consegue processar." A visão é BORRADA por um
+# desfoque gaussiano CONTÍNUO no cone, com largura sigma ∝ (1−A): cérebro pobre vê tudo smeared
+# (só o borrão); afina LISO conforme a linhagem evolui — CADA conexão a mais deixa um tico mais
+# nítido (gradiente SEM platô, pra a seleção conseguir catar; a versão em degraus travava a
+# catraca — dentes a ~80 conexões um do outro). Determinístico (sem ruído aleatório -> auditável).
+# Lei de embodiment (como cubo-quadrado/Kleiber), não currículo. Fixo no nascimento, client-side.
+ACUITY_K = 120.0        # meia-saturação: A = C/(C+K). Baixo -> gradiente morde na faixa magra.
+ACUITY_SIGMA_MAX = 6.0  # desfoque máximo (sigma no cone de 31 células) em A=0
+# R5/#2 (08/2026): SEM fade semântico. O pred_w zerava os canais 2/3 (inimigo/perigo) pra
+# A<0,40 — o executor EDITANDO a própria observação. O mundo descreve; quem interpreta é o
+# cérebro. A única física da percepção é a PSF acima, aplicada igual a TODOS os canais.
+
+
+def acuity_params(conns):
+    """C (conexões) -> (PSF_do_cone, sigma, A). Fixo no nascimento.
+
+    R-BLUR (§8 do Relatório Guardião): a PSF passou a viver na GEOMETRIA do cone
+    (cone_psf.py), não no índice do buffer. A LEI não muda — A = C/(C+K),
+    sigma = SIGMA_MAX*(1-A) —, muda a métrica de vizinhança."""
+    A = conns / (conns + ACUITY_K)
+    sigma = ACUITY_SIGMA_MAX * (1.0 - A)
+    return (cone_psf.psf(sigma), sigma, A)
+
+
+def _blur(row, P):
+    """Aplica a PSF geométrica do cone (cone_psf). Substitui a convolução no índice serial,
+    que misturava a extrema direita de uma fileira com a extrema esquerda da seguinte."""
+    return cone_psf.blur(row, P)
+
+
+# Encoding v3 EGOCÊNTRICO: 161 = bias + energy + stomach + ingested + MARCA-PASSO(sin,cos)
+# + 5 canais x 31 do CONE, BORRADOS pela acuidade do cérebro (desfoque contínuo, igual em todos).
+def encode(vision, chemical, energy, stomach, stomach_size, ingested, pace_sin, pace_cos,
+           acuity,
+           damage=0.0, impact=0.0,
+           moved_self=0.0, moved_passive=0.0, contact_body=0.0, contact_wall=0.0):
+    if not vision or len(vision) < 4 or len(vision[0]) < 31:
+        return [0.0] * 163
+    if not chemical or len(chemical) < 3 or len(chemical[0]) < 9:
+        return [0.0] * 163
+    P = acuity[0]
+    ss = stomach_size or 1.0
+    # §26: damage/impact = FATO BRUTO interoceptivo (dano de mordida e impacto de colisão
+    # sofridos neste tick), normalizados pelo PRÓPRIO estômago (egocêntrico, sinal positivo).
+    # Não é valência: o mundo diz "aconteceu, nesta quantidade"; o que vale é do cérebro.
+    # R4/#3 (08/2026): ingested idem — quanto o mundo reportou INGERIDO neste tick, no MESMO
+    # idioma de normalização. Substitui a endorfina que o executor FABRICAVA (pico +100 por
+    # delta de energia, decaimento, penalidade de fome): estado interno inventado, não fato.
+    inp = [1.0, min(1.0, energy / ss), min(stomach, ss) / ss, min(1.0, ingested / ss),
+           pace_sin, pace_cos, min(1.0, damage / ss), min(1.0, impact / ss),
+           # §50/§51 (#43): quatro fatos que o mundo passou a entregar. Ja chegam
+           # normalizados (bits e fracao sobre 4), entao NAO passam pelo estomago.
+           #   moved_self/moved_passive: PROPRIOCEPCAO. A rede e feedforward, sem
+           #     memoria — sem estes bits, "andei" e "esbarrei num corpo" tem o mesmo
+           #     vetor de entrada, e ser deslocada por forca externa era invisivel.
+           #   contact_body/contact_wall: PELE. Fracao das 4 ortogonais ocupadas,
+           #     360 graus, independente do heading. O cone e OLHO e nao ve atras;
+           #     estar cercada e exatamente quando a informacao esta fora do cone.
+           moved_self, moved_passive, contact_body, contact_wall]
+    # §23: 6º canal (sangue) entra como o cheiro — traço QUÍMICO, legível por qualquer cérebro.
+    # 52 (#44): o cone tem 4 canais de VISAO (obstaculo, corpo, perigo, comida). O
+    # borrao da acuidade e a PSF geometrica DO CONE — do olho. Nao se aplica a quimico.
+    for ch in range(4):
+        inp.extend(_blur(vision[ch], P))
+    # 52: campos QUIMICOS por CONTATO — 3 canais x 9 celulas (a propria + as 8 vizinhas,
+    # em coordenada de corpo). SEM borrao: acuidade e propriedade do olho, e este bloco
+    # nao passa pelo olho. Valor bruto, como o mundo entrega.
+    for ch in range(3):
+        inp.extend(chemical[ch])
+    return inp
+
+def encode_msg(msg: dict, stomach_size: float, acuity, enc=None):
+    """TICK do mundo -> entradas da rede (o encode acima, campo a campo). Ausente vale 0.
+    `enc`: outro encode com a mesma assinatura (replay.py compara candidato x referência)."""
+    return (enc or encode)(msg.get("vision"), msg.get("chemical"),
+                           msg.get("energy", 0), msg.get("stomach", 0), stomach_size,
+                           msg.get("ingested", 0.0),
+                           msg.get("pace_sin", 0.0), msg.get("pace_cos", 0.0), acuity,
+                           damage=msg.get("damage", 0.0), impact=msg.get("impact", 0.0),
+                           moved_self=msg.get("moved_self", 0.0),
+                           moved_passive=msg.get("moved_passive", 0.0),
+                           contact_body=msg.get("contact_body", 0.0),
+                           contact_wall=msg.get("contact_wall", 0.0))
+
+
+# índice -> comando de wire (bate com ACTION_SPEC do mundo, v3 egocêntrico: 7 ações)
+ACTIONS = [
+    {"action": "forward"},              # 0: anda pra frente (onde encara)
+    {"action": "backward"},             # 1: recua (ré, sem virar)
+    {"action": "turn", "dir": "left"},  # 2: gira à esquerda
+    {"action": "turn", "dir": "right"}, # 3: gira à direita
+    {"action": "stay"},                 # 4: fica
+    {"action": "attack"},               # 5: morde a célula à frente
+    {"action": "push"},                 # 6: empurra a célula à frente (sem dano; massa decide)
+]
+
+
+NULL_EPS = 0.05   # abaixo disto, a saída é ruído: o cérebro não disse nada
+
+
+def decide(out):
+    """Saídas da rede -> índice da ação. Três casos, e cada um tem uma razão física.
+
+    1) SEM SINAL (tudo ~0) -> FICA. Nervo desconectado não dispara músculo: sem comando motor,
+       o bicho não se mexe. Antes, um cérebro SEM conexões caía no argmax e ganhava "frente"
+       DE GRAÇA — só porque frente é o índice 0. Um passeio em linha reta de presente, dado
+       pela ORDEM em que as ações foram listadas. Era o mesmo viés-índice-0 que a gente já
+       tinha consertado pro empate saturado, escancarado no caso "tudo zero". Medido: o
+       cérebro-zero CONQUISTOU o HyperNEAT (31 de 39 provados, mediana 0 conexões) — não por
+       ser estratégia, mas por bug de desempate. Quem não paga por um cérebro não age.
+    2) EMPATE SATURADO (topo >=0.9 e várias coladas nele) -> sorteio uniforme. O cérebro grita
+       tudo ao mesmo tempo e genuinamente não distingue; escolher por índice seria viés.
+    3) Decisão graduada ou vencedor claro -> argmax, respeitando o gradiente.
+    """
+    c = choices(out)
+    return c[0] if len(c) == 1 else random.choice(c)
+
+
+def choices(out) -> list:
+    """As ações que decide(out) pode tomar: uma só, salvo no empate saturado (o sorteio).
+    O replay.py compara por aqui — a ação gravada tem de estar no conjunto."""
+    mx = max(out)
+    if max(abs(mx), abs(min(out))) < NULL_EPS:
+        return [4]                                  # "stay": o cérebro não disse nada
+    near = [i for i in range(len(out)) if out[i] >= mx - 0.05]
+    if len(near) > 1 and mx >= 0.9:
+        return near
+    return [max(range(len(out)), key=lambda i: out[i])]
+
+
+# --- BACKENDS -------------------------------------------------------------------------------
+# O que muda de uma espécie pra outra. Um nascimento é um dict `b` (o que o _nascer do
+# backend devolve: genoma, blob, métricas, acuidade, cérebro) — vive uma vida e morre com ela.
+
+class Backend:
+    """Contrato de uma espécie plugada no runtime. A herança (cruzamento/mutação/primordial)
+    é a mesma pras duas — o genoma do nativo e o CPPN do hyper são ambos genomas NEAT —, só
+    muda o config (self.cfg) e o que nasce dele (nascer)."""
+
+    name = ""            # runtime_stats / status do supervisor: "native", "hyper"
+    tag = ""             # prefixo das linhas de log ([3] / [H3])
+    title = ""           # "Executor nativo"
+    species = ""         # join: species=
+    paradigm = ""        # join: paradigm=
+    cfg = None           # o config NEAT desta espécie (neat_brain.load_config(caminho))
+
+    def warm(self) -> None:
+        """Aquece o que o 1º nascimento pagaria inline (config, tabelas)."""
+
+    def nascer(self, g, pai=None) -> dict:
+        raise NotImplementedError
+
+    def primordial(self) -> dict:
+        """Nascimento sem semente (o `make` do reservatório primordial)."""
+        return self.nascer(nb.random_genome(random.randint(1, 1_000_000), self.cfg))
+
+    def birth(self, seed_a, seed_b, pool):
+        """Sementes do WELCOME -> (nascimento, origem).
+
+        HERANÇA: 2 pais -> cruzamento sexual + mutação; 1 -> só mutação (bootstrap
+        assexuado enquanto o banco não tem 2 provados); 0 -> primordial. O crossover é o que
+        MISTURA linhagens de clientes/máquinas diferentes = diversidade no mundo distribuído
+        (alinhado pela identidade DETERMINÍSTICA do neat_brain). O mundo já filtra por
+        espécie (§15): semente de uma nunca chega à outra. Pais vêm do cache de blobs abertos
+        (unpack_shared, SÓ LEITURA): pai provado é servido a muitos nascimentos. mutate()
+        copia o compartilhado antes de mexer (usa-se o RETORNO); o cérebro do filho remenda o
+        esqueleto compilado do pai. Primordial não depende do mundo: sai pronto do `pool`."""
+        if seed_a and seed_b:
+            g = nb.crossover(nb.unpack_shared(seed_a), nb.unpack_shared(seed_b),
+                             random.randint(1, 1_000_000), cfg=self.cfg)
+            return self.nascer(nb.mutate(g, self.cfg)), "cruzamento"
+        if seed_a or seed_b:
+            pai = nb.unpack_shared(seed_a or seed_b)
+            return self.nascer(nb.mutate(pai, self.cfg), pai), "mutacao"
+        return pool.take(), "primordial"
+
+    def report(self, b) -> dict:
+        """A mensagem `brain` do nascimento (genoma compactado + métricas)."""
+        raise NotImplementedError
+
+    def born_line(self, b, origin: str) -> str:
+        raise NotImplementedError
+
+    def start(self, idx: int, origin: str, b) -> None:
+        """Nasceu (relatório enviado): telemetria, lugar no lote, etc."""
+
+    def end(self, b) -> None:
+        """Morreu (ou caiu): devolve o que start() pegou."""
+
+    async def activate(self, b, inp, viz: bool):
+        """Forward pass -> saídas. `viz`: há observador, a viz vai ler os ocultos depois."""
+        raise NotImplementedError
+
+    def viz_ids(self, b) -> list:
+        """Ids (do viewer) dos ocultos FUNCIONAIS — só eles vão nos quadros (viz.py)."""
+        raise NotImplementedError
+
+    def viz_hidden(self, b, ids) -> list:
+        """Valores dos ocultos `ids` após o último activate, na mesma ordem."""
+        raise NotImplementedError
+
+    def viz_struct(self, b) -> dict:
+        """Topologia FUNCIONAL no formato do viewer (o de neat_brain.to_dict)."""
+        raise NotImplementedError
+
+    def caches(self) -> dict:
+        """Caches desta espécie -> métricas (hits, misses, hit_rate, entries, bytes) pro
+        admin.py. Os do processo (pais abertos) o runtime já publica."""
+        return {}
+
+    def banner(self) -> str:
+        """Complemento da linha de partida."""
+        return ""
+
+    def close(self) -> None:
+        """Fim do executor: grava o que ficou pendente (telemetria)."""
+
+
+def _backends(names):
+    """Nome -> backend. Os módulos das espécies importam este (executor) — o import é tardio."""
+    out = []
+    for name in names:
+        if name == "native":
+            import host
+            out.append(host.NativeBackend())
+        elif name == "hyper":
+            sys.path.insert(0, os.path.join(os.path.dirname(_HERE), "client_hyperneat"))
+            import host_hyper
+            out.append(host_hyper.HyperBackend())
+        else:
+            raise ValueError(f"espécie desconhecida: {name}")
+    return out
+
+
+# --- RUNTIME --------------------------------------------------------------------------------
+
+# DRENAGEM (SIGTERM, o supervisor manda ao parar/reiniciar): ninguém é derrubado no meio da
+# vida — cada ameba termina a vida em curso e não reconecta. O processo sai quando a última
+# morrer (ou o supervisor perde a paciência e mata). Vale pra todas as espécies do processo.
+_DRAINING = False
+_SPECIES = []
+# CORTE SOB CARGA (governor.py): o degrau de trabalho opcional cortado, do processo todo.
+# Trocado no run(); o daqui (desligado) serve a quem chama run_one sem run.
+_GOV = governor.Governor(enabled=False)
+_MON = None                          # lagmon.LagMonitor do processo (atraso do loop, travas)
+_REC = None                          # recorder.TickRecorder (REGENES_RECORD) ou None
+
+
+def _drain(*_):
+    global _DRAINING
+    if not _DRAINING:
+        _DRAINING = True
+        for sp in _SPECIES:
+            sp.stats.state = "draining"
+        alive = sum(sp.stats.alive for sp in _SPECIES)
+        print(f"[drain] SIGTERM: {alive} vidas em curso terminam, sem reconectar")
+
+
+def draining() -> bool:
+    return _DRAINING
+
+
+class Species:
+    """As vagas de UMA espécie no processo: o join dela, os números dela, o alvo de vagas
+    dela (autoscale) e o reservatório primordial dela. O relógio da partida é do processo."""
+
+    def __init__(self, backend: Backend, n: int, base: str, clock: startup.StartupClock):
+        self.be = backend
+        self.url = join_url(base, backend.species, backend.paradigm)
+        self.ssl = ssl_ctx(self.url)
+        self.clock = clock
+        self.stats = runtime_stats.RuntimeStats(backend.name, n)
+        # VAGAS: N é o ponto de partida; com REGENES_AUTOSCALE=1 o alvo anda com a latência
+        # do tick e a CPU (autoscale.py). Vaga acima do alvo termina a vida e não reconecta.
+        self.scaler = autoscale.Autoscaler.from_env(
+            n, label=f" {backend.tag}" if backend.tag else "")
+        self.pool = primordial.PrimordialPool(self._primordial)
+        self.slots = autoscale.Slots(self.run_one, self.scaler)
+
+    def _primordial(self) -> dict:
+        with lagmon.stage("primordial", self.be.tag):
+            return self.be.primordial()
+
+    def banner(self) -> str:
+        sc = self.scaler
+        return (f"{self.be.title}: {self.stats.n} amebas -> {self.url}"
+                + (f" | autoscale {sc.lo}..{sc.hi} (p99 <= {sc.target_ms:.0f} ms)"
+                   if sc.enabled else "") + self.be.banner())
+
+    async def run_one(self, idx: int):
+        be, stats, clock = self.be, self.stats, self.clock
+        tag = f"{be.tag}{idx}"
+        while not _DRAINING and idx < self.scaler.target:
+            born = False
+            b = None
+            try:
+                # CRONÔMETRO DE CICLO (diagnóstico Fable 04/08): 50 clientes sustentavam só
+                # ~8 amebas — cada cliente passava 79% do ciclo FORA DO AR (~36s de 46s).
+                # Hipótese principal: o close handshake do websocket (close_timeout padrão
+                # 10s na lib) esperando o frame de um servidor que já saiu do handler na
+                # morte. close_timeout=1 mitiga; o print mede connect/vida/close p/ provar.
+                t0 = time.perf_counter()
+                t_born = t_dead = None
+                async with websockets.connect(self.url, max_size=8_000_000, ssl=self.ssl,
+                                              close_timeout=1) as ws:
+                    raw = await ws.recv()
+                    with lagmon.stage("parse", tag):
+                        welcome = json.loads(raw)
+                    t_born = time.perf_counter()
+                    clock.connected((be.name, idx))
+                    body = welcome.get("body") or welcome.get("stats") or {}
+                    stomach_size = body.get("stomach_size", 200) or 200
+                    # reporta o genoma final (compactado) + complexidade (telemetria pro mundo
+                    # logar, sem ele precisar decodificar o blob — respeita "cérebro opaco").
+                    # O mundo envolve com genealogia+assinatura e guarda.
+                    with lagmon.stage("birth", tag):
+                        b, origin = be.birth(welcome.get("brain_a"), welcome.get("brain_b"),
+                                             self.pool)
+                        report = json.dumps(be.report(b))
+                    acuity = b["acuity"]
+                    await ws.send(report)
+                    be.start(idx, origin, b)
+                    stats.born(origin)
+                    born = True
+                    lid = (_REC.life(be.name, origin, welcome, b, stomach_size)
+                           if _REC is not None else None)
+                    _GOV.log(f"[{tag}] {be.born_line(b, origin)}")
+
+                    vs = None          # quadros de viz desta vida (só se alguém observar)
+                    async for raw in ws:
+                        t_tick = time.perf_counter()
+                        with lagmon.stage("parse", tag):
+                            msg = json.loads(raw)
+                        if msg.get("type") == "UPDATE":
+                            if not msg.get("alive", True):
+                                t_dead = time.perf_counter()
+                                break  # morreu -> reconecta
+                            continue
+                        if "vision" in msg:  # TICK: decide e age
+                            # R10: corpo atual (tanque cresce com a massa). Sem o campo, mantém WELCOME.
+                            stomach_size = msg.get("stomach_size", stomach_size)
+                            # R4/#3: ingested vem do TICK (fato do mundo; 0.0 na ausência do campo).
+                            # Sem estado, sem decaimento: um tick não vaza para o seguinte.
+                            with lagmon.stage("encode", tag):
+                                inp = encode_msg(msg, stomach_size, acuity)
+                            viz = bool(msg.get("viz"))
+                            out = await be.activate(b, inp, viz)   # etapa marcada no backend
+                            a = decide(out)
+                            await ws.send(json.dumps(ACTIONS[a]))
+                            stats.tick(time.perf_counter() - t_tick)
+                            if _REC is not None:
+                                _REC.tick(lid, raw, stomach_size, out, a)
+                            if not clock.done:
+                                clock.acted((be.name, idx))
+                                if clock.done:
+                                    print(f"[partida] {clock.summary()}")
+
+                            # VIZ DE CÉREBRO: se algum viewer observa esta ameba, manda a
+                            # estrutura FUNCIONAL (1x por sessão; montada 1x por vida) +
+                            # ativações, com teto de frequência e só o que mudou (viz.py). O
+                            # mundo só relaya. Sem observador, não custa nada.
+                            if viz:
+                                if vs is None:
+                                    vs = viz_mod.VizStream(be.viz_ids(b))
+                                now = time.monotonic()
+                                if vs.due(now, _GOV.viz_slow):
+                                    with lagmon.stage("viz", tag):
+                                        act = vs.frame(now, inp, be.viz_hidden(b, vs.hid_ids),
+                                                       out, a)
+                                        # estrutura: serializada 1x/vida
+                                        payload = (None if act is None
+                                                   else vs.payload(act, be.viz_struct, b))
+                                    if payload is not None:
+                                        await ws.send(payload)
+                            elif vs is not None and not vs.fresh:
+                                vs.reset()         # parou de observar -> reenvia estrutura depois
+                t_end = time.perf_counter()
+                _GOV.log(f"[{tag}] ciclo: connect {((t_born or t0) - t0):.1f}s | "
+                         f"vida {((t_dead - t_born) if (t_dead and t_born) else -1):.1f}s | "
+                         f"close {(t_end - (t_dead or t_born or t0)):.1f}s")
+            except Exception as e:
+                print(f"[{tag}] reconnect ({e.__class__.__name__}: {e})")
+                stats.reconnect()
+                await asyncio.sleep(1.0)
+            finally:
+                if born:
+                    be.end(b)
+                    stats.died()
+
+
+def metrics() -> dict:
+    """O que o endpoint local (admin.py, REGENES_ADMIN) publica: por espécie, os números do
+    runtime_stats, os nascimentos por origem e o reservatório primordial; os caches (o de pais,
+    as PSFs do cone e os configs do processo + os de cada backend); as etapas e o atraso do loop (lagmon); o degrau de
+    corte (governor). Só lê contadores — roda no loop, entre dois ticks."""
+    species, caches = {}, {"unpack": nb.unpack_cache_stats(),
+                           "psf": {"entries": len(cone_psf._cache)},
+                           "config": {"entries": len(nb._CONFIGS)}}
+    for sp in _SPECIES:
+        s = sp.stats.snapshot()
+        s.update(target=sp.scaler.target, births_by_origin=dict(sp.stats.origins),
+                 pool=sp.pool.stats())
+        species[sp.be.name] = s
+        for name, c in sp.be.caches().items():
+            caches[f"{sp.be.name}.{name}"] = c
+    t0 = min((sp.stats.started for sp in _SPECIES), default=time.time())
+    return {"pid": os.getpid(), "uptime_s": round(time.time() - t0, 1),
+            "draining": _DRAINING, "species": species, "caches": caches,
+            "stages": lagmon.stage_stats(),
+            "loop": _MON.snapshot() if _MON is not None else {}, "shed": _GOV.status()}
+
+
+async def run(backends_n, base: str = DEFAULT_BASE, measure: bool = False, t0: float = None):
+    """Roda as vagas de cada (backend, N) até drenar (ou até a partida medida, `measure`)."""
+    global _GOV, _MON, _REC
+    _GOV = governor.Governor.from_env()
+    _MON = lagmon.LagMonitor(log=_GOV.log)
+    _REC = recorder.TickRecorder.from_env()
+    clock = startup.StartupClock(sum(n for _, n in backends_n), _T0 if t0 is None else t0)
+    clock.mark("import")
+    _SPECIES[:] = [Species(be, n, base, clock) for be, n in backends_n]
+    # Aquece ANTES de abrir as conexões o que o 1º nascimento pagaria inline: config de cada
+    # espécie (snapshot já parseado), tabelas, e um primordial pronto por espécie.
+    for sp in _SPECIES:
+        sp.be.warm()
+        sp.pool.fill(1)
+    clock.mark("warm")
+    for sp in _SPECIES:
+        print(sp.banner())
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, _drain)
+    except (NotImplementedError, AttributeError):
+        pass                                 # Windows: sem drenagem, Ctrl+C como sempre
+    # Uma espécie: o status é o dela, como sempre. Duas: o agregado + o de cada uma.
+    stats = (_SPECIES[0].stats if len(_SPECIES) == 1
+             else runtime_stats.StatsGroup([sp.stats for sp in _SPECIES]))
+    # pool.run(): reposição dos primordiais, em baixa prioridade atrás dos ticks.
+    # _MON.run(): atraso do loop e travas (chave "loop" do status).
+    # _GOV.run(): mede a carga e corta o opcional (o degrau sai no status, chave "shed").
+    bg = [asyncio.create_task(runtime_stats.publish(stats, extra=lambda: {
+              "loop": _MON.snapshot(), "shed": _GOV.status()})),
+          asyncio.create_task(_MON.run()),
+          asyncio.create_task(_GOV.run([sp.stats for sp in _SPECIES], draining, _MON))]
+    # ADMIN (REGENES_ADMIN): /metrics e /metrics.json locais, servidos pelo próprio loop.
+    adm = admin.Admin(metrics)
+    await adm.start(admin.ADMIN)
+    # PERFIL sob demanda (profiler.py): kill -USR2 <pid> amostra uma janela e grava em logs/.
+    prof = profiler.Profiler(label="+".join(sp.be.name for sp in _SPECIES))
+    prof.install(asyncio.get_running_loop())
+    for sp in _SPECIES:
+        bg.append(asyncio.create_task(sp.pool.run()))
+        sp.slots.fill()
+        bg.append(asyncio.create_task(sp.slots.control(sp.stats, draining)))
+    try:
+        if measure:
+            await startup.measure(clock, asyncio.gather(
+                *(t for sp in _SPECIES for t in sp.slots.tasks.values())))
+        else:
+            for sp in _SPECIES:              # só voltam drenadas: todas as vidas terminaram
+                await sp.slots.wait()
+            print("[drain] todas as vidas terminaram")
+    finally:
+        for sp in _SPECIES:
+            sp.stats.state = "stopped"
+            sp.be.close()
+        if _REC is not None:
+            _REC.close()
+        for t in bg:
+            t.cancel()
+        await asyncio.gather(*bg, return_exceptions=True)
+        await adm.close()
+        prof.stop()
+
+
+def main(argv=None, only: Backend = None, t0: float = None) -> None:
+    """Linha de comando. `only`: o backend de um host de uma espécie só (host.py,
+    host_hyper.py) — argv é o de sempre, [N] [ws_base] [--measure-startup]."""
+    argv = sys.argv[1:] if argv is None else argv
+    measure = "--measure-startup" in argv
+    if only is not None:
+        args = [a for a in argv if not a.startswith("--")]
+        plan = [(only, int(args[0]) if args else 8)]
+        base = args[1] if len(args) > 1 else DEFAULT_BASE
+        title = only.title
+    else:
+        ap = argparse.ArgumentParser(description="Executor Fase 2: as duas espécies num processo.")
+        ap.add_argument("--native", type=int, default=8, help="amebas NEAT nativo (default 8)")
+        ap.add_argument("--hyper", type=int, default=8, help="amebas HyperNEAT (default 8)")
+        ap.add_argument("ws_base", nargs="?", default=DEFAULT_BASE)
+        ap.add_argument("--measure-startup", action="store_true",
+                        help="mede a partida a frio, imprime o relatório JSON e sai")
+        a = ap.parse_args(argv)
+        counts = {"native": a.native, "hyper": a.hyper}
+        names = [k for k, n in counts.items() if n > 0]
+        if not names:
+            ap.error("nenhuma ameba: --native e --hyper são 0")
+        plan = [(be, counts[be.name]) for be in _backends(names)]
+        base = a.ws_base
+        title = "Executor combinado" if len(plan) > 1 else plan[0][0].title
+    try:
+        asyncio.run(run(plan, base, measure, t0))
+    except KeyboardInterrupt:
+        print(f"\n{title} encerrado.")
+
+
+if __name__ == "__main__":
+    # Os backends importam `executor`: sem o alias, este arquivo seria importado de novo como
+    # outro módulo (outro _DRAINING, outras vagas).
+    sys.modules.setdefault("executor", sys.modules[__name__])
+    main()
@@ -0,0 +1,221 @@
+"""
+fake_world.py — MUNDO DE MENTIRA local: fala o protocolo do mundo com os executores e
+cronometra cada decisão, no relógio do mundo. É o palco do soak.py.
+
+Medir o executor contra o mundo de verdade mistura a rede, a carga do servidor e as outras
+amebas; contra um script que só responde, ninguém cobra prazo. Aqui o mundo faz o papel
+dele e nada mais:
+
+  · JOIN (/?species=...&paradigm=...) -> WELCOME com 0, 1 ou 2 sementes tiradas dos cérebros
+    que a espécie já relatou (o banco guarda os `bank` mais recentes): os nascimentos passam
+    por primordial, mutação e cruzamento, como no mundo;
+  · TICK a `tick_hz` por ameba, no RELÓGIO do mundo (o próximo tick é marcado a partir do
+    anterior, não da resposta) — a ameba que demora perde a vez (`overruns`);
+  · o relógio de uma vida começa no relato do nascimento (`birth_ms`: WELCOME -> cérebro
+    montado); decisão mais lenta que `deadline_ms` (default: o período) é ATRASADA (`late`);
+  · depois de `life_ticks` ticks, UPDATE alive=false: a ameba morre e o executor reconecta
+    — nascimentos e mortes o tempo todo, que é o que o soak precisa.
+
+Os quadros de TICK são sorteados uma vez (semente fixa, a textura do mundo: visão quase
+toda zero, químico denso) e reusados em rodízio: o mundo de mentira gasta o mínimo da CPU
+que ele divide com o executor.
+
+Uso:
+    python fake_world.py [--port 8765] [--hz 10] [--life 300] [--deadline-ms 100]
+    (imprime os números da janela a cada 5 s; o executor aponta pra ws://127.0.0.1:8765)
+"""
+import argparse
+import asyncio
+import json
+import random
+import time
+from urllib.parse import parse_qs, urlsplit
+
+import websockets
+
+from runtime_stats import percentile
+
+
+def frames(n: int = 64, seed: int = 0) -> list:
+    """`n` TICKs já serializados, com a textura do mundo."""
+    rng = random.Random(seed)
+    out = []
+    for k in range(n):
+        out.append(json.dumps({
+            "vision": [[rng.random() if rng.random() < 0.2 else 0.0 for _ in range(31)]
+                       for _ in range(4)],
+            "chemical": [[rng.random() for _ in range(9)] for _ in range(3)],
+            "energy": rng.uniform(20, 200), "stomach": rng.uniform(0, 200),
+            "ingested": rng.choice((0.0, 0.0, 2.0)), "pace_sin": 0.3, "pace_cos": 0.95,
+            "damage": 0.0, "impact": 0.0, "contact_wall": rng.choice((0.0, 0.25)),
+            "viz": False}))
+    return out
+
+
+def _quantiles(vals) -> dict:
+    v = sorted(vals)
+
+    def ms(x):
+        return None if x is None else round(x * 1000, 3)
+    return {"p50": ms(percentile(v, 0.50)), "p90": ms(percentile(v, 0.90)),
+            "p99": ms(percentile(v, 0.99)), "max": ms(v[-1] if v else None)}
+
+
+class FakeWorld:
+    """O servidor e os números dele. Contadores da JANELA (reset()) + totais da vida toda."""
+
+    def __init__(self, tick_hz: float = 10.0, deadline_ms: float = None, life_ticks: int = 300,
+                 bank: int = 30, seed: int = 0):
+        self.tick_hz = tick_hz
+        self.period = 1.0 / tick_hz
+        self.deadline = deadline_ms / 1000.0 if deadline_ms else self.period
+        self.life_ticks = life_ticks
+        self.bank = bank
+        self.rng = random.Random(seed)
+        self.frames = frames(seed=seed)
+        self.banks = {}                      # espécie -> blobs relatados (os mais recentes)
+        self.alive = 0
+        self.totals = {"connects": 0, "ticks": 0, "late": 0, "births": 0, "deaths": 0,
+                       "dropped": 0}
+        self.address = None
+        self._server = None
+        self._conns = set()
+        self.reset()
+
+    def reset(self) -> None:
+        """Abre uma janela nova de medição."""
+        self.t_window = time.monotonic()
+        self.ticks = self.late = self.overruns = self.births = self.deaths = self.dropped = 0
+        self.lat = []
+        self.birth_lat = []
+
+    def snapshot(self, reset: bool = False) -> dict:
+        """Números da janela (e, com `reset`, abre a próxima)."""
+        dt = time.monotonic() - self.t_window
+        out = {"window_s": round(dt, 2), "alive": self.alive, "ticks": self.ticks,
+               "ticks_per_s": round(self.ticks / dt, 1) if dt > 0 else None,
+               "late": self.late,
+               "late_frac": round(self.late / self.ticks, 5) if self.ticks else None,
+               "overruns": self.overruns, "births": self.births, "deaths": self.deaths,
+               "dropped": self.dropped, "decision_ms": _quantiles(self.lat),
+               "birth_ms": _quantiles(self.birth_lat)}
+        if reset:
+            self.reset()
+        return out
+
+    def _seeds(self, species: str) -> list:
+        bank = self.banks.get(species) or []
+        seeds = self.rng.sample(bank, min(len(bank), self.rng.choice((0, 1, 2))))
+        return seeds + [None] * (2 - len(seeds))
+
+    def _report(self, species: str, raw) -> bool:
+        """True se `raw` não é a ação (o relato do nascimento vai pro banco)."""
+        if '"type"' not in raw:
+            return False
+        m = json.loads(raw)
+        if m.get("type") == "brain":
+            bank = self.banks.setdefault(species, [])
+            bank.append(m["brain"])
+            del bank[:-self.bank]
+            self.births += 1
+            self.totals["births"] += 1
+        return m.get("type") is not None and "action" not in m
+
+    async def handler(self, ws, *_) -> None:
+        path = ws.path if hasattr(ws, "path") else ws.request.path
+        species = (parse_qs(urlsplit(path).query).get("species") or ["?"])[0]
+        a, b = self._seeds(species)
+        self._conns.add(ws)
+        self.alive += 1
+        self.totals["connects"] += 1
+        k = self.rng.randrange(len(self.frames))
+        try:
+            await ws.send(json.dumps({"type": "WELCOME", "brain_a": a, "brain_b": b,
+                                      "body": {"stomach_size": 200}}))
+            # o relógio da vida começa no relato do nascimento (o cérebro montado)
+            t0 = time.monotonic()
+            while not self._report(species, await ws.recv()):
+                pass
+            nxt = time.monotonic()
+            self.birth_lat.append(nxt - t0)
+            for _ in range(self.life_ticks):
+                t_sent = time.monotonic()
+                await ws.send(self.frames[k % len(self.frames)])
+                k += 1
+                raw = await ws.recv()
+                while self._report(species, raw):
+                    raw = await ws.recv()
+                dt = time.monotonic() - t_sent
+                self.lat.append(dt)
+                self.ticks += 1
+                self.totals["ticks"] += 1
+                if dt > self.deadline:
+                    self.late += 1
+                    self.totals["late"] += 1
+                nxt += self.period
+                wait = nxt - time.monotonic()
+                if wait > 0:
+                    await asyncio.sleep(wait)
+                else:
+                    self.overruns += 1       # o mundo não espera: a vez passou
+                    nxt = time.monotonic()
+            await ws.send(json.dumps({"type": "UPDATE", "alive": False}))
+            self.deaths += 1
+            self.totals["deaths"] += 1
+            try:
+                await asyncio.wait_for(ws.wait_closed(), 2.0)
+            except asyncio.TimeoutError:
+                pass                         # quem fecha é o executor; a vida já contou
+        except websockets.ConnectionClosed:
+            self.dropped += 1
+            self.totals["dropped"] += 1
+        finally:
+            self.alive -= 1
+            self._conns.discard(ws)
+
+    async def start(self, host: str = "127.0.0.1", port: int = 0) -> str:
+        """Abre o servidor -> a URL base que o executor recebe (porta 0: uma livre)."""
+        self._server = await websockets.serve(self.handler, host, port, max_size=8_000_000)
+        h, p = self._server.sockets[0].getsockname()[:2]
+        self.address = f"ws://{h}:{p}"
+        return self.address
+
+    async def kill_all(self) -> None:
+        """Derruba todas as conexões (fim de uma medida: o executor drenando não reconecta)."""
+        await asyncio.gather(*(ws.close() for ws in list(self._conns)), return_exceptions=True)
+
+    async def close(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+
+async def _serve(a) -> None:
+    world = FakeWorld(a.hz, a.deadline_ms, a.life)
+    print(f"[mundo] {await world.start(a.host, a.port)} | {a.hz:g} ticks/s por ameba | "
+          f"vida de {a.life} ticks | prazo {world.deadline * 1000:.0f} ms")
+    try:
+        while True:
+            await asyncio.sleep(5.0)
+            print("[mundo]", json.dumps(world.snapshot(reset=True)))
+    finally:
+        await world.close()
+
+
+def main(argv=None) -> None:
+    ap = argparse.ArgumentParser(description="Mundo de mentira local (protocolo + prazo)")
+    ap.add_argument("--host", default="127.0.0.1")
+    ap.add_argument("--port", type=int, default=8765)
+    ap.add_argument("--hz", type=float, default=10.0, help="ticks por segundo por ameba (10)")
+    ap.add_argument("--life", type=int, default=300, help="ticks por vida (300)")
+    ap.add_argument("--deadline-ms", type=float, default=None,
+                    help="decisão mais lenta que isto é atrasada (default: o período)")
+    a = ap.parse_args(argv)
+    try:
+        asyncio.run(_serve(a))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
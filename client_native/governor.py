@@ -0,0 +1,153 @@
+"""
+governor.py — o que o executor DEIXA DE FAZER quando está afogado (compartilhado pelos hosts).
+
+O caminho obrigatório de um tick é receber -> encode -> activate -> enviar. Em volta dele há
+trabalho OPCIONAL que disputa o mesmo event loop: quadros de viz, telemetria local, as linhas
+de log por nascimento/ciclo. Com o executor saturado, cada milissegundo desses atrasa a ação
+de alguma ameba (que age sobre um mundo que já passou). O governador mede a carga e corta o
+opcional, em ordem de prioridade — um degrau por vez:
+
+  0 normal
+  1 viz        — quadros de viz a 1/VIZ_SLOW da frequência (viz.py, REGENES_VIZ_HZ)
+  2 telemetry  — a telemetria local grava 1 a cada TELEMETRY_EVERY nascimentos (telemetry.py;
+                 os pulados contam em `sampled_out`)
+  3 logs       — some a linha por nascimento e a de ciclo (reconexão e drenagem continuam);
+                 as suprimidas são contadas e o total sai no log ao voltar
+
+Carga = o ATRASO DO EVENT LOOP (a sonda do lagmon.py dorme e mede quanto acordou depois do
+combinado: é o tempo que um tick pronto espera na fila) e a LATÊNCIA DO TICK (p99 da janela,
+runtime_stats). SOBE um degrau quando o pior atraso da janela passou de REGENES_SHED_LAG_MS
+(default 100) OU o p99 passou do alvo do tick (REGENES_TICK_TARGET_MS, o do autoscale), por
+`up` avaliações seguidas; DESCE um degrau quando os dois ficaram abaixo de `low` × limite por
+`down` avaliações seguidas (mais lento pra descer que pra subir: a histerese — e o corte
+que desce cedo demais volta a afogar). Avaliação a cada REGENES_SHED_EVERY s (default 1).
+
+O degrau corrente vai no status (runtime_stats.publish, chave "shed") e toda mudança sai no
+log com o porquê. REGENES_SHED=0 desliga (fica sempre em 0).
+"""
+import asyncio
+import os
+import time
+
+import telemetry
+from runtime_stats import percentile
+
+ENABLED = os.getenv("REGENES_SHED", "1") != "0"
+LEVELS = ("normal", "viz", "telemetry", "logs")
+VIZ_SLOW = 4                 # degrau >= 1: viz 4 Hz -> 1 Hz
+TELEMETRY_EVERY = 10         # degrau >= 2: 1 registro a cada 10
+
+
+class Governor:
+    """Degrau de corte do processo. decide() é puro (dados -> degrau); run() é a task que
+    sonda o event loop e lê a latência dos ticks."""
+
+    def __init__(self, lag_ms: float = 100.0, target_ms: float = 50.0, low: float = 0.5,
+                 up: int = 2, down: int = 10, every: float = 1.0, probe: float = 0.05,
+                 enabled: bool = True):
+        self.lag_ms = lag_ms
+        self.target_ms = target_ms
+        self.low = low
+        self.up = up
+        self.down = down
+        self.every = every
+        self.probe = probe
+        self.enabled = enabled
+        self.level = 0
+        self._over = self._under = 0
+        self._seen = {}                      # stats -> ticks já lidos
+        self.lag = 0.0                       # pior atraso da última janela (s)
+        self.p99 = None                      # p99 do tick na última janela (s)
+        self.suppressed = 0                  # linhas de log engolidas no degrau 3
+        self.changes = []                    # (quando, de, para, motivo)
+
+    @classmethod
+    def from_env(cls):
+        return cls(lag_ms=float(os.getenv("REGENES_SHED_LAG_MS", "100")),
+                   target_ms=float(os.getenv("REGENES_TICK_TARGET_MS", "50")),
+                   every=float(os.getenv("REGENES_SHED_EVERY", "1")), enabled=ENABLED)
+
+    # --- o que os consumidores perguntam ---
+    @property
+    def viz_slow(self) -> float:
+        return VIZ_SLOW if self.level >= 1 else 1
+
+    @property
+    def quiet(self) -> bool:
+        return self.level >= 3
+
+    def log(self, line: str) -> None:
+        """print() do opcional: no degrau 3 só conta."""
+        if self.level >= 3:
+            self.suppressed += 1
+        else:
+            print(line)
+
+    # --- a política ---
+    def decide(self, lag_ms: float, p99_ms) -> int:
+        """Novo degrau a partir do pior atraso do loop na janela e do p99 do tick (ms; None =
+        sem ticks na janela — só o atraso conta)."""
+        if not self.enabled:
+            return self.level
+        tick = p99_ms or 0.0
+        if lag_ms > self.lag_ms or tick > self.target_ms:
+            self._over, self._under = self._over + 1, 0
+        elif lag_ms < self.low * self.lag_ms and tick < self.low * self.target_ms:
+            self._under, self._over = self._under + 1, 0
+        else:
+            self._over = self._under = 0     # faixa morta: segura o degrau
+        if self._over >= self.up and self.level < len(LEVELS) - 1:
+            why = (f"atraso do loop {lag_ms:.0f} ms > {self.lag_ms:.0f} ms"
+                   if lag_ms > self.lag_ms else f"p99 {tick:.1f} ms > {self.target_ms:.0f} ms")
+            self._set(self.level + 1, why)
+        elif self._under >= self.down and self.level > 0:
+            self._set(self.level - 1, f"atraso {lag_ms:.0f} ms, p99 "
+                      + ("sem ticks" if p99_ms is None else f"{tick:.1f} ms") + ": folga")
+        return self.level
+
+    def _set(self, level: int, why: str) -> None:
+        old, self.level = self.level, level
+        self._over = self._under = 0
+        telemetry.SAMPLE = TELEMETRY_EVERY if level >= 2 else 1
+        self.changes.append((time.time(), old, level, why))
+        msg = f"[shed] {LEVELS[old]} -> {LEVELS[level]} ({why})"
+        if old >= 3 > level and self.suppressed:
+            msg += f" | {self.suppressed} linhas de log suprimidas"
+            self.suppressed = 0
+        print(msg)
+
+    def sample(self, members, lag: float) -> int:
+        """Lê os ticks novos de cada RuntimeStats desde a última amostra e decide."""
+        lat = []
+        for st in members:
+            lat += st.recent(st.ticks - self._seen.get(st, 0))
+            self._seen[st] = st.ticks
+        lat.sort()
+        p99 = percentile(lat, 0.99)
+        self.lag, self.p99 = lag, p99
+        return self.decide(lag * 1e3, None if p99 is None else p99 * 1e3)
+
+    async def run(self, members, draining, monitor=None) -> None:
+        """Task: a cada `every` s, avalia a janela. O atraso vem do lagmon.LagMonitor do
+        processo (`monitor`); sem ele, sonda o loop aqui mesmo a cada `probe` s."""
+        if monitor is not None:
+            while not draining():
+                await asyncio.sleep(self.every)
+                self.sample(members, monitor.take_worst())
+            return
+        loop = asyncio.get_running_loop()
+        worst, t_eval = 0.0, loop.time()
+        while not draining():
+            t = loop.time()
+            await asyncio.sleep(self.probe)
+            worst = max(worst, loop.time() - t - self.probe)
+            if loop.time() - t_eval >= self.every:
+                self.sample(members, worst)
+                worst, t_eval = 0.0, loop.time()
+
+    def status(self) -> dict:
+        return {"level": self.level, "name": LEVELS[self.level],
+                "loop_lag_ms": round(self.lag * 1e3, 1),
+                "tick_p99_ms": None if self.p99 is None else round(self.p99 * 1e3, 3),
+                "changes": len(self.changes), "suppressed_logs": self.suppressed,
+                "enabled": self.enabled}
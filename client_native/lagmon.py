@@ -0,0 +1,189 @@
+"""
+lagmon.py — quem TRAVOU o event loop, e quanto (compartilhado pelos hosts).
+
+A linha de ciclo do run_one (connect / vida / close) não separa rede, mundo e o nosso
+próprio loop parado num nascimento pesado ou num JSON grande: tudo vira "a vida demorou".
+Aqui:
+
+  · ATRASO DE AGENDAMENTO contínuo: uma task dorme `probe` s e mede quanto acordou depois do
+    combinado — é quanto um tick pronto esperou na fila. Percentis da janela no status
+    (runtime_stats.publish, chave "loop"); o governor.py usa o pior da janela como carga.
+  · ETAPAS: o runtime embrulha as seções síncronas do caminho (parse, birth, pack, encode,
+    activate, viz) em `with stage(nome, tag)`. Custa uma troca de variável global — o loop
+    é uma thread só, então durante uma trava a etapa corrente é exatamente a que travou.
+  · DURAÇÃO POR ETAPA: as últimas STAGE_WINDOW durações de cada etapa (stage_stats():
+    percentis, contagem), que o admin.py publica;
+  · TRAVAS: um cão de guarda (thread daemon) olha o batimento do loop; parou por mais de
+    REGENES_STALL_MS (default 100), ele copia a pilha da thread do loop
+    (sys._current_frames) e a etapa corrente. Quando o loop volta, a trava entra no log
+    ("[stall] 230 ms em birth>pack [H3] ...") e na lista das `keep` piores (com a pilha)
+    do status. Trava dentro de C que segura o GIL a thread não vê por dentro: aí vale a
+    etapa síncrona mais longa desde o último batimento.
+"""
+import asyncio
+import heapq
+import os
+import sys
+import threading
+import time
+import traceback
+from collections import deque
+
+from runtime_stats import percentile
+
+STALL_MS = float(os.getenv("REGENES_STALL_MS", "100"))
+STAGE_WINDOW = 1024
+
+# --- etapas (estado do processo: o loop é uma thread só) ---
+_cur = ""                    # "birth>pack"
+_tag = ""                    # de qual ameba ("H3")
+_long = ("", 0.0, "")        # a seção síncrona mais longa desde o último batimento
+_durations = {}              # etapa -> deque das últimas durações (s)
+_counts = {}                 # etapa -> quantas vezes rodou
+
+
+class stage:
+    """`with stage("encode", tag):` — marca a etapa corrente (aninha: "birth>pack")."""
+
+    __slots__ = ("name", "tag", "_prev", "_t")
+
+    def __init__(self, name: str, tag: str = None):
+        self.name = name
+        self.tag = tag
+
+    def __enter__(self):
+        global _cur, _tag
+        self._prev = (_cur, _tag)
+        _cur = f"{_cur}>{self.name}" if _cur else self.name
+        if self.tag is not None:
+            _tag = self.tag
+        self._t = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        global _cur, _tag, _long
+        dt = time.perf_counter() - self._t
+        if dt > _long[1]:
+            _long = (_cur, dt, _tag)
+        d = _durations.get(_cur)
+        if d is None:
+            d = _durations[_cur] = deque(maxlen=STAGE_WINDOW)
+        d.append(dt)
+        _counts[_cur] = _counts.get(_cur, 0) + 1
+        _cur, _tag = self._prev
+        return False
+
+
+def current() -> tuple:
+    return _cur, _tag
+
+
+def stage_stats() -> dict:
+    """etapa -> {n, p50, p90, p99, max} (ms, sobre a janela das últimas STAGE_WINDOW)."""
+    def ms(x):
+        return None if x is None else round(x * 1e3, 3)
+    out = {}
+    for name, d in list(_durations.items()):
+        v = sorted(d)
+        out[name] = {"n": _counts.get(name, 0), "p50": ms(percentile(v, 0.50)),
+                     "p90": ms(percentile(v, 0.90)), "p99": ms(percentile(v, 0.99)),
+                     "max": ms(v[-1] if v else None)}
+    return out
+
+
+class LagMonitor:
+    """Sonda de atraso (task no loop) + cão de guarda (thread) + as piores travas."""
+
+    def __init__(self, stall_ms: float = STALL_MS, probe: float = 0.05, window: int = 1200,
+                 keep: int = 10, stack_depth: int = 12, log=print):
+        self.stall = stall_ms / 1e3
+        self.probe = probe
+        self.lags = deque(maxlen=window)     # atrasos das últimas `window` sondas (s)
+        self.keep = keep
+        self.stack_depth = stack_depth
+        self.log = log
+        self.stalls = 0
+        self.worst = []                      # heap (ms, seq, registro) das `keep` piores
+        self._window_worst = 0.0             # pior atraso desde o último take_worst()
+        self._beat = time.monotonic()
+        self._caught = None                  # o que o cão de guarda viu na trava em curso
+        self._loop_tid = None
+        self._stop = threading.Event()
+        self._thread = None
+
+    # --- lado do loop ---
+    async def run(self) -> None:
+        """Task: a sonda. Roda até ser cancelada (fim do executor)."""
+        global _long
+        loop = asyncio.get_running_loop()
+        self._loop_tid = threading.get_ident()
+        self._start_watchdog()
+        try:
+            while True:
+                t = loop.time()
+                self._beat = time.monotonic()
+                await asyncio.sleep(self.probe)
+                lag = max(0.0, loop.time() - t - self.probe)
+                self._beat = time.monotonic()
+                self.lags.append(lag)
+                if lag > self._window_worst:
+                    self._window_worst = lag
+                if lag >= self.stall:
+                    self._record(lag)
+                _long = ("", 0.0, "")
+                self._caught = None
+        finally:
+            self._stop.set()
+
+    def _record(self, lag: float) -> None:
+        caught = self._caught
+        if caught is not None:
+            where, tag, stack = caught
+        else:
+            where, _dt, tag = _long
+            stack = []
+        self.stalls += 1
+        rec = {"ms": round(lag * 1e3, 1), "stage": where or "?", "tag": tag,
+               "at": round(time.time(), 3), "stack": stack}
+        heapq.heappush(self.worst, (rec["ms"], self.stalls, rec))
+        if len(self.worst) > self.keep:
+            heapq.heappop(self.worst)
+        top = stack[-1].strip().splitlines()[0] if stack else "sem pilha"
+        self.log(f"[stall] {rec['ms']:.0f} ms em {rec['stage']}"
+                 + (f" [{tag}]" if tag else "") + f" | {top}")
+
+    def take_worst(self) -> float:
+        """O pior atraso (s) desde a última chamada — a janela do governor."""
+        w, self._window_worst = self._window_worst, 0.0
+        return w
+
+    # --- cão de guarda ---
+    def _start_watchdog(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._watch, name="lagmon", daemon=True)
+            self._thread.start()
+
+    def _watch(self) -> None:
+        step = self.stall / 4
+        while not self._stop.wait(step):
+            if self._caught is not None or time.monotonic() - self._beat < self.stall:
+                continue
+            frame = sys._current_frames().get(self._loop_tid)
+            if frame is None:
+                continue
+            stack = traceback.format_stack(frame, limit=self.stack_depth)
+            where, tag = current()
+            if self._caught is None and time.monotonic() - self._beat >= self.stall:
+                self._caught = (where, tag, stack)
+
+    # --- números ---
+    def snapshot(self) -> dict:
+        lags = sorted(self.lags)
+
+        def ms(v):
+            return None if v is None else round(v * 1e3, 2)
+        return {"lag_ms": {"p50": ms(percentile(lags, 0.50)), "p90": ms(percentile(lags, 0.90)),
+                           "p99": ms(percentile(lags, 0.99)),
+                           "max": ms(lags[-1] if lags else None), "window": len(lags)},
+                "stall_ms": round(self.stall * 1e3), "stalls": self.stalls,
+                "worst": [r for _, _, r in sorted(self.worst, reverse=True)]}
@@ -19,7 +19,14 @@ import gzip
 import hashlib
 import json
 import os
+import pickle
+import struct
+import sys
 import types
+import zlib
+from array import array
+from collections import OrderedDict
+from functools import lru_cache
 from random import choice, random
 
 import neat
@@ -51,8 +58,11 @@ def _stable_hash(text: str, nbytes: int) -> int:
     return int.from_bytes(hashlib.sha256(text.encode("ascii")).digest()[:nbytes], "big")
 
 
+@lru_cache(maxsize=1 << 16)
 def _det_innovation(in_node: int, out_node: int) -> int:
-    """Inovacao = funcao estavel de (in,out). Mesma conexao -> mesmo numero, em todo lugar."""
+    """Inovacao = funcao estavel de (in,out). Mesma conexao -> mesmo numero, em todo lugar.
+    Memoizada: o pack/unpack v2 recalcula a de toda ligacao, e os pares (in,out) se repetem
+    entre todos os genomas do processo (e justamente a identidade ser estavel)."""
     return _stable_hash(f"conn:{in_node}:{out_node}", 8)  # 64 bits
 
 
@@ -226,46 +236,119 @@ def _install_deterministic_identity(cfg: neat.Config) -> None:
     neat.DefaultGenome.mutate_add_node = _det_mutate_add_node          # patch de classe (so amebas nativas)
 
 
-_CONFIG = None
+_CONFIG = None                         # o config DEFAULT do processo (o primeiro carregado)
+_CONFIGS = {}                          # caminho absoluto -> config (um por espécie no processo)
 # Config ISOLADO do nativo (161 entradas v3 EGOCENTRICO: bias+energy+stomach+endorfina+
 # marca-passo(sin,cos) + 5 canais x 31 do cone frontal). NAO usa o config-feedforward do
 # client_neat (104 entradas) — as duas especies divergiram de proposito.
 _DEFAULT_CONFIG = os.path.join(os.path.dirname(__file__), "config-native")
 
 
+def _parse_config(path: str) -> neat.Config:
+    return neat.Config(neat.DefaultGenome, neat.DefaultReproduction,
+                       neat.DefaultSpeciesSet, neat.DefaultStagnation, path)
+
+
+def _config_snapshot(path: str) -> neat.Config:
+    """O config JÁ PARSEADO, do snapshot em __pycache__/ (pickle), ou parseado e gravado lá.
+
+    Partida a frio (stop/start_luna) parseava o INI toda vez. O snapshot é o neat.Config
+    CRU — antes da identidade determinística, que é reinstalada por cima — e a chave é o
+    conteúdo do arquivo + versão do neat + do Python: editou o config, o snapshot velho
+    simplesmente não é mais achado. Qualquer falha (sem __pycache__ gravável, pickle de
+    outra versão) cai no parse de sempre. REGENES_CONFIG_SNAPSHOT=0 desliga."""
+    if os.getenv("REGENES_CONFIG_SNAPSHOT") == "0":
+        return _parse_config(path)
+    try:
+        with open(path, "rb") as f:
+            raw = f.read()
+    except OSError:
+        return _parse_config(path)          # o neat reporta o erro do jeito dele
+    tag = f"{neat.__version__}|{sys.version_info[0]}.{sys.version_info[1]}|".encode()
+    digest = hashlib.blake2b(tag + raw, digest_size=8).hexdigest()
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(path)), "__pycache__")
+    snap = os.path.join(cache_dir, f"{os.path.basename(path)}.{digest}.pickle")
+    try:
+        with open(snap, "rb") as f:
+            return pickle.load(f)
+    except Exception:
+        pass
+    cfg = _parse_config(path)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        tmp = f"{snap}.{os.getpid()}.tmp"
+        with open(tmp, "wb") as f:
+            pickle.dump(cfg, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp, snap)               # atômico: o outro executor nunca lê pela metade
+    except OSError:
+        pass
+    return cfg
+
+
 def load_config(path: str = None) -> neat.Config:
-    """Carrega (e memoiza) o config NEAT. Define num_inputs/outputs e taxas de mutação."""
+    """Carrega (e memoiza, por caminho) o config NEAT. Define num_inputs/outputs e taxas de
+    mutação. Sem caminho: o config default do processo — o PRIMEIRO carregado (o host_hyper
+    carrega o do CPPN antes de tudo) ou, se nenhum ainda, o config-native.
+
+    Processo com mais de uma espécie (executor.py) passa o config de cada uma explicitamente
+    (cfg=) às funções abaixo; sem cfg, elas usam o default."""
     global _CONFIG
-    if _CONFIG is None:
-        _CONFIG = neat.Config(
-            neat.DefaultGenome, neat.DefaultReproduction,
-            neat.DefaultSpeciesSet, neat.DefaultStagnation,
-            path or _DEFAULT_CONFIG,
-        )
+    if path is None:
+        if _CONFIG is not None:
+            return _CONFIG
+        path = _DEFAULT_CONFIG
+    key = os.path.abspath(path)
+    cfg = _CONFIGS.get(key)
+    if cfg is None:
+        cfg = _CONFIGS[key] = _config_snapshot(path)
         # Identidade estrutural GLOBAL e DETERMINISTICA (inovacao + id de no). Substitui o
         # tracker por-processo do fork -> genomas de qualquer processo/maquina/restart alinham
         # no crossover. Ver bloco no topo do modulo.
-        _install_deterministic_identity(_CONFIG)
-        _install_symmetric_crossover(_CONFIG)   # clausula do fitness igual (Stanley p.108)
-    return _CONFIG
+        _install_deterministic_identity(cfg)
+        _install_symmetric_crossover(cfg)   # clausula do fitness igual (Stanley p.108)
+    if _CONFIG is None:
+        _CONFIG = cfg
+    return cfg
 
 
-def random_genome(key: int = 0):
+def random_genome(key: int = 0, cfg=None):
     """Cérebro da 'sopa primordial': genoma novo conforme o config (topologia inicial)."""
-    cfg = load_config()
+    cfg = cfg or load_config()
     g = neat.DefaultGenome(key)
     g.configure_new(cfg.genome_config)
     return g
 
 
-def mutate(genome):
-    """Herança com variação: mutação estrutural (cresce) + de pesos, in-place. Retorna o genoma."""
-    cfg = load_config()
+def mutate(genome, cfg=None):
+    """Herança com variação: mutação estrutural (cresce) + de pesos, in-place. Retorna o genoma.
+
+    Genoma COMPARTILHADO (pai servido pelo cache do unpack_shared) nunca é mutado: a mutação
+    cai numa cópia, que é o que volta — por isso o chamador usa o RETORNO (g = mutate(g))."""
+    cfg = cfg or load_config()
+    if getattr(genome, "_shared", False):
+        genome = copy_genome(genome)
     genome.mutate(cfg.genome_config)
     return genome
 
 
-def crossover(g1, g2, key: int = 0):
+def _copy_gene(gene):
+    """gene.copy() sem o laço getattr/setattr por atributo do fork: copia o __dict__ inteiro
+    (key, innovation e atributos são todos imutáveis — int, float, str, bool, tupla)."""
+    new = object.__new__(gene.__class__)
+    new.__dict__ = gene.__dict__.copy()
+    return new
+
+
+def copy_genome(genome, key: int = None):
+    """Cópia rasa-por-gene (genes novos, mesmos valores). Nunca marcada como compartilhada."""
+    g = neat.DefaultGenome(genome.key if key is None else key)
+    g.nodes = {k: _copy_gene(ng) for k, ng in genome.nodes.items()}
+    g.connections = {k: _copy_gene(cg) for k, cg in genome.connections.items()}
+    g.fitness = genome.fitness
+    return g
+
+
+def crossover(g1, g2, key: int = 0, cfg=None):
     """
     Cruzamento sexual NEAT — MISTURA linhagens de clientes/máquinas diferentes (a fonte de
     diversidade no mundo distribuído). Recombinação alinhada por número de inovação; genes
@@ -279,18 +362,126 @@ def crossover(g1, g2, key: int = 0):
     06/08/2026 sobre 120 pares do brain_bank de producao: 68,4% de genes em comum (Jaccard 45%).
     O crossover alinha. Este paragrafo existia como "BUG ABERTO" e estava stale.
     """
-    cfg = load_config()
-    g1.fitness = g1.fitness if getattr(g1, "fitness", None) is not None else 1.0
-    g2.fitness = g2.fitness if getattr(g2, "fitness", None) is not None else 1.0
+    cfg = cfg or load_config()
+    if getattr(g1, "fitness", None) is None:   # só escreve se falta: pai compartilhado já vem
+        g1.fitness = 1.0                       # com 1.0 do cache e não pode ser tocado
+    if getattr(g2, "fitness", None) is None:
+        g2.fitness = 1.0
     child = neat.DefaultGenome(key)
     child.configure_crossover(g1, g2, cfg.genome_config)
     return child
 
 
-def build_net(genome):
-    """Rede executável (forward pass) a partir do genoma."""
-    cfg = load_config()
-    return neat.nn.FeedForwardNetwork.create(genome, cfg)
+# --- REDE COMPILADA: genoma -> FeedForwardNetwork, com remendo a partir do pai ---
+# O FeedForwardNetwork.create do fork é quadrático: pra cada camada varre todas as conexões,
+# e pra cada nó varre todas de novo atrás das entradas dele (~33 ms num genoma de 900
+# ligações). E o nascimento por "mutacao" compila um genoma que é o PAI com pesos
+# perturbados e, às vezes, uma mudança estrutural. Aqui a compilação é linear e guarda um
+# ESQUELETO no pai (_plan: conexões habilitadas, entradas de cada nó, ordem topológica).
+# O filho do mesmo pai remenda o esqueleto:
+#   - mesmas conexões habilitadas -> reusa entradas e ordem; só relê pesos/bias/ativação;
+#   - mudança estrutural -> refaz as listas de entrada SÓ dos nós cujas ligações mudaram e
+#     reordena (Kahn, linear); o resto das listas vem do pai.
+# Mesma rede que o create monta: mesmos nós (os necessários às saídas; nó sem entrada
+# avalia act(bias), nó em ciclo fica de fora) e, em cada nó, as ligações na ordem do genoma
+# — a soma sai bit a bit igual. Só a ordem ENTRE nós de uma mesma camada pode variar.
+
+_build_stats = {"full": 0, "weights": 0, "structural": 0}
+
+
+class _Plan:
+    __slots__ = ("enabled", "enabled_set", "preds", "order")
+
+    def __init__(self, enabled, preds, order):
+        self.enabled = enabled                   # conexões habilitadas, na ordem do genoma
+        self.enabled_set = frozenset(enabled)
+        self.preds = preds                       # nó -> lista de entradas (não mutar: o pai
+        self.order = order                       #   e os irmãos compartilham as listas)
+
+
+def _preds(enabled, plan=None):
+    if plan is None:
+        preds = {}
+        for a, b in enabled:
+            preds.setdefault(b, []).append(a)
+        return preds
+    mudou = {b for _, b in plan.enabled_set.symmetric_difference(enabled)}
+    preds = dict(plan.preds)
+    for b in mudou:
+        preds.pop(b, None)
+    for a, b in enabled:
+        if b in mudou:
+            preds.setdefault(b, []).append(a)
+    return preds
+
+
+def _topo_order(gc, preds):
+    """Nós necessários às saídas, em ordem topológica (Kahn) — o que o create avalia."""
+    inputs = set(gc.input_keys)
+    required = set(gc.output_keys)
+    pilha = list(gc.output_keys)
+    while pilha:
+        for a in preds.get(pilha.pop(), ()):
+            if a not in required and a not in inputs:
+                required.add(a)
+                pilha.append(a)
+    grau, succ = {}, {}
+    for n in required:
+        k = 0
+        for a in preds.get(n, ()):
+            if a not in inputs:
+                k += 1
+                succ.setdefault(a, []).append(n)
+        grau[n] = k
+    fila = [n for n, k in grau.items() if k == 0]
+    for n in fila:                               # a fila cresce enquanto anda
+        for m in succ.get(n, ()):
+            grau[m] -= 1
+            if grau[m] == 0:
+                fila.append(m)
+    return fila
+
+
+def _plan_of(genome, cfg=None):
+    """Esqueleto do genoma (memoizado no objeto: pai do unpack_shared é só leitura)."""
+    plan = getattr(genome, "_plan", None)
+    if plan is None:
+        cfg = cfg or load_config()
+        enabled = [k for k, cg in genome.connections.items() if cg.enabled]
+        preds = _preds(enabled)
+        plan = genome._plan = _Plan(enabled, preds, _topo_order(cfg.genome_config, preds))
+    return plan
+
+
+def build_net(genome, parent=None, cfg=None):
+    """Rede executável (forward pass) a partir do genoma.
+
+    parent: o genoma de onde `genome` saiu por mutação (o pai do cache). Com ele, a
+    compilação remenda o esqueleto do pai em vez de refazer tudo."""
+    cfg = cfg or load_config()
+    gc = cfg.genome_config
+    enabled = [k for k, cg in genome.connections.items() if cg.enabled]
+    plan = _plan_of(parent, cfg) if parent is not None else None
+    if plan is not None and plan.enabled == enabled:
+        preds, order = plan.preds, plan.order
+        _build_stats["weights"] += 1
+    else:
+        preds = _preds(enabled, plan)
+        order = _topo_order(gc, preds)
+        _build_stats["full" if plan is None else "structural"] += 1
+    acts, aggs = gc.activation_defs, gc.aggregation_function_defs
+    nodes, conns = genome.nodes, genome.connections
+    node_evals = []
+    for n in order:
+        ng = nodes[n]
+        node_evals.append((n, acts.get(ng.activation), aggs.get(ng.aggregation), ng.bias,
+                           ng.response, [(a, conns[(a, n)].weight) for a in preds.get(n, ())]))
+    return neat.nn.FeedForwardNetwork(gc.input_keys, gc.output_keys, node_evals)
+
+
+def build_stats() -> dict:
+    """Compilações por caminho: do zero, só pesos (esqueleto do pai), estrutural (remendo)."""
+    return dict(_build_stats)
 
 
 def complexity(genome):
@@ -299,7 +490,7 @@ def complexity(genome):
     return (len(genome.nodes), active)
 
 
-def functional_complexity(genome, output_keys=None):
+def functional_complexity(genome, output_keys=None, cfg=None):
     """(n_neuronios, n_ligacoes) FUNCIONAIS — o cérebro de verdade, não o genoma.
 
     Mesmo critério do FeedForwardNetwork.create (neat.graphs.required_for_output): um nó só
@@ -313,7 +504,7 @@ def functional_complexity(genome, output_keys=None):
     as suas — pesos + LEO — pra medir o funcional com a mesma régua, §24 #4).
     """
     if output_keys is None:
-        cfg = load_config()
+        cfg = cfg or load_config()
         outputs = set(cfg.genome_config.output_keys)
     else:
         outputs = set(output_keys)
@@ -349,6 +540,23 @@ def to_dict(genome) -> dict:
     }
 
 
+def functional_dict(genome, net) -> dict:
+    """Só o CÉREBRO REAL, no formato do to_dict — o que a viz desenha.
+
+    A rede compilada (build_net) já é o subgrafo funcional: node_evals = os nós que computam
+    (saídas incluídas), cada um com as ligações habilitadas que o alimentam. Tecido morto
+    (99% dos ocultos do brain_bank, ver functional_complexity) fica de fora — o viewer não
+    recebe, nem desenha, centenas de nós que nunca disparam."""
+    nodes, conns = {}, []
+    genes = genome.connections
+    for n, _act, _agg, _bias, _resp, links in net.node_evals:
+        ng = genome.nodes[n]
+        nodes[str(n)] = [ng.bias, ng.response, ng.activation, ng.aggregation]
+        for a, w in links:
+            conns.append([a, n, w, True, getattr(genes[(a, n)], "innovation", 0)])
+    return {"key": genome.key, "nodes": nodes, "conns": conns}
+
+
 def from_dict(d: dict):
     """dict JSON -> genoma NEAT (reconstrói pra rodar/mutar)."""
     g = neat.DefaultGenome(d.get("key", 0))
@@ -368,24 +576,271 @@ def from_dict(d: dict):
     return g
 
 
-# --- PACOTE COMPACTO: o que trafega/armazena (base64(gzip(json))) ---
+# --- PACOTE COMPACTO: o que trafega/armazena ---
 # O mundo guarda/entrega essa STRING opaca; só o executor comprime/descomprime.
-# ~24 KB de JSON -> ~4-6 KB. String ASCII, cabe em JSON (WELCOME/report/snapshot).
+#
+# v1 (até 10/2026): base64(gzip(json)). ~24 KB de JSON -> ~4-6 KB. Chave de nó como string,
+#     cada gene uma lista, o nome da ativação repetido por extenso em todo nó, e o base64
+#     somando +33% no fim. Roda em TODO nascimento e o mundo relaya a string no WELCOME.
+# v2: "RG2:" + base64(frame). frame = [codec u8][dict_id u8] + compress(corpo binário):
+#     colunas tipadas (array) — nós: id i64, bias f64, response f64, ativação u8 (enum),
+#     agregação u8 (enum); ligações: in i64, out i64, peso f64, enabled u8, inovação u64.
+#     A inovação é sha256 de (in,out) (identidade determinística, topo do módulo): 8 bytes
+#     de entropia pura por ligação, incompressíveis. Quando TODAS batem com _det_innovation
+#     (o caso normal), a coluna nem vai: a flag no cabeçalho manda o unpack recalcular.
+#     f64 de propósito: o filho herda o peso EXATO do pai (f32 mudaria o cérebro no caminho).
+#     Continua base64 no fim (string ASCII opaca pro mundo): base85 pouparia ~7%, mas o
+#     b85 do stdlib é Python puro — medido ~3 ms por ida/volta num genoma de 900 ligações,
+#     mais que todo o resto do pacote.
+# `unpack` fareja a versão pelo prefixo: v1 sempre começa por "H4sI" (gzip em base64) e
+# nunca contém ":", então blobs antigos do brain_bank continuam abrindo para sempre.
+_BLOB_V2 = "RG2:"
+
+# ENUMS DO FORMATO — só crescem NO FIM. Reordenar/remover muda o significado de todo blob
+# já arquivado no mundo. Nome fora da tabela (ativação customizada) -> pack cai pro v1.
+_ACTIVATIONS = ("sigmoid", "tanh", "sin", "gauss", "relu", "elu", "lelu", "selu", "softplus",
+                "identity", "clamped", "inv", "log", "exp", "abs", "hat", "square", "cube")
+_AGGREGATIONS = ("sum", "product", "max", "min", "maxabs", "median", "mean")
+_ACT_CODE = {n: i for i, n in enumerate(_ACTIVATIONS)}
+_AGG_CODE = {n: i for i, n in enumerate(_AGGREGATIONS)}
+
+_CODEC_ZLIB, _CODEC_ZSTD = 0, 1
+try:                                   # zstd é OPCIONAL: sem o pacote, zlib (stdlib)
+    import zstandard as _zstd
+except ImportError:
+    _zstd = None
+
+# Rollout: um executor antigo (outra máquina) não abre v2. REGENES_BLOB_VERSION=1 mantém a
+# emissão no formato antigo enquanto houver cliente velho no mesmo mundo; unpack lê os dois.
+_PACK_VERSION = int(os.getenv("REGENES_BLOB_VERSION", "2"))
+_PACK_CODEC = (_CODEC_ZSTD if os.getenv("REGENES_BLOB_CODEC", "zlib") == "zstd" and _zstd
+               else _CODEC_ZLIB)
+_HEAD = struct.Struct("<qIIB")         # key, n_nodes, n_conns, flags
+_F_DET_INNOV = 1                       # flag: inovações = _det_innovation(in,out), coluna omitida
+_FRAME = struct.Struct("<BB")          # codec, dict_id
+
+
+def _col(typecode: str, values) -> bytes:
+    a = array(typecode, values)
+    if sys.byteorder != "little":
+        a.byteswap()
+    return a.tobytes()
+
+
+def _uncol(typecode: str, buf, off: int, n: int):
+    a = array(typecode)
+    end = off + n * a.itemsize
+    a.frombytes(buf[off:end])
+    if sys.byteorder != "little":
+        a.byteswap()
+    return a, end
+
+
+def _to_binary(genome):
+    """Genoma -> corpo binário v2, ou None se algo não couber no formato (-> v1)."""
+    try:
+        nids = sorted(genome.nodes)
+        nodes = [genome.nodes[k] for k in nids]
+        conns = list(genome.connections.values())
+        innov = [getattr(cg, "innovation", 0) for cg in conns]
+        det = all(inn == _det_innovation(*cg.key) for inn, cg in zip(innov, conns))
+        body = [_HEAD.pack(genome.key, len(nids), len(conns), _F_DET_INNOV if det else 0),
+                _col("q", nids),
+                _col("d", [ng.bias for ng in nodes]),
+                _col("d", [ng.response for ng in nodes]),
+                _col("B", [_ACT_CODE[ng.activation] for ng in nodes]),
+                _col("B", [_AGG_CODE[ng.aggregation] for ng in nodes]),
+                _col("q", [cg.key[0] for cg in conns]),
+                _col("q", [cg.key[1] for cg in conns]),
+                _col("d", [cg.weight for cg in conns]),
+                _col("B", [1 if cg.enabled else 0 for cg in conns])]
+        if not det:
+            body.append(_col("Q", innov))
+    except (KeyError, TypeError, OverflowError, struct.error):
+        return None
+    return b"".join(body)
+
+
+def _from_binary(buf):
+    """Corpo binário v2 -> genoma NEAT (mesmos objetos de gene que o from_dict monta)."""
+    key, n_nodes, n_conns, flags = _HEAD.unpack_from(buf, 0)
+    off = _HEAD.size
+    nids, off = _uncol("q", buf, off, n_nodes)
+    bias, off = _uncol("d", buf, off, n_nodes)
+    resp, off = _uncol("d", buf, off, n_nodes)
+    act, off = _uncol("B", buf, off, n_nodes)
+    agg, off = _uncol("B", buf, off, n_nodes)
+    cin, off = _uncol("q", buf, off, n_conns)
+    cout, off = _uncol("q", buf, off, n_conns)
+    w, off = _uncol("d", buf, off, n_conns)
+    en, off = _uncol("B", buf, off, n_conns)
+    if flags & _F_DET_INNOV:
+        innov = [_det_innovation(cin[k], cout[k]) for k in range(n_conns)]
+    else:
+        innov, off = _uncol("Q", buf, off, n_conns)
+    if off != len(buf):
+        raise ValueError(f"blob v2 corrompido ({len(buf) - off} bytes sobrando)")
+    g = neat.DefaultGenome(key)
+    g.nodes = {}
+    for k in range(n_nodes):
+        ng = DefaultNodeGene(nids[k])
+        ng.bias, ng.response = bias[k], resp[k]
+        ng.activation, ng.aggregation = _ACTIVATIONS[act[k]], _AGGREGATIONS[agg[k]]
+        g.nodes[nids[k]] = ng
+    g.connections = {}
+    for k in range(n_conns):
+        ck = (cin[k], cout[k])
+        cg = DefaultConnectionGene(ck, innov[k])
+        cg.weight, cg.enabled = w[k], bool(en[k])
+        g.connections[ck] = cg
+    return g
 
-def pack(genome) -> str:
-    """Genoma -> pacote compacto (string base64 de gzip(json))."""
+
+# --- DICIONÁRIO PRÉ-TREINADO (dict_id no frame) ---
+# Blob pequeno comprime mal: o zlib começa cada um sem contexto nenhum. Mas os genomas do
+# banco são PARENTES — ids de nó de mutação (determinísticos), pares (in,out) e pesos
+# herdados se repetem entre linhagens. Um dicionário treinado OFFLINE numa amostra de blobs
+# reais (blob_dict.py) dá esse contexto de graça. O id vai no frame; o unpack escolhe o
+# dicionário pelo id. Arquivos em blob_dicts/NNN.zdict, e são APPEND-ONLY: blob arquivado
+# com o dicionário N precisa do N para sempre. dict_id 0 = sem dicionário.
+_DICT_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "blob_dicts")
+_DICTS = {}                            # dict_id -> bytes (carregado sob demanda)
+_PACK_DICT = int(os.getenv("REGENES_BLOB_DICT", "0"))
+
+
+def blob_dict(dict_id: int) -> bytes:
+    """Conteúdo do dicionário `dict_id` (memoizado). ValueError se este executor não o tem."""
+    d = _DICTS.get(dict_id)
+    if d is None:
+        path = os.path.join(_DICT_DIR, f"{dict_id:03d}.zdict")
+        try:
+            with open(path, "rb") as f:
+                d = f.read()
+        except OSError:
+            raise ValueError(f"blob v2 pede o dicionário {dict_id}, que este executor não tem "
+                             f"({path})") from None
+        _DICTS[dict_id] = d
+    return d
+
+
+def _compress(raw: bytes, codec: int, dict_id: int = 0) -> bytes:
+    zdict = blob_dict(dict_id) if dict_id else None
+    if codec == _CODEC_ZSTD:
+        if zdict:
+            zd = _zstd.ZstdCompressionDict(zdict, dict_type=_zstd.DICT_TYPE_RAWCONTENT)
+            return _zstd.ZstdCompressor(level=6, dict_data=zd).compress(raw)
+        return _zstd.ZstdCompressor(level=6).compress(raw)
+    if zdict:
+        c = zlib.compressobj(6, zlib.DEFLATED, 15, 9, zlib.Z_DEFAULT_STRATEGY, zdict)
+        return c.compress(raw) + c.flush()
+    return zlib.compress(raw, 6)       # 9 custa 6x o tempo p/ <1% de tamanho (medido)
+
+
+def _decompress(data, codec: int, dict_id: int = 0) -> bytes:
+    zdict = blob_dict(dict_id) if dict_id else None
+    if codec == _CODEC_ZSTD:
+        if _zstd is None:
+            raise ValueError("blob v2 em zstd, mas o pacote zstandard não está instalado")
+        if zdict:
+            zd = _zstd.ZstdCompressionDict(zdict, dict_type=_zstd.DICT_TYPE_RAWCONTENT)
+            return _zstd.ZstdDecompressor(dict_data=zd).decompress(data)
+        return _zstd.ZstdDecompressor().decompress(data)
+    if codec == _CODEC_ZLIB:
+        if zdict:
+            d = zlib.decompressobj(zdict=zdict)
+            return d.decompress(data) + d.flush()
+        return zlib.decompress(data)
+    raise ValueError(f"blob v2 com codec desconhecido ({codec})")
+
+
+def _pack_v1(genome) -> str:
+    """Formato v1: base64(gzip(json)). Mantido p/ rollout e p/ genes fora do enum."""
     raw = json.dumps(to_dict(genome), separators=(",", ":")).encode("utf-8")
     return base64.b64encode(gzip.compress(raw, 6)).decode("ascii")
 
 
+def pack(genome, version: int = None, dict_id: int = None) -> str:
+    """Genoma -> pacote compacto (string ASCII). v2 binário por default; v1 se pedido ou se o
+    genoma tiver algo que o formato binário não representa (ex.: ativação fora do enum).
+    dict_id: dicionário pré-treinado (default REGENES_BLOB_DICT; 0 = nenhum)."""
+    if (version or _PACK_VERSION) >= 2:
+        raw = _to_binary(genome)
+        if raw is not None:
+            did = _PACK_DICT if dict_id is None else dict_id
+            frame = _FRAME.pack(_PACK_CODEC, did) + _compress(raw, _PACK_CODEC, did)
+            return _BLOB_V2 + base64.b64encode(frame).decode("ascii")
+    return _pack_v1(genome)
+
+
 def unpack(pkt: str):
-    """Pacote compacto -> genoma. Aceita dict cru também (retrocompat com JSON não comprimido)."""
+    """Pacote compacto -> genoma. Fareja a versão: "RG2:" -> v2; senão base64(gzip(json)) v1.
+    Aceita dict cru também (retrocompat com JSON não comprimido)."""
     if isinstance(pkt, dict):        # tolera blobs antigos (dict JSON puro)
         return from_dict(pkt)
+    if pkt.startswith(_BLOB_V2):
+        frame = base64.b64decode(pkt[len(_BLOB_V2):])
+        codec, dict_id = _FRAME.unpack_from(frame, 0)
+        return _from_binary(_decompress(frame[_FRAME.size:], codec, dict_id))
     raw = gzip.decompress(base64.b64decode(pkt))
     return from_dict(json.loads(raw))
 
 
+# --- CACHE DE PAIS: blob -> genoma já aberto (LRU por digest) ---
+# Pai provado é servido de novo e de novo como brain_a/brain_b — e cada nascimento pagava
+# b64 + descompressão + reconstrução de todo gene. O cache guarda o genoma ABERTO, indexado
+# pelo digest do blob, e o entrega COMPARTILHADO (marcado _shared): crossover só lê os pais,
+# e mutate() copia antes de mexer (copy-on-write). O pai em cache nunca muda. Vale pros dois
+# executores — o CPPN do HyperNEAT é o mesmo genoma NEAT, pelo mesmo neat_brain.
+_UNPACK_CACHE = OrderedDict()          # digest -> (genoma compartilhado, bytes estimados)
+_UNPACK_CACHE_MAX = int(os.getenv("REGENES_UNPACK_CACHE", "256"))
+_unpack_stats = {"hits": 0, "misses": 0, "bytes": 0}
+
+
+def _genome_nbytes(genome) -> int:
+    """Estimativa barata da memória de um genoma aberto (1 gene de amostra x contagem)."""
+    n = sys.getsizeof(genome.nodes) + sys.getsizeof(genome.connections)
+    for genes, extra in ((genome.nodes, 2 * 24), (genome.connections, 24 + 56 + 36)):
+        if genes:
+            gene = next(iter(genes.values()))
+            n += len(genes) * (sys.getsizeof(gene) + sys.getsizeof(gene.__dict__) + extra)
+    return n
+
+
+def unpack_shared(pkt):
+    """Pacote -> genoma COMPARTILHADO, do cache quando o blob já foi visto. SÓ LEITURA:
+    serve de pai pro crossover; pra herdar assexuado, `g = mutate(unpack_shared(pkt))`."""
+    if isinstance(pkt, dict) or _UNPACK_CACHE_MAX <= 0:
+        g = unpack(pkt)
+        g.fitness = 1.0
+        g._shared = True
+        return g
+    key = hashlib.blake2b(pkt.encode("ascii"), digest_size=16).digest()
+    hit = _UNPACK_CACHE.get(key)
+    if hit is not None:
+        _UNPACK_CACHE.move_to_end(key)
+        _unpack_stats["hits"] += 1
+        return hit[0]
+    _unpack_stats["misses"] += 1
+    g = unpack(pkt)
+    g.fitness = 1.0                    # o crossover não precisa escrever no pai
+    g._shared = True
+    nbytes = _genome_nbytes(g)
+    _UNPACK_CACHE[key] = (g, nbytes)
+    _unpack_stats["bytes"] += nbytes
+    while len(_UNPACK_CACHE) > _UNPACK_CACHE_MAX:
+        _, (_, nb_old) = _UNPACK_CACHE.popitem(last=False)
+        _unpack_stats["bytes"] -= nb_old
+    return g
+
+
+def unpack_cache_stats() -> dict:
+    """Métricas do cache de pais: entradas, acertos, taxa e bytes retidos (estimados)."""
+    h, m = _unpack_stats["hits"], _unpack_stats["misses"]
+    return {"entries": len(_UNPACK_CACHE), "max_entries": _UNPACK_CACHE_MAX,
+            "hits": h, "misses": m, "hit_rate": h / (h + m) if h + m else 0.0,
+            "bytes": _unpack_stats["bytes"]}
+
+
 # --- ARQUIVO .brain: exportar/propagar um campeão (magic + gzip(json)) ---
 _BRAIN_MAGIC = b"RGB1"  # re-genes brain, formato v1
 
@@ -0,0 +1,76 @@
+"""
+primordial.py — reservatório de nascimentos PRIMORDIAIS prontos (compartilhado pelos hosts).
+
+Nascimento sem semente (gênese, banco zerado, banco magro) fazia tudo inline depois do
+WELCOME: random_genome, pack, métricas, e então build_net (nativo) ou express (HyperNEAT,
+~20 ms de CPPN). Nada disso depende do que o mundo manda — o genoma primordial é sorteio
+puro — então pode estar PRONTO antes da ameba pedir.
+
+O pool guarda poucos itens prontos (o que o `make` do host devolve: genoma, blob, métricas,
+rede/substrato). A reposição é uma task de BAIXA PRIORIDADE no mesmo event loop: fabrica
+um item por vez e só quando o loop está ocioso (o último sleep não atrasou mais que
+`busy_lag`); tick pendente sempre passa na frente. Pool vazio não trava ninguém: take()
+fabrica inline, como antes, e conta a falta.
+
+REGENES_PRIMORDIAL_POOL = tamanho do reservatório (default 4; 0 desliga).
+"""
+import asyncio
+import os
+import time
+
+POOL_SIZE = int(os.getenv("REGENES_PRIMORDIAL_POOL", "4"))
+
+
+class PrimordialPool:
+    def __init__(self, make, size: int = POOL_SIZE, idle: float = 0.05, busy_lag: float = 0.005):
+        self.make = make
+        self.size = size
+        self.idle = idle                 # pausa entre itens (o loop respira)
+        self.busy_lag = busy_lag         # atraso do sleep acima disto = loop ocupado, espera
+        self._items = []
+        self._wake = None
+        self.hits = self.misses = 0
+
+    def take(self):
+        """Um nascimento primordial pronto (ou fabricado na hora, se o pool secou)."""
+        if self._wake is not None:
+            self._wake.set()
+        if self._items:
+            self.hits += 1
+            return self._items.pop(0)
+        self.misses += 1
+        return self.make()
+
+    def fill(self, n: int = None) -> None:
+        """Fabrica agora (síncrono) até `n` itens prontos — aquecimento ANTES do 1º connect:
+        o primeiro nascimento primordial da partida não paga inline."""
+        n = self.size if n is None else min(n, self.size)
+        while len(self._items) < n:
+            self._items.append(self.make())
+
+    def __len__(self):
+        return len(self._items)
+
+    async def run(self):
+        """Task de reposição: enche até `size`, dorme até o próximo take()."""
+        if self.size <= 0:
+            return
+        self._wake = asyncio.Event()
+        while True:
+            while len(self._items) < self.size:
+                t0 = time.perf_counter()
+                await asyncio.sleep(self.idle)
+                if time.perf_counter() - t0 - self.idle > self.busy_lag:
+                    continue                 # loop atrasado: há tick na fila, tenta depois
+                try:
+                    self._items.append(self.make())
+                except Exception as e:       # reposição nunca derruba o executor
+                    print(f"[pool] primordial falhou ({e.__class__.__name__}: {e})")
+                    await asyncio.sleep(1.0)
+            self._wake.clear()
+            await self._wake.wait()
+
+    def stats(self) -> dict:
+        tot = self.hits + self.misses
+        return {"ready": len(self._items), "size": self.size, "hits": self.hits,
+                "misses": self.misses, "hit_rate": self.hits / tot if tot else 0.0}
@@ -0,0 +1,163 @@
+"""
+profiler.py — perfil SOB DEMANDA de um executor em produção (compartilhado pelos hosts).
+
+Quando a latência do tick piora no Luna, o lagmon diz QUAL etapa travou, não ONDE dentro
+dela. Reiniciar com cProfile muda o que se quer medir (o processo volta frio, com outras
+amebas). Aqui o processo vivo se perfila por uma janela e desliga sozinho:
+
+    kill -USR2 <pid>                 perfila REGENES_PROFILE_S segundos (default 30)
+    REGENES_PROFILE=20               perfila os primeiros 20 s desde a partida
+
+É AMOSTRAGEM, não instrumentação: uma thread daemon copia a pilha da thread do event loop
+(sys._current_frames) a cada 1/REGENES_PROFILE_HZ s (default 200) — o loop não paga nada
+além do GIL por alguns µs por amostra. Cada amostra leva como RAIZ o grupo e a etapa
+corrente do lagmon (`with stage(...)` dos hosts):
+
+    birth;birth>pack;...             nascimento (welcome, herança, compilação) e primordial
+    tick;activate;...                o caminho do tick (parse, encode, activate, viz)
+    idle;...                         o loop parado no select() esperando a rede
+    loop;...                         o resto (websockets, agendador, tasks de fundo)
+
+— então o flame graph separa nascimento de tick sem esforço. Fim da janela: grava
+logs/profile-<espécies>-<pid>-<data-hora>.folded (formato "collapsed": uma pilha por
+linha, quadros separados por ';' e a contagem no fim — flamegraph.pl, speedscope,
+inferno) e uma linha de resumo no log com a parte de cada grupo.
+"""
+import os
+import signal
+import sys
+import threading
+import time
+from collections import Counter
+
+import lagmon
+
+PROFILE_S = float(os.getenv("REGENES_PROFILE_S", "30"))
+PROFILE_HZ = float(os.getenv("REGENES_PROFILE_HZ", "200"))
+AT_START = float(os.getenv("REGENES_PROFILE", "0") or 0)
+LOG_DIR = os.getenv("REGENES_LOG_DIR") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs")
+
+_BIRTH = ("birth", "primordial")
+_TICK = ("parse", "encode", "activate", "viz")
+_IDLE = ("selectors.py", "select")       # (arquivo, função) do topo quando o loop dorme
+
+
+def group(stage: str, top=None) -> str:
+    """Etapa do lagmon (e o quadro do topo) -> birth | tick | idle | loop."""
+    first = stage.split(">", 1)[0]
+    if first in _BIRTH:
+        return "birth"
+    if first in _TICK:
+        return "tick"
+    if top is not None and os.path.basename(top.f_code.co_filename) == _IDLE[0] \
+            and top.f_code.co_name == _IDLE[1]:
+        return "idle"
+    return "loop"
+
+
+class Profiler:
+    """Amostrador da thread do event loop por uma janela limitada."""
+
+    def __init__(self, label: str = "executor", hz: float = PROFILE_HZ,
+                 out_dir: str = LOG_DIR, max_depth: int = 64, log=print):
+        self.label = label
+        self.interval = 1.0 / hz
+        self.out_dir = out_dir
+        self.max_depth = max_depth
+        self.log = log
+        self.stacks = Counter()
+        self.samples = 0
+        self.runs = 0
+        self.last_path = None
+        self._names = {}                     # code -> "func (arquivo:linha)"
+        self._tid = None
+        self._thread = None
+        self._stop = threading.Event()
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def install(self, loop) -> None:
+        """No event loop: SIGUSR2 dispara uma janela; REGENES_PROFILE abre a primeira."""
+        self._tid = threading.get_ident()
+        try:
+            loop.add_signal_handler(signal.SIGUSR2, self.start)
+        except (NotImplementedError, AttributeError, ValueError):
+            pass                             # Windows: só REGENES_PROFILE
+        if AT_START > 0:
+            self.start(AT_START)
+
+    def start(self, seconds: float = None, tid: int = None) -> bool:
+        """Abre uma janela de `seconds` (default REGENES_PROFILE_S). Já rodando: ignora."""
+        if self.running:
+            self.log("[profile] já perfilando — sinal ignorado")
+            return False
+        seconds = PROFILE_S if seconds is None else seconds
+        self._tid = tid or self._tid or threading.get_ident()
+        self.stacks, self.samples = Counter(), 0
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(seconds,), name="profiler",
+                                        daemon=True)
+        self._thread.start()
+        self.log(f"[profile] amostrando {seconds:.0f} s a {1 / self.interval:.0f} Hz")
+        return True
+
+    def stop(self) -> None:
+        """Encerra a janela em curso (grava o que já amostrou)."""
+        if self.running:
+            self._stop.set()
+            self._thread.join()
+
+    # --- a thread ---
+    def _name(self, code) -> str:
+        n = self._names.get(code)
+        if n is None:
+            n = self._names[code] = (f"{code.co_name} ({os.path.basename(code.co_filename)}:"
+                                     f"{code.co_firstlineno})").replace(";", ":")
+        return n
+
+    def sample(self) -> None:
+        """Uma amostra da thread do loop (a thread do profiler chama; o teste também)."""
+        top = sys._current_frames().get(self._tid)
+        if top is None:
+            return
+        stage, _tag = lagmon.current()
+        frames, f = [], top
+        while f is not None and len(frames) < self.max_depth:
+            frames.append(self._name(f.f_code))
+            f = f.f_back
+        frames.append(stage or "-")
+        frames.append(group(stage, top))
+        self.stacks[";".join(reversed(frames))] += 1
+        self.samples += 1
+
+    def _run(self, seconds: float) -> None:
+        end = time.monotonic() + seconds
+        t0 = time.monotonic()
+        while not self._stop.wait(self.interval) and time.monotonic() < end:
+            self.sample()
+        self.runs += 1
+        try:
+            self.last_path = self.write(time.monotonic() - t0)
+        except OSError as e:                 # disco cheio/sem permissão: avisa e segue
+            self.log(f"[profile] não gravou: {e}")
+
+    def shares(self) -> dict:
+        """Grupo -> fração das amostras."""
+        by = Counter()
+        for stack, n in self.stacks.items():
+            by[stack.split(";", 1)[0]] += n
+        return {g: n / self.samples for g, n in by.most_common()} if self.samples else {}
+
+    def write(self, elapsed: float) -> str:
+        os.makedirs(self.out_dir, exist_ok=True)
+        stamp = time.strftime("%Y%m%d-%H%M%S")
+        path = os.path.join(self.out_dir, f"profile-{self.label}-{os.getpid()}-{stamp}.folded")
+        with open(path, "w", encoding="utf-8") as f:
+            for stack, n in self.stacks.most_common():
+                f.write(f"{stack} {n}\n")
+        parts = " ".join(f"{g} {v:.0%}" for g, v in self.shares().items())
+        self.log(f"[profile] {elapsed:.1f} s, {self.samples} amostras -> {path} | {parts}")
+        return path
@@ -0,0 +1,102 @@
+"""
+recorder.py — GRAVAÇÃO de ticks de verdade pra otimizar encode/activate com dado real
+(compartilhado pelos hosts). O replay.py é quem lê.
+
+Otimizar o caminho do tick com vetor sintético engana: a visão real é quase toda zero, o
+químico tem cauda, o empate saturado do decide() aparece em cérebro de verdade. Com
+REGENES_RECORD, o executor grava o que o mundo mandou e o que a ameba fez:
+
+    REGENES_RECORD=1                    -> logs/ticks.jsonl.gz (ou REGENES_RECORD=caminho)
+    REGENES_RECORD_EVERY=10             1 tick a cada 10 (default 1: todos)
+    REGENES_RECORD_MAX_MB=256           roda o arquivo ao passar disso (0 = nunca)
+
+Uma linha JSON por registro:
+  · vida — espécie, origem, as sementes do WELCOME (brain_a/brain_b) e o BLOB do filho. As
+    sementes dizem de onde veio; o blob é o cérebro que pensou (a mutação é sorteada: das
+    sementes não se refaz o mesmo filho). Sempre gravada, mesmo com amostragem.
+  · tick — a mensagem TICK crua (visão, químico, escalares), o estômago em vigor, as saídas
+    da rede e a ação escolhida.
+
+Sem travar o loop: o tick só enfileira a tupla (a mensagem crua já é texto — nada é
+serializado no loop); a thread da telemetria (telemetry.Sink: lotes, rotação, vários
+workers no mesmo arquivo) monta as linhas e grava cada lote como UM membro gzip — o arquivo
+é gzip válido do começo ao fim (zcat, gzip.open), e um membro cortado no fim (processo
+morto no meio do write) só perde o último lote. Sob carga, o governor amostra a gravação
+como amostra a telemetria.
+"""
+import gzip
+import json
+import os
+import time
+import zlib
+
+import telemetry
+
+RECORD = os.getenv("REGENES_RECORD", "")
+EVERY = max(1, int(os.getenv("REGENES_RECORD_EVERY", "1")))
+MAX_BYTES = int(float(os.getenv("REGENES_RECORD_MAX_MB", "256")) * 1024 * 1024)
+LOG_DIR = os.getenv("REGENES_LOG_DIR") or os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "logs")
+
+
+class TickRecorder(telemetry.Sink):
+    """Um Sink cujas linhas são vidas e ticks, gravadas em membros gzip de JSON Lines."""
+
+    def __init__(self, path: str, every: int = EVERY, max_bytes: int = MAX_BYTES, **kw):
+        kw.setdefault("enabled", True)       # REGENES_TELEMETRY=0 não desliga a gravação
+        super().__init__(path, (("rec", "s"),), fmt="csv", max_bytes=max_bytes, **kw)
+        self.path = path                     # a extensão é a do gzip, não a do formato
+        self.every = every
+        self.lives = 0
+        self._ticks = 0
+
+    @classmethod
+    def from_env(cls):
+        """None sem REGENES_RECORD."""
+        if not RECORD:
+            return None
+        path = os.path.join(LOG_DIR, "ticks.jsonl.gz") if RECORD == "1" else RECORD
+        os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+        return cls(path)
+
+    def life(self, species: str, origin: str, welcome: dict, b, stomach_size) -> str:
+        """Cabeçalho de uma vida -> o id que os ticks dela levam."""
+        self.lives += 1
+        lid = f"{os.getpid()}-{self.lives}"
+        if self.enabled:
+            self._put(("L", {"k": "life", "id": lid, "species": species, "origin": origin,
+                             "brain_a": welcome.get("brain_a"),
+                             "brain_b": welcome.get("brain_b"), "blob": b["blob"],
+                             "stomach_size": stomach_size, "t": round(time.time(), 3)}))
+        return lid
+
+    def tick(self, lid: str, raw, stomach_size, out, act: int) -> None:
+        """Caminho quente: uma tupla na fila (1 a cada `every`)."""
+        self._ticks += 1
+        if self._ticks % self.every == 0:
+            self.record("T", lid, raw, stomach_size, tuple(out), act)
+
+    def _encode(self, rows, fresh: bool) -> bytes:
+        lines = []
+        for r in rows:
+            if r[0] == "L":
+                lines.append(json.dumps(r[1], separators=(",", ":")))
+                continue
+            _, lid, raw, ss, out, act = r
+            if isinstance(raw, (bytes, bytearray)):
+                raw = raw.decode("utf-8")
+            lines.append(f'{{"k":"tick","id":"{lid}","stomach_size":{json.dumps(ss)},'
+                         f'"out":{json.dumps([float(x) for x in out])},"act":{int(act)},'
+                         f'"msg":{raw}}}')
+        return gzip.compress(("\n".join(lines) + "\n").encode("utf-8"), 6)
+
+
+def read(path: str):
+    """Gera os registros (dicts) de uma gravação. Último lote cortado: para ali."""
+    with gzip.open(path, "rt", encoding="utf-8") as f:
+        try:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+        except (EOFError, ValueError, zlib.error, gzip.BadGzipFile):
+            return
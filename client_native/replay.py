@@ -0,0 +1,131 @@
+"""
+replay.py — passa uma GRAVAÇÃO de ticks (recorder.py, REGENES_RECORD) por um encode e um
+backend, offline: mede a vazão e confere, tick a tick, que dá a MESMA ação.
+
+Otimizar o encode ou o activate (lote, NumPy, outra ordem de soma) é seguro quando o
+caminho novo, com as entradas reais, decide o mesmo que o de produção. A gravação traz o
+que o caminho de referência fez — saídas da rede e ação —, então o candidato é conferido
+contra ela:
+
+  · cada vida renasce do BLOB gravado (backend.nascer(unpack(blob)) — o cérebro exato);
+  · cada tick passa por encode_msg (ou pelo `--encode` candidato) e pelo activate do
+    backend (ou do `--backend` candidato);
+  · SAÍDAS: diferença absoluta máxima contra as gravadas (`--tol`, default 1e-9: só o
+    ruído de ponto flutuante de uma soma reordenada);
+  · AÇÃO: a gravada tem de estar em executor.choices(saídas) — no empate saturado o
+    decide() sorteia, e qualquer uma do empate vale.
+
+Uso:
+    python replay.py GRAVACAO... [--backend native|hyper|modulo:Classe]
+                     [--encode modulo:funcao] [--repeat 3] [--tol 1e-9] [--out -]
+    Sai um JSON: vidas, ticks, divergências (as primeiras com o detalhe), µs por tick de
+    encode e de activate, ticks/s. Código de saída 1 se algum tick divergiu.
+"""
+import argparse
+import asyncio
+import importlib
+import json
+import os
+import sys
+import time
+
+import executor
+import neat_brain as nb
+import recorder
+
+
+def _load(spec: str):
+    """'modulo:nome' -> o objeto (o diretório corrente entra no caminho de import)."""
+    mod, _, name = spec.partition(":")
+    sys.path.insert(0, os.getcwd())
+    return getattr(importlib.import_module(mod), name)
+
+
+def backend_for(species: str, spec: str = None):
+    """Backend de `species` (native/hyper), ou o candidato `spec` (modulo:Classe)."""
+    be = _load(spec)() if spec and ":" in spec else executor._backends([spec or species])[0]
+    be.warm()
+    return be
+
+
+async def replay(records, backend: str = None, enc=None, tol: float = 1e-9,
+                 keep: int = 10) -> dict:
+    """Registros (recorder.read) -> relatório. backend=None: o da espécie de cada vida."""
+    backends, lives = {}, {}
+    n_lives = ticks = bad_out = bad_act = 0
+    max_diff = t_enc = t_act = 0.0
+    first = []
+    for rec in records:
+        if rec.get("k") == "life":
+            sp = rec["species"]
+            if sp not in backends:
+                backends[sp] = backend_for(sp, backend)
+            be = backends[sp]
+            lives[rec["id"]] = (be, be.nascer(nb.unpack(rec["blob"])))
+            n_lives += 1
+            continue
+        life = lives.get(rec.get("id"))
+        if life is None:
+            continue                         # vida noutro arquivo (rodado): sem o cérebro
+        be, b = life
+        t0 = time.perf_counter()
+        inp = executor.encode_msg(rec["msg"], rec["stomach_size"], b["acuity"], enc)
+        t1 = time.perf_counter()
+        out = await be.activate(b, inp, False)
+        t2 = time.perf_counter()
+        t_enc += t1 - t0
+        t_act += t2 - t1
+        ticks += 1
+        diff = max((abs(x - y) for x, y in zip(out, rec["out"])), default=0.0)
+        if len(out) != len(rec["out"]):
+            diff = float("inf")
+        max_diff = max(max_diff, diff)
+        act_ok = rec["act"] in executor.choices(out)
+        if diff > tol or not act_ok:
+            bad_out += diff > tol
+            bad_act += not act_ok
+            if len(first) < keep:
+                first.append({"life": rec["id"], "tick": rec["msg"].get("tick"),
+                              "act": rec["act"], "choices": executor.choices(out),
+                              "max_abs_diff": diff})
+    total = t_enc + t_act
+    return {"lives": n_lives, "ticks": ticks, "out_mismatches": bad_out,
+            "act_mismatches": bad_act, "max_abs_diff": max_diff, "tol": tol,
+            "encode_us": round(t_enc / ticks * 1e6, 2) if ticks else None,
+            "activate_us": round(t_act / ticks * 1e6, 2) if ticks else None,
+            "ticks_per_s": round(ticks / total, 1) if total else None,
+            "first_mismatches": first}
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Replay de ticks gravados: vazão e equivalência")
+    ap.add_argument("paths", nargs="+", help="gravações (.jsonl.gz do recorder), em ordem")
+    ap.add_argument("--backend", default=None,
+                    help="native | hyper | modulo:Classe (default: a espécie de cada vida)")
+    ap.add_argument("--encode", default=None, help="encode candidato, modulo:funcao")
+    ap.add_argument("--repeat", type=int, default=1, help="passadas (vazão: pegue a melhor)")
+    ap.add_argument("--tol", type=float, default=1e-9, help="diferença máxima nas saídas")
+    ap.add_argument("--out", default="-", help="JSON do relatório; '-' = stdout")
+    a = ap.parse_args(argv)
+    enc = _load(a.encode) if a.encode else None
+
+    def records():
+        for p in a.paths:
+            if not os.path.exists(p):
+                print(f"[replay] {p}: não existe", file=sys.stderr)
+                continue
+            yield from recorder.read(p)
+    runs = [asyncio.run(replay(records(), a.backend, enc, a.tol)) for _ in range(a.repeat)]
+    rep = max(runs, key=lambda r: r["ticks_per_s"] or 0)
+    rep["runs_ticks_per_s"] = [r["ticks_per_s"] for r in runs]
+    text = json.dumps(rep, indent=1)
+    if a.out == "-":
+        print(text)
+    else:
+        with open(a.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+    return 1 if rep["out_mismatches"] or rep["act_mismatches"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,132 @@
+"""
+runtime_stats.py — números de RUNTIME de um executor (compartilhado pelos hosts).
+
+Cada host mede o que só ele vê: latência do TICK (mensagem do mundo chegou -> ação
+enviada; o tempo que a ameba passa "pensando" no relógio do mundo), ticks, nascimentos,
+mortes, reconexões, amebas no ar. CPU quem lê é o supervisor, de fora (/proc).
+
+Com REGENES_STATUS_FILE, o host grava um snapshot JSON a cada REGENES_STATUS_EVERY
+segundos (default 2) — tmp + os.replace, quem lê nunca pega arquivo pela metade. O
+supervisor (supervisor.py) junta os de todos os workers numa visão só. Sem a variável,
+os contadores existem e ninguém grava nada.
+"""
+import asyncio
+import json
+import os
+import time
+from collections import deque
+
+STATUS_FILE = os.getenv("REGENES_STATUS_FILE", "")
+STATUS_EVERY = float(os.getenv("REGENES_STATUS_EVERY", "2"))
+
+
+def percentile(sorted_vals, q: float):
+    """Percentil por vizinho mais próximo de uma lista JÁ ordenada (None se vazia)."""
+    if not sorted_vals:
+        return None
+    return sorted_vals[min(len(sorted_vals) - 1, int(q * len(sorted_vals)))]
+
+
+class RuntimeStats:
+    """Contadores de um processo executor. tick() é o caminho quente: um append."""
+
+    def __init__(self, species: str, n: int, window: int = 2048):
+        self.species = species
+        self.n = n
+        self.started = time.time()
+        self.lat = deque(maxlen=window)          # últimas latências de tick (s)
+        self.ticks = self.births = self.deaths = self.reconnects = 0
+        self.alive = 0
+        self.origins = {}                        # nascimentos por origem (primordial, ...)
+        self.state = "running"
+
+    def tick(self, dt: float) -> None:
+        self.ticks += 1
+        self.lat.append(dt)
+
+    def recent(self, k: int) -> list:
+        """As últimas `k` latências (limitado à janela)."""
+        if k <= 0:
+            return []
+        return list(self.lat)[-k:] if k < len(self.lat) else list(self.lat)
+
+    def born(self, origin: str = None) -> None:
+        self.births += 1
+        self.alive += 1
+        if origin is not None:
+            self.origins[origin] = self.origins.get(origin, 0) + 1
+
+    def died(self) -> None:
+        self.deaths += 1
+        self.alive -= 1
+
+    def reconnect(self) -> None:
+        self.reconnects += 1
+
+    def snapshot(self) -> dict:
+        lat = sorted(self.lat)
+
+        def ms(v):
+            return None if v is None else round(v * 1e3, 3)
+        return {"species": self.species, "pid": os.getpid(), "n": self.n,
+                "state": self.state, "time": time.time(),
+                "uptime_s": round(time.time() - self.started, 1), "alive": self.alive,
+                "ticks": self.ticks, "births": self.births, "deaths": self.deaths,
+                "reconnects": self.reconnects,
+                "tick_ms": {"p50": ms(percentile(lat, 0.50)), "p90": ms(percentile(lat, 0.90)),
+                            "p99": ms(percentile(lat, 0.99)), "max": ms(lat[-1] if lat else None),
+                            "window": len(lat)}}
+
+
+class StatsGroup:
+    """As espécies de um executor combinado (executor.py --native N --hyper M) vistas como
+    um worker só: contadores somados, percentis sobre as latências de todas — e o snapshot
+    de cada uma em `by_species`. Mesma interface de snapshot() que o RuntimeStats."""
+
+    def __init__(self, members):
+        self.members = list(members)
+
+    def snapshot(self) -> dict:
+        snaps = [m.snapshot() for m in self.members]
+        lat = [x for m in self.members for x in m.lat]
+        merged = RuntimeStats("+".join(m.species for m in self.members), 0,
+                              window=max(1, len(lat)))
+        merged.started = min(m.started for m in self.members)
+        merged.lat.extend(lat)
+        snap = merged.snapshot()
+        for k in ("n", "alive", "ticks", "births", "deaths", "reconnects"):
+            snap[k] = sum(s[k] for s in snaps)
+        states = {s["state"] for s in snaps}
+        snap["state"] = states.pop() if len(states) == 1 else "draining"
+        snap["by_species"] = {s["species"]: s for s in snaps}
+        return snap
+
+
+def write_json(path: str, data: dict) -> None:
+    """Grava atômico (tmp + replace). Falha de disco nunca derruba o executor."""
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp, path)
+    except OSError:
+        pass
+
+
+async def publish(stats, path: str = STATUS_FILE, every: float = STATUS_EVERY,
+                  extra=None) -> None:
+    """Task: grava o snapshot (+ extra(), se dado) a cada `every` s. Sem caminho, não faz nada."""
+    if not path:
+        return
+    try:
+        while True:
+            snap = stats.snapshot()
+            if extra is not None:
+                snap.update(extra())
+            write_json(path, snap)
+            await asyncio.sleep(every)
+    finally:                                      # cancelada no fim: o último estado fica gravado
+        snap = stats.snapshot()
+        if extra is not None:
+            snap.update(extra())
+        write_json(path, snap)
@@ -0,0 +1,178 @@
+"""
+shm_registry.py — tabelas SÓ-LEITURA compartilhadas entre os processos executores do host.
+
+start_luna.sh sobe o nativo e o HyperNEAT em processos separados (e um modo multi-worker
+subiria mais). Cada um refazia o mesmo estado imutável: tabela de consultas do substrato,
+substratos expressos, PSFs do cone, ... Aqui um processo PUBLICA e os outros ANEXAM sem cópia.
+
+Mecânica (sem daemon, sem lock): um diretório em /dev/shm (tmpfs — memória, não disco),
+um arquivo por chave. Publicar = escrever num temporário e `os.replace` (atômico: quem lê
+nunca vê entrada pela metade; dois publicadores da mesma chave escrevem o mesmo conteúdo e
+o último vence). Ler = `mmap` só-leitura do arquivo -> memoryview. As páginas são as MESMAS
+em todos os processos: a tabela ocupa RAM uma vez no host, não uma vez por processo. Uma
+entrada nunca é reescrita no lugar; mapear e apagar em seguida é seguro (o mapa segura o
+inode até o processo soltar).
+
+Liga com REGENES_SHM=1 (o start_luna.sh liga). Raiz: REGENES_SHM_DIR, default
+/dev/shm/regenes-<uid>. Teto: REGENES_SHM_MAX_MB (default 256) — passou, as entradas mais
+velhas (mtime) saem na próxima varredura. Chave com prefixo `pin.` (a tabela de consultas do
+substrato, lida em toda expressão) nunca sai; temporário de publicação em curso também não.
+
+O que sai daqui vira CÉREBRO (substrato expresso): o nome da raiz é previsível, então a raiz
+é criada 0700 e só é usada se for um diretório de verdade (não symlink), do nosso usuário e
+sem permissão nenhuma pra grupo/outros. Outro usuário que criou antes (e plantou entradas)
+-> OSError: quem chama segue sem o nível compartilhado.
+"""
+import hashlib
+import mmap
+import os
+import re
+import stat
+import tempfile
+import time
+from collections import OrderedDict
+
+_SAFE = re.compile(r"^[A-Za-z0-9._-]{1,120}$")
+_SWEEP_EVERY = 64            # varre o teto a cada N publicações (scandir não é de graça)
+PIN = "pin."                 # prefixo de chave que a varredura nunca apaga
+_TMP = ".tmp-"
+_TMP_STALE_S = 3600          # temporário mais velho que isto: publicador que morreu no meio
+
+
+def _own_private_dir(root: str) -> None:
+    """Cria `root` 0700 (se não existe) e exige: diretório (não symlink), nosso, sem bits de
+    grupo/outros. Senão OSError."""
+    os.makedirs(root, mode=0o700, exist_ok=True)
+    st = os.lstat(root)
+    if not stat.S_ISDIR(st.st_mode):
+        raise OSError(f"{root}: não é um diretório")
+    if hasattr(os, "getuid") and (st.st_uid != os.getuid() or st.st_mode & 0o077):
+        raise OSError(f"{root}: dono {st.st_uid}, modo {stat.S_IMODE(st.st_mode):o} — "
+                      f"exige o nosso usuário e 0700")
+
+
+class Registry:
+    def __init__(self, root: str, max_bytes: int = 256 << 20, max_maps: int = 1024):
+        self.root = root
+        self.max_bytes = max_bytes
+        self.max_maps = max_maps
+        # chave -> (mmap, memoryview), LRU. Sair daqui só solta a NOSSA referência: quem
+        # ainda usa a memoryview (um substrato vivo) segura o mapa até terminar.
+        self._maps = OrderedDict()
+        self._since_sweep = 0
+        self.hits = self.misses = self.publishes = 0
+        _own_private_dir(root)
+
+    def _path(self, key: str) -> str:
+        if not _SAFE.match(key):
+            key = hashlib.blake2b(key.encode("utf-8"), digest_size=16).hexdigest()
+        return os.path.join(self.root, key)
+
+    def _map(self, key: str, path: str):
+        try:
+            with open(path, "rb") as f:
+                if os.fstat(f.fileno()).st_size == 0:
+                    return None
+                mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            return None
+        mv = memoryview(mm)
+        self._maps[key] = (mm, mv)
+        while len(self._maps) > self.max_maps:
+            self._maps.popitem(last=False)
+        return mv
+
+    def get(self, key: str):
+        """memoryview (só leitura, sem cópia) da entrada, ou None se ninguém publicou."""
+        hit = self._maps.get(key)
+        if hit is not None:
+            self._maps.move_to_end(key)
+            self.hits += 1
+            return hit[1]
+        mv = self._map(key, self._path(key))
+        if mv is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+        return mv
+
+    def put(self, key: str, data) -> memoryview:
+        """Publica `data` sob `key` e devolve o mapeamento. Falha de disco nunca é erro:
+        devolve os próprios bytes (o processo segue com a cópia privada)."""
+        path = self._path(key)
+        try:
+            fd, tmp = tempfile.mkstemp(dir=self.root, prefix=_TMP)
+            with os.fdopen(fd, "wb") as f:
+                f.write(data)
+            os.replace(tmp, path)
+        except OSError:
+            return memoryview(bytes(data))
+        self.publishes += 1
+        self._since_sweep += 1
+        if self._since_sweep >= _SWEEP_EVERY:
+            self._sweep()
+        return self._map(key, path) or memoryview(bytes(data))
+
+    def get_or_build(self, key: str, build):
+        """A entrada publicada, ou build() -> bytes publicado agora (o primeiro processo paga)."""
+        mv = self.get(key)
+        return mv if mv is not None else self.put(key, build())
+
+    def _sweep(self) -> None:
+        """Teto: apaga as mais velhas (mtime). Fixas (PIN) contam no total mas ficam; o
+        temporário de outro processo publicando fica (só o abandonado há uma hora sai)."""
+        self._since_sweep = 0
+        now = time.time()
+        ents, total = [], 0
+        try:
+            for e in os.scandir(self.root):
+                if not e.is_file(follow_symlinks=False):
+                    continue
+                st = e.stat(follow_symlinks=False)
+                if e.name.startswith(_TMP):
+                    if now - st.st_mtime > _TMP_STALE_S:
+                        try:
+                            os.unlink(e.path)
+                        except OSError:
+                            pass
+                    continue
+                total += st.st_size
+                if not e.name.startswith(PIN):
+                    ents.append((st.st_mtime, st.st_size, e.path))
+        except OSError:
+            return
+        for _, size, path in sorted(ents):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.unlink(path)
+            except OSError:
+                pass
+            total -= size
+
+    def stats(self) -> dict:
+        tot = self.hits + self.misses
+        return {"root": self.root, "hits": self.hits, "misses": self.misses,
+                "hit_rate": self.hits / tot if tot else 0.0, "publishes": self.publishes,
+                "mapped_entries": len(self._maps),
+                "mapped_bytes": sum(len(mm) for mm, _ in self._maps.values())}
+
+
+_DEFAULT = None
+_REFUSED = False                 # a raiz foi recusada: avisa uma vez, não tenta de novo
+
+
+def default():
+    """O registro do host (REGENES_SHM=1), ou None — aí cada processo segue com o seu."""
+    global _DEFAULT, _REFUSED
+    if _DEFAULT is None and not _REFUSED and os.getenv("REGENES_SHM") == "1":
+        root = os.getenv("REGENES_SHM_DIR") or os.path.join(
+            "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir(),
+            f"regenes-{os.getuid() if hasattr(os, 'getuid') else 0}")
+        try:
+            _DEFAULT = Registry(root, int(os.getenv("REGENES_SHM_MAX_MB", "256")) << 20)
+        except OSError as e:
+            print(f"[shm] {e} — seguindo sem o registro compartilhado")
+            _REFUSED = True
+            return None
+    return _DEFAULT
@@ -0,0 +1,441 @@
+"""
+soak.py — CAPACIDADE e SOAK dos executores contra o mundo de mentira (fake_world.py).
+
+Quantas amebas um núcleo do Luna aguenta a 10 ticks/s? O executor segura por horas de
+nascimentos e mortes sem crescer? Até aqui a resposta era olho no log. Aqui vira número:
+
+  capacity  sobe o executor (host.py, host_hyper.py ou o combinado) com N amebas, preso num
+            núcleo (o event loop é single-thread: um processo = um núcleo), mede uma janela
+            e derruba; N dobra desde --start até falhar e depois bissecta entre o último que
+            aguentou e o primeiro que não. AGUENTA = no relógio do mundo, a fração de
+            decisões atrasadas fica <= --late (default 1%) e a vazão chega a 95% de N x --hz.
+  soak      um executor com N amebas por horas, com vidas curtas (--life) pra nascer e morrer
+            o tempo todo; a cada --every s, uma amostra: RSS, descritores abertos, os caches
+            do processo (PSF do cone, configs, pais, os de cada backend), atraso do loop, CPU
+            e a janela do mundo (decisão p50/p99, atrasos). No fim, as TENDÊNCIAS depois do
+            aquecimento: RSS por hora (mínimos quadrados), cache que ainda cresce no último
+            terço, descritor que vaza, deriva da latência (p99 do último terço / do primeiro)
+            — e os alertas. Soak de minutos só serve de fumaça: a inclinação é por hora.
+
+O executor roda como em produção (subprocesso, o mesmo argv dos hosts), com REGENES_ADMIN num
+unix socket (os números vêm do /metrics.json dele), REGENES_LOG_DIR no diretório da rodada e
+REGENES_TELEMETRY=0 (vida de mentira não entra na curva de complexidade). O mundo roda neste
+processo; com mais de um núcleo, fica fora do núcleo do executor.
+
+Uso:
+    python soak.py capacity [--species native|hyper|both] [--hz 10] [--late 0.01]
+                            [--start 8] [--max 512] [--step-s 20] [--warmup-s 10]
+    python soak.py soak [--species ...] [--n 32] [--hz 10] [--hours 4] [--every 60] [--life 200]
+    Sai um JSON (meta, parâmetros, medidas, veredito) em logs/soak-<data-hora>/<modo>.json
+    (ou --out; '-' = stdout). Código de saída 1: capacity em que nem 1 ameba aguentou; soak
+    com alerta ou com o executor caído.
+"""
+import argparse
+import asyncio
+import json
+import os
+import signal
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+import runtime_stats
+import supervisor as sup
+from fake_world import FakeWorld
+
+LATE = 0.01                      # fração de decisões atrasadas tolerada
+RATE_SLACK = 0.05                # vazão mínima: 95% de N x hz
+RESOLUTION = 0.1                 # a bissecção para quando o intervalo cabe em 10% do N
+
+
+def command(species: str, n: int, url: str):
+    """-> (argv, cwd) do executor de `species` com `n` amebas (both: metade de cada)."""
+    if species == "both":
+        return ([sys.executable, "-u", "executor.py", "--native", str(n - n // 2),
+                 "--hyper", str(n // 2), url], os.path.join(sup.ROOT, "client_native"))
+    cwd, script = sup.SPECIES[species]
+    return [sys.executable, "-u", script, str(n), url], cwd
+
+
+def cores():
+    """(núcleo do executor, núcleos do mundo) — com um núcleo só, dividem (None, None)."""
+    cs = sup.available_cores()
+    if len(cs) < 2 or not hasattr(os, "sched_setaffinity"):
+        return None, None
+    return cs[0], set(cs[1:])
+
+
+class Target:
+    """Um executor sob medida: subprocesso (preso em `core`), números pelo admin dele."""
+
+    def __init__(self, species: str, n: int, url: str, work_dir: str, core=None):
+        self.species, self.n, self.url, self.core = species, n, url, core
+        self.work_dir = work_dir
+        self.log_path = os.path.join(work_dir, f"{species}-{n}.log")
+        self.sock = os.path.join(tempfile.gettempdir(), f"rg-soak-{os.getpid()}-{n}.sock")
+        self.proc = None
+        self._cpu_prev = None
+
+    def start(self) -> None:
+        argv, cwd = command(self.species, self.n, self.url)
+        env = dict(os.environ, REGENES_ADMIN="unix:" + self.sock,
+                   REGENES_LOG_DIR=self.work_dir, REGENES_TELEMETRY="0")
+        with open(self.log_path, "ab") as log:
+            self.proc = subprocess.Popen(argv, cwd=cwd, env=env, stdout=log,
+                                         stderr=subprocess.STDOUT, start_new_session=True,
+                                         preexec_fn=sup.pin_to(self.core))
+        self._cpu_prev = None
+
+    @property
+    def exit_code(self):
+        return None if self.proc is None else self.proc.poll()
+
+    def cpu_percent(self):
+        """CPU desde a leitura anterior (%; None na primeira)."""
+        cpu, now = sup._cpu_seconds(self.proc.pid), time.monotonic()
+        if cpu is None:
+            return None
+        prev, self._cpu_prev = self._cpu_prev, (cpu, now)
+        if prev is None or now <= prev[1]:
+            return None
+        return round(100.0 * (cpu - prev[0]) / (now - prev[1]), 1)
+
+    async def metrics(self, timeout: float = 5.0):
+        """O /metrics.json do executor (None se não respondeu)."""
+        try:
+            r, w = await asyncio.wait_for(asyncio.open_unix_connection(self.sock), timeout)
+            try:
+                w.write(b"GET /metrics.json HTTP/1.0\r\n\r\n")
+                data = await asyncio.wait_for(r.read(), timeout)
+            finally:
+                w.close()
+            return json.loads(data.split(b"\r\n\r\n", 1)[1])
+        except (OSError, asyncio.TimeoutError, ValueError, IndexError):
+            return None
+
+    async def stop(self, world: FakeWorld, grace: float = 10.0) -> None:
+        """Drena (SIGTERM) e derruba as conexões no mundo; passou `grace`, SIGKILL."""
+        if self.proc is None:
+            return
+        if self.proc.poll() is None:
+            self.proc.send_signal(signal.SIGTERM)
+            end = time.monotonic() + grace
+            while self.proc.poll() is None and time.monotonic() < end:
+                await asyncio.sleep(0.3)     # quem reconectou antes do sinal chegar cai aqui
+                await world.kill_all()
+            if self.proc.poll() is None:
+                self.proc.kill()
+            self.proc.wait()
+        await world.kill_all()
+
+
+def executor_numbers(m) -> dict:
+    """O que interessa do /metrics.json numa medida (tudo None sem o admin)."""
+    m = m or {}
+    loop = m.get("loop") or {}
+    return {"rss_bytes": m.get("rss_bytes"), "open_fds": m.get("open_fds"),
+            "tick_p99_ms": {sp: (s.get("tick_ms") or {}).get("p99")
+                            for sp, s in (m.get("species") or {}).items()},
+            "loop_lag_p99_ms": (loop.get("lag_ms") or {}).get("p99"),
+            "loop_stalls": loop.get("stalls"),
+            "shed_level": (m.get("shed") or {}).get("level"),
+            "caches": {name: {"entries": c.get("entries", c.get("ready")),
+                              "max_entries": c.get("max_entries"), "bytes": c.get("bytes")}
+                       for name, c in (m.get("caches") or {}).items()}}
+
+
+# --- capacidade ---------------------------------------------------------------------------------
+
+async def measure(world: FakeWorld, species: str, n: int, work_dir: str, core=None,
+                  step_s: float = 20.0, warmup_s: float = 10.0, late: float = LATE) -> dict:
+    """Uma medida: N amebas no ar, aquece, janela de `step_s` s -> a linha do relatório."""
+    t = Target(species, n, world.address, work_dir, core)
+    t.start()
+    try:
+        t0 = time.monotonic()
+        while (world.alive < n and t.exit_code is None
+               and time.monotonic() - t0 < max(30.0, 3 * warmup_s)):
+            await asyncio.sleep(0.1)
+        up_s = round(time.monotonic() - t0, 2)
+        await asyncio.sleep(warmup_s)
+        world.reset()
+        t.cpu_percent()
+        await asyncio.sleep(step_s)
+        w = world.snapshot()
+        cpu = t.cpu_percent()
+        ex = executor_numbers(await t.metrics())
+        crashed = t.exit_code
+    finally:
+        await t.stop(world)
+    expected = n * world.tick_hz
+    ok = (crashed is None and w["late_frac"] is not None and w["late_frac"] <= late
+          and w["ticks_per_s"] >= (1 - RATE_SLACK) * expected)
+    return {"n": n, "ok": ok, "up_s": up_s, "cpu_pct": cpu,
+            "expected_ticks_per_s": expected, "world": w, "executor": ex,
+            "exit": crashed, "log": t.log_path}
+
+
+async def search(probe, start: int, hi: int, resolution: float = RESOLUTION) -> dict:
+    """Maior N em que `probe(n)` aguenta: dobra desde `start` até falhar (ou chegar a `hi`),
+    depois bissecta entre o último que aguentou e o primeiro que não."""
+    steps, ok_n, bad_n, n = [], 0, None, max(1, start)
+    while True:
+        row = await probe(n)
+        steps.append(row)
+        if not row["ok"]:
+            bad_n = n
+            break
+        ok_n = n
+        if n >= hi:
+            break
+        n = min(2 * n, hi)
+    while bad_n is not None and bad_n - ok_n > max(1, int(ok_n * resolution)):
+        n = (ok_n + bad_n) // 2
+        row = await probe(n)
+        steps.append(row)
+        ok_n, bad_n = (n, bad_n) if row["ok"] else (ok_n, n)
+    return {"max_ok": ok_n, "first_fail": bad_n, "capped": bad_n is None, "steps": steps}
+
+
+async def capacity(species: str = "native", hz: float = 10.0, late: float = LATE,
+                   deadline_ms: float = None, start: int = 8, hi: int = 512,
+                   step_s: float = 20.0, warmup_s: float = 10.0, life: int = 600,
+                   work_dir: str = None, log=print) -> dict:
+    """A busca inteira -> relatório (JSON-serializável)."""
+    work_dir = work_dir or _work_dir()
+    world = FakeWorld(hz, deadline_ms, life)
+    await world.start()
+    ex_core, world_cores = cores()
+    prev_aff = _pin_self(world_cores)
+
+    async def probe(n):
+        row = await measure(world, species, n, work_dir, ex_core, step_s, warmup_s, late)
+        w = row["world"]
+        log(f"[soak] N={n}: {w['ticks_per_s']} ticks/s (de {row['expected_ticks_per_s']:g}), "
+            f"atrasadas {100 * (w['late_frac'] or 0):.2f}%, decisão p99 "
+            f"{w['decision_ms']['p99']} ms, CPU {row['cpu_pct']}% -> "
+            f"{'aguenta' if row['ok'] else 'NÃO aguenta'}")
+        return row
+    try:
+        found = await search(probe, start, hi)
+    finally:
+        _pin_self(prev_aff)
+        await world.close()
+    return {"mode": "capacity", "meta": _meta(),
+            "params": {"species": species, "tick_hz": hz, "late_max": late,
+                       "deadline_ms": round(world.deadline * 1000, 3), "start": start,
+                       "max": hi, "step_s": step_s, "warmup_s": warmup_s, "life_ticks": life,
+                       "rate_slack": RATE_SLACK},
+            "cores": {"executor": ex_core, "world": sorted(world_cores) if world_cores else None,
+                      "shared": ex_core is None},
+            "max_amebas": found["max_ok"], "first_fail": found["first_fail"],
+            "capped": found["capped"],
+            # um executor = um event loop = um núcleo: o máximo do processo é o por núcleo
+            "amebas_per_core": found["max_ok"],
+            "ticks_per_core_s": round(found["max_ok"] * hz, 1),
+            "steps": found["steps"], "work_dir": work_dir}
+
+
+# --- soak ---------------------------------------------------------------------------------------
+
+def _slope(xs, ys):
+    """Inclinação dos mínimos quadrados (None com menos de 2 pontos)."""
+    if len(xs) < 2:
+        return None
+    mx, my = statistics.fmean(xs), statistics.fmean(ys)
+    den = sum((x - mx) ** 2 for x in xs)
+    return sum((x - mx) * (y - my) for x, y in zip(xs, ys)) / den if den else None
+
+
+def trend(samples: list, warmup: float = 0.1, rss_mb_per_h: float = 16.0,
+          drift: float = 1.5, fd_slack: int = 4) -> dict:
+    """Amostras do soak -> tendências depois do aquecimento (os primeiros `warmup` do tempo) e
+    os alertas: RSS subindo mais que `rss_mb_per_h`, descritores acima do começo + `fd_slack`,
+    cache que ainda cresce no último terço (e não é o teto dele), p99 da decisão `drift`
+    vezes o do começo."""
+    if not samples:
+        return {"samples": 0, "alerts": ["sem amostras"]}
+    t_end = samples[-1]["t_s"]
+    s = [x for x in samples if x["t_s"] >= warmup * t_end] or samples[-1:]
+    k = max(1, len(s) // 3)
+    head, tail = s[:k], s[-k:]
+    alerts = []
+
+    pts = [(x["t_s"], x["rss_bytes"]) for x in s if x.get("rss_bytes") is not None]
+    slope = _slope([p[0] for p in pts], [p[1] for p in pts])
+    rss_h = None if slope is None else round(slope * 3600 / 2 ** 20, 2)
+    if rss_h is not None and rss_h > rss_mb_per_h:
+        alerts.append(f"rss: +{rss_h} MB/h")
+
+    fds = [x["open_fds"] for x in s if x.get("open_fds") is not None]
+    fd = {"first": fds[0], "last": fds[-1], "max": max(fds)} if fds else None
+    if fd and fd["last"] > fd["first"] + fd_slack:
+        alerts.append(f"fds: {fd['first']} -> {fd['last']}")
+
+    caches = {}
+    for name in sorted({c for x in s for c in (x.get("caches") or {})}):
+        def top(part, key="entries"):
+            v = [((x.get("caches") or {}).get(name) or {}).get(key) for x in part]
+            v = [e for e in v if e is not None]
+            return max(v) if v else None
+        first, last, cap = top(head), top(tail), top(tail, "max_entries")
+        if first is None or last is None:
+            continue
+        growing = len(s) >= 3 and last > first and (cap is None or last < cap)
+        caches[name] = {"first": first, "last": last, "growing": growing}
+        if growing:
+            alerts.append(f"cache {name}: {first} -> {last} entradas")
+
+    def p99(part):
+        v = [x["world"]["decision_ms"]["p99"] for x in part
+             if x["world"]["decision_ms"]["p99"] is not None]
+        return round(statistics.median(v), 3) if v else None
+    d0, d1 = p99(head), p99(tail)
+    ratio = round(d1 / d0, 3) if d0 and d1 is not None else None
+    if ratio is not None and len(s) >= 3 and ratio > drift and d1 - d0 > 1.0:
+        alerts.append(f"latência: p99 {d0} -> {d1} ms")
+
+    ticks = sum(x["world"]["ticks"] for x in s)
+    late = sum(x["world"]["late"] for x in s)
+    return {"samples": len(s), "span_h": round((s[-1]["t_s"] - s[0]["t_s"]) / 3600, 3),
+            "rss_mb_per_hour": rss_h,
+            "rss_mb": {"first": _mb(pts[0][1]), "last": _mb(pts[-1][1])} if pts else None,
+            "open_fds": fd, "caches": caches,
+            "decision_p99_ms": {"first": d0, "last": d1, "drift": ratio},
+            "late_frac": round(late / ticks, 5) if ticks else None,
+            "births": sum(x["world"]["births"] for x in s),
+            "deaths": sum(x["world"]["deaths"] for x in s), "alerts": alerts}
+
+
+async def soak(species: str = "native", n: int = 32, hz: float = 10.0,
+               duration_s: float = 4 * 3600, every_s: float = 60.0, life: int = 200,
+               deadline_ms: float = None, work_dir: str = None, out: str = None,
+               log=print) -> dict:
+    """Um executor por `duration_s` s -> relatório (gravado em `out` a cada amostra: o soak de
+    horas que cair no meio deixa o que já mediu)."""
+    work_dir = work_dir or _work_dir()
+    world = FakeWorld(hz, deadline_ms, life)
+    await world.start()
+    ex_core, world_cores = cores()
+    prev_aff = _pin_self(world_cores)
+    t = Target(species, n, world.address, work_dir, ex_core)
+    rep = {"mode": "soak", "meta": _meta(),
+           "params": {"species": species, "n": n, "tick_hz": hz,
+                      "deadline_ms": round(world.deadline * 1000, 3), "duration_s": duration_s,
+                      "every_s": every_s, "life_ticks": life},
+           "cores": {"executor": ex_core, "world": sorted(world_cores) if world_cores else None,
+                     "shared": ex_core is None},
+           "samples": [], "work_dir": work_dir}
+    t.start()
+    t0 = time.monotonic()
+    world.reset()
+    t.cpu_percent()
+    try:
+        while t.exit_code is None:
+            left = duration_s - (time.monotonic() - t0)
+            if left <= 0:
+                break
+            await asyncio.sleep(min(every_s, left))
+            w = world.snapshot(reset=True)
+            x = executor_numbers(await t.metrics())
+            x.update(t_s=round(time.monotonic() - t0, 1), cpu_pct=t.cpu_percent(), world=w)
+            rep["samples"].append(x)
+            log(f"[soak] {x['t_s']:.0f}s: {w['alive']} no ar, {w['ticks_per_s']} ticks/s, "
+                f"p99 {w['decision_ms']['p99']} ms, atrasadas {w['late']}, "
+                f"RSS {_mb(x['rss_bytes'])} MB, fds {x['open_fds']}, CPU {x['cpu_pct']}%")
+            if out:
+                runtime_stats.write_json(out, rep)
+        rep["exit"] = t.exit_code
+    finally:
+        await t.stop(world)
+        _pin_self(prev_aff)
+        await world.close()
+    rep["world_totals"] = dict(world.totals)
+    rep["trend"] = trend(rep["samples"])
+    if rep["exit"] is not None:
+        rep["trend"]["alerts"].insert(0, f"executor saiu com código {rep['exit']}")
+    if out:
+        runtime_stats.write_json(out, rep)
+    return rep
+
+
+# --- miúdos -------------------------------------------------------------------------------------
+
+def _mb(v):
+    return None if v is None else round(v / 2 ** 20, 1)
+
+
+def _pin_self(cpus):
+    """Prende este processo (o mundo) em `cpus` -> a afinidade anterior (pra devolver)."""
+    if not cpus or not hasattr(os, "sched_setaffinity"):
+        return None
+    prev = os.sched_getaffinity(0)
+    try:
+        os.sched_setaffinity(0, cpus)
+    except OSError:
+        return None
+    return prev
+
+
+def _work_dir() -> str:
+    d = os.path.join(sup.LOG_DIR, f"soak-{time.strftime('%Y%m%d-%H%M%S')}")
+    os.makedirs(d, exist_ok=True)
+    return d
+
+
+def _meta() -> dict:
+    from bench_suite import meta             # o mesmo carimbo dos microbenchmarks
+    return meta()
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Capacidade e soak do executor (mundo de mentira)")
+    sub = ap.add_subparsers(dest="mode", required=True)
+    for name in ("capacity", "soak"):
+        p = sub.add_parser(name)
+        p.add_argument("--species", choices=("native", "hyper", "both"), default="native")
+        p.add_argument("--hz", type=float, default=10.0, help="ticks/s por ameba (10)")
+        p.add_argument("--deadline-ms", type=float, default=None,
+                       help="decisão mais lenta que isto é atrasada (default: o período)")
+        p.add_argument("--out", default=None, help="JSON do relatório; '-' = stdout")
+        p.add_argument("--work-dir", default=None, help="logs dos executores (logs/soak-...)")
+    cap, sk = sub.choices["capacity"], sub.choices["soak"]
+    cap.add_argument("--late", type=float, default=LATE, help="atrasadas toleradas (0.01)")
+    cap.add_argument("--start", type=int, default=8)
+    cap.add_argument("--max", type=int, default=512)
+    cap.add_argument("--step-s", type=float, default=20.0, help="janela de cada medida (20)")
+    cap.add_argument("--warmup-s", type=float, default=10.0)
+    cap.add_argument("--life", type=int, default=600, help="ticks por vida (600)")
+    sk.add_argument("--n", type=int, default=32)
+    sk.add_argument("--hours", type=float, default=4.0)
+    sk.add_argument("--every", type=float, default=60.0, help="segundos entre amostras (60)")
+    sk.add_argument("--life", type=int, default=200, help="ticks por vida (200)")
+    a = ap.parse_args(argv)
+    work_dir = a.work_dir or _work_dir()
+    os.makedirs(work_dir, exist_ok=True)
+    out = a.out or os.path.join(work_dir, f"{a.mode}.json")
+    log = (lambda s: print(s, file=sys.stderr))
+    if a.mode == "capacity":
+        rep = asyncio.run(capacity(a.species, a.hz, a.late, a.deadline_ms, a.start, a.max,
+                                   a.step_s, a.warmup_s, a.life, work_dir, log))
+        log(f"[soak] {a.species}: {rep['max_amebas']} amebas por núcleo a {a.hz:g} ticks/s "
+            f"(atrasadas <= {100 * a.late:g}%)" + (" — chegou no --max" if rep["capped"] else ""))
+        code = 0 if rep["max_amebas"] else 1
+    else:
+        rep = asyncio.run(soak(a.species, a.n, a.hz, a.hours * 3600, a.every, a.life,
+                               a.deadline_ms, work_dir, None if a.out == "-" else out, log))
+        for s in rep["trend"]["alerts"]:
+            log(f"[soak] ALERTA {s}")
+        code = 1 if rep["trend"]["alerts"] else 0
+    if a.out == "-":
+        print(json.dumps(rep, indent=1))
+    else:
+        runtime_stats.write_json(out, rep)
+        log(f"[soak] relatório em {out}")
+    return code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,109 @@
+"""
+startup.py — cronômetro da PARTIDA a frio de um executor (compartilhado pelos hosts).
+
+Reiniciar os executores (stop_luna.sh + start_luna.sh) tira as amebas do ar até cada
+processo: subir o Python, importar (neat, websockets, numpy), parsear o config, aquecer os
+caches quentes, conectar e devolver a PRIMEIRA ação. Este módulo mede essas fases, todas
+em segundos desde o topo do script do host (o `t0` que ele passa):
+
+  boot      — do exec do processo até o topo do script (interpretador + site), via /proc;
+              None fora do Linux
+  import    — imports do host prontos
+  warm      — aquecimento feito (config, reservatório primordial, tabelas) — antes do 1º connect
+  connect   — WELCOME recebido: da 1ª ameba e de TODAS as N
+  action    — 1ª ação enviada: da 1ª ameba e de TODAS as N (= tempo fora do ar na partida)
+
+Sempre ligado (custa um dict por tick); imprime UMA linha quando as N agiram. Com
+`--measure-startup` o host imprime o relatório em JSON e sai — pra comparar partidas.
+"""
+import asyncio
+import json
+import os
+import time
+
+
+def _boot_seconds(t0: float):
+    """Tempo do exec do processo até t0 (resolução do relógio do kernel, ~10 ms)."""
+    try:
+        with open("/proc/self/stat", "rb") as f:
+            start_ticks = int(f.read().rsplit(b")", 1)[1].split()[19])
+        with open("/proc/uptime", "rb") as f:
+            uptime = float(f.read().split()[0])
+    except (OSError, ValueError, IndexError):
+        return None
+    alive_at_t0 = uptime - start_ticks / os.sysconf("SC_CLK_TCK") - (time.perf_counter() - t0)
+    return max(0.0, alive_at_t0)
+
+
+class StartupClock:
+    def __init__(self, n: int, t0: float):
+        self.n = n
+        self.t0 = t0
+        self.boot = _boot_seconds(t0)
+        self.phases = {}                 # fase -> segundos desde t0 (primeira marcação vale)
+        self.connects = {}               # ameba -> 1º WELCOME
+        self.actions = {}                # ameba -> 1ª ação
+        self.done = False
+        self._event = None
+
+    def mark(self, phase: str) -> None:
+        self.phases.setdefault(phase, time.perf_counter() - self.t0)
+
+    def connected(self, idx: int) -> None:
+        if idx not in self.connects:
+            self.connects[idx] = time.perf_counter() - self.t0
+
+    def acted(self, idx: int) -> None:
+        if self.done or idx in self.actions:
+            return
+        self.actions[idx] = time.perf_counter() - self.t0
+        if len(self.actions) >= self.n:
+            self.done = True
+            if self._event is not None:
+                self._event.set()
+
+    async def wait(self, timeout: float = None) -> bool:
+        """Espera as N primeiras ações (True) ou o timeout (False, relatório parcial)."""
+        if not self.done:
+            self._event = asyncio.Event()
+            try:
+                await asyncio.wait_for(self._event.wait(), timeout)
+            except asyncio.TimeoutError:
+                return False
+        return True
+
+    def report(self) -> dict:
+        c, a = sorted(self.connects.values()), sorted(self.actions.values())
+        return {"n": self.n, "boot_s": self.boot,
+                "import_s": self.phases.get("import"), "warm_s": self.phases.get("warm"),
+                "first_connect_s": c[0] if c else None,
+                "all_connected_s": c[-1] if len(c) >= self.n else None,
+                "first_action_s": a[0] if a else None,
+                "all_acted_s": a[-1] if len(a) >= self.n else None,
+                "connected": len(c), "acted": len(a)}
+
+    def summary(self) -> str:
+        r = self.report()
+
+        def s(v):
+            return "-" if v is None else f"{v:.2f}s"
+        return (f"boot {s(r['boot_s'])} | import {s(r['import_s'])} | warm {s(r['warm_s'])} | "
+                f"connect {s(r['first_connect_s'])} (todas {s(r['all_connected_s'])}) | "
+                f"1ª ação {s(r['first_action_s'])} (todas {s(r['all_acted_s'])}) "
+                f"[{r['acted']}/{r['n']}]")
+
+
+async def measure(clock: StartupClock, tasks, timeout: float = None) -> dict:
+    """--measure-startup: espera as N primeiras ações (teto REGENES_STARTUP_TIMEOUT, 120 s),
+    encerra as amebas e imprime o relatório em UMA linha JSON (fácil de juntar em série)."""
+    if timeout is None:
+        timeout = float(os.getenv("REGENES_STARTUP_TIMEOUT", "120"))
+    complete = await clock.wait(timeout)
+    tasks.cancel()
+    try:
+        await tasks
+    except asyncio.CancelledError:
+        pass
+    rep = dict(clock.report(), complete=complete)
+    print(json.dumps(rep))
+    return rep
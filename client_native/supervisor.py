@@ -0,0 +1,398 @@
+"""
+supervisor.py — sobe, prende em núcleo, vigia e DRENA os executores Fase 2.
+
+Substitui o nohup + pkill do start_luna.sh/stop_luna.sh, que subia exatamente um processo
+nativo e um HyperNEAT, sem núcleo fixo, sem reinício (executor que caía ficava caído até
+alguém olhar o log) e parava tudo no meio da vida das amebas.
+
+Aqui:
+  · PLANO: N amebas por espécie viram workers de até --per-worker amebas cada; cada worker
+    vai pro núcleo com MENOS amebas já atribuídas (os.sched_setaffinity). O event loop de
+    um executor é single-thread: dois workers no mesmo núcleo disputam, um worker por
+    núcleo escala.
+  · REINÍCIO: worker que sai sem ter sido mandado volta sozinho, com backoff exponencial
+    (1 s, 2 s, 4 s… teto de 60 s). Ficou de pé mais de 60 s antes de cair, o backoff zera:
+    crash esporádico não acumula castigo; crash em laço não martela o mundo.
+  · DRENAGEM: SIGTERM/Ctrl+C no supervisor -> SIGTERM em cada worker -> cada ameba termina
+    a vida em curso e não reconecta (host.py/_drain). Passou REGENES_DRAIN_TIMEOUT
+    (default 120 s) ou veio um segundo sinal: SIGKILL no que sobrou.
+  · STATUS: cada worker grava seus números (runtime_stats.py) e o supervisor junta tudo,
+    mais a CPU de cada processo lida do /proc, em logs/status.json.
+
+Uso:
+    python supervisor.py run [--native N] [--hyper M] [--ws URL] [--per-worker K] [--cores 0-3,6]
+    python supervisor.py status          # a visão agregada (lê logs/status.json)
+    python supervisor.py stop [--wait]   # SIGTERM no supervisor: drena e sai
+"""
+import argparse
+import json
+import os
+import signal
+import subprocess
+import sys
+import time
+
+import runtime_stats
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LOG_DIR = os.getenv("REGENES_LOG_DIR") or os.path.join(ROOT, "logs")
+DRAIN_TIMEOUT = float(os.getenv("REGENES_DRAIN_TIMEOUT", "120"))
+
+# espécie -> (diretório, script). O script recebe [N] [ws_base], como sempre recebeu.
+SPECIES = {
+    "native": (os.path.join(ROOT, "client_native"), "host.py"),
+    "hyper": (os.path.join(ROOT, "client_hyperneat"), "host_hyper.py"),
+}
+
+BACKOFF_BASE = 1.0
+BACKOFF_MAX = 60.0
+STABLE_S = 60.0                  # de pé há mais que isto = o crash não foi em laço
+POLL_S = 0.5
+STATUS_EVERY = 2.0
+
+
+def parse_cores(spec: str) -> list:
+    """'0-3,6' -> [0, 1, 2, 3, 6]."""
+    cores = set()
+    for part in spec.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        lo, _, hi = part.partition("-")
+        cores.update(range(int(lo), int(hi or lo) + 1))
+    return sorted(cores)
+
+
+def available_cores() -> list:
+    if hasattr(os, "sched_getaffinity"):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+def backoff(fails: int) -> float:
+    return min(BACKOFF_MAX, BACKOFF_BASE * 2 ** max(0, fails - 1))
+
+
+def _cpu_seconds(pid: int):
+    """utime+stime do processo (s), do /proc; None fora do Linux."""
+    try:
+        with open(f"/proc/{pid}/stat", "rb") as f:
+            fields = f.read().rsplit(b")", 1)[1].split()
+        return (int(fields[11]) + int(fields[12])) / os.sysconf("SC_CLK_TCK")
+    except (OSError, ValueError, IndexError):
+        return None
+
+
+def pin_to(core):
+    """preexec_fn que prende o FILHO em `core` antes do exec (None sem núcleo). Preso de
+    fora, depois do Popen, só a thread principal ficaria no núcleo — e as que o filho abre
+    cedo (o pool do BLAS no `import numpy` com REGENES_BATCH=1) correriam soltas; preso
+    antes do exec, toda thread já nasce presa."""
+    if core is None or not hasattr(os, "sched_setaffinity"):
+        return None
+
+    def pin():
+        try:
+            os.sched_setaffinity(0, {core})
+        except OSError:
+            pass                             # núcleo sumiu (cgroup mudou): roda solto
+    return pin
+
+
+class Worker:
+    """Um processo executor: espécie, quantas amebas, núcleo, e o histórico de reinícios."""
+
+    def __init__(self, name: str, species: str, n: int, core=None):
+        self.name = name
+        self.species = species
+        self.n = n
+        self.core = core
+        self.proc = None
+        self.started_at = None
+        self.restarts = 0
+        self.fails = 0
+        self.next_start = 0.0
+        self.last_exit = None
+        self._cpu_prev = None                # (cpu s, relógio) da última leitura
+
+    def status_file(self, log_dir: str) -> str:
+        return os.path.join(log_dir, "status", f"{self.name}.json")
+
+    def start(self, ws: str, log_dir: str) -> None:
+        cwd, script = SPECIES[self.species]
+        env = dict(os.environ, REGENES_STATUS_FILE=self.status_file(log_dir))
+        log = open(os.path.join(log_dir, f"{self.name}.log"), "ab")
+        try:
+            # sessão própria: o Ctrl+C do terminal chega só no supervisor, que drena
+            self.proc = subprocess.Popen([sys.executable, "-u", script, str(self.n), ws],
+                                         cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT,
+                                         start_new_session=True, preexec_fn=pin_to(self.core))
+        finally:
+            log.close()
+        self.started_at = time.monotonic()
+        self._cpu_prev = None
+        print(f"[sup] {self.name} pid {self.proc.pid} N={self.n} núcleo={self.core}")
+
+    def reap(self, now: float, restart: bool = True) -> bool:
+        """True se o processo saiu (e, com `restart`, agenda o reinício com backoff)."""
+        if self.proc is None or self.proc.poll() is None:
+            return False
+        code, up = self.proc.returncode, now - self.started_at
+        self.proc = None
+        self.last_exit = code
+        if not restart:
+            print(f"[sup] {self.name} saiu (código {code}) após {up:.0f}s")
+            return True
+        self.fails = 1 if up >= STABLE_S else self.fails + 1
+        delay = backoff(self.fails)
+        self.next_start = now + delay
+        print(f"[sup] {self.name} saiu (código {code}) após {up:.0f}s; reinicia em {delay:.0f}s")
+        return True
+
+    def cpu_percent(self, now: float):
+        if self.proc is None:
+            return None
+        cpu = _cpu_seconds(self.proc.pid)
+        if cpu is None:
+            return None
+        prev, self._cpu_prev = self._cpu_prev, (cpu, now)
+        if prev is None or now <= prev[1]:
+            return None
+        return round(100.0 * (cpu - prev[0]) / (now - prev[1]), 1)
+
+
+def plan(counts: dict, per_worker: int, cores: list) -> list:
+    """{espécie: amebas} -> workers de até `per_worker` amebas, divididos por igual e cada
+    um preso no núcleo com menos amebas já atribuídas (núcleo None se não há lista)."""
+    load = {c: 0 for c in cores}
+    workers = []
+    for species, n in counts.items():
+        if n <= 0:
+            continue
+        k = min(n, max(1, -(-n // max(1, per_worker))))
+        base, extra = divmod(n, k)
+        for i in range(k):
+            m = base + (1 if i < extra else 0)
+            core = min(load, key=lambda c: (load[c], c)) if load else None
+            if core is not None:
+                load[core] += m
+            workers.append(Worker(f"{species}-{i}", species, m, core))
+    return workers
+
+
+class Supervisor:
+    def __init__(self, workers: list, ws: str, log_dir: str = LOG_DIR,
+                 drain_timeout: float = DRAIN_TIMEOUT):
+        self.workers = workers
+        self.ws = ws
+        self.log_dir = log_dir
+        self.drain_timeout = drain_timeout
+        self.stopping = False
+        self.state = "running"
+        self._signals = 0
+        self._prev_ticks = {}                # worker -> (ticks, relógio)
+        self._last_status = 0.0
+        os.makedirs(os.path.join(log_dir, "status"), exist_ok=True)
+
+    def _on_signal(self, *_):
+        self._signals += 1
+        self.stopping = True
+
+    def step(self, now: float) -> None:
+        """Uma volta da vigília: colhe quem saiu, sobe quem está na hora, grava o status."""
+        for w in self.workers:
+            w.reap(now, restart=not self.stopping)
+            if w.proc is None and not self.stopping and now >= w.next_start:
+                if w.started_at is not None:
+                    w.restarts += 1
+                w.start(self.ws, self.log_dir)
+        if now - self._last_status >= STATUS_EVERY:
+            self._last_status = now
+            runtime_stats.write_json(os.path.join(self.log_dir, "status.json"),
+                                     self.status(now))
+
+    def drain(self) -> None:
+        """SIGTERM em todos; espera as vidas em curso; SIGKILL no que passar do prazo."""
+        self.stopping, self.state = True, "draining"
+        live = [w for w in self.workers if w.proc is not None]
+        print(f"[sup] drenando {len(live)} workers (prazo {self.drain_timeout:.0f}s)")
+        for w in live:
+            try:
+                w.proc.send_signal(signal.SIGTERM)
+            except OSError:
+                pass
+        signals_at_start = self._signals
+        deadline = time.monotonic() + self.drain_timeout
+        while any(w.proc is not None and w.proc.poll() is None for w in live):
+            now = time.monotonic()
+            if now >= deadline or self._signals > signals_at_start:
+                break
+            self.step(now)
+            time.sleep(POLL_S)
+        for w in live:
+            if w.proc is not None and w.proc.poll() is None:
+                print(f"[sup] {w.name} não drenou a tempo: SIGKILL")
+                w.proc.kill()
+                w.proc.wait()
+        now = time.monotonic()
+        for w in live:
+            w.reap(now, restart=False)
+        self.state = "stopped"
+        runtime_stats.write_json(os.path.join(self.log_dir, "status.json"), self.status(now))
+
+    def run(self) -> None:
+        signal.signal(signal.SIGTERM, self._on_signal)
+        signal.signal(signal.SIGINT, self._on_signal)
+        pidfile = os.path.join(self.log_dir, "supervisor.pid")
+        with open(pidfile, "w") as f:
+            f.write(str(os.getpid()))
+        try:
+            while not self.stopping:
+                self.step(time.monotonic())
+                time.sleep(POLL_S)
+            self.drain()
+        finally:
+            try:
+                os.unlink(pidfile)
+            except OSError:
+                pass
+        print("[sup] encerrado")
+
+    def status(self, now: float) -> dict:
+        """Visão agregada: por worker (processo, núcleo, CPU, latência do tick) e por espécie."""
+        rows, species = [], {}
+        for w in self.workers:
+            st = {}
+            try:
+                with open(w.status_file(self.log_dir), encoding="utf-8") as f:
+                    st = json.load(f)
+            except (OSError, ValueError):
+                pass
+            if w.proc is None or st.get("pid") != w.proc.pid:
+                st = {}                      # status de uma encarnação anterior: não vale
+            ticks = st.get("ticks", 0)
+            prev = self._prev_ticks.get(w.name)
+            tps = (round((ticks - prev[0]) / (now - prev[1]), 1)
+                   if prev and now > prev[1] and ticks >= prev[0] else None)
+            self._prev_ticks[w.name] = (ticks, now)
+            # n = o alvo de vagas que o worker reporta (muda com REGENES_AUTOSCALE=1)
+            row = {"name": w.name, "species": w.species, "n": st.get("n", w.n), "core": w.core,
+                   "pid": w.proc.pid if w.proc else None,
+                   "up_s": round(now - w.started_at, 1) if w.proc else None,
+                   "restarts": w.restarts, "last_exit": w.last_exit,
+                   "cpu_pct": w.cpu_percent(now), "state": st.get("state", "starting"),
+                   "alive": st.get("alive", 0), "ticks_per_s": tps,
+                   "tick_ms": st.get("tick_ms", {}), "births": st.get("births", 0),
+                   "reconnects": st.get("reconnects", 0),
+                   "shed": (st.get("shed") or {}).get("name")}   # corte sob carga (governor.py)
+            rows.append(row)
+            agg = species.setdefault(w.species, {"workers": 0, "target": 0, "alive": 0,
+                                                 "ticks_per_s": 0.0, "cpu_pct": 0.0,
+                                                 "tick_p99_ms": None, "restarts": 0})
+            agg["workers"] += 1
+            agg["target"] += row["n"]
+            agg["alive"] += row["alive"]
+            agg["ticks_per_s"] = round(agg["ticks_per_s"] + (tps or 0.0), 1)
+            agg["cpu_pct"] = round(agg["cpu_pct"] + (row["cpu_pct"] or 0.0), 1)
+            agg["restarts"] += w.restarts
+            p99 = row["tick_ms"].get("p99")
+            if p99 is not None and (agg["tick_p99_ms"] is None or p99 > agg["tick_p99_ms"]):
+                agg["tick_p99_ms"] = p99     # pior worker: é ele que atrasa a ameba
+        return {"time": time.time(), "supervisor_pid": os.getpid(), "ws": self.ws,
+                "state": self.state, "species": species, "workers": rows}
+
+
+def format_status(st: dict) -> str:
+    def v(x, fmt="{}"):
+        return "-" if x is None else fmt.format(x)
+    lines = [f"ws {st.get('ws')}  supervisor pid {st.get('supervisor_pid')}  "
+             f"[{st.get('state')}]"]
+    for sp, a in st.get("species", {}).items():
+        lines.append(f"{sp:7s} {a['alive']}/{a['target']} vivas em {a['workers']} workers | "
+                     f"{a['ticks_per_s']} ticks/s | CPU {a['cpu_pct']}% | "
+                     f"p99 tick {v(a['tick_p99_ms'], '{:.1f}')} ms | reinícios {a['restarts']}")
+    lines.append(f"{'worker':10s} {'pid':>7s} {'núcleo':>6s} {'CPU%':>6s} {'vivas':>7s} "
+                 f"{'ticks/s':>8s} {'p50ms':>7s} {'p99ms':>7s} {'reinícios':>9s}  estado")
+    for r in st.get("workers", []):
+        t = r.get("tick_ms", {})
+        lines.append(f"{r['name']:10s} {v(r['pid']):>7s} {v(r['core']):>6s} "
+                     f"{v(r['cpu_pct']):>6s} {r['alive']:>3d}/{r['n']:<3d} "
+                     f"{v(r['ticks_per_s']):>8s} {v(t.get('p50'), '{:.1f}'):>7s} "
+                     f"{v(t.get('p99'), '{:.1f}'):>7s} {r['restarts']:>9d}  {r['state']}"
+                     + (f" (corte: {r['shed']})" if r.get("shed") not in (None, "normal") else ""))
+    return "\n".join(lines)
+
+
+def _read_pid(log_dir: str):
+    try:
+        with open(os.path.join(log_dir, "supervisor.pid")) as f:
+            return int(f.read().strip())
+    except (OSError, ValueError):
+        return None
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Supervisor dos executores Fase 2")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+    run = sub.add_parser("run")
+    run.add_argument("--native", type=int, default=int(os.getenv("N_NATIVE", "20")))
+    run.add_argument("--hyper", type=int, default=int(os.getenv("N_HYPER", "20")))
+    run.add_argument("--ws", default=os.getenv("REGENES_WS", "ws://127.0.0.1:8081"))
+    run.add_argument("--per-worker", type=int,
+                     default=int(os.getenv("REGENES_PER_WORKER", "20")))
+    run.add_argument("--cores", default=os.getenv("REGENES_CORES", ""))
+    sub.add_parser("status")
+    stop = sub.add_parser("stop")
+    stop.add_argument("--wait", action="store_true")
+    a = ap.parse_args(argv)
+
+    if a.cmd == "status":
+        try:
+            with open(os.path.join(LOG_DIR, "status.json"), encoding="utf-8") as f:
+                st = json.load(f)
+        except (OSError, ValueError):
+            print(f"sem status em {LOG_DIR} (supervisor nunca rodou aqui?)")
+            return 1
+        print(format_status(st))
+        return 0
+
+    if a.cmd == "stop":
+        pid = _read_pid(LOG_DIR)
+        if pid is None:
+            print("supervisor não está rodando")
+            return 0
+        try:
+            os.kill(pid, signal.SIGTERM)
+        except ProcessLookupError:
+            print("supervisor não está rodando (pidfile velho)")
+            return 0
+        print(f"SIGTERM -> supervisor {pid} (drenando)")
+        while a.wait and _read_pid(LOG_DIR) == pid:
+            try:
+                os.kill(pid, 0)
+            except ProcessLookupError:
+                break
+            time.sleep(0.5)
+        return 0
+
+    pid = _read_pid(LOG_DIR)
+    if pid is not None and pid != os.getpid():
+        try:
+            os.kill(pid, 0)
+            print(f"supervisor já rodando (pid {pid}); use 'stop' antes")
+            return 1
+        except ProcessLookupError:
+            pass
+        except PermissionError:
+            print(f"supervisor já rodando (pid {pid}, outro usuário)")
+            return 1
+    cores = parse_cores(a.cores) if a.cores else available_cores()
+    workers = plan({"native": a.native, "hyper": a.hyper}, a.per_worker, cores)
+    print(f"[sup] {a.native} nativas + {a.hyper} hyper em {len(workers)} workers, "
+          f"núcleos {cores} -> {a.ws}")
+    Supervisor(workers, a.ws).run()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
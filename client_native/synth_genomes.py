@@ -0,0 +1,77 @@
+"""
+synth_genomes.py — genomas SINTÉTICOS com o formato do brain_bank (benchmarks e testes).
+
+Os benchmarks do executor precisam de genomas com o tamanho e a textura dos de produção —
+muito tecido morto (split de conexão desligada, órfãos de crossover), inovações de 64 bits
+e ids de nó de mutação >= 100000 — sem depender de um dump do banco. Tudo DETERMINÍSTICO
+pela semente: o estado global do `random` (que o neat-python usa) é salvo e restaurado.
+
+Não é usado em produção; só `bench_*.py` e testes importam daqui.
+"""
+import random
+
+import neat_brain as nb
+
+
+def bank_like(seed: int, n_conns: int, disabled_frac: float = 0.3):
+    """Genoma com ~n_conns conexões, crescido pelos MESMOS operadores estruturais do executor.
+
+    Alterna split de nó (o _det_mutate_add_node instalado) e ligação nova, desliga uma
+    fração das conexões (o "cemitério" medido no banco) e perturba os pesos uma vez."""
+    cfg = nb.load_config()
+    gc = cfg.genome_config
+    estado = random.getstate()
+    random.seed(seed)
+    try:
+        g = nb.random_genome(seed)
+        tentativas = 0
+        while len(g.connections) < n_conns and tentativas < 20 * n_conns:
+            tentativas += 1
+            if random.random() < 0.35:
+                g.mutate_add_node(gc)
+            else:
+                g.mutate_add_connection(gc)
+        for cg in g.connections.values():
+            if random.random() < disabled_frac:
+                cg.enabled = False
+            cg.mutate(gc)
+        for ng in g.nodes.values():
+            ng.mutate(gc)
+        return g
+    finally:
+        random.setstate(estado)
+
+
+def bank_like_corpus(n: int, sizes=(60, 300, 900), seed: int = 0):
+    """n genomas cobrindo a faixa do banco (magro, mediano, inchado), em ciclo sobre `sizes`."""
+    return [bank_like(seed + k, sizes[k % len(sizes)]) for k in range(n)]
+
+
+def lineage_corpus(n: int, n_conns: int = 300, gens: int = 8, seed: int = 0):
+    """n genomas APARENTADOS: um pool bank_like cruzado+mutado por `gens` gerações, como o
+    banco (ids de nó de mutação, pares (in,out) e pesos herdados se repetem entre eles)."""
+    estado = random.getstate()
+    random.seed(seed)
+    try:
+        pool = [bank_like(seed + k, n_conns) for k in range(n)]
+        for ger in range(gens):
+            pool = [nb.mutate(nb.crossover(*random.sample(pool, 2), key=ger * n + i))
+                    for i in range(n)]
+        return pool
+    finally:
+        random.setstate(estado)
+
+
+def thin(seed: int, n_conns: int):
+    """Genoma MAGRO com exatamente n_conns conexões — abaixo do que o config inicial liga
+    (~114): o primordial com as ligações sorteadas que sobram removidas, os nós intactos."""
+    estado = random.getstate()
+    random.seed(seed)
+    try:
+        g = nb.random_genome(seed)
+        keys = sorted(g.connections)
+        for k in random.sample(keys, max(0, len(keys) - n_conns)):
+            del g.connections[k]
+        return g
+    finally:
+        random.setstate(estado)
@@ -0,0 +1,247 @@
+"""
+telemetry.py — a TELEMETRIA LOCAL dos executores, fora do event loop (compartilhado pelos hosts).
+
+Antes: a cada nascimento, o host abria o CSV, escrevia UMA linha e fechava — síncrono, no
+event loop, entre um tick e outro. E o arquivo crescia sem fim (a série v1 chegou a 148k
+linhas num arquivo só). Agora o host só ENFILEIRA o registro (record(): um append sob
+trava); uma thread de fundo grava em LOTES (a cada REGENES_TELEMETRY_FLUSH_S segundos, ou
+antes se a fila passar de `batch`) e RODA o arquivo:
+
+  · por tamanho — passou de REGENES_TELEMETRY_MAX_MB (default 64; 0 = nunca);
+  · por idade  — o arquivo corrente tem mais de REGENES_TELEMETRY_MAX_HOURS (default 0 = nunca).
+
+O arquivo rodado ganha carimbo no nome (native_telemetry_v2.20261019-142501.1234-0.csv:
+data, hora, pid de quem rodou e a conta de rotações dele) e o corrente recomeça com header.
+Vários workers no mesmo arquivo (supervisor.py) seguem seguros: cada lote é UM write() em
+modo append, e quem perde a corrida do rename só segue gravando no arquivo novo.
+
+Formato (REGENES_TELEMETRY_FORMAT):
+  csv  (default) — o de sempre, uma linha por registro, lido pelo DictReader.
+  bin  — COLUNAR e compacto: cada lote é um bloco autodescritivo (nome + typecode + coluna
+         `array`, little-endian — o mesmo esquema de coluna do blob v2 do neat_brain — e o
+         corpo em zlib), sem NumPy. read_blocks()/read_rows() leem de volta; com NumPy, um
+         bloco vira record array (to_records()).
+
+Sob carga, o governador do executor (governor.py) baixa o detalhe: com SAMPLE = k, cada
+Sink grava 1 a cada k registros e conta os pulados em `sampled_out` (as curvas seguem com a
+mesma forma, só mais ralas).
+
+Falha de disco nunca derruba o executor: o lote é descartado e conta em `dropped`. Fila
+cheia (disco travado) idem: descarta o MAIS ANTIGO. REGENES_TELEMETRY=0 desliga tudo.
+"""
+import atexit
+import os
+import struct
+import sys
+import threading
+import time
+import zlib
+from array import array
+
+ENABLED = os.getenv("REGENES_TELEMETRY", "1") != "0"
+FORMAT = os.getenv("REGENES_TELEMETRY_FORMAT", "csv")
+FLUSH_S = float(os.getenv("REGENES_TELEMETRY_FLUSH_S", "2"))
+MAX_BYTES = int(float(os.getenv("REGENES_TELEMETRY_MAX_MB", "64")) * 1024 * 1024)
+MAX_AGE_S = float(os.getenv("REGENES_TELEMETRY_MAX_HOURS", "0")) * 3600
+
+SAMPLE = 1                             # 1 a cada SAMPLE registros (governor.py mexe)
+
+MAGIC = b"RGT1"
+_BLOCK = struct.Struct("<4sIHI")       # magic, n_linhas, n_colunas, n_bytes do corpo (zlib)
+_COLHEAD = struct.Struct("<BcI")       # len(nome), typecode, n_bytes (nome vem depois)
+
+
+def _col(typecode: str, values) -> bytes:
+    if typecode == "s":                # texto: utf-8 separado por \n (origin, rótulos)
+        return "\n".join(values).encode("utf-8")
+    a = array(typecode, values)
+    if sys.byteorder != "little":
+        a.byteswap()
+    return a.tobytes()
+
+
+def _uncol(typecode: str, buf: bytes, n: int):
+    if typecode == "s":
+        return buf.decode("utf-8").split("\n") if n else []
+    a = array(typecode)
+    a.frombytes(buf)
+    if sys.byteorder != "little":
+        a.byteswap()
+    return a
+
+
+def encode_block(schema, rows) -> bytes:
+    """Lote de linhas -> um bloco colunar. schema = ((nome, typecode), ...). O corpo vai em
+    zlib: coluna é o caso bom de compressão (horário crescente, origem repetida)."""
+    body = []
+    for j, (name, tc) in enumerate(schema):
+        data = _col(tc, [r[j] for r in rows])
+        nm = name.encode("ascii")
+        body += [_COLHEAD.pack(len(nm), tc.encode("ascii"), len(data)), nm, data]
+    body = zlib.compress(b"".join(body), 6)
+    return _BLOCK.pack(MAGIC, len(rows), len(schema), len(body)) + body
+
+
+def read_blocks(path: str):
+    """Gera (n_linhas, {nome: coluna}) bloco a bloco — memória de UM lote, não do arquivo."""
+    with open(path, "rb") as f:
+        while True:
+            head = f.read(_BLOCK.size)
+            if len(head) < _BLOCK.size:
+                return
+            magic, n, ncols, size = _BLOCK.unpack(head)
+            if magic != MAGIC:
+                raise ValueError(f"{path}: bloco de telemetria corrompido")
+            body, off = zlib.decompress(f.read(size)), 0
+            cols = {}
+            for _ in range(ncols):
+                ln, tc, nbytes = _COLHEAD.unpack_from(body, off)
+                off += _COLHEAD.size
+                name = body[off:off + ln].decode("ascii")
+                off += ln
+                cols[name] = _uncol(tc.decode("ascii"), body[off:off + nbytes], n)
+                off += nbytes
+            yield n, cols
+
+
+def read_rows(path: str):
+    """Gera dicts linha a linha (a mesma cara de um DictReader no CSV, com tipos)."""
+    for n, cols in read_blocks(path):
+        names = list(cols)
+        for i in range(n):
+            yield {k: cols[k][i] for k in names}
+
+
+def to_records(cols: dict):
+    """Bloco -> NumPy record array (precisa de NumPy; texto vira dtype unicode)."""
+    import numpy as np
+    return np.rec.fromarrays([np.asarray(v) for v in cols.values()], names=list(cols))
+
+
+class Sink:
+    """Fila de registros + thread de gravação. record() é o que o event loop paga."""
+
+    def __init__(self, path: str, schema, fmt: str = FORMAT, flush_s: float = FLUSH_S,
+                 batch: int = 256, max_bytes: int = MAX_BYTES, max_age_s: float = MAX_AGE_S,
+                 max_queue: int = 100_000, enabled: bool = ENABLED):
+        self.schema = tuple(schema)
+        self.fmt = fmt if fmt in ("csv", "bin") else "csv"
+        stem, ext = os.path.splitext(path)
+        self.path = stem + (".bin" if self.fmt == "bin" else ext or ".csv")
+        self.flush_s = flush_s
+        self.batch = batch
+        self.max_bytes = max_bytes
+        self.max_age_s = max_age_s
+        self.max_queue = max_queue
+        self.enabled = enabled
+        self.written = self.dropped = self.rotations = self.sampled_out = 0
+        self._seen = 0
+        self._q = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = False
+        self._opened = None              # quando ESTE processo começou o arquivo corrente
+        self._thread = None
+        self._warned = False
+
+    def record(self, *values) -> None:
+        """Enfileira uma linha (na ordem do schema). Nunca bloqueia em disco."""
+        if not self.enabled:
+            return
+        if SAMPLE > 1:
+            self._seen += 1
+            if self._seen % SAMPLE:
+                self.sampled_out += 1
+                return
+        self._put(values)
+
+    def _put(self, values) -> None:
+        """Enfileira sem amostragem (o que não pode faltar: o cabeçalho de uma vida gravada)."""
+        with self._lock:
+            self._q.append(values)
+            if len(self._q) > self.max_queue:
+                del self._q[0]
+                self.dropped += 1
+            n = len(self._q)
+        if self._thread is None:
+            self._start()
+        if n >= self.batch:
+            self._wake.set()
+
+    def _start(self) -> None:
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="telemetry", daemon=True)
+            self._thread.start()
+        atexit.register(self.close)
+
+    def _run(self) -> None:
+        while not self._stop:
+            self._wake.wait(self.flush_s)
+            self._wake.clear()
+            self.flush()
+
+    def flush(self) -> None:
+        """Grava o que está na fila (um write só). Chamado pela thread, ou no close()."""
+        with self._lock:
+            rows, self._q = self._q, []
+        if not rows:
+            return
+        try:
+            self._rotate_if_due()
+            fd = os.open(self.path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                os.write(fd, self._encode(rows, os.fstat(fd).st_size == 0))
+            finally:
+                os.close(fd)
+            if self._opened is None:
+                self._opened = time.time()
+            self.written += len(rows)
+        except (OSError, ValueError, TypeError, OverflowError) as e:
+            self.dropped += len(rows)    # telemetria nunca derruba o executor
+            if not self._warned:
+                self._warned = True
+                print(f"[telemetria] {self.path}: {e.__class__.__name__}: {e} (lotes descartados)")
+
+    def _encode(self, rows, fresh: bool) -> bytes:
+        """Lote -> bytes de UM write. `fresh`: o arquivo está vazio (vai o header do CSV)."""
+        if self.fmt == "bin":
+            return encode_block(self.schema, rows)
+        data = "".join(",".join(map(str, r)) + "\n" for r in rows).encode("utf-8")
+        if fresh:
+            data = (",".join(n for n, _ in self.schema) + "\n").encode("ascii") + data
+        return data
+
+    def _rotate_if_due(self) -> None:
+        try:
+            size = os.path.getsize(self.path)
+        except OSError:
+            self._opened = None
+            return
+        old = self._opened is not None and self.max_age_s and \
+            time.time() - self._opened >= self.max_age_s
+        if not ((self.max_bytes and size >= self.max_bytes) or old):
+            return
+        stem, ext = os.path.splitext(self.path)
+        dest = f"{stem}.{time.strftime('%Y%m%d-%H%M%S')}.{os.getpid()}-{self.rotations}{ext}"
+        try:
+            os.rename(self.path, dest)
+            self.rotations += 1
+        except FileNotFoundError:
+            pass                         # outro worker rodou antes: segue no arquivo novo
+        self._opened = None
+
+    def close(self) -> None:
+        """Para a thread e grava o resto da fila (fim do executor)."""
+        self._stop = True
+        self._wake.set()
+        t = self._thread
+        if t is not None and t is not threading.current_thread():
+            t.join(timeout=5.0)
+        self.flush()
+
+    def stats(self) -> dict:
+        return {"path": self.path, "queued": len(self._q), "written": self.written,
+                "dropped": self.dropped, "rotations": self.rotations,
+                "sampled_out": self.sampled_out}
@@ -0,0 +1,331 @@
+"""
+telemetry_report.py — resume a telemetria local dos executores EM STREAMING, memória fixa.
+
+As curvas de complexidade (o genoma inchando 21 -> 414 nós enquanto o cérebro funcional
+fica em 6-14 ligações — ver neat_brain.functional_complexity) saem de arquivos de centenas
+de milhares de linhas. DictReader com tudo em memória não escala pra multi-GB. Aqui cada
+linha passa UMA vez e some:
+
+  · janelas de tempo de `--window` segundos (por unix_time), por `origin` (primordial,
+    mutacao, cruzamento) e no agregado "*": n, média, mín., máx. e quantis de cada métrica;
+    com `--step` menor que a janela elas DESLIZAM (uma janela de `--window` termina a cada
+    `--step`) — a linha cai num sketch por passo e cada janela é a soma dos últimos
+    window/step passos, então a memória continua fixa; sem `--step`, janelas fixas;
+  · quantis por SKETCH de baldes logarítmicos (precisão relativa `--alpha`, default 1%):
+    memória = nº de baldes, não nº de linhas, e sketches SOMAM — o total do arquivo é a
+    soma das janelas, sem segunda passada;
+  · cada janela é escrita (JSON por linha) assim que fecha — `--lateness` segundos depois
+    do fim dela, porque vários workers gravam no mesmo arquivo em lotes (telemetry.py) e
+    as linhas chegam um pouco fora de ordem. Linha mais atrasada que isso conta em `late`.
+
+Lê os dois headers do CSV (v1 native_telemetry.csv: métricas do genoma; v2
+native_telemetry_v2.csv: + fnodes/fconns/genes) e o do HyperNEAT — as métricas são as
+colunas que o header tiver, fora unix_time/idx/origin —, arquivos rodados em sequência
+(header repetido no meio é pulado) e o formato colunar binário (.bin, telemetry.py).
+Linha torta (escrita cortada) é contada em `bad` e pulada.
+
+Uso:
+    python telemetry_report.py ARQUIVO... [--window 3600] [--step 600] [--lateness 300]
+                               [--quantiles 0.5,0.9,0.99] [--alpha 0.01] [--out -]
+    A última linha da saída é o total do(s) arquivo(s) (window "total").
+"""
+import argparse
+import csv
+import json
+import math
+import os
+import sys
+from collections import deque
+
+import telemetry
+
+_KEYS = ("unix_time", "idx", "origin")
+
+
+class Sketch:
+    """Sketch de quantis por baldes logarítmicos (erro relativo <= alpha). Valores <= 0 (as
+    métricas são contagens e acuidade: nunca negativas) vão num balde próprio.
+
+    O caminho quente é add(): só conta o valor cru num dict. As métricas são discretas
+    (contagens; acuidade com 3 casas), então o dict fica pequeno; passou de `raw_max`
+    valores distintos, dobra nos baldes — a memória continua limitada."""
+
+    __slots__ = ("alpha", "_lg", "raw_max", "raw", "bins", "zero", "n", "total", "lo", "hi")
+
+    def __init__(self, alpha: float = 0.01, raw_max: int = 4096):
+        self.alpha = alpha
+        self._lg = math.log((1 + alpha) / (1 - alpha))
+        self.raw_max = raw_max
+        self.raw = {}
+        self.bins = {}
+        self.zero = self.n = 0
+        self.total = 0.0
+        self.lo = self.hi = None
+
+    def add(self, v: float) -> None:
+        raw = self.raw
+        raw[v] = raw.get(v, 0) + 1
+        if len(raw) > self.raw_max:
+            self._fold()
+
+    def _fold(self) -> None:
+        if not self.raw:
+            return
+        lg, bins = self._lg, self.bins
+        for v, c in self.raw.items():
+            self.n += c
+            self.total += v * c
+            if v <= 0:
+                self.zero += c
+            else:
+                k = math.ceil(math.log(v) / lg)
+                bins[k] = bins.get(k, 0) + c
+        lo, hi = min(self.raw), max(self.raw)
+        self.lo = lo if self.lo is None else min(self.lo, lo)
+        self.hi = hi if self.hi is None else max(self.hi, hi)
+        self.raw = {}
+
+    def merge(self, other: "Sketch") -> None:
+        self._fold()
+        other._fold()
+        self.n += other.n
+        self.total += other.total
+        self.zero += other.zero
+        for k, c in other.bins.items():
+            self.bins[k] = self.bins.get(k, 0) + c
+        for v in (other.lo, other.hi):
+            if v is not None:
+                self.lo = v if self.lo is None else min(self.lo, v)
+                self.hi = v if self.hi is None else max(self.hi, v)
+
+    def count(self) -> int:
+        return self.n + sum(self.raw.values())
+
+    def quantile(self, q: float):
+        self._fold()
+        if not self.n:
+            return None
+        rank = q * (self.n - 1)
+        seen = self.zero
+        if rank < seen:
+            return 0.0
+        gamma = math.exp(self._lg)
+        for k in sorted(self.bins):
+            seen += self.bins[k]
+            if rank < seen:
+                v = 2 * gamma ** k / (gamma + 1)       # meio do balde (em escala relativa)
+                return min(max(v, self.lo), self.hi)
+        return self.hi
+
+    def summary(self, qs) -> dict:
+        self._fold()
+        out = {"mean": round(self.total / self.n, 4) if self.n else None,
+               "min": self.lo, "max": self.hi}
+        for q in qs:
+            v = self.quantile(q)
+            out[f"p{q * 100:g}"] = None if v is None else round(v, 4)
+        return out
+
+
+class Window:
+    """Uma janela de tempo: sketches por (origin, métrica)."""
+
+    def __init__(self, t0: float, alpha: float):
+        self.t0 = t0
+        self.alpha = alpha
+        self.groups = {}                               # origin -> {métrica: Sketch}
+
+    def add(self, origin: str, metrics, values) -> None:
+        g = self.groups.get(origin)
+        if g is None:
+            g = self.groups[origin] = {}
+        for m, v in zip(metrics, values):
+            s = g.get(m)
+            if s is None:
+                s = g[m] = Sketch(self.alpha)
+            s.add(v)
+
+    def merge(self, other: "Window") -> None:
+        for origin, g in other.groups.items():
+            mine = self.groups.setdefault(origin, {})
+            for m, s in g.items():
+                if m not in mine:
+                    mine[m] = Sketch(self.alpha)
+                mine[m].merge(s)
+
+    def records(self, label, t1, qs):
+        """Um registro por origin + o agregado "*" (soma dos sketches das origens)."""
+        tudo = {}
+        for origin in sorted(self.groups):
+            g = self.groups[origin]
+            for m, s in g.items():
+                if m not in tudo:
+                    tudo[m] = Sketch(self.alpha)
+                tudo[m].merge(s)
+            yield self._record(label, t1, origin, g, qs)
+        if self.groups:
+            yield self._record(label, t1, "*", tudo, qs)
+
+    def _record(self, label, t1, origin, g, qs) -> dict:
+        n = max(s.count() for s in g.values()) if g else 0
+        return {"window": label, "t0": self.t0, "t1": t1, "origin": origin, "n": n,
+                "metrics": {m: s.summary(qs) for m, s in g.items()}}
+
+
+class Report:
+    """Dobra linhas (unix_time, origin, {métrica: valor}) em janelas e as emite ao fechar.
+
+    As linhas caem em passos de `step` segundos (default: a própria janela, fixas); ao fechar
+    um passo sai a janela de `window` que termina nele, somada dos passos que ela cobre."""
+
+    def __init__(self, emit, window: float = 3600, lateness: float = 300,
+                 quantiles=(0.5, 0.9, 0.99), alpha: float = 0.01, step: float = None):
+        step = window if step is None else step
+        k = round(window / step) if step > 0 else 0
+        if k < 1 or abs(k * step - window) > 1e-9 * window:
+            raise ValueError(f"--window ({window:g}) tem que ser múltiplo de --step ({step:g})")
+        self.emit = emit
+        self.window = window
+        self.step = step
+        self.lateness = lateness
+        self.qs = tuple(quantiles)
+        self.alpha = alpha
+        self.open = {}                                 # início do passo -> Window
+        self.done = deque(maxlen=k)                    # passos fechados que a janela ainda cobre
+        self.total = Window(None, alpha)
+        self.rows = self.late = self.bad = 0
+        self._watermark = None                         # passos antes disto já saíram
+        self._newest = -math.inf
+        self._due = math.inf                           # fim do passo aberto mais antigo
+        self.t_first = self.t_last = None
+
+    def add(self, t: float, origin: str, metrics, values) -> None:
+        w0 = math.floor(t / self.step) * self.step
+        if self._watermark is not None and w0 < self._watermark:
+            self.late += 1
+            return
+        self.rows += 1
+        self.t_first = t if self.t_first is None else min(self.t_first, t)
+        self.t_last = t if self.t_last is None else max(self.t_last, t)
+        win = self.open.get(w0)
+        if win is None:
+            win = self.open[w0] = Window(w0, self.alpha)
+            self._due = min(self._due, w0 + self.step)
+        win.add(origin, metrics, values)
+        if t > self._newest:
+            self._newest = t
+            if t - self.lateness >= self._due:
+                self._close(t - self.lateness)
+
+    def _close(self, before: float) -> None:
+        for w0 in sorted(self.open):
+            if w0 + self.step > before:
+                break
+            self._emit(self.open.pop(w0))
+            self._watermark = w0 + self.step
+        self._due = min(self.open, default=math.inf) + self.step
+
+    def _emit(self, part: Window) -> None:
+        self.done.append(part)
+        self.total.merge(part)
+        t1 = part.t0 + self.step
+        if self.done.maxlen == 1:
+            win = part                                 # janelas fixas: o passo é a janela
+        else:
+            win = Window(t1 - self.window, self.alpha)
+            for p in self.done:
+                if p.t0 >= win.t0:                     # passo vazio no meio: o velho já saiu
+                    win.merge(p)
+        for rec in win.records("window", t1, self.qs):
+            self.emit(rec)
+
+    def finish(self) -> None:
+        self._close(math.inf)
+        for rec in self.total.records("total", self.t_last, self.qs):
+            rec["t0"] = self.t_first
+            self.emit(rec)
+        self.emit({"window": "stats", "rows": self.rows, "late": self.late, "bad": self.bad})
+
+
+def _feed_csv(path: str, rep: Report) -> None:
+    with open(path, newline="", encoding="utf-8", errors="replace") as f:
+        header = None
+        for row in csv.reader(f):
+            if not row:
+                continue
+            if row[0] == "unix_time":                  # header (1º, ou de arquivo emendado)
+                header = row
+                it, io = row.index("unix_time"), row.index("origin")
+                cols = [(i, c) for i, c in enumerate(row) if c not in _KEYS]
+                metrics = tuple(c for _, c in cols)
+                idx = [i for i, _ in cols]
+                ncol = len(row)
+                continue
+            if header is None or len(row) != ncol:
+                rep.bad += 1
+                continue
+            try:
+                t = float(row[it])
+                vals = [float(row[i]) for i in idx]
+            except ValueError:
+                rep.bad += 1
+                continue
+            rep.add(t, row[io], metrics, vals)
+
+
+def _feed_bin(path: str, rep: Report) -> None:
+    for n, cols in telemetry.read_blocks(path):
+        metrics = tuple(c for c in cols if c not in _KEYS)
+        ts, origins = cols["unix_time"], cols["origin"]
+        mcols = [cols[m] for m in metrics]
+        for i in range(n):
+            rep.add(ts[i], origins[i], metrics, [c[i] for c in mcols])
+
+
+def feed(path: str, rep: Report) -> None:
+    if path.endswith(".bin"):
+        _feed_bin(path, rep)
+    else:
+        _feed_csv(path, rep)
+
+
+def main(argv=None) -> int:
+    ap = argparse.ArgumentParser(description="Resumo em streaming da telemetria dos executores")
+    ap.add_argument("paths", nargs="+", help="CSV (v1/v2/hyper) ou .bin, em ordem")
+    ap.add_argument("--window", type=float, default=3600, help="janela em segundos (3600)")
+    ap.add_argument("--step", type=float, default=None,
+                    help="a janela desliza a cada STEP segundos (default: a janela, fixas)")
+    ap.add_argument("--lateness", type=float, default=300,
+                    help="atraso tolerado antes de fechar a janela, em segundos (300)")
+    ap.add_argument("--quantiles", default="0.5,0.9,0.99")
+    ap.add_argument("--alpha", type=float, default=0.01, help="erro relativo dos quantis (0.01)")
+    ap.add_argument("--out", default="-", help="JSON por linha; '-' = stdout")
+    a = ap.parse_args(argv)
+    try:
+        Report(None, a.window, step=a.step)
+    except ValueError as e:
+        ap.error(str(e))
+    out = sys.stdout if a.out == "-" else open(a.out, "w", encoding="utf-8")
+
+    def emit(rec):
+        out.write(json.dumps(rec) + "\n")
+        out.flush()                                    # incremental: dá pra seguir com tail -f
+    rep = Report(emit, a.window, a.lateness,
+                 [float(q) for q in a.quantiles.split(",")], a.alpha, a.step)
+    try:
+        for p in a.paths:
+            if not os.path.exists(p):
+                print(f"[telemetria] {p}: não existe", file=sys.stderr)
+                continue
+            feed(p, rep)
+        rep.finish()
+    except BrokenPipeError:
+        return 0
+    finally:
+        if out is not sys.stdout:
+            out.close()
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
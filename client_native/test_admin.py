@@ -0,0 +1,151 @@
+"""
+Testes do endpoint local de métricas (admin.py).
+
+O endpoint só presta se: /metrics sair no texto Prometheus (TYPE uma vez por métrica,
+rótulos escapados, série ausente quando o número não existe); /metrics.json trazer o mesmo
+JSON do collect() com as taxas por segundo entre duas coletas; uma rajada de raspadores
+custar UMA coleta; e funcionar em TCP (porta ocupada -> a seguinte) e em unix socket.
+
+Roda com:  pytest test_admin.py   (ou: python test_admin.py)
+"""
+import asyncio
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import admin                                 # noqa: E402
+import lagmon                                # noqa: E402
+import runtime_stats                         # noqa: E402
+
+
+def _coletor():
+    st = runtime_stats.RuntimeStats("native", 4)
+    chamadas = []
+
+    def collect():
+        chamadas.append(1)
+        s, h = st.snapshot(), runtime_stats.RuntimeStats("hyper", 1).snapshot()
+        s.update(target=4, births_by_origin=dict(st.origins),
+                 pool={"ready": 2, "size": 4, "hits": 1, "misses": 0, "hit_rate": 1.0})
+        return {"uptime_s": 1.0, "species": {"native": s, "hyper": h}, "stages": lagmon.stage_stats(),
+                "caches": {"unpack": {"entries": 3, "hits": 9, "misses": 1, "hit_rate": 0.9,
+                                      "bytes": 1024, "shared": None}},
+                "shed": {"level": 0, "name": "normal"}}
+    return st, collect, chamadas
+
+
+def test_texto_prometheus():
+    st, collect, _ = _coletor()
+    st.born("primordial")
+    st.born("cruzamento")
+    st.tick(0.004)
+    with lagmon.stage("encode"):
+        pass
+    txt = admin.Admin(collect).snapshot(now=0.0)[1]
+    linhas = txt.splitlines()
+    assert 'regenes_alive{species="native"} 2' in linhas
+    assert 'regenes_births_total{species="native",origin="cruzamento"} 1' in linhas
+    assert 'regenes_tick_latency_ms{species="native",quantile="0.99"} 4.0' in linhas
+    assert 'regenes_cache_hit_ratio{cache="unpack"} 0.9' in linhas
+    assert any(x.startswith('regenes_stage_latency_ms{stage="encode",quantile="0.5"}')
+               for x in linhas)
+    assert sum(x == "# TYPE regenes_births_total counter" for x in linhas) == 1
+    i = linhas.index("# TYPE regenes_alive gauge")         # família junta: todas as espécies
+    assert linhas[i + 1:i + 3] == ['regenes_alive{species="native"} 2',
+                                   'regenes_alive{species="hyper"} 0']
+    assert "regenes_loop_stalls_total" not in txt          # sem monitor: sem série
+    assert not any("shared" in x for x in linhas)           # não-número não vira série
+    p = admin._Prom()
+    p.add("x", 1, esp='a"b\\c')
+    assert p.lines[-1] == 'regenes_x{esp="a\\"b\\\\c"} 1'
+
+
+def test_coleta_em_cache_e_taxas():
+    st, collect, chamadas = _coletor()
+    a = admin.Admin(collect, min_interval=1.0)
+    a.snapshot(now=10.0)
+    for _ in range(50):                                    # rajada de raspadores
+        a.snapshot(now=10.5)
+    assert len(chamadas) == 1
+    for _ in range(30):
+        st.tick(0.001)
+    for _ in range(4):
+        st.born("mutacao")
+    m = json.loads(a.snapshot(now=12.0)[0])["species"]["native"]
+    assert len(chamadas) == 2
+    assert m["ticks_per_s"] == 15.0 and m["births_per_s"] == {"mutacao": 2.0}
+    assert m["births_by_origin"] == {"mutacao": 4} and m["pool"]["ready"] == 2
+
+
+async def _get(reader, writer, path: str):
+    writer.write(f"GET {path} HTTP/1.1\r\nHost: x\r\n\r\n".encode())
+    await writer.drain()
+    resp = await reader.read()
+    writer.close()
+    head, _, body = resp.partition(b"\r\n\r\n")
+    return head.split(b"\r\n")[0].decode(), body.decode()
+
+
+def test_servidor_tcp_e_unix():
+    _, collect, _ = _coletor()
+
+    async def cenario():
+        a, b = admin.Admin(collect), admin.Admin(collect)
+        await a.start("127.0.0.1:0")
+        port = int(a.address.rsplit(":", 1)[1])
+        await b.start(f"127.0.0.1:{port}")                  # ocupada: pega a seguinte
+        assert int(b.address.rsplit(":", 1)[1]) != port
+        st, txt = await _get(*await asyncio.open_connection("127.0.0.1", port), "/metrics")
+        assert st.endswith("200 OK") and "regenes_up 1" in txt
+        st, body = await _get(*await asyncio.open_connection("127.0.0.1", port),
+                              "/metrics.json?x=1")
+        assert json.loads(body)["species"]["native"]["pool"]["size"] == 4
+        st, _ = await _get(*await asyncio.open_connection("127.0.0.1", port), "/nada")
+        assert st.endswith("404 Not Found")
+        with tempfile.TemporaryDirectory() as d:
+            u = admin.Admin(collect)
+            await u.start(f"unix:{d}/rg-{{pid}}.sock")
+            path = f"{d}/rg-{os.getpid()}.sock"
+            assert u.address == "unix:" + path
+            st, body = await _get(*await asyncio.open_unix_connection(path), "/status")
+            assert "rss_bytes" in json.loads(body)
+            await u.close()
+            assert not os.path.exists(path)
+        ruim = admin.Admin(collect)
+        assert await ruim.start("unix:/proc/nao/existe.sock") is None   # avisa e segue
+        assert await admin.Admin(collect).start("") is None
+        await a.close()
+        await b.close()
+        assert a.scrapes == 3
+    asyncio.run(cenario())
+
+
+
+def test_sem_resource_nem_proc_o_executor_importa():
+    # Windows: sem o módulo resource e sem /proc -> o executor sobe e rss_bytes é None
+    codigo = ("import sys; sys.modules['resource'] = None\n"
+              "import executor, admin\n"
+              "def sem_proc(*a, **k): raise OSError('sem /proc')\n"
+              "admin.open = sem_proc\n"
+              "print(admin.rss_bytes())\n")
+    r = subprocess.run([sys.executable, "-c", codigo], cwd=os.path.dirname(os.path.abspath(__file__)),
+                       capture_output=True, text=True, timeout=60)
+    assert r.returncode == 0, r.stderr[-400:]
+    assert r.stdout.strip().splitlines()[-1] == "None"
+    assert admin.rss_bytes() > 0
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
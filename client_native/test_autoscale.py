@@ -0,0 +1,117 @@
+"""
+Testes do controlador de vagas (autoscale.py).
+
+O controlador só presta se for ESTÁVEL: não mexe com uma amostra ruim só (paciência), não
+oscila em volta do alvo (faixa morta + cooldown), respeita [mínimo, máximo] — e encolher
+nunca derruba ameba viva: a vaga acima do alvo só não renasce.
+
+Roda com:  pytest test_autoscale.py   (ou: python test_autoscale.py)
+"""
+import asyncio
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import autoscale                             # noqa: E402
+import runtime_stats                         # noqa: E402
+
+
+def _ctl(**kw):
+    base = dict(n=10, lo=4, hi=12, target_ms=50.0, patience=3, cooldown=10.0)
+    base.update(kw)
+    return autoscale.Autoscaler(**base)
+
+
+def test_encolhe_so_com_paciencia_e_respeita_cooldown():
+    c = _ctl()
+    assert c.decide(80.0, 0.3, 0.0) == 10 and c.decide(80.0, 0.3, 1.0) == 10
+    assert c.decide(80.0, 0.3, 2.0) == 9                  # 3ª seguida: encolhe
+    for t in (3.0, 4.0, 5.0, 6.0):
+        assert c.decide(80.0, 0.3, t) == 9                # cooldown: o efeito ainda não apareceu
+    assert c.decide(80.0, 0.3, 12.5) == 8
+    assert len(c.decisions) == 2 and c.decisions[0][1:3] == (10, 9)
+
+
+def test_cpu_alta_tambem_encolhe():
+    c = _ctl(patience=1)
+    assert c.decide(5.0, 0.95, 0.0) == 9
+
+
+def test_faixa_morta_nao_mexe():
+    c = _ctl(patience=1)
+    for t in range(20):
+        assert c.decide(40.0, 0.3, float(t * 100)) == 10  # entre low×alvo e o alvo: histerese
+
+
+def test_cresce_ate_o_maximo_e_amostra_ruim_zera_a_sequencia():
+    c = _ctl(cooldown=0.0)
+    c.decide(5.0, 0.2, 0.0)
+    c.decide(5.0, 0.2, 1.0)
+    c.decide(80.0, 0.2, 2.0)                              # uma ruim no meio: recomeça
+    assert c.target == 10
+    t = 3.0
+    while c.target < c.hi and t < 100:
+        c.decide(5.0, 0.2, t)
+        t += 1.0
+    assert c.target == 12
+    assert c.decide(5.0, 0.2, t) == 12
+
+
+def test_desligado_segura_n():
+    c = _ctl(enabled=False, patience=1)
+    assert c.decide(500.0, 1.0, 0.0) == 10
+
+
+def test_sample_le_so_a_janela_nova():
+    st = runtime_stats.RuntimeStats("native", 10)
+    c = _ctl(patience=1, cooldown=0.0)
+    for _ in range(100):
+        st.tick(0.200)                                    # janela velha: lenta
+    c.sample(st, now=1.0)
+    assert c.target == 9
+    for _ in range(100):
+        st.tick(0.001)                                    # janela nova: rápida
+    c.sample(st, now=100.0)
+    assert c.target == 10                                 # a janela velha não contou de novo
+    assert st.recent(3) == [0.001] * 3
+
+
+def test_encolher_nao_mata_vida_em_curso():
+    async def cenario():
+        c = _ctl(n=3, lo=1, hi=3)
+        vidas = {i: 0 for i in range(3)}
+        fim = asyncio.Event()
+
+        async def run_one(idx):
+            while idx < c.target:
+                vidas[idx] += 1
+                await fim.wait()                          # a "vida" dura até o mundo soltar
+                await asyncio.sleep(0)
+        slots = autoscale.Slots(run_one, c)
+        slots.fill()
+        await asyncio.sleep(0)
+        c.target = 1                                      # encolhe com todas vivas
+        await asyncio.sleep(0.01)
+        assert len(slots.tasks) == 3                      # ninguém foi derrubado
+        fim.set()
+        await asyncio.sleep(0.01)
+        assert sorted(slots.tasks) == [0]                 # as de cima não renasceram
+        c.target = 0
+        await slots.wait()
+        return vidas
+    vidas = asyncio.run(cenario())
+    assert vidas[1] == 1 and vidas[2] == 1
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
@@ -0,0 +1,103 @@
+"""
+Testes do forward em lote (batch_eval.BatchEvaluator).
+
+O lote é só um jeito mais barato de rodar AS MESMAS redes: para toda ameba, em qualquer
+ordem de nascimentos e mortes, a saída tem de bater com o net.activate dela (a menos do
+arredondamento da soma). Uma saída trocada entre slots seria uma ameba decidindo com o
+cérebro da vizinha — e nada no mundo avisaria.
+
+Roda com:  pytest test_batch_eval.py   (ou: python test_batch_eval.py)
+"""
+import asyncio
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import pytest                                # noqa: E402
+
+pytest.importorskip("numpy")
+import batch_eval as be                      # noqa: E402
+import neat_brain as nb                      # noqa: E402
+from synth_genomes import bank_like          # noqa: E402
+
+TOL = 1e-12
+_RND = random.Random(7)
+_X = [[_RND.uniform(-1.0, 1.0) for _ in range(be.N_IN)] for _ in range(4)]
+_NETS = [nb.build_net(bank_like(s, (40, 200, 500)[s % 3])) for s in range(9)]
+
+
+def _confere(ev, batch):
+    res = ev.evaluate(batch)
+    assert set(res) == set(batch)
+    for s, x in batch.items():
+        ref = ev._nets[s].activate(x)
+        assert all(abs(a - b) <= TOL for a, b in zip(res[s], ref)), f"slot {s}"
+
+
+def test_lote_igual_ao_activate_por_rede():
+    ev = be.BatchEvaluator()
+    slots = [ev.add(n) for n in _NETS]
+    _confere(ev, {s: _X[s % 4] for s in slots})
+    _confere(ev, {s: _X[(s + 1) % 4] for s in slots[::3]})      # só parte pede ação
+
+
+def test_nascer_e_morrer_com_reuso_de_slot_e_compactacao():
+    """Slots mortos são reusados; blocos mortos acumulam até compactar — saída sempre certa."""
+    ev = be.BatchEvaluator(slots=2, nodes=64)                   # força crescer o buffer
+    vivos = {}
+    rnd = random.Random(1)
+    for passo in range(60):
+        if vivos and rnd.random() < 0.45:
+            s = rnd.choice(sorted(vivos))
+            ev.remove(s)
+            del vivos[s]
+        else:
+            net = rnd.choice(_NETS)
+            vivos[ev.add(net)] = net
+        if vivos:
+            _confere(ev, {s: _X[(s + passo) % 4] for s in vivos})
+    assert len(ev) == len(vivos)
+    assert all(ev._nets[s] is net for s, net in vivos.items())
+
+
+def test_rede_fora_do_lote_roda_solo():
+    """Agregação que o lote não vetoriza: o slot segue pelo net.activate, sem erro."""
+    g = bank_like(3, 60)
+    next(n for k, n in g.nodes.items() if k >= 0).aggregation = "max"
+    net = nb.build_net(g)
+    ev = be.BatchEvaluator()
+    a, b = ev.add(net), ev.add(_NETS[0])
+    assert ev._blocks[a] is None
+    assert ev.evaluate({a: _X[0], b: _X[1]})[a] == net.activate(_X[0])
+    _confere(ev, {b: _X[1]})
+
+
+def test_activate_junta_os_ticks_da_mesma_volta_do_loop():
+    ev = be.BatchEvaluator()
+    slots = [ev.add(n) for n in _NETS[:5]]
+    chamadas = []
+    original = ev.evaluate
+    ev.evaluate = lambda batch: chamadas.append(len(batch)) or original(batch)
+
+    async def tudo():
+        return await asyncio.gather(*[ev.activate(s, _X[s % 4]) for s in slots])
+
+    outs = asyncio.run(tudo())
+    assert chamadas == [5]
+    for s, out in zip(slots, outs):
+        assert all(abs(a - b) <= TOL for a, b in zip(out, _NETS[s].activate(_X[s % 4])))
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
@@ -0,0 +1,87 @@
+"""
+Testes da suíte de microbenchmarks (bench_suite.py) — e a própria suíte, via pytest.
+
+Na suíte normal: todo caso monta e roda (com orçamento mínimo: quebrou a assinatura de um
+caminho quente, quebra aqui), as entradas são determinísticas e a comparação acusa a
+regressão certa. Com REGENES_BENCH=1, test_mede_e_compara mede pra valer, grava o JSON
+(REGENES_BENCH_OUT, default logs/bench-<data-hora>.json) e, com REGENES_BENCH_BASELINE,
+falha se algum caso regrediu além de REGENES_BENCH_THRESHOLD (default 0.15).
+
+Roda com:  pytest test_bench_suite.py   (ou: python test_bench_suite.py)
+"""
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import bench_suite                           # noqa: E402
+import neat_brain as nb                      # noqa: E402
+from synth_genomes import thin               # noqa: E402
+
+
+def test_todo_caso_roda_e_cobre_o_caminho_quente():
+    rep = bench_suite.run(min_time=0.001, repeat=1)
+    res = rep["results"]
+    assert set(res) == set(bench_suite.CASES)
+    for nome in ("cone_psf.psf[build]", "cone_psf.blur", "encode[nitido]", "encode_msg",
+                 "ffnet.activate[10c]", "ffnet.activate[1000c]", "sub.express",
+                 "sub.activate[compilado]", "nb.crossover[300c]", "nb.mutate[300c]",
+                 "nb.pack[300c]", "nb.unpack[300c]", "nb.functional_complexity[1000c]"):
+        assert res[nome]["min_us"] > 0 and res[nome]["loops"] >= 1, nome
+    assert rep["meta"]["python"] and "numpy" in rep["meta"]
+    json.dumps(rep)                                         # serializável como está
+
+
+def test_entradas_deterministicas():
+    assert len(thin(10, 10).connections) == 10
+    assert nb.pack(thin(10, 10)) == nb.pack(thin(10, 10))
+    assert bench_suite._msg(0) == bench_suite._msg(0) != bench_suite._msg(1)
+    estado = random.getstate()
+    thin(3, 10)
+    assert random.getstate() == estado                     # não mexe no random global
+
+
+def test_compara_pelo_minimo():
+    base = {"results": {"a": {"min_us": 100.0}, "b": {"min_us": 100.0},
+                        "c": {"min_us": 100.0}, "velho": {"min_us": 1.0}}}
+    cur = {"results": {"a": {"min_us": 110.0}, "b": {"min_us": 130.0},
+                       "c": {"min_us": 50.0}, "novo": {"min_us": 1.0}}}
+    r = bench_suite.compare(base, cur, threshold=0.15)
+    assert [x["case"] for x in r["regressions"]] == ["b"] and r["regressions"][0]["ratio"] == 1.3
+    assert [x["case"] for x in r["improvements"]] == ["c"]
+    assert r["missing"] == ["velho"] and r["new"] == ["novo"]
+
+
+def test_mede_e_compara():
+    """A suíte de verdade: só com REGENES_BENCH=1 (mede por ~5 s)."""
+    if os.getenv("REGENES_BENCH") != "1":
+        return
+    rep = bench_suite.run(log=print)
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    out = os.getenv("REGENES_BENCH_OUT") or os.path.join(
+        raiz, "logs", f"bench-{time.strftime('%Y%m%d-%H%M%S')}.json")
+    os.makedirs(os.path.dirname(os.path.abspath(out)), exist_ok=True)
+    with open(out, "w", encoding="utf-8") as f:
+        json.dump(rep, f, indent=1)
+    base = os.getenv("REGENES_BENCH_BASELINE")
+    if base:
+        with open(base, encoding="utf-8") as f:
+            cmp = bench_suite.compare(json.load(f), rep,
+                                      float(os.getenv("REGENES_BENCH_THRESHOLD", "0.15")))
+        assert not cmp["regressions"], cmp["regressions"]
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
@@ -0,0 +1,122 @@
+"""
+Testes do pacote de cérebro v2 (binário tipado; ver o bloco PACOTE COMPACTO do neat_brain).
+
+O blob é a única coisa que atravessa o mundo entre gerações: se a ida/volta perder um bit,
+o filho herda um cérebro que o pai não tinha — e nada avisa. E o brain_bank de produção
+está cheio de blobs v1, que têm de continuar abrindo.
+
+Roda com:  pytest test_blob_v2.py   (ou: python test_blob_v2.py)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import blob_dict                             # noqa: E402
+import neat_brain as nb                      # noqa: E402
+import pytest                                # noqa: E402
+from synth_genomes import bank_like, lineage_corpus   # noqa: E402
+
+
+def test_ida_e_volta_exata():
+    """Todo atributo de todo gene volta IGUAL (peso f64, enabled, inovação, enums)."""
+    for n in (120, 400, 900):
+        g = bank_like(n, n)
+        assert nb.to_dict(nb.unpack(nb.pack(g))) == nb.to_dict(g), f"conns={n}"
+
+
+def test_v2_tem_prefixo_e_e_ascii():
+    """O mundo guarda e relaya uma STRING ASCII dentro do JSON."""
+    pkt = nb.pack(bank_like(1, 200))
+    assert pkt.startswith("RG2:")
+    pkt.encode("ascii")
+
+
+def test_blob_v1_continua_abrindo():
+    """Retrocompat: o brain_bank tem blobs base64(gzip(json)) — unpack fareja e abre."""
+    g = bank_like(2, 300)
+    v1 = nb.pack(g, 1)
+    assert v1.startswith("H4sI")
+    assert nb.to_dict(nb.unpack(v1)) == nb.to_dict(g)
+    assert nb.to_dict(nb.unpack(nb.to_dict(g))) == nb.to_dict(g)     # dict cru, idem
+
+
+def test_v2_menor_que_v1():
+    for n in (120, 900):
+        g = bank_like(n, n)
+        assert len(nb.pack(g, 2)) < 0.7 * len(nb.pack(g, 1)), f"conns={n}"
+
+
+def test_ativacao_fora_do_enum_cai_pro_v1():
+    """Nome que a tabela do formato não conhece não pode virar lixo: sai em v1."""
+    g = bank_like(3, 120)
+    next(iter(g.nodes.values())).activation = "minha_ativacao"
+    pkt = nb.pack(g)
+    assert not pkt.startswith("RG2:")
+    assert nb.to_dict(nb.unpack(pkt)) == nb.to_dict(g)
+
+
+def test_inovacao_fora_da_identidade_deterministica_e_preservada():
+    """Genoma antigo (inovação do contador por processo) -> a coluna vai junto no blob."""
+    g = bank_like(4, 120)
+    cg = next(iter(g.connections.values()))
+    cg.innovation = 12345
+    h = nb.unpack(nb.pack(g))
+    assert h.connections[cg.key].innovation == 12345
+    assert nb.to_dict(h) == nb.to_dict(g)
+
+
+def test_rede_do_filho_igual_a_do_pai():
+    """O que importa no fim: a rede montada do blob decide igual à do genoma original."""
+    g = bank_like(5, 400)
+    a, b = nb.build_net(g), nb.build_net(nb.unpack(nb.pack(g)))
+    inp = [((i * 7) % 11) / 11.0 for i in range(163)]
+    assert a.activate(inp) == b.activate(inp)
+
+
+def _com_dicionario(dict_id, fn):
+    pool = lineage_corpus(12, n_conns=150, gens=3)
+    nb._DICTS[dict_id] = blob_dict.train([nb._to_binary(g) for g in pool[:6]])
+    try:
+        return fn(pool[6:])
+    finally:
+        nb._DICTS.pop(dict_id, None)
+
+
+def test_dicionario_ida_e_volta_e_id_no_frame():
+    """O id vai no frame e o unpack escolhe o dicionário por ele, sem o chamador saber."""
+    def caso(gs):
+        for g in gs:
+            pkt = nb.pack(g, dict_id=254)
+            assert nb.base64.b64decode(pkt[4:])[1] == 254
+            assert nb.to_dict(nb.unpack(pkt)) == nb.to_dict(g)
+    _com_dicionario(254, caso)
+
+
+def test_dicionario_ausente_falha_alto():
+    """Blob com dicionário que este executor não tem: erro claro, nunca genoma lixo."""
+    pkt = _com_dicionario(253, lambda gs: nb.pack(gs[0], dict_id=253))
+    with pytest.raises(ValueError, match="dicion"):
+        nb.unpack(pkt)
+
+
+def test_dicionario_encolhe_linhagens():
+    """Genomas aparentados (o banco) comprimem melhor com o contexto compartilhado."""
+    def caso(gs):
+        sem = sum(len(nb.pack(g, dict_id=0)) for g in gs)
+        com = sum(len(nb.pack(g, dict_id=252)) for g in gs)
+        return com / sem
+    assert _com_dicionario(252, caso) < 0.97
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
@@ -0,0 +1,97 @@
+"""
+Testes da rede compilada (nb.build_net; bloco REDE COMPILADA do neat_brain).
+
+A compilação linear e o remendo a partir do pai só valem se montarem A MESMA rede que o
+FeedForwardNetwork.create do fork: mesmos nós avaliados, mesmas ligações em cada nó, na
+mesma ordem — e por isso a mesma saída, bit a bit, para qualquer entrada.
+
+Roda com:  pytest test_build_net.py   (ou: python test_build_net.py)
+"""
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import neat                                  # noqa: E402
+import neat_brain as nb                      # noqa: E402
+from synth_genomes import bank_like          # noqa: E402
+
+_RND = random.Random(3)
+_X = [[_RND.uniform(-1.0, 1.0) for _ in range(163)] for _ in range(3)]
+
+
+def _igual_ao_create(g, net):
+    ref = neat.nn.FeedForwardNetwork.create(g, nb.load_config())
+    assert {e[0]: e[1:] for e in net.node_evals} == {e[0]: e[1:] for e in ref.node_evals}
+    for x in _X:
+        assert net.activate(x) == ref.activate(x)
+
+
+def test_compilacao_do_zero_igual_ao_create():
+    for s in range(12):
+        g = bank_like(s, (30, 200, 700)[s % 3])
+        _igual_ao_create(g, nb.build_net(g))
+
+
+def test_filho_remendado_do_pai_igual_ao_create():
+    """Filhos por mutação (só pesos ou estruturais) do MESMO pai compartilhado."""
+    antes = nb.build_stats()
+    for s in range(6):
+        pai = nb.unpack_shared(nb.pack(bank_like(100 + s, 400)))
+        for _ in range(6):
+            filho = nb.mutate(pai)
+            _igual_ao_create(filho, nb.build_net(filho, parent=pai))
+    depois = nb.build_stats()
+    remendos = (depois["weights"] + depois["structural"]) - (antes["weights"] + antes["structural"])
+    assert remendos == 36
+
+
+def test_so_pesos_reusa_o_esqueleto():
+    pai = bank_like(7, 300)
+    filho = nb.copy_genome(pai)
+    for cg in filho.connections.values():
+        cg.weight *= -0.5
+    n0 = nb.build_stats()["weights"]
+    net = nb.build_net(filho, parent=pai)
+    assert nb.build_stats()["weights"] == n0 + 1
+    assert [e[0] for e in net.node_evals] == list(pai._plan.order)
+    _igual_ao_create(filho, net)
+
+
+def test_mudanca_estrutural_e_no_sem_entrada():
+    """Desligar a única entrada de um nó necessário faz dele 'neurônio de bias' (act(bias))."""
+    pai = bank_like(8, 200)
+    nb.build_net(pai, parent=pai)
+    filho = nb.copy_genome(pai)
+    saida = 0
+    for k, cg in filho.connections.items():
+        if k[1] == saida:
+            cg.enabled = False
+    net = nb.build_net(filho, parent=pai)
+    assert any(e[0] == saida and e[5] == [] for e in net.node_evals)
+    _igual_ao_create(filho, net)
+
+
+def test_esqueleto_do_pai_mutado_depois_continua_coerente():
+    """O esqueleto guardado é autossuficiente: mesmo se o pai (não compartilhado) for mutado
+    depois, remendar a partir dele segue dando a rede certa."""
+    pai = bank_like(9, 300)
+    nb.build_net(nb.copy_genome(pai), parent=pai)          # guarda _plan
+    pai.mutate(nb.load_config().genome_config)              # o pai muda por baixo
+    filho = nb.copy_genome(pai)
+    filho.mutate(nb.load_config().genome_config)
+    _igual_ao_create(filho, nb.build_net(filho, parent=pai))
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
@@ -11,9 +11,11 @@ Roda com:  pytest test_cone_psf.py   (ou: python test_cone_psf.py)
 import math
 import os
 import sys
+import tempfile
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 import cone_psf                                                   # noqa: E402
+import shm_registry                                               # noqa: E402
 from cone_psf import CONE_OFFSETS, psf, blur                      # noqa: E402
 
 DIR = [i for i, (f, l) in enumerate(CONE_OFFSETS) if l > 0]
@@ -214,6 +216,33 @@ def test_canais_de_predacao_intactos_com_acuidade_baixa():
             assert max(obtido) > 0.0, f"{hx.__name__} canal {ch} zerado (o velho fade)"
 
 
+def test_psf_publicada_no_registro_do_host():
+    """REGENES_SHM=1: um processo monta e publica, o outro anexa a MESMA PSF (bit a bit);
+    entrada plantada com índice fora do cone é remontada, nunca usada."""
+    antes, cache = shm_registry._DEFAULT, dict(cone_psf._cache)
+    try:
+        with tempfile.TemporaryDirectory() as d:
+            reg = shm_registry._DEFAULT = shm_registry.Registry(os.path.join(d, "shm"))
+            cone_psf._cache.clear()
+            montada = psf(1.57)
+            assert reg.publishes == 1
+            assert bytes(reg.get("cone-psf-v1-1.570")) == cone_psf._encode(montada)
+            cone_psf._cache.clear()                          # o "outro processo"
+            hits = reg.hits
+            assert psf(1.57) == montada and reg.hits == hits + 1 and reg.publishes == 1
+            assert psf(0.2) == [[(i, 1.0)] for i in range(31)] and reg.publishes == 1
+            ruim = bytearray(cone_psf._encode(montada))
+            ruim[-2:] = (31).to_bytes(2, "little")             # último índice: célula 31
+            reg.put("cone-psf-v1-2.500", bytes(ruim))
+            cone_psf._cache.clear()
+            assert psf(2.5) == cone_psf._build(2.5)
+            assert bytes(reg.get("cone-psf-v1-2.500")) == cone_psf._encode(psf(2.5))
+    finally:
+        shm_registry._DEFAULT = antes
+        cone_psf._cache.clear()
+        cone_psf._cache.update(cache)
+
+
 def test_custo_de_cpu():
     """A §7.2 do meu contraditório exigiu o custo antes de priorizar. Aqui está ele."""
     import time
@@ -0,0 +1,121 @@
+"""
+Testes do executor combinado (executor.py): as duas espécies num processo só.
+
+O combinado só presta se cada espécie continuar sendo ELA MESMA: o genoma nativo nasce do
+config-native e o CPPN do config-cppn, no mesmo processo, sem um config vazar pro outro
+(neat_brain memoizava UM config por processo). E o runtime tem de levar as duas pela vida
+inteira (nascer, agir, viz, morrer, drenar) contra um mundo de mentira, cada uma no join dela.
+
+Roda com:  pytest test_executor.py   (ou: python test_executor.py)
+"""
+import asyncio
+import json
+import os
+import sys
+from urllib.parse import urlsplit, parse_qs
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(raiz, "client_hyperneat"))
+import websockets                            # noqa: E402
+import executor                              # noqa: E402
+import runtime_stats                         # noqa: E402
+import neat_brain as nb                      # noqa: E402
+
+VIS = [[((i * 3 + ch) % 11) / 11.0 for i in range(31)] for ch in range(4)]
+QUI = [[0.0] * 9 for _ in range(3)]
+
+
+def _backends():
+    hyper, native = executor._backends(["hyper", "native"])   # o CPPN carrega PRIMEIRO
+    for mod in ("host", "host_hyper"):                        # teste não escreve o CSV
+        sys.modules[mod]._SINK.enabled = False
+    for be in (hyper, native):
+        be.warm()
+    return native, hyper
+
+
+def test_configs_das_duas_especies_convivem():
+    native, hyper = _backends()
+    assert native.cfg is not hyper.cfg
+    assert native.cfg.genome_config.num_inputs == executor.N_OBS
+    assert hyper.cfg.genome_config.num_inputs != executor.N_OBS          # CPPN: coordenadas
+    bn, bh = native.primordial(), hyper.primordial()
+    assert len(bn["net"].input_nodes) == executor.N_OBS
+    assert len(bn["net"].output_nodes) == executor.N_ACTIONS
+    assert set(bn["g"].nodes) >= set(native.cfg.genome_config.output_keys)
+    assert set(bh["g"].nodes) >= set(hyper.cfg.genome_config.output_keys)
+    assert len(bh["g"].nodes) < executor.N_ACTIONS                       # pesos + LEO, não 7
+    # herança com o config certo: o filho do nativo continua nativo, o do CPPN continua CPPN
+    filho, origem = native.birth(bn["blob"], None, None)
+    assert origem == "mutacao" and len(filho["net"].input_nodes) == executor.N_OBS
+    filho, origem = hyper.birth(bh["blob"], bh["blob"], None)
+    assert origem == "cruzamento" and set(filho["g"].nodes) >= set(
+        hyper.cfg.genome_config.output_keys)
+    assert nb.load_config(nb._DEFAULT_CONFIG) is native.cfg              # memo por caminho
+
+
+def test_as_duas_especies_agem_no_mesmo_processo():
+    async def mundo(ws, *_):
+        path = ws.path if hasattr(ws, "path") else ws.request.path
+        vistos.append(parse_qs(urlsplit(path).query)["species"][0])
+        await ws.send(json.dumps({"type": "WELCOME", "body": {"stomach_size": 200}}))
+        if len(vistos) == 3:
+            executor._drain()                # todas no ar: a vida em curso é a última
+        try:
+            for _ in range(5):
+                await ws.send(json.dumps({"vision": VIS, "chemical": QUI, "energy": 50,
+                                          "stomach": 10, "viz": True}))
+                msg = json.loads(await ws.recv())
+                while msg.get("type") in ("brain", "brain_viz"):
+                    tipos.add(msg["type"])
+                    msg = json.loads(await ws.recv())
+                assert msg in executor.ACTIONS
+                await asyncio.sleep(0.01)
+            await ws.send(json.dumps({"type": "UPDATE", "alive": False}))
+            await ws.wait_closed()
+        except websockets.ConnectionClosed:
+            pass
+
+    async def cenario():
+        async with websockets.serve(mundo, "127.0.0.1", 0) as srv:
+            port = srv.sockets[0].getsockname()[1]
+            await asyncio.wait_for(executor.run(list(zip(_backends(), (2, 1))),
+                                                f"ws://127.0.0.1:{port}"), 30)
+
+    vistos, tipos = [], set()
+    try:
+        asyncio.run(cenario())
+    finally:
+        executor._DRAINING = False
+    assert sorted(vistos) == ["HyperNEAT", "Native_NEAT", "Native_NEAT"]
+    assert tipos == {"brain", "brain_viz"}
+    assert [(sp.stats.births, sp.stats.ticks, sp.stats.state) for sp in executor._SPECIES] == \
+        [(2, 10, "stopped"), (1, 5, "stopped")]
+
+
+def test_status_agregado_soma_as_especies():
+    a, b = runtime_stats.RuntimeStats("native", 3), runtime_stats.RuntimeStats("hyper", 2)
+    for dt in (0.001, 0.002):
+        a.tick(dt)
+    b.tick(0.010)
+    a.born()
+    b.state = "draining"
+    snap = runtime_stats.StatsGroup([a, b]).snapshot()
+    assert (snap["species"], snap["n"], snap["ticks"], snap["alive"]) == ("native+hyper", 5, 3, 1)
+    assert snap["tick_ms"]["max"] == 10.0 and snap["state"] == "draining"
+    assert snap["by_species"]["hyper"]["ticks"] == 1
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
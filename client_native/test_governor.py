@@ -0,0 +1,113 @@
+"""
+Testes do corte sob carga (governor.py).
+
+O governador só presta se: subir um degrau por vez, na ordem (viz, telemetria, logs), só
+depois de carga sustentada; descer mais devagar do que sobe (histerese); cada degrau cortar
+de fato o que promete; e a sonda enxergar um event loop travado.
+
+Roda com:  pytest test_governor.py   (ou: python test_governor.py)
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import governor                              # noqa: E402
+import runtime_stats                         # noqa: E402
+import telemetry                             # noqa: E402
+import viz                                   # noqa: E402
+
+
+def _gov(**kw):
+    kw.setdefault("lag_ms", 100.0)
+    kw.setdefault("target_ms", 50.0)
+    return governor.Governor(**kw)
+
+
+def test_sobe_em_ordem_e_desce_com_histerese():
+    g = _gov(up=2, down=4)
+    try:
+        niveis = [g.decide(250, 10) for _ in range(8)]     # loop afogado
+        assert niveis == [0, 1, 1, 2, 2, 3, 3, 3]
+        assert [c[2] for c in g.changes] == [1, 2, 3] and "atraso do loop" in g.changes[0][3]
+        assert g.quiet and g.viz_slow == governor.VIZ_SLOW
+        assert telemetry.SAMPLE == governor.TELEMETRY_EVERY
+        assert g.decide(70, 30) == 3                         # faixa morta: segura
+        assert [g.decide(10, 5) for _ in range(4)] == [3, 3, 3, 2]   # folga: 4 seguidas
+        assert [g.decide(10, None) for _ in range(8)] == [2, 2, 2, 1, 1, 1, 1, 0]
+        assert telemetry.SAMPLE == 1 and g.viz_slow == 1
+        assert g.decide(20, 80) == 0 and g.decide(20, 80) == 1   # p99 alto também sobe
+        desligado = _gov(enabled=False)
+        assert [desligado.decide(999, 999) for _ in range(5)] == [0] * 5
+    finally:
+        telemetry.SAMPLE = 1
+
+
+def test_cada_degrau_corta_o_que_promete():
+    g = _gov()
+    with tempfile.TemporaryDirectory() as d:
+        s = telemetry.Sink(os.path.join(d, "t.csv"), (("i", "I"),), enabled=True,
+                           flush_s=3600)
+        try:
+            g._set(2, "teste")
+            for i in range(100):
+                s.record(i)
+            g.log("linha")                                  # degrau 2: log ainda sai
+            assert g.suppressed == 0
+            g._set(3, "teste")
+            for _ in range(5):
+                g.log("linha")
+            assert g.suppressed == 5 and g.status()["suppressed_logs"] == 5
+            g._set(0, "teste")
+            assert g.suppressed == 0                         # o total saiu no log da volta
+        finally:
+            telemetry.SAMPLE = 1
+        s.close()
+        assert (s.written, s.sampled_out) == (10, 90)
+    vs = viz.VizStream([7], hz=4, delta=0)
+    inp, out = [0.1] * 5, [0.0] * 7
+    n = {1: 0, governor.VIZ_SLOW: 0}
+    for slow in n:
+        vs.reset()
+        for k in range(40):                                  # 4 s de ticks a 10 Hz
+            if vs.due(k / 10, slow) and vs.frame(k / 10, inp, [k / 40], out, 0):
+                n[slow] += 1
+    assert 15 <= n[1] <= 17 and 4 <= n[governor.VIZ_SLOW] <= 5   # 4 Hz -> 1 Hz
+
+
+def test_sonda_ve_o_loop_travado():
+    st = runtime_stats.RuntimeStats("native", 1)
+    g = _gov(lag_ms=50, up=1, every=0.1, probe=0.01)
+    fim = []
+
+    async def travador():
+        for _ in range(6):
+            time.sleep(0.12)                                 # trabalho síncrono no loop
+            st.tick(0.12)
+            await asyncio.sleep(0.02)
+        fim.append(1)
+
+    async def cenario():
+        await asyncio.gather(travador(), g.run([st], lambda: bool(fim)))
+    asyncio.run(cenario())
+    try:
+        assert g.level >= 2 and g.status()["loop_lag_ms"] >= 50
+        assert g.status()["tick_p99_ms"] == 120.0
+    finally:
+        telemetry.SAMPLE = 1
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
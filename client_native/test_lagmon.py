@@ -0,0 +1,91 @@
+"""
+Testes do monitor de atraso do event loop (lagmon.py).
+
+O monitor só presta se: a etapa corrente for a certa (aninhada, e restaurada na saída); uma
+trava de verdade cair no log com a etapa, a ameba e a PILHA de quem travou; e os percentis
+do atraso saírem no snapshot que o status publica.
+
+Roda com:  pytest test_lagmon.py   (ou: python test_lagmon.py)
+"""
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import governor                              # noqa: E402
+import lagmon                                # noqa: E402
+import runtime_stats                         # noqa: E402
+import telemetry                             # noqa: E402
+
+
+def test_etapas_aninham_e_restauram():
+    assert lagmon.current() == ("", "")
+    with lagmon.stage("birth", "H3"):
+        assert lagmon.current() == ("birth", "H3")
+        with lagmon.stage("pack"):
+            assert lagmon.current() == ("birth>pack", "H3")
+            time.sleep(0.01)
+        assert lagmon.current() == ("birth", "H3")
+    assert lagmon.current() == ("", "")
+    assert lagmon._long[0] == "birth" and lagmon._long[1] >= 0.01
+    try:
+        with lagmon.stage("encode", "7"):
+            raise ValueError("x")
+    except ValueError:
+        pass
+    assert lagmon.current() == ("", "")
+
+
+def _nascimento_pesado():
+    with lagmon.stage("birth", "H1"):
+        with lagmon.stage("pack"):
+            fim = time.perf_counter() + 0.25
+            while time.perf_counter() < fim:        # Python puro: o cão de guarda enxerga
+                sum(range(200))
+
+
+def test_trava_vai_pro_log_com_etapa_e_pilha():
+    linhas = []
+    mon = lagmon.LagMonitor(stall_ms=100, probe=0.01, keep=3, log=linhas.append)
+    st = runtime_stats.RuntimeStats("hyper", 1)
+    gov = governor.Governor(lag_ms=100, up=1, every=0.05)
+
+    async def cenario():
+        task = asyncio.create_task(mon.run())
+        feito = []
+        gt = asyncio.create_task(gov.run([st], lambda: bool(feito), mon))
+        await asyncio.sleep(0.1)
+        _nascimento_pesado()
+        await asyncio.sleep(0.1)
+        feito.append(1)
+        await gt
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+    try:
+        asyncio.run(cenario())
+    finally:
+        telemetry.SAMPLE = 1
+    snap = mon.snapshot()
+    assert snap["stalls"] == 1 and len(linhas) == 1, linhas
+    pior = snap["worst"][0]
+    assert pior["ms"] >= 200 and pior["stage"] == "birth>pack" and pior["tag"] == "H1"
+    assert any("_nascimento_pesado" in f for f in pior["stack"])
+    assert "birth>pack [H1]" in linhas[0]
+    assert snap["lag_ms"]["max"] >= 200 and snap["lag_ms"]["p50"] < 50
+    assert gov.level == 1 and "atraso do loop" in gov.changes[0][3]   # a mesma sonda
+    assert not mon._thread.is_alive() or mon._stop.is_set()
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
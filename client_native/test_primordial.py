@@ -0,0 +1,87 @@
+"""
+Testes do reservatório de primordiais (primordial.PrimordialPool).
+
+O pool só pode ADIANTAR trabalho: pool vazio fabrica na hora (nunca trava o nascimento),
+a reposição não pode furar a fila dos ticks, e cada item sai uma vez só — duas amebas
+com o MESMO genoma primordial seria um clone que ninguém pediu.
+
+Roda com:  pytest test_primordial.py   (ou: python test_primordial.py)
+"""
+import asyncio
+import itertools
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import primordial                            # noqa: E402
+
+
+def _pool(size=3, **kw):
+    cont = itertools.count()
+    return primordial.PrimordialPool(lambda: next(cont), size=size, idle=0.001, **kw)
+
+
+def test_vazio_fabrica_na_hora_e_conta_falta():
+    p = _pool()
+    assert p.take() == 0 and p.take() == 1
+    assert p.stats()["misses"] == 2 and p.stats()["hits"] == 0
+
+
+def test_reposicao_enche_e_item_sai_uma_vez():
+    async def caso():
+        p = _pool(size=3)
+        t = asyncio.create_task(p.run())
+        for _ in range(200):
+            if len(p) == 3:
+                break
+            await asyncio.sleep(0.002)
+        assert len(p) == 3
+        tirados = [p.take() for _ in range(3)]
+        for _ in range(200):                 # take() acorda a reposição
+            if len(p) == 3:
+                break
+            await asyncio.sleep(0.002)
+        tirados += [p.take() for _ in range(3)]
+        t.cancel()
+        return p, tirados
+    p, tirados = asyncio.run(caso())
+    assert len(set(tirados)) == 6
+    assert p.stats()["hits"] == 6 and p.stats()["misses"] == 0
+
+
+def test_loop_ocupado_adia_a_reposicao():
+    """Com o loop atrasado (tick pesado rodando), o pool não fabrica — espera folga."""
+    async def caso():
+        p = _pool(size=2, busy_lag=0.001)
+        t = asyncio.create_task(p.run())
+
+        async def ticks():
+            for _ in range(20):
+                time.sleep(0.004)            # handler síncrono segurando o loop
+                await asyncio.sleep(0)
+        await ticks()
+        cheio_durante = len(p)
+        t.cancel()
+        return cheio_durante
+    assert asyncio.run(caso()) == 0
+
+
+def test_tamanho_zero_desliga():
+    p = _pool(size=0)
+    asyncio.run(asyncio.wait_for(p.run(), 1.0))     # retorna na hora
+    assert p.take() == 0 and len(p) == 0
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
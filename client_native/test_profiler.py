@@ -0,0 +1,95 @@
+"""
+Testes do perfil sob demanda (profiler.py).
+
+O perfil só presta se: as amostras levarem como raiz o grupo e a etapa do lagmon (o flame
+graph separa nascimento de tick); a janela acabar sozinha e gravar o .folded em logs/; e o
+SIGUSR2 abrir uma janela num processo vivo, sem reiniciar.
+
+Roda com:  pytest test_profiler.py   (ou: python test_profiler.py)
+"""
+import asyncio
+import os
+import signal
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import lagmon                                # noqa: E402
+import profiler                              # noqa: E402
+
+
+def _gira(s: float):
+    fim = time.perf_counter() + s
+    while time.perf_counter() < fim:
+        sum(range(100))
+
+
+def nascer_pesado():
+    with lagmon.stage("birth", "H1"):
+        with lagmon.stage("pack"):
+            _gira(0.15)
+
+
+def tick_pesado():
+    with lagmon.stage("encode", "3"):
+        _gira(0.15)
+
+
+def test_raiz_e_a_etapa_e_a_janela_fecha_sozinha():
+    assert profiler.group("birth>pack") == "birth" and profiler.group("primordial") == "birth"
+    assert profiler.group("activate") == "tick" and profiler.group("") == "loop"
+    with tempfile.TemporaryDirectory() as d:
+        linhas = []
+        p = profiler.Profiler(label="native", hz=500, out_dir=d, log=linhas.append)
+        assert p.start(0.4)
+        assert not p.start(1)                                # já rodando: ignora
+        nascer_pesado()
+        tick_pesado()
+        p._thread.join(2)
+        assert not p.running and p.runs == 1
+        assert os.path.basename(p.last_path).startswith(f"profile-native-{os.getpid()}-")
+        with open(p.last_path, encoding="utf-8") as f:
+            pilhas = [ln.rsplit(" ", 1) for ln in f.read().splitlines()]
+        assert all(int(n) > 0 for _, n in pilhas)
+        nasc = [s for s, _ in pilhas if s.startswith("birth;birth>pack;")]
+        tick = [s for s, _ in pilhas if s.startswith("tick;encode;")]
+        assert nasc and tick
+        assert any("nascer_pesado (test_profiler.py" in s for s in nasc)
+        assert not any("nascer_pesado" in s for s in tick)
+        sh = p.shares()
+        assert sh["birth"] > 0.2 and sh["tick"] > 0.2 and abs(sum(sh.values()) - 1) < 1e-9
+        assert "amostras ->" in linhas[-1] and "birth" in linhas[-1]
+
+
+def test_sigusr2_perfila_o_processo_vivo():
+    with tempfile.TemporaryDirectory() as d:
+        linhas = []
+        p = profiler.Profiler(label="hyper", hz=500, out_dir=d, log=linhas.append)
+
+        async def cenario():
+            p.install(asyncio.get_running_loop())
+            os.kill(os.getpid(), signal.SIGUSR2)
+            await asyncio.sleep(0.05)
+            assert p.running
+            tick_pesado()
+            await asyncio.sleep(0.05)
+            p.stop()                                         # fim do executor: grava o parcial
+            asyncio.get_running_loop().remove_signal_handler(signal.SIGUSR2)
+        asyncio.run(cenario())
+        assert not p.running and p.last_path and os.path.exists(p.last_path)
+        assert "tick" in p.shares() and p.samples > 20
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
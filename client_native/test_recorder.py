@@ -0,0 +1,125 @@
+"""
+Testes da gravação de ticks e do replay (recorder.py, replay.py).
+
+A gravação só presta se: o arquivo for gzip válido com uma vida e seus ticks por linha, a
+mensagem crua intacta; a rotação e a amostragem funcionarem sem perder o cabeçalho da vida;
+e o replay refizer, a partir do BLOB, exatamente as saídas e ações gravadas — e acusar um
+encode candidato que muda a decisão.
+
+Roda com:  pytest test_recorder.py   (ou: python test_recorder.py)
+"""
+import asyncio
+import gzip
+import json
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(raiz, "client_hyperneat"))
+import executor                              # noqa: E402
+import neat_brain as nb                      # noqa: E402
+import recorder                              # noqa: E402
+import replay                                # noqa: E402
+
+
+def _msg(rng, tick):
+    return {"type": "TICK", "tick": tick,
+            "vision": [[rng.choice((0.0, 0.0, 0.0, rng.random())) for _ in range(31)]
+                       for _ in range(4)],
+            "chemical": [[rng.random() for _ in range(9)] for _ in range(3)],
+            "energy": rng.uniform(0, 200), "stomach": rng.uniform(0, 200),
+            "pace_sin": 0.5, "pace_cos": -0.5, "ingested": 1.0, "contact_wall": 0.25}
+
+
+def _grava(path, n_vidas=3, n_ticks=20, **kw):
+    """Vidas de verdade (nativo e hyper) passando pelo caminho do executor."""
+    rng = random.Random(7)
+    rec = recorder.TickRecorder(path, flush_s=3600, **kw)
+    native, hyper = (executor._backends([n])[0] for n in ("native", "hyper"))
+    for be in (native, hyper):
+        be.warm()
+    for v in range(n_vidas):
+        be = (native, hyper)[v % 2]
+        b = be.nascer(nb.mutate(nb.random_genome(100 + v, be.cfg), be.cfg))
+        lid = rec.life(be.name, "mutacao", {"brain_a": None, "brain_b": None}, b, 200)
+        for t in range(n_ticks):
+            raw = json.dumps(_msg(rng, t))
+            inp = executor.encode_msg(json.loads(raw), 200, b["acuity"])
+            out = asyncio.run(be.activate(b, inp, False))
+            rec.tick(lid, raw, 200, out, executor.decide(out))
+    rec.close()
+    return rec
+
+
+def test_grava_gzip_com_vida_e_ticks():
+    with tempfile.TemporaryDirectory() as d:
+        p = os.path.join(d, "ticks.jsonl.gz")
+        rec = _grava(p, n_vidas=2, n_ticks=5)
+        with gzip.open(p, "rt") as f:                        # gzip comum lê
+            linhas = [json.loads(x) for x in f]
+        assert [x["k"] for x in linhas] == ["life"] + ["tick"] * 5 + ["life"] + ["tick"] * 5
+        assert linhas[0]["species"] == "native" and linhas[6]["species"] == "hyper"
+        assert nb.unpack(linhas[0]["blob"]) is not None
+        t = linhas[1]
+        assert t["id"] == linhas[0]["id"] and len(t["out"]) == 7 and t["msg"]["tick"] == 0
+        assert len(t["msg"]["vision"]) == 4 and rec.written == 12
+        with open(p, "ab") as f:                             # processo morto no meio do lote
+            f.write(gzip.compress(b'{"k":"tick","id":"1-1"}\n{"k":"ti')[:-8])
+        regs = list(recorder.read(p))                        # a linha inteira vale; a metade não
+        assert len(regs) == 13 and regs[-1] == {"k": "tick", "id": "1-1"}
+
+
+def test_amostra_e_roda_sem_perder_a_vida():
+    with tempfile.TemporaryDirectory() as d:
+        p = os.path.join(d, "ticks.jsonl.gz")
+        rec = recorder.TickRecorder(p, every=4, max_bytes=1, flush_s=3600)
+        for v in range(3):
+            lid = rec.life("native", "primordial", {}, {"blob": "x"}, 200)
+            for t in range(8):
+                rec.tick(lid, '{"tick":%d}' % t, 200, [0.0] * 7, 4)
+            rec.flush()
+        rec.close()
+        arquivos = sorted(os.listdir(d))
+        assert len(arquivos) == 3 and rec.rotations == 2
+        regs = [r for a in arquivos for r in recorder.read(os.path.join(d, a))]
+        assert sum(r["k"] == "life" for r in regs) == 3
+        assert sum(r["k"] == "tick" for r in regs) == 6          # 24 ticks, 1 a cada 4
+
+
+def _encode_sem_borrao(*a, **kw):
+    """Candidato errado: ignora a acuidade (visão sempre nítida)."""
+    return executor.encode(*a[:-1], (executor.cone_psf.psf(0.0), 0.0, 1.0), **kw)
+
+
+def test_replay_refaz_as_acoes_e_acusa_o_candidato_errado():
+    with tempfile.TemporaryDirectory() as d:
+        p = os.path.join(d, "ticks.jsonl.gz")
+        _grava(p)
+        rep = asyncio.run(replay.replay(recorder.read(p)))
+        assert rep["lives"] == 3 and rep["ticks"] == 60
+        assert rep["out_mismatches"] == rep["act_mismatches"] == 0, rep["first_mismatches"]
+        assert rep["max_abs_diff"] <= 1e-9 and rep["ticks_per_s"] > 0
+        ruim = asyncio.run(replay.replay(recorder.read(p), enc=_encode_sem_borrao))
+        assert ruim["out_mismatches"] > 0 and ruim["first_mismatches"][0]["max_abs_diff"] > 1e-9
+        out = os.path.join(d, "rep.json")
+        assert replay.main([p, "--encode", "test_recorder:_encode_sem_borrao", "--out", out]) == 1
+        assert replay.main([p, "--out", out, "--repeat", "2"]) == 0
+        with open(out) as f:
+            assert len(json.load(f)["runs_ticks_per_s"]) == 2
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
@@ -0,0 +1,120 @@
+"""
+Testes do registro compartilhado (shm_registry.Registry).
+
+O registro é a memória que os processos do host dividem: o que um publica, o outro tem de
+ler IGUAL, inteiro (nunca pela metade) e sem cópia; e o teto de tamanho não pode virar
+vazamento de /dev/shm.
+
+Roda com:  pytest test_shm_registry.py   (ou: python test_shm_registry.py)
+"""
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import shm_registry                          # noqa: E402
+
+
+def test_publica_num_processo_anexa_no_outro():
+    with tempfile.TemporaryDirectory() as d:
+        a, b = shm_registry.Registry(d), shm_registry.Registry(d)   # dois "processos"
+        assert b.get("tabela") is None
+        a.put("tabela", b"\x01\x02" * 1000)
+        mv = b.get("tabela")
+        assert bytes(mv) == b"\x01\x02" * 1000 and mv.readonly
+        assert (b.stats()["hits"], b.stats()["misses"]) == (1, 1)
+        assert not [f for f in os.listdir(d) if f.startswith(".tmp-")]   # nada pela metade
+
+
+def test_get_or_build_so_o_primeiro_paga():
+    with tempfile.TemporaryDirectory() as d:
+        chamadas = []
+
+        def build():
+            chamadas.append(1)
+            return b"x" * 64
+        for _ in range(3):
+            assert bytes(shm_registry.Registry(d).get_or_build("k", build)) == b"x" * 64
+        assert len(chamadas) == 1
+
+
+def test_chave_arbitraria_vira_nome_seguro():
+    with tempfile.TemporaryDirectory() as d:
+        r = shm_registry.Registry(d)
+        r.put("../fora/do/diretorio", b"ok")
+        assert bytes(r.get("../fora/do/diretorio")) == b"ok"
+        assert len(os.listdir(d)) == 1
+
+
+def test_teto_apaga_as_mais_velhas_e_mapa_vivo_segue_valido():
+    with tempfile.TemporaryDirectory() as d:
+        r = shm_registry.Registry(d, max_bytes=10_000)
+        primeira = r.put("e0", b"a" * 4000)
+        for k in range(1, 70):                       # passa de _SWEEP_EVERY publicações
+            os.utime(os.path.join(d, f"e{k - 1}"), (k, k))
+            r.put(f"e{k}", b"b" * 4000)
+        total = sum(os.path.getsize(os.path.join(d, f)) for f in os.listdir(d))
+        assert total <= 10_000 + 64 * 4000           # só varre a cada _SWEEP_EVERY
+        assert not os.path.exists(os.path.join(d, "e0"))
+        assert bytes(primeira) == b"a" * 4000        # quem já mapeou continua lendo
+
+
+def test_raiz_alheia_ou_aberta_e_recusada():
+    """Nome previsível em /dev/shm: quem chegou antes não pode plantar substrato."""
+    with tempfile.TemporaryDirectory() as d:
+        nova = os.path.join(d, "nova")
+        shm_registry.Registry(nova)
+        assert os.stat(nova).st_mode & 0o777 == 0o700
+        aberta = os.path.join(d, "aberta")
+        os.mkdir(aberta)
+        os.chmod(aberta, 0o755)
+        link = os.path.join(d, "link")
+        os.symlink(nova, link)
+        for raiz in (aberta, link):
+            try:
+                shm_registry.Registry(raiz)
+            except OSError:
+                continue
+            raise AssertionError(f"{raiz} aceita")
+        if os.getuid() == 0:                         # como root dá pra simular o outro usuário
+            alheia = os.path.join(d, "alheia")
+            os.mkdir(alheia, 0o700)
+            os.chown(alheia, 12345, 12345)
+            try:
+                shm_registry.Registry(alheia)
+                raise AssertionError("raiz de outro usuário aceita")
+            except OSError:
+                pass
+
+
+def test_varredura_poupa_fixas_e_temporarios_em_curso():
+    with tempfile.TemporaryDirectory() as d:
+        r = shm_registry.Registry(d, max_bytes=10_000)
+        r.put(shm_registry.PIN + "tabela", b"t" * 4000)
+        os.utime(os.path.join(d, shm_registry.PIN + "tabela"), (1, 1))   # a mais velha
+        em_curso = os.path.join(d, ".tmp-outro")
+        with open(em_curso, "wb") as f:
+            f.write(b"p" * 4000)
+        morto = os.path.join(d, ".tmp-morto")
+        with open(morto, "wb") as f:
+            f.write(b"m")
+        os.utime(morto, (1, 1))
+        for k in range(70):
+            r.put(f"e{k}", b"b" * 4000)
+        assert bytes(r.get(shm_registry.PIN + "tabela")) == b"t" * 4000
+        assert os.path.exists(em_curso) and not os.path.exists(morto)
+        assert not os.path.exists(os.path.join(d, "e0"))
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
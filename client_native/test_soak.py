@@ -0,0 +1,130 @@
+"""
+Testes do mundo de mentira (fake_world.py) e do harness de capacidade/soak (soak.py).
+
+O harness só presta se: o mundo cronometrar a decisão no relógio DELE (atrasada conta,
+demorada perde a vez, nascimento e morte contam); a busca achar o maior N que aguenta sem
+medir à toa; as tendências acusarem o que vaza e calarem o que só aqueceu; e, de ponta a
+ponta, um executor de verdade nascer, morrer e ser medido pelo admin.
+
+Roda com:  pytest test_soak.py   (ou: python test_soak.py)
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+
+import websockets
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import soak                                  # noqa: E402
+from fake_world import FakeWorld             # noqa: E402
+
+
+def test_mundo_cronometra_e_cobra_o_prazo():
+    async def ameba(url, lentos):
+        async with websockets.connect(url + "/?species=Native_NEAT&paradigm=neat") as ws:
+            welcome = json.loads(await ws.recv())
+            await ws.send(json.dumps({"type": "brain", "brain": "BLOB"}))
+            k = 0
+            async for raw in ws:
+                if json.loads(raw).get("type") == "UPDATE":
+                    return welcome
+                if k in lentos:
+                    await asyncio.sleep(0.03)                # passa do prazo e da vez
+                await ws.send(json.dumps({"action": "stay"}))
+                k += 1
+
+    async def cenario():
+        mundo = FakeWorld(tick_hz=50, deadline_ms=15, life_ticks=8)
+        url = await mundo.start()
+        w1 = await ameba(url, {2, 5})
+        n1 = mundo.snapshot(reset=True)
+        for _ in range(5):                                   # o banco vira semente
+            await ameba(url, set())
+        n2 = mundo.snapshot()
+        await mundo.close()
+        return mundo, w1, n1, n2
+
+    mundo, w1, n1, n2 = asyncio.run(cenario())
+    assert w1["type"] == "WELCOME" and w1["brain_a"] is None and w1["brain_b"] is None
+    assert n1["ticks"] == 8 and n1["late"] == 2 and n1["overruns"] == 2
+    assert n1["births"] == n1["deaths"] == 1 and n1["decision_ms"]["max"] >= 30
+    assert n1["birth_ms"]["p50"] is not None
+    assert n2["late"] == 0 and n2["births"] == 5 and n2["ticks_per_s"] > 0
+    assert mundo.totals["births"] == 6 and mundo.banks["Native_NEAT"] == ["BLOB"] * 6
+
+
+def test_busca_dobra_e_bissecta():
+    def busca(limite, start, hi):
+        medidos = []
+
+        async def probe(n):
+            medidos.append(n)
+            return {"n": n, "ok": n <= limite}
+        return asyncio.run(soak.search(probe, start, hi)), medidos
+
+    r, medidos = busca(37, 8, 512)
+    assert r["max_ok"] == 36 and r["first_fail"] == 38 and not r["capped"]   # dentro de 10%
+    assert medidos == [8, 16, 32, 64, 48, 40, 36, 38]
+    r, medidos = busca(10 ** 6, 8, 20)
+    assert r["max_ok"] == 20 and r["capped"] and medidos == [8, 16, 20]
+    r, _ = busca(2, 8, 512)                                  # nem o início aguentou
+    assert r["max_ok"] == 2 and r["first_fail"] == 3
+
+
+def _amostra(t, rss_mb, fds, psf, unpack, p99, cap=None):
+    return {"t_s": t, "rss_bytes": rss_mb * 2 ** 20, "open_fds": fds,
+            "caches": {"psf": {"entries": psf}, "unpack": {"entries": unpack, "max_entries": cap}},
+            "world": {"ticks": 100, "late": 0, "births": 2, "deaths": 2,
+                      "decision_ms": {"p99": p99}}}
+
+
+def test_tendencias_acusam_vazamento_e_calam_o_aquecimento():
+    # estável: a PSF e os pais enchem no aquecimento (e os pais param no teto)
+    ok = [_amostra(t * 600, 40 + (t == 0) * -8, 16, min(t, 1) * 20, min(t * 50, 100), 5.0, 100)
+          for t in range(13)]
+    r = soak.trend(ok)
+    assert r["alerts"] == [], r["alerts"]
+    assert r["rss_mb_per_hour"] == 0.0 and r["late_frac"] == 0.0 and r["births"] == 22
+    # vazando: RSS +30 MB/h, um descritor por amostra, PSF sem fim, latência dobrando
+    ruim = [_amostra(t * 600, 40 + 5 * t, 16 + t, 20 + t, 10, 5.0 + t) for t in range(13)]
+    r = soak.trend(ruim)
+    assert r["rss_mb_per_hour"] == 30.0
+    assert [a.split(":")[0] for a in r["alerts"]] == ["rss", "fds", "cache psf", "latência"]
+    assert r["caches"]["unpack"]["growing"] is False
+    assert soak.trend([])["alerts"]
+
+
+def test_soak_e_capacidade_de_verdade():
+    with tempfile.TemporaryDirectory() as d:
+        out = os.path.join(d, "soak.json")
+        rep = asyncio.run(soak.soak("native", n=2, hz=20, duration_s=4, every_s=1, life=10,
+                                    work_dir=d, out=out, log=lambda s: None))
+        assert rep["exit"] is None and len(rep["samples"]) >= 3
+        ult = rep["samples"][-1]
+        assert ult["rss_bytes"] > 0 and ult["open_fds"] > 0
+        assert {"psf", "config", "unpack"} <= set(ult["caches"])
+        assert ult["caches"]["config"]["entries"] == 1
+        assert rep["world_totals"]["births"] >= 3 and rep["world_totals"]["deaths"] >= 2
+        with open(out) as f:
+            assert json.load(f)["trend"] == rep["trend"]
+        cap = asyncio.run(soak.capacity("native", hz=10, start=2, hi=2, step_s=1,
+                                        warmup_s=0.5, work_dir=d, log=lambda s: None))
+        assert cap["capped"] and cap["max_amebas"] == 2 and cap["steps"][0]["ok"]
+        assert cap["steps"][0]["world"]["ticks_per_s"] >= 19 and cap["meta"]["python"]
+        json.dumps(cap)
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
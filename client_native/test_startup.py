@@ -0,0 +1,97 @@
+"""
+Testes da partida a frio (startup.py + snapshot do config em neat_brain).
+
+O snapshot do config só presta se for INVISÍVEL: o neat.Config que sai do pickle tem de
+gerar exatamente os mesmos genomas que o parse do INI. E o cronômetro tem de contar cada
+ameba uma vez só — a 1ª ação, não a de todo tick.
+
+Roda com:  pytest test_startup.py   (ou: python test_startup.py)
+"""
+import asyncio
+import os
+import random
+import shutil
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import neat_brain as nb                      # noqa: E402
+import startup                               # noqa: E402
+
+
+def _genes(cfg):
+    nb._install_deterministic_identity(cfg)             # o que load_config põe por cima
+    random.seed(7)
+    g = nb.neat.DefaultGenome(1)
+    g.configure_new(cfg.genome_config)
+    for _ in range(3):
+        g.mutate(cfg.genome_config)
+    return (sorted((k, round(n.bias, 12)) for k, n in g.nodes.items()),
+            sorted((k, round(c.weight, 12), c.enabled) for k, c in g.connections.items()))
+
+
+def test_snapshot_do_config_equivale_ao_parse():
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "config-native")
+        shutil.copy(nb._DEFAULT_CONFIG, path)
+        frio = nb._config_snapshot(path)                 # parseia e grava
+        snaps = os.listdir(os.path.join(d, "__pycache__"))
+        assert len(snaps) == 1 and snaps[0].endswith(".pickle")
+        quente = nb._config_snapshot(path)               # lê do snapshot
+        assert quente is not frio
+        assert _genes(quente) == _genes(nb._parse_config(path))
+        with open(path, "a") as f:                       # editou o INI: outra chave
+            f.write("\n")
+        nb._config_snapshot(path)
+        assert len(os.listdir(os.path.join(d, "__pycache__"))) == 2
+
+
+def test_relogio_conta_a_primeira_acao_de_cada_ameba():
+    c = startup.StartupClock(2, 0.0)
+    c.mark("import")
+    c.mark("import")                                     # a primeira marcação vale
+    for idx in (0, 0, 1):
+        c.connected(idx)
+        c.acted(idx)
+    r = c.report()
+    assert c.done and (r["connected"], r["acted"]) == (2, 2)
+    assert r["first_action_s"] <= r["all_acted_s"]
+    assert r["import_s"] <= r["first_connect_s"]
+
+
+def test_measure_encerra_as_amebas_e_reporta():
+    async def cenario():
+        c = startup.StartupClock(3, 0.0)
+
+        async def ameba(i):
+            await asyncio.sleep(0.01 * i)
+            c.acted(i)
+            await asyncio.sleep(3600)                    # vive "pra sempre"
+        tasks = asyncio.gather(*[ameba(i) for i in range(3)])
+        return await startup.measure(c, tasks, timeout=5)
+    rep = asyncio.run(cenario())
+    assert rep["complete"] and rep["acted"] == 3
+
+
+def test_measure_com_timeout_devolve_parcial():
+    async def cenario():
+        c = startup.StartupClock(2, 0.0)
+        c.acted(0)
+        tasks = asyncio.gather(asyncio.sleep(3600))
+        return await startup.measure(c, tasks, timeout=0.05)
+    rep = asyncio.run(cenario())
+    assert not rep["complete"] and rep["acted"] == 1 and rep["all_acted_s"] is None
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
@@ -0,0 +1,166 @@
+"""
+Testes do supervisor dos executores (supervisor.py) e dos números de runtime (runtime_stats.py).
+
+O supervisor só presta se: dividir as amebas sem perder nenhuma e sem empilhar núcleo;
+reerguer quem cai SEM martelar (backoff); e parar DRENANDO — SIGTERM primeiro, SIGKILL só
+pra quem estourar o prazo. Os workers aqui são scripts de mentira no lugar de host.py.
+
+Roda com:  pytest test_supervisor.py   (ou: python test_supervisor.py)
+"""
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import runtime_stats                         # noqa: E402
+import supervisor as sup                     # noqa: E402
+
+# worker de mentira: `modo` diz o que ele faz com [N] [ws] e com o SIGTERM
+_FAKE = """
+import signal, sys, time
+modo = {modo!r}
+if modo == "cai":
+    sys.exit(3)
+if modo == "drena":
+    signal.signal(signal.SIGTERM, lambda *a: sys.exit(0))
+if modo == "teimoso":
+    signal.signal(signal.SIGTERM, signal.SIG_IGN)
+while True:
+    time.sleep(0.05)
+"""
+
+
+def _supervisor(d, modo, drain_timeout=5.0):
+    with open(os.path.join(d, "fake.py"), "w") as f:
+        f.write(_FAKE.format(modo=modo))
+    sup.SPECIES["fake"] = (d, "fake.py")
+    w = sup.Worker("fake-0", "fake", 2)
+    return sup.Supervisor([w], "ws://x", log_dir=d, drain_timeout=drain_timeout), w
+
+
+def _espera(cond, prazo=5.0):
+    fim = time.monotonic() + prazo
+    while not cond() and time.monotonic() < fim:
+        time.sleep(0.02)
+    return cond()
+
+
+def test_plano_divide_amebas_e_equilibra_nucleos():
+    ws = sup.plan({"native": 45, "hyper": 20, "vazio": 0}, per_worker=20, cores=[0, 1, 2])
+    assert [w.n for w in ws if w.species == "native"] == [15, 15, 15]
+    assert [w.n for w in ws if w.species == "hyper"] == [20]
+    carga = {}
+    for w in ws:
+        carga[w.core] = carga.get(w.core, 0) + w.n
+    assert sorted(carga.values()) == [15, 15, 35]          # o hyper vai pro menos carregado
+    assert all(w.core is None for w in sup.plan({"native": 3}, 20, []))
+    assert sup.parse_cores("0-2, 6") == [0, 1, 2, 6]
+
+
+def test_worker_nasce_preso_no_nucleo():
+    """Preso ANTES do exec (preexec_fn): o filho e toda thread que ele abrir já estão no núcleo."""
+    if not hasattr(os, "sched_setaffinity"):
+        return
+    nucleo = sup.available_cores()[-1]
+    with tempfile.TemporaryDirectory() as d:
+        s, w = _supervisor(d, "drena")
+        w.core = nucleo
+        w.start("ws://x", d)
+        try:
+            assert os.sched_getaffinity(w.proc.pid) == {nucleo}
+        finally:
+            w.proc.terminate()
+            w.proc.wait()
+    assert sup.pin_to(None) is None
+
+
+def test_backoff_cresce_e_tem_teto():
+    assert [sup.backoff(f) for f in (1, 2, 3, 4)] == [1.0, 2.0, 4.0, 8.0]
+    assert sup.backoff(50) == sup.BACKOFF_MAX
+
+
+def test_worker_que_cai_volta_com_backoff():
+    with tempfile.TemporaryDirectory() as d:
+        s, w = _supervisor(d, "cai")
+        t = time.monotonic()
+        s.step(t)
+        assert _espera(lambda: w.proc.poll() is not None)
+        s.step(t + 0.1)                                    # colhe: 1ª falha, 1 s
+        assert w.proc is None and w.last_exit == 3 and w.next_start == t + 0.1 + 1.0
+        s.step(t + 0.5)
+        assert w.proc is None                              # ainda no castigo
+        s.step(t + 1.2)
+        assert w.proc is not None and w.restarts == 1
+        assert _espera(lambda: w.proc.poll() is not None)
+        s.step(t + 1.3)
+        assert w.next_start == t + 1.3 + 2.0               # 2ª falha seguida: 2 s
+
+
+def test_drenagem_manda_sigterm_e_espera():
+    with tempfile.TemporaryDirectory() as d:
+        s, w = _supervisor(d, "drena")
+        s.step(time.monotonic())
+        proc = w.proc
+        time.sleep(0.3)                                    # deixa instalar o handler
+        s.drain()
+        assert proc.returncode == 0 and w.proc is None and s.state == "stopped"
+
+
+def test_drenagem_estourada_vira_sigkill():
+    with tempfile.TemporaryDirectory() as d:
+        s, w = _supervisor(d, "teimoso", drain_timeout=0.5)
+        s.step(time.monotonic())
+        proc = w.proc
+        time.sleep(0.3)
+        s.drain()
+        assert proc.returncode == -9
+
+
+def test_status_agrega_o_arquivo_do_worker():
+    with tempfile.TemporaryDirectory() as d:
+        s, w = _supervisor(d, "drena")
+        t = time.monotonic()
+        s.step(t)
+        st = runtime_stats.RuntimeStats("fake", 2)
+        for dt in (0.001, 0.002, 0.010):
+            st.tick(dt)
+        st.born()
+        snap = dict(st.snapshot(), pid=w.proc.pid)         # como se fosse o worker
+        runtime_stats.write_json(w.status_file(d), snap)
+        agg = s.status(t + 1.0)
+        assert agg["species"]["fake"]["alive"] == 1
+        assert agg["species"]["fake"]["tick_p99_ms"] == 10.0
+        assert "fake-0" in sup.format_status(json.loads(json.dumps(agg)))
+        s.drain()
+
+
+def test_publish_grava_e_deixa_o_ultimo_estado():
+    async def cenario(path):
+        st = runtime_stats.RuntimeStats("native", 1)
+        t = asyncio.create_task(runtime_stats.publish(st, path, every=0.01))
+        await asyncio.sleep(0.05)
+        st.state = "stopped"
+        t.cancel()
+        await asyncio.gather(t, return_exceptions=True)
+    with tempfile.TemporaryDirectory() as d:
+        path = os.path.join(d, "s.json")
+        asyncio.run(cenario(path))
+        with open(path) as f:
+            assert json.load(f)["state"] == "stopped"
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
@@ -0,0 +1,105 @@
+"""
+Testes da telemetria local em lote (telemetry.py).
+
+A fila só presta se: o event loop NÃO tocar em disco no record(); o que sai do arquivo for
+o que entrou, nos dois formatos (CSV com header pro DictReader, colunar binário); a
+rotação deixar cada arquivo com o seu header; e disco quebrado não derrubar ninguém.
+
+Roda com:  pytest test_telemetry.py   (ou: python test_telemetry.py)
+"""
+import csv
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import telemetry                             # noqa: E402
+
+SCHEMA = (("unix_time", "q"), ("idx", "I"), ("origin", "s"), ("conns", "I"), ("acuity", "d"))
+ROWS = [(1792000000 + i, i % 8, ("primordial", "mutacao", "cruzamento")[i % 3], 100 + i,
+         round(i / 997, 3)) for i in range(300)]
+
+
+def _sink(d, **kw):
+    kw.setdefault("flush_s", 3600)                     # só grava quando o teste manda
+    kw.setdefault("batch", 10_000)
+    kw.setdefault("enabled", True)
+    return telemetry.Sink(os.path.join(d, "t.csv"), SCHEMA, **kw)
+
+
+def test_record_so_enfileira_e_o_lote_grava_com_header():
+    with tempfile.TemporaryDirectory() as d:
+        s = _sink(d)
+        for r in ROWS[:5]:
+            s.record(*r)
+        assert not os.path.exists(s.path)              # o record() não tocou em disco
+        s.flush()
+        for r in ROWS[5:]:
+            s.record(*r)
+        s.close()
+        with open(s.path) as f:
+            lidas = list(csv.DictReader(f))
+        assert len(lidas) == len(ROWS) and s.written == len(ROWS)
+        assert lidas[7] == {"unix_time": "1792000007", "idx": "7", "origin": "mutacao",
+                            "conns": "107", "acuity": "0.007"}
+
+
+def test_binario_colunar_volta_igual():
+    with tempfile.TemporaryDirectory() as d:
+        s = _sink(d, fmt="bin")
+        for i, r in enumerate(ROWS):
+            s.record(*r)
+            if i % 100 == 99:
+                s.flush()                              # 3 blocos no arquivo
+        s.close()
+        assert s.path.endswith(".bin")
+        assert [n for n, _ in telemetry.read_blocks(s.path)] == [100, 100, 100]
+        lidas = [tuple(r.values()) for r in telemetry.read_rows(s.path)]
+        assert lidas == ROWS
+        assert os.path.getsize(s.path) < len("".join(",".join(map(str, r)) + "\n" for r in ROWS))
+
+
+def test_rotacao_por_tamanho_deixa_header_em_cada_arquivo():
+    with tempfile.TemporaryDirectory() as d:
+        s = _sink(d, max_bytes=2000)
+        for i in range(0, len(ROWS), 50):
+            for r in ROWS[i:i + 50]:
+                s.record(*r)
+            s.flush()
+        s.close()
+        arquivos = sorted(os.listdir(d))
+        assert s.rotations >= 2 and len(arquivos) == s.rotations + 1
+        total = 0
+        for a in arquivos:
+            with open(os.path.join(d, a)) as f:
+                linhas = list(csv.DictReader(f))
+            assert linhas and set(linhas[0]) == {n for n, _ in SCHEMA}, a
+            total += len(linhas)
+        assert total == len(ROWS)
+
+
+def test_disco_quebrado_descarta_e_segue():
+    with tempfile.TemporaryDirectory() as d:
+        s = telemetry.Sink(os.path.join(d, "nao", "existe", "t.csv"), SCHEMA, enabled=True,
+                           flush_s=3600)
+        s.record(*ROWS[0])
+        s.close()
+        assert (s.written, s.dropped) == (0, 1)
+        desligada = _sink(d, enabled=False)
+        desligada.record(*ROWS[0])
+        desligada.close()
+        assert desligada.stats()["written"] == 0 and not os.path.exists(desligada.path)
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
@@ -0,0 +1,165 @@
+"""
+Testes do resumo em streaming da telemetria (telemetry_report.py).
+
+O resumo só presta se: o quantil do sketch ficar dentro do erro relativo prometido; as
+janelas fecharem na hora certa (e o total bater com a soma delas); os dois headers do CSV
+e o binário derem o mesmo número; e linha torta/atrasada ser contada, não engolida.
+
+Roda com:  pytest test_telemetry_report.py   (ou: python test_telemetry_report.py)
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import telemetry                             # noqa: E402
+import telemetry_report as tr                # noqa: E402
+
+V2 = "unix_time,idx,origin,nodes,conns,fnodes,fconns,genes,acuity"
+ORIGENS = ("primordial", "mutacao", "cruzamento")
+
+
+def _linhas(n, t0=1792000200, passo=1.0):         # t0 alinhado às janelas
+    rnd = random.Random(3)
+    for i in range(n):
+        conns = rnd.randint(20, 900)
+        yield (int(t0 + i * passo), i % 8, ORIGENS[i % 3], rnd.randint(7, 414), conns,
+               rnd.randint(6, 14), rnd.randint(6, 14), conns + 20, round(conns / (conns + 120), 3))
+
+
+def _roda(paths, **kw):
+    saida = []
+    rep = tr.Report(saida.append, **kw)
+    for p in paths:
+        tr.feed(p, rep)
+    rep.finish()
+    return saida
+
+
+def test_sketch_respeita_o_erro_relativo():
+    rnd = random.Random(1)
+    vals = [rnd.lognormvariate(4, 1) for _ in range(20000)] + [0.0] * 100
+    s = tr.Sketch(0.01)
+    for v in vals:
+        s.add(v)
+    vals.sort()
+    for q in (0.5, 0.9, 0.99):
+        exato = vals[int(q * (len(vals) - 1))]
+        assert abs(s.quantile(q) - exato) <= 0.011 * exato, q
+    assert len(s.bins) < 1200                          # memória: baldes, não linhas
+    a, b = tr.Sketch(0.01), tr.Sketch(0.01)
+    for i, v in enumerate(vals):
+        (a if i % 2 else b).add(v)
+    a.merge(b)
+    assert a.quantile(0.9) == s.quantile(0.9) and a.n == s.n
+
+
+def test_janelas_fecham_e_o_total_soma():
+    with tempfile.TemporaryDirectory() as d:
+        p = os.path.join(d, "v2.csv")
+        with open(p, "w") as f:
+            f.write(V2 + "\n")
+            for r in _linhas(3000):                    # 3000 s = 5 janelas de 600 s (a última parcial)
+                f.write(",".join(map(str, r)) + "\n")
+        saida = _roda([p], window=600, lateness=30)
+        janelas = [r for r in saida if r["window"] == "window" and r["origin"] == "*"]
+        assert [r["n"] for r in janelas] == [600, 600, 600, 600, 600]
+        total = [r for r in saida if r["window"] == "total"]
+        assert {r["origin"]: r["n"] for r in total} == {"cruzamento": 1000, "mutacao": 1000,
+                                                        "primordial": 1000, "*": 3000}
+        assert set(total[-1]["metrics"]) == {"nodes", "conns", "fnodes", "fconns", "genes",
+                                             "acuity"}
+        assert saida[-1] == {"window": "stats", "rows": 3000, "late": 0, "bad": 0}
+
+
+def test_janelas_deslizam_somando_os_passos():
+    with tempfile.TemporaryDirectory() as d:
+        p = os.path.join(d, "v2.csv")
+        with open(p, "w") as f:
+            f.write(V2 + "\n")
+            for r in _linhas(3000):                    # 15 passos de 200 s; janela = 3 passos
+                f.write(",".join(map(str, r)) + "\n")
+        saida = _roda([p], window=600, step=200, lateness=30)
+        janelas = [r for r in saida if r["window"] == "window" and r["origin"] == "*"]
+        assert [r["n"] for r in janelas] == [200, 400] + [600] * 13
+        assert all(b["t1"] - a["t1"] == 200 and b["t1"] - b["t0"] == 600
+                   for a, b in zip(janelas, janelas[1:]))
+        fixas = [r for r in _roda([p], window=600, lateness=30)
+                 if r["window"] == "window" and r["origin"] == "*"]
+        assert [r["metrics"] for r in janelas[2::3]] == [r["metrics"] for r in fixas]
+        assert [r for r in saida if r["window"] != "window"] == \
+            [r for r in _roda([p], window=600, lateness=30) if r["window"] != "window"]
+    try:
+        tr.Report(saida.append, window=600, step=250)
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("janela que não é múltiplo do passo passou")
+
+
+def test_header_v1_emendado_binario_e_linhas_tortas():
+    linhas = list(_linhas(1200))
+    with tempfile.TemporaryDirectory() as d:
+        v1, v2 = os.path.join(d, "v1.csv"), os.path.join(d, "v2.csv")
+        with open(v1, "w") as f:                       # v1: só as métricas do genoma
+            f.write("unix_time,idx,origin,nodes,conns,acuity\n")
+            for r in linhas[:600]:
+                f.write(",".join(map(str, (*r[:5], r[8]))) + "\n")
+        with open(v2, "w") as f:                       # v2 + rodado emendado (header no meio)
+            f.write(V2 + "\n")
+            for r in linhas[600:900]:
+                f.write(",".join(map(str, r)) + "\n")
+            f.write("1792000950,3,mut\n")              # escrita cortada
+            f.write(V2 + "\n")
+            for r in linhas[900:]:
+                f.write(",".join(map(str, r)) + "\n")
+            f.write(",".join(map(str, linhas[0])) + "\n")   # MUITO atrasada: janela já saiu
+        saida = _roda([v1, v2], window=300, lateness=10)
+        assert saida[-1] == {"window": "stats", "rows": 1200, "late": 1, "bad": 1}
+        total = [r for r in saida if r["window"] == "total" and r["origin"] == "*"][0]
+        assert total["metrics"]["nodes"]["max"] == max(r[3] for r in linhas)
+        assert "fconns" in total["metrics"]            # veio do v2; o v1 só não contribui
+
+        limpo = os.path.join(d, "limpo.csv")           # as mesmas linhas, CSV x binário
+        with open(limpo, "w") as f:
+            f.write(V2 + "\n")
+            for r in linhas[600:]:
+                f.write(",".join(map(str, r)) + "\n")
+        s = telemetry.Sink(os.path.join(d, "b.csv"), tuple(
+            (c, tc) for c, tc in zip(V2.split(","), "qIsIIIIId")), fmt="bin", enabled=True,
+            flush_s=3600)
+        for r in linhas[600:]:
+            s.record(*r)
+        s.close()
+        csv_v2 = [r for r in _roda([limpo], window=300) if r["window"] == "total"]
+        binario = [r for r in _roda([s.path], window=300) if r["window"] == "total"]
+        assert binario == csv_v2
+
+
+def test_cli_grava_json_por_linha():
+    with tempfile.TemporaryDirectory() as d:
+        p, out = os.path.join(d, "v2.csv"), os.path.join(d, "r.jsonl")
+        with open(p, "w") as f:
+            f.write(V2 + "\n")
+            for r in _linhas(100):
+                f.write(",".join(map(str, r)) + "\n")
+        assert tr.main([p, "--window", "60", "--out", out]) == 0
+        with open(out) as f:
+            recs = [json.loads(ln) for ln in f]
+        assert recs[-1]["rows"] == 100 and "p99" in recs[0]["metrics"]["conns"]
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
@@ -0,0 +1,86 @@
+"""
+Testes do cache de pais abertos (unpack_shared; bloco CACHE DE PAIS do neat_brain).
+
+O risco de um cache de genomas é um só: o pai em cache MUDAR. Um mutate in-place num pai
+compartilhado contaminaria todos os nascimentos seguintes que o recebem — e o filho de
+amanhã herdaria a mutação do irmão de hoje, sem ninguém ver.
+
+Roda com:  pytest test_unpack_cache.py   (ou: python test_unpack_cache.py)
+"""
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import neat_brain as nb                      # noqa: E402
+from synth_genomes import bank_like          # noqa: E402
+
+
+def _limpa():
+    nb._UNPACK_CACHE.clear()
+    nb._unpack_stats.update(hits=0, misses=0, bytes=0)
+
+
+def test_mesmo_blob_mesmo_objeto_e_conta_acerto():
+    _limpa()
+    pkt = nb.pack(bank_like(1, 200))
+    a = nb.unpack_shared(pkt)
+    b = nb.unpack_shared(pkt)
+    assert a is b
+    st = nb.unpack_cache_stats()
+    assert (st["hits"], st["misses"], st["entries"]) == (1, 1, 1)
+    assert st["hit_rate"] == 0.5 and st["bytes"] > 0
+
+
+def test_mutate_nao_toca_o_pai_em_cache():
+    """Copy-on-write: mutate devolve uma cópia; o pai compartilhado fica byte a byte igual."""
+    _limpa()
+    pkt = nb.pack(bank_like(2, 300))
+    pai = nb.unpack_shared(pkt)
+    antes = nb.to_dict(pai)
+    for _ in range(5):
+        filho = nb.mutate(nb.unpack_shared(pkt))
+        assert filho is not pai and not getattr(filho, "_shared", False)
+    assert nb.to_dict(pai) == antes
+    assert nb.to_dict(nb.unpack(pkt)) == antes
+
+
+def test_crossover_nao_toca_os_pais_em_cache():
+    _limpa()
+    pa, pb = nb.pack(bank_like(3, 200)), nb.pack(bank_like(4, 200))
+    a, b = nb.unpack_shared(pa), nb.unpack_shared(pb)
+    antes = (nb.to_dict(a), nb.to_dict(b))
+    for i in range(10):
+        nb.mutate(nb.crossover(a, b, i))
+    assert (nb.to_dict(a), nb.to_dict(b)) == antes
+
+
+def test_lru_limitado_e_bytes_acompanham():
+    _limpa()
+    velho = nb._UNPACK_CACHE_MAX
+    nb._UNPACK_CACHE_MAX = 3
+    try:
+        blobs = [nb.pack(bank_like(10 + k, 120)) for k in range(5)]
+        for p in blobs:
+            nb.unpack_shared(p)
+        st = nb.unpack_cache_stats()
+        assert st["entries"] == 3
+        assert st["bytes"] == sum(nb._UNPACK_CACHE[k][1] for k in nb._UNPACK_CACHE)
+        nb.unpack_shared(blobs[0])                 # o mais antigo foi despejado
+        assert nb.unpack_cache_stats()["misses"] == 6
+    finally:
+        nb._UNPACK_CACHE_MAX = velho
+        _limpa()
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
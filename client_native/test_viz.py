@@ -0,0 +1,144 @@
+"""
+Testes dos quadros de viz (viz.py) e da estrutura funcional (neat_brain.functional_dict).
+
+A viz só presta se: a estrutura for o cérebro REAL (nada de oculto morto); o teto de
+frequência valer independente do ritmo dos ticks; quadro sem mudança ficar em casa; e, no
+q8, um viewer que acumula os deltas chegar ao mesmo vetor (a menos da quantização).
+
+Roda com:  pytest test_viz.py   (ou: python test_viz.py)
+"""
+import json
+import os
+import random
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+import neat_brain as nb                      # noqa: E402
+import viz                                   # noqa: E402
+
+N_INP, N_OUT = 163, 7
+
+
+def _genoma_com_tecido_morto():
+    random.seed(5)
+    g = nb.random_genome(5)
+    for _ in range(60):
+        g = nb.mutate(g)
+    return g
+
+
+def test_estrutura_funcional_e_so_o_cerebro_real():
+    g = _genoma_com_tecido_morto()
+    net = nb.build_net(g)
+    st = nb.functional_dict(g, net)
+    fnodes, fconns = nb.functional_complexity(g)
+    assert len(st["conns"]) == sum(len(ev[5]) for ev in net.node_evals)
+    assert len(st["nodes"]) == len(net.node_evals) <= fnodes
+    assert len(st["conns"]) <= fconns
+    ids = {int(n) for n in st["nodes"]}
+    assert all(c[1] in ids and (c[0] in ids or c[0] < 0) and c[3] for c in st["conns"])
+    cheio = nb.to_dict(g)
+    assert len(json.dumps(st)) < len(json.dumps(cheio))
+    assert all(st["nodes"][k] == cheio["nodes"][k] for k in st["nodes"])
+
+
+def test_teto_de_frequencia_e_quadro_parado_fica_em_casa():
+    vs = viz.VizStream([7, 9], fmt="json", hz=4, delta=0.01, key_s=60)
+    inp, hid, out = [0.5] * N_INP, [0.1, 0.2], [0.0] * N_OUT
+    enviados = []
+    for k in range(50):                                # 5 s de ticks a 10 Hz
+        t = k * 0.1
+        if vs.due(t):
+            inp = list(inp)
+            inp[k % N_INP] += 0.05                     # algo muda a cada tick
+            act = vs.frame(t, inp, hid, out, 2)
+            if act is not None:
+                enviados.append(act)
+    assert 18 <= len(enviados) <= 21                   # ~4 Hz, não 10
+    assert set(enviados[0]["hid"]) == {"7", "9"} and len(enviados[0]["inp"]) == N_INP
+    parado = viz.VizStream([7], fmt="json", hz=0, delta=0.01, key_s=1.0)
+    sai = [parado.frame(t / 10, inp, [0.3], out, 1) is not None for t in range(25)]
+    assert sai == [True] + [False] * 9 + [True] + [False] * 9 + [True] + [False] * 4
+    assert parado.frame(2.5, inp, [0.3], out, 4) is not None   # mudou a ação: sai
+    assert parado.frame(2.6, inp, [0.3 + 0.02], out, 4) is not None
+
+
+def test_quadro_segurado_tambem_respeita_o_teto():
+    # cérebro parado, ticks a 10 Hz, teto de 4 Hz: frame() (ocultos, vetor, comparação) roda
+    # ~4x/s, não em todo tick que vem depois de um quadro segurado
+    for fmt in ("json", "q8"):
+        vs = viz.VizStream([7], fmt=fmt, hz=4, delta=0.01, key_s=60)
+        inp, out = [0.5] * N_INP, [0.0] * N_OUT
+        montados = enviados = 0
+        for k in range(100):
+            t = k * 0.1
+            if vs.due(t):
+                montados += 1
+                enviados += vs.frame(t, inp, [0.3], out, 1) is not None
+        assert 38 <= montados <= 42, (fmt, montados)
+        assert enviados == 1 and vs.held == montados - 1
+
+
+def test_q8_o_viewer_reconstroi_o_vetor_pelos_deltas():
+    rnd = random.Random(2)
+    vs = viz.VizStream(list(range(7, 27)), fmt="q8", hz=0, delta=0.02, key_s=60)
+    vec = [rnd.uniform(-1, 1) for _ in range(N_INP + 20 + N_OUT)]
+    visto, n_bytes = None, 0
+    for k in range(40):
+        for _ in range(10):                            # poucos valores mexem por tick
+            i = rnd.randrange(len(vec))
+            vec[i] = max(-1.0, min(1.0, vec[i] + rnd.uniform(-0.3, 0.3)))
+        act = vs.frame(k * 0.25, vec[:N_INP], vec[N_INP:N_INP + 20], vec[N_INP + 20:], 0)
+        n_bytes += len(json.dumps(act))
+        if "d" in act:                                 # delta: só os índices que mudaram
+            for i, v in zip(viz.indices(act["d"]), viz.dequantize(act["q"])):
+                visto[i] = v
+        else:
+            assert act["key"] == 1
+            visto = viz.dequantize(act["q"])
+        assert max(abs(a - b) for a, b in zip(visto, vec)) <= 0.02 + 0.5 / viz.Q
+    assert vs.sent == 40
+    legado = viz.VizStream(list(range(7, 27)), fmt="json", hz=0, delta=0)
+    cheio = json.dumps(legado.frame(0, vec[:N_INP], vec[N_INP:N_INP + 20], vec[N_INP + 20:], 0))
+    assert n_bytes < 40 * len(cheio) / 4                # < 1/4 dos bytes do quadro de sempre
+    assert viz.quantize([2.0, -3.0, 0.5]).tolist() == [127, -127, 64]
+
+
+def test_estrutura_serializada_uma_vez_por_vida():
+    g = _genoma_com_tecido_morto()
+    net = nb.build_net(g)
+    chamadas = []
+
+    def struct(b):
+        chamadas.append(b)
+        return nb.functional_dict(g, net)
+    for fmt in ("json", "q8"):
+        chamadas.clear()
+        vs = viz.VizStream([7], fmt=fmt, hz=0, delta=0)
+        inp, out = [0.2] * N_INP, [0.0] * N_OUT
+        msgs = []
+        for sessao in range(3):                        # o viewer entra e sai 3 vezes
+            for k in range(3):
+                act = vs.frame(sessao * 10 + k, inp, [k / 10], out, k)
+                msgs.append(json.loads(vs.payload(act, struct, "b")))
+            vs.reset()
+        assert chamadas == ["b"], fmt                  # montada (e serializada) 1x
+        com = [m for m in msgs if "struct" in m]
+        assert len(com) == 3 and all(m["struct"] == nb.functional_dict(g, net) for m in com)
+        assert [m["type"] for m in msgs] == ["brain_viz"] * 9
+        assert ("layout" in com[0]) == (fmt == "q8")
+        assert msgs[1]["act"]["win"] == 1
+
+
+if __name__ == "__main__":
+    testes = [v for k, v in sorted(globals().items()) if k.startswith("test_")]
+    ok = 0
+    for t in testes:
+        try:
+            t(); print("PASS", t.__name__); ok += 1
+        except AssertionError as e:
+            print("FAIL", t.__name__, "->", e)
+        except Exception as e:
+            print("ERRO", t.__name__, "->", type(e).__name__, e)
+    print(f"\n{ok}/{len(testes)} testes passaram.")
+    sys.exit(0 if ok == len(testes) else 1)
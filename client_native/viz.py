@@ -0,0 +1,159 @@
+"""
+viz.py — os quadros de BRAIN_VIZ de uma ameba observada (compartilhado pelas duas espécies).
+
+Antes, com observador, TODO tick: as 163 entradas arredondadas uma a uma, um dict com TODOS
+os nós do genoma (centenas de ocultos mortos que nunca disparam) e, a cada sessão nova de
+observação, o nb.to_dict(g) inteiro. Agora:
+
+  · só o CÉREBRO REAL — ocultos funcionais (nb.functional_dict / substrato.functional_hidden);
+    a estrutura mandada é o subgrafo funcional, não o genoma;
+  · teto de quadros por ameba (REGENES_VIZ_HZ, default 4 = o refresh do viewer), sem
+    depender do ritmo dos ticks: tick acima do teto nem lê os ocultos;
+  · quadro que não muda nada além de REGENES_VIZ_DELTA (default 0.01) não sai — com a
+    mesma ação vencedora, o viewer já mostra o que importa. A cada REGENES_VIZ_KEY_S
+    (default 5 s) sai um quadro cheio de qualquer jeito (viewer que entrou no meio);
+  · a estrutura é FIXA na vida: montada e serializada UMA vez, na 1ª observação, e guardada
+    como texto JSON pronto; sessão nova de observação só emenda o quadro pequeno em volta
+    dela (payload()) — sem remontar o dict nem re-serializar as sinapses de novo;
+  · REGENES_VIZ_FORMAT=q8 (opt-in: o viewer precisa entender): o vetor entradas|ocultos|
+    saídas quantizado em int8 (v*127, cortado em [-1, 1]) e em base64. Quadro cheio = o
+    vetor todo ("q"); o resto é DELTA: só os índices que mudaram >= o limiar ("d", uint16)
+    e os valores novos deles ("q"). O layout (nº de entradas, ids dos ocultos, nº de saídas)
+    vai junto da estrutura. O default (json) mantém o quadro de sempre — as mesmas chaves,
+    só que "hid" com os funcionais.
+"""
+import base64
+import json
+import os
+import sys
+from array import array
+
+FORMAT = os.getenv("REGENES_VIZ_FORMAT", "json")
+HZ = float(os.getenv("REGENES_VIZ_HZ", "4"))
+DELTA = float(os.getenv("REGENES_VIZ_DELTA", "0.01"))
+KEY_S = float(os.getenv("REGENES_VIZ_KEY_S", "5"))
+
+Q = 127                                  # escala do int8: v = q / 127
+
+
+def quantize(values) -> array:
+    """floats -> int8 (v*127 arredondado, cortado em [-1, 1])."""
+    return array("b", [Q if v >= 1.0 else -Q if v <= -1.0 else int(round(v * Q))
+                       for v in values])
+
+
+def _b64(a: array) -> str:
+    if a.itemsize > 1 and sys.byteorder != "little":
+        a = array(a.typecode, a)
+        a.byteswap()
+    return base64.b64encode(a.tobytes()).decode("ascii")
+
+
+def dequantize(payload: str) -> list:
+    """base64 int8 -> floats (o que o viewer faz; testes e inspeção)."""
+    return [q / Q for q in array("b", base64.b64decode(payload))]
+
+
+def indices(payload: str) -> list:
+    a = array("H", base64.b64decode(payload))
+    if sys.byteorder != "little":
+        a.byteswap()
+    return list(a)
+
+
+class VizStream:
+    """Quadros de UMA vida enquanto é observada. due() decide se o tick paga um quadro (teto
+    de frequência); frame() monta o `act` — ou None, se nada mudou além do limiar."""
+
+    def __init__(self, hid_ids, fmt: str = FORMAT, hz: float = HZ, delta: float = DELTA,
+                 key_s: float = KEY_S):
+        self.hid_ids = list(hid_ids)
+        self.fmt = fmt if fmt in ("json", "q8") else "json"
+        self.interval = 1.0 / hz if hz > 0 else 0.0
+        self.delta = delta
+        self.qdelta = max(1, int(round(delta * Q)))
+        self.key_s = key_s
+        self.sent = self.held = 0
+        self._struct = None              # ',"struct":{...}' já serializado: 1x por vida
+        self._sizes = (0, 0)
+        self.reset()
+
+    def reset(self) -> None:
+        """Parou de observar: a próxima sessão começa com estrutura + quadro cheio."""
+        self.fresh = True                # a próxima saída leva a estrutura
+        self._last = None                # último vetor mandado (float no json, int8 no q8)
+        self._win = None
+        self._next = self._t_key = None
+
+    def due(self, now: float, slow: float = 1) -> bool:
+        """O tick paga um quadro? slow: o teto dividido por isto (governor.py, sob carga)."""
+        if self._next is None:
+            return True
+        # folga de 10%: tick a 4 Hz com jitter não pode cair pra 2 Hz
+        return now >= self._next + (slow - 1.1) * self.interval
+
+    def layout(self, n_inp: int, n_out: int) -> dict:
+        return {"inp": n_inp, "hid": self.hid_ids, "out": n_out, "q": Q}
+
+    def payload(self, act: dict, struct_fn, b) -> str:
+        """`act` -> a mensagem brain_viz pronta. No 1º quadro da sessão vai a estrutura junto:
+        struct_fn(b) roda (e é serializada) só na 1ª sessão da vida; as outras reusam o texto."""
+        msg = '{"type":"brain_viz","act":' + json.dumps(act, separators=(",", ":"))
+        if not self.fresh:
+            return msg + "}"
+        self.fresh = False
+        if self._struct is None:
+            self._struct = ',"struct":' + json.dumps(struct_fn(b), separators=(",", ":"))
+            if self.fmt == "q8":
+                self._struct += ',"layout":' + json.dumps(self.layout(*self._sizes),
+                                                          separators=(",", ":"))
+        return msg + self._struct + "}"
+
+    def frame(self, now: float, inp, hid, out, win: int):
+        """-> o dict `act` do brain_viz, ou None. hid = valores alinhados com hid_ids."""
+        key = self._last is None or now - self._t_key >= self.key_s
+        vec = list(inp) + list(hid) + list(out)
+        self._sizes = (len(inp), len(out))
+        if self.fmt == "q8":
+            act = self._q8(vec, win, key)
+        else:
+            act = self._json(vec, len(inp), len(hid), win, key)
+        # agenda em grade (não "agora + intervalo"): ticks a 10 Hz dão 4 quadros/s, não 3.3;
+        # depois de um buraco (tick lento, observação parada), a grade recomeça de agora. O
+        # quadro segurado também anda a grade: senão due() fica True e todo tick paga a montagem
+        nxt = self._next
+        self._next = (nxt if nxt is not None and now - nxt < self.interval else now) \
+            + self.interval
+        if act is None:
+            self.held += 1
+            return None
+        self._win = win
+        if key:
+            self._t_key = now
+        self.sent += 1
+        return act
+
+    def _json(self, vec, n_inp, n_hid, win, key):
+        last = self._last
+        if not key and win == self._win and \
+                max(abs(a - b) for a, b in zip(vec, last)) < self.delta:
+            return None
+        self._last = vec
+        return {"inp": [round(x, 3) for x in vec[:n_inp]],
+                "hid": {str(i): round(v, 3)
+                        for i, v in zip(self.hid_ids, vec[n_inp:n_inp + n_hid])},
+                "out": [round(x, 3) for x in vec[n_inp + n_hid:]],
+                "win": win}
+
+    def _q8(self, vec, win, key):
+        q = quantize(vec)
+        if key:
+            self._last = q
+            return {"q": _b64(q), "win": win, "key": 1}
+        last, thr = self._last, self.qdelta
+        idx = array("H", [i for i, (a, b) in enumerate(zip(q, last)) if abs(a - b) >= thr])
+        if not idx and win == self._win:
+            return None
+        for i in idx:
+            last[i] = q[i]               # o viewer acumula: a régua é o que ELE tem
+        return {"d": _b64(idx), "q": _b64(array("b", [q[i] for i in idx])), "win": win}
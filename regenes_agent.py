@@ -29,6 +29,7 @@ import os
 import random
 import ssl
 import sys
+import time
 
 import websockets
 
@@ -116,7 +117,9 @@ class BaseAgent:
 # =========================================================
 #  Runtime: conexão, handshake e loop universal
 # =========================================================
-async def _run_one(agent: BaseAgent):
+async def _run_one(agent: BaseAgent, stats=None):
+    """Uma vida. `stats` (opcional, runtime_stats.RuntimeStats): os números do endpoint
+    admin (run_swarm com REGENES_ADMIN)."""
     q = (f"/ws/join?species={agent.species}&paradigm={agent.paradigm}"
          f"&wants_brain={int(agent.wants_brain)}&self_learns={int(agent.self_learns)}"
          f"&protocol_version={PROTOCOL_VERSION}&n_obs={N_OBS}&n_actions={N_ACTIONS}")
@@ -125,50 +128,95 @@ async def _run_one(agent: BaseAgent):
     async with websockets.connect(url, ssl=ssl_ctx) as ws:
         welcome = json.loads(await ws.recv())
         agent.on_welcome(welcome)
-        commands = (agent.action_spec or {}).get("commands") or [
-            {"wire": {"action": "forward"}},
-            {"wire": {"action": "backward"}},
-            {"wire": {"action": "turn", "dir": "left"}},
-            {"wire": {"action": "turn", "dir": "right"}},
-            {"wire": {"action": "stay"}},
-            {"wire": {"action": "attack"}},
-            {"wire": {"action": "push"}},
-        ]
-
-        while True:
-            msg = json.loads(await ws.recv())
-            mtype = msg.get("type")
-            if mtype == "UPDATE":
-                agent.on_update(msg)
-                if not msg.get("alive", True):
-                    agent.on_death(msg)
-                    return
-            elif mtype == "TICK":
-                obs = {
-                    "vision": msg.get("vision"),
-                    "energy": msg.get("energy", 0),
-                    "stomach": msg.get("stomach", 0),
-                    "tick": msg.get("tick"),
-                    # marca-passo interno (relógio endógeno) — ver GENESIS_BIBLE §12
-                    "pace_sin": msg.get("pace_sin", 0.0),
-                    "pace_cos": msg.get("pace_cos", 0.0),
-                }
-                idx = agent.decide(obs)
-                idx = max(0, min(int(idx), len(commands) - 1))
-                await ws.send(json.dumps(commands[idx]["wire"]))
-
-
-async def run_swarm(factory, n: int):
+        if stats is not None:
+            stats.born("heranca" if agent.brain else "primordial")
+        try:
+            await _live(ws, agent, stats)
+        finally:
+            if stats is not None:
+                stats.died()
+
+
+async def _live(ws, agent: BaseAgent, stats):
+    """O loop universal da vida (depois do WELCOME)."""
+    commands = (agent.action_spec or {}).get("commands") or [
+        {"wire": {"action": "forward"}},
+        {"wire": {"action": "backward"}},
+        {"wire": {"action": "turn", "dir": "left"}},
+        {"wire": {"action": "turn", "dir": "right"}},
+        {"wire": {"action": "stay"}},
+        {"wire": {"action": "attack"}},
+        {"wire": {"action": "push"}},
+    ]
+
+    while True:
+        msg = json.loads(await ws.recv())
+        mtype = msg.get("type")
+        if mtype == "UPDATE":
+            agent.on_update(msg)
+            if not msg.get("alive", True):
+                agent.on_death(msg)
+                return
+        elif mtype == "TICK":
+            t_tick = time.perf_counter()
+            obs = {
+                "vision": msg.get("vision"),
+                "energy": msg.get("energy", 0),
+                "stomach": msg.get("stomach", 0),
+                "tick": msg.get("tick"),
+                # marca-passo interno (relógio endógeno) — ver GENESIS_BIBLE §12
+                "pace_sin": msg.get("pace_sin", 0.0),
+                "pace_cos": msg.get("pace_cos", 0.0),
+            }
+            idx = agent.decide(obs)
+            idx = max(0, min(int(idx), len(commands) - 1))
+            await ws.send(json.dumps(commands[idx]["wire"]))
+            if stats is not None:
+                stats.tick(time.perf_counter() - t_tick)
+
+
+def _admin(species: str, n: int, addr: str, errors: dict):
+    """-> (RuntimeStats, Admin) do endpoint local de métricas, ou (None, None).
+
+    O endpoint é o mesmo dos executores Fase 2 (client_native/admin.py: /metrics no texto
+    Prometheus, /metrics.json). O SDK anda sozinho — o módulo só é procurado quando
+    REGENES_ADMIN (ou admin=) pede; fora de um checkout do repo, avisa e segue sem."""
+    if not addr:
+        return None, None
+    sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "client_native"))
+    try:
+        import admin
+        import runtime_stats
+    except ImportError:
+        print("⚠️  REGENES_ADMIN: client_native/admin.py não encontrado — sem endpoint")
+        return None, None
+    stats = runtime_stats.RuntimeStats(species, n)
+
+    def collect():
+        s = stats.snapshot()
+        s.update(target=n, births_by_origin=dict(stats.origins), errors=errors["count"])
+        return {"pid": os.getpid(), "uptime_s": s["uptime_s"], "species": {species: s}}
+    return stats, admin.Admin(collect)
+
+
+async def run_swarm(factory, n: int, admin: str = None):
     """Mantém n amebas vivas dessa espécie; respawna quando morrem.
-    'factory' é chamado a cada nova vida (pode fechar sobre um modelo compartilhado)."""
+    'factory' é chamado a cada nova vida (pode fechar sobre um modelo compartilhado).
+    'admin' ("host:porta" ou "unix:/caminho"; default REGENES_ADMIN): endpoint local de
+    métricas (amebas vivas, nascimentos, ticks/s, latência do decide)."""
     tasks = set()
     errors = {"count": 0}
+    species = factory().species
+    addr = os.getenv("REGENES_ADMIN", "") if admin is None else admin
+    stats, adm = _admin(species, n, addr, errors)
+    if adm is not None:
+        await adm.start(addr)
 
     async def spawn():
         agent = None
         try:
             agent = factory()          # DENTRO do try: se o factory (get_genome) lançar,
-            await _run_one(agent)       # a gente captura em vez de matar os nascimentos calado.
+            await _run_one(agent, stats)  # a gente captura em vez de matar os nascimentos calado.
         except Exception as e:
             errors["count"] += 1
             if errors["count"] <= 5 or errors["count"] % 100 == 0:
@@ -176,7 +224,7 @@ async def run_swarm(factory, n: int):
                 print(f"⚠️  erro #{errors['count']} ({sp}): {type(e).__name__}: {e}")
             await asyncio.sleep(0.25)    # evita loop apertado de falha (não pega 100% de CPU)
 
-    print(f"🚀 Arena: subindo {n}x {factory().species} contra {SERVER_URL}")
+    print(f"🚀 Arena: subindo {n}x {species} contra {SERVER_URL}")
     while True:
         while len(tasks) < n:
             t = asyncio.create_task(spawn())
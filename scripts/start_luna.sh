@@ -1,5 +1,7 @@
 #!/usr/bin/env bash
-# Sobe os dois executores Fase 2 contra o mundo local.
+# Sobe os executores Fase 2 contra o mundo local, via supervisor (client_native/supervisor.py):
+# workers presos em núcleo, reinício com backoff, drenagem no stop. Status agregado:
+#   .venv/bin/python client_native/supervisor.py status
 # NÃO sobe legacy/ (fitness explícita, card #10).
 set -euo pipefail
 
@@ -16,17 +18,19 @@ if [[ ! -x "$PY" ]]; then
   exit 1
 fi
 
-# pkill: colchetes pra não casar com este próprio shell (armadilha da CLAUDE.md).
+# reinício: drena o supervisor anterior (as vidas em curso terminam) antes de subir o novo.
+"$PY" "$ROOT/client_native/supervisor.py" stop --wait
+# executores soltos da era nohup. pkill: colchetes pra não casar com este próprio shell
+# (armadilha da CLAUDE.md).
 pkill -f "client_native/hos[t].py" 2>/dev/null || true
 pkill -f "client_hyperneat/host_hype[r].py" 2>/dev/null || true
 sleep 0.3
 
 export REGENES_OPERATOR="${REGENES_OPERATOR:-luna}"
+# tabelas só-leitura (consultas do substrato, substratos expressos, PSFs do cone) em /dev/shm: uma cópia no host
+export REGENES_SHM="${REGENES_SHM:-1}"
 cd "$ROOT/client_native"
-nohup "$PY" -u host.py "$N_NATIVE" "$WS" >>"$LOG/native.log" 2>&1 &
-echo "native pid $!  N=$N_NATIVE  $WS"
-
-cd "$ROOT/client_hyperneat"
-nohup "$PY" -u host_hyper.py "$N_HYPER" "$WS" >>"$LOG/hyper.log" 2>&1 &
-echo "hyper  pid $!  N=$N_HYPER  $WS"
-echo "logs: $LOG/{native,hyper}.log"
+nohup "$PY" -u supervisor.py run --native "$N_NATIVE" --hyper "$N_HYPER" --ws "$WS" \
+  >>"$LOG/supervisor.log" 2>&1 &
+echo "supervisor pid $!  native=$N_NATIVE hyper=$N_HYPER  $WS"
+echo "logs: $LOG/supervisor.log, $LOG/{native,hyper}-<k>.log"
@@ -1,6 +1,11 @@
 #!/usr/bin/env bash
-# Colchetes no padrão: pkill -f com o nome do script na mesma linha se mata.
+# Drena os executores: cada ameba termina a vida em curso (prazo REGENES_DRAIN_TIMEOUT).
 set -euo pipefail
+ROOT="$(cd "$(dirname "$0")/.." && pwd)"
+PY="${ROOT}/.venv/bin/python"
+[[ -x "$PY" ]] || PY=python3
+"$PY" "$ROOT/client_native/supervisor.py" stop --wait
+# Sobras da era nohup. Colchetes no padrão: pkill -f com o nome do script na mesma linha se mata.
 pkill -f "client_native/hos[t].py" 2>/dev/null || true
 pkill -f "client_hyperneat/host_hype[r].py" 2>/dev/null || true
 echo "clientes luna parados"